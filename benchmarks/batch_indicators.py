@@ -0,0 +1,112 @@
+# benchmarks/batch_indicators.py
+"""
+batch 지표 커널 처리량 측정 (기본 1,000만 틱)
+
+예)
+  python -m benchmarks.batch_indicators                 # 10M 틱
+  python -m benchmarks.batch_indicators --ticks 1000000 --scalar-sample 20000
+
+- 1,400원대 랜덤워크(횡보 구간 포함)로 커널별 소요 시간/처리량 측정
+- 같은 데이터 앞부분으로 틱별 스칼라 경로(signal_utils / _is_squeeze)를 돌려 틱당 비용을 외삽해 비교
+- 샘플 구간에서 커널 ↔ 스칼라 최대 오차 출력 (정확성 회귀 확인용)
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from config import MOVING_AVERAGE_PERIOD, SHORT_TERM_PERIOD, LONG_TERM_PERIOD
+from strategies.utils import batch
+
+
+def make_ticks(n: int, seed: int = 42) -> np.ndarray:
+    """랜덤워크 + 1만 틱마다 200틱 횡보 (누적합 잡음 보정 경로도 함께 측정)"""
+    rng = np.random.default_rng(seed)
+    x = 1400.0 + np.cumsum(rng.normal(0, 0.3, n))
+    for start in range(10_000, n, 10_000):
+        x[start:start + 200] = x[start - 1]
+    return np.round(x, 2)
+
+
+def _timed(label: str, fn, n: int) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<18} {elapsed:7.2f}s  ({n / elapsed / 1e6:6.1f}M 틱/s)")
+    return elapsed, result
+
+
+def bench_kernels(x: np.ndarray) -> dict[str, np.ndarray]:
+    n = len(x)
+    print(f"⏱️ 커널별 ({n:,}틱)")
+    _, bands = _timed(f"bollinger({MOVING_AVERAGE_PERIOD})", lambda: batch.bollinger_bands(x, MOVING_AVERAGE_PERIOD), n)
+    _timed(f"zscore({MOVING_AVERAGE_PERIOD})", lambda: batch.rolling_zscore(x, MOVING_AVERAGE_PERIOD), n)
+    _timed(f"sma({SHORT_TERM_PERIOD})", lambda: batch.rolling_sma(x, SHORT_TERM_PERIOD), n)
+    _timed(f"sma({LONG_TERM_PERIOD})", lambda: batch.rolling_sma(x, LONG_TERM_PERIOD), n)
+    _timed("close_atr(14)", lambda: batch.close_atr(x, 14), n)
+    _timed("squeeze", lambda: batch.squeeze_flags(bands["width"]), n)
+    total, result = _timed("compute_indicators", lambda: batch.compute_indicators(x), n)
+    print(f"  → 전체 {total:.2f}s, 틱당 {total / n * 1e9:.0f}ns")
+    return result
+
+
+def bench_scalar(x: np.ndarray, indicators: dict[str, np.ndarray], sample: int) -> None:
+    """틱별 스칼라 경로로 앞 sample 틱 처리 → 틱당 비용과 최대 오차"""
+    from strategies import bollinger
+    from strategies.utils.signal_utils import atr_from_rates, rolling_stdev, sma, zscore
+
+    rates = x[:sample].tolist()
+    window = max(LONG_TERM_PERIOD, MOVING_AVERAGE_PERIOD, 15)
+    err = {"boll_mid": 0.0, "boll_upper": 0.0, "zscore": 0.0, "sma_long": 0.0, "atr": 0.0}
+    squeeze_mismatch = 0
+    bollinger.reset_band_width_history()
+    started = time.perf_counter()
+    try:
+        for i in range(len(rates)):
+            # 워처처럼 최근 window 개만 넘김 (전체 prefix 를 넘기면 O(n²))
+            tail = rates[max(0, i + 1 - window):i + 1]
+            m = sma(tail, MOVING_AVERAGE_PERIOD)
+            if m is None:
+                continue
+            s = rolling_stdev(tail, MOVING_AVERAGE_PERIOD)
+            values = {
+                "boll_mid": m, "boll_upper": m + 2 * s, "zscore": zscore(tail, MOVING_AVERAGE_PERIOD),
+                "sma_long": sma(tail, LONG_TERM_PERIOD), "atr": atr_from_rates([], [], tail[-15:], 14),
+            }
+            for key, v in values.items():
+                if v is not None:
+                    err[key] = max(err[key], abs(indicators[key][i] - v))
+            bw = 4 * s
+            if bw >= bollinger.EPSILON:
+                bollinger.BAND_WIDTH_HISTORY.push(bw)
+                squeeze_mismatch += bool(bollinger._is_squeeze(bw)) != bool(indicators["squeeze"][i])
+    finally:
+        bollinger.reset_band_width_history()
+    elapsed = time.perf_counter() - started
+    per_tick = elapsed / len(rates)
+    print(f"🐢 틱별 스칼라 경로 ({len(rates):,}틱 샘플): {elapsed:.2f}s, 틱당 {per_tick * 1e6:.1f}µs")
+    print(f"  → {len(x):,}틱 외삽 {per_tick * len(x):,.0f}s")
+    print("🎯 최대 오차: " + ", ".join(f"{k}={v:.1e}" for k, v in err.items()) + f", squeeze 불일치={squeeze_mismatch}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="batch 지표 커널 처리량 측정")
+    parser.add_argument("--ticks", type=int, default=10_000_000, help="틱 수 (기본 1,000만)")
+    parser.add_argument("--scalar-sample", type=int, default=50_000, help="스칼라 경로 비교용 앞부분 틱 수 (0 이면 생략)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    x = make_ticks(args.ticks, args.seed)
+    print(f"📦 틱 생성 {args.ticks:,}건 ({x.nbytes / 2**20:.0f}MiB, {time.perf_counter() - started:.2f}s)")
+    indicators = bench_kernels(x)
+    if args.scalar_sample:
+        bench_scalar(x, indicators, min(args.scalar_sample, args.ticks))
+    nan_tail = sum(math.isnan(v[-1]) for k, v in indicators.items() if v.dtype.kind == "f")
+    if nan_tail:
+        print(f"⚠️ 마지막 틱에 NaN 지표 {nan_tail}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/chart_loop_lag.py
+"""
+30분 차트 렌더링 중 이벤트 루프 지연 측정 (루프 안 동기 렌더링 vs 차트 프로세스 풀)
+
+예)
+  python -m benchmarks.chart_loop_lag
+  python -m benchmarks.chart_loop_lag --renders 10 --interval-ms 5
+
+- 루프에 interval 마다 깨어나는 티커를 띄우고, 예정 시각 대비 늦게 깨어난 시간(지연)을 기록
+- inline: generate_30min_chart (워처가 풀 도입 전 하던 방식, 루프 스레드에서 렌더링)
+- pool: render_30min_chart (첫 렌더링은 워커 spawn 포함 → cold, 이후 warm 으로 분리 집계)
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from strategies.summary import generate_30min_chart, render_30min_chart
+from utils.charts import shutdown_chart_pool
+from utils.time import TIMEZONE
+
+
+def make_rates(n: int = 180) -> list[tuple[datetime, float]]:
+    """30분 구간 10초 간격 틱 (요약 차트 입력과 같은 형태)"""
+    start = TIMEZONE.localize(datetime(2025, 9, 2, 10))
+    return [(start + timedelta(seconds=10 * i), 1390.0 + (i % 17) * 0.05) for i in range(n)]
+
+
+class LagProbe:
+    """interval 마다 깨어나며 (실제 깨어난 시각 - 예정 시각) 을 기록"""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def start(self):
+        self.lags.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> list[float]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return list(self.lags)
+
+
+def _report(label: str, lags: list[float], durations: list[float]):
+    if not lags:
+        print(f"  {label:<11} 표본 없음")
+        return
+    ordered = sorted(lags)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"  {label:<11} 렌더링 평균 {statistics.mean(durations) * 1e3:7.1f}ms | "
+        f"루프 지연 최대 {ordered[-1] * 1e3:7.1f}ms, p99 {p99 * 1e3:6.1f}ms, 중앙값 {statistics.median(ordered) * 1e3:5.2f}ms "
+        f"(표본 {len(ordered)})"
+    )
+
+
+async def _measure(render, rates, renders: int, interval: float) -> tuple[list[float], list[float]]:
+    probe = LagProbe(interval)
+    lags, durations = [], []
+    for _ in range(renders):
+        probe.start()
+        await asyncio.sleep(interval * 4)   # 티커가 도는 상태에서 시작
+        started = time.perf_counter()
+        result = render(rates)
+        if asyncio.iscoroutine(result):
+            result = await result
+        durations.append(time.perf_counter() - started)
+        await asyncio.sleep(interval * 4)
+        lags.extend(await probe.stop())
+        assert result is not None and result.getbuffer().nbytes > 0
+    return lags, durations
+
+
+async def main_async(renders: int, interval: float):
+    rates = make_rates()
+    print(f"⏱️ 차트 렌더링 {renders}회, 티커 간격 {interval * 1e3:.0f}ms")
+
+    _report("inline", *await _measure(generate_30min_chart, rates, renders, interval))
+    try:
+        _report("pool(cold)", *await _measure(render_30min_chart, rates, 1, interval))
+        _report("pool(warm)", *await _measure(render_30min_chart, rates, renders, interval))
+    finally:
+        shutdown_chart_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="차트 렌더링 중 이벤트 루프 지연 측정")
+    parser.add_argument("--renders", type=int, default=5, help="방식별 렌더링 횟수")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="지연 측정 티커 간격(ms)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.renders, args.interval_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,18 +18,85 @@ DB_URL_MASKED = f"postgresql://{DB_USER}:*****@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 # 환율 API 키
 ACCESS_KEY = os.environ.get("EXCHANGERATE_API_KEY")
 
+# 시세 공급자 (콤마 구분, 동시에 조회해 중앙값 합의)
+# 사용 가능: exchangerate_host, open_er_api, frankfurter
+QUOTE_PROVIDERS = [p.strip() for p in os.environ.get("QUOTE_PROVIDERS", "exchangerate_host").split(",") if p.strip()]
+QUOTE_LATENCY_BUDGET = 8.0        # 1회 합의 조회 지연 예산(초)
+QUOTE_MIN_RESPONSES = 2           # 이만큼 응답이 모이면 예산 전이라도 종료
+QUOTE_OUTLIER_PCT = 0.003         # 중앙값 대비 0.3% 이상 벗어나면 이상치로 제외
+QUOTE_MAX_STALENESS = 900         # 공급자 기준 시세 시각이 15분 넘게 지났으면 제외(초) - 실시간 피드 기본값
+                                  # (기준 안이면서 더 최신인 다른 시세가 있을 때만 제외 → 단독 공급자는 오래된 시세로도 동작)
+# 공급자별 시세 지연 허용치(초): 일 1회 갱신 피드는 15분 기준이면 항상 제외되므로 갱신 주기에 맞춤
+# (일 단위 피드는 장중 움직임을 반영하지 못하므로 교차 검증용 - 실시간 피드와 함께 쓸 것)
+QUOTE_PROVIDER_MAX_STALENESS = {
+    "exchangerate_host": QUOTE_MAX_STALENESS,
+    "open_er_api": 26 * 3600,          # 하루 1회 갱신 (+여유 2시간)
+    "frankfurter": 4 * 86400,          # ECB 영업일 기준가, 날짜만 제공(UTC 0시로 해석) → 주말/휴일 포함
+}
+
 # 텔레그램
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN")
 CHAT_IDS = os.environ.get("CHAT_IDS", "").split(",")
+TELEGRAM_BASE_URL = os.environ.get("TELEGRAM_BASE_URL", "https://api.telegram.org/bot")  # 로컬 Bot API 서버 등으로 교체 가능
+TELEGRAM_GLOBAL_RATE = 30.0       # 봇 전체 초당 전송 한도 (Telegram 권장: 30건/초)
+TELEGRAM_PER_CHAT_RATE = 1.0      # 채팅방별 초당 전송 한도 (Telegram 권장: 1건/초)
+TELEGRAM_MAX_CONCURRENCY = 64     # 동시 전송 요청 수 (HTTP 커넥션 풀 크기)
+TELEGRAM_MAX_RETRIES = 3          # RetryAfter/일시 오류 재시도 횟수
+
+# DB 지연 저장 (rates / bollinger_history / breakout_events write-behind)
+WRITE_BEHIND_BATCH_SIZE = 200     # 이만큼 쌓이면 즉시 flush
+WRITE_BEHIND_FLUSH_INTERVAL = 5.0 # 가장 오래된 미저장 행 기준 최대 지연(초)
+WRITE_BEHIND_MAX_PENDING = 50_000 # flush 실패가 이어질 때 큐에 남겨 둘 최대 행 수 (초과분은 오래된 것부터 폐기)
+
+# DB 대용량 조회 스트리밍 (db.streaming)
+STREAM_PREFETCH = 5000            # 서버 측 커서가 한 번에 받아오는 행 수
+STREAM_CHUNK_ROWS = 65536         # 바이너리 COPY 조회 시 한 번에 돌려줄 NumPy 배열 행 수
 
 # 전략 설정
 CHECK_INTERVAL = 200              # 3분 20초
+# 아래 기간은 시간이 아니라 틱 수 (괄호 안 시간은 CHECK_INTERVAL 고정 간격 기준)
+# ADAPTIVE_POLLING 을 켜면 간격이 100~600초로 바뀌어 같은 45틱이 1.25~7.5시간을 덮음
+# → 볼린저/크로스/급변 판정과 돌파 확률 이력의 시간 범위가 변동성에 따라 달라짐
 MOVING_AVERAGE_PERIOD = 45        # 볼린저: 2.5시간
 SHORT_TERM_PERIOD = 90            # 단기선: 5시간
 LONG_TERM_PERIOD = 306            # 장기선: 17시간
 JUMP_THRESHOLD = 1.0              # 급변 기준 (1원 이상)
 SUMMARY_INTERVAL = 1800           # 30분
 
+# 워처 파이프라인 (수집 → 저장/분석 → 알림 / 30분 요약) 단계 간 큐 크기
+TICK_QUEUE_SIZE = 4               # 분석 대기 틱 - 가득 차면 수집 단계가 기다림 (backpressure)
+NOTIFY_QUEUE_SIZE = 64            # 전송 대기 알림 - 가득 차면 분석 단계가 기다림
+PIPELINE_REPORT_INTERVAL = 1800   # 단계별 처리 통계 출력 주기(초)
+
+# 적응형 폴링 (변동성 국면에 따라 CHECK_INTERVAL 을 줄이거나 늘림, 간격은 모두 1800 의 약수 → 30분 경계 정렬 유지)
+# 기본 꺼짐: 위 전략 기간이 틱 수라 간격이 바뀌면 분석 창의 시간 범위도 바뀜 (ADAPTIVE_POLLING=1 로 켬)
+# 꺼져 있어도 하루 요청 예산이 모자라면 POLL_INTERVAL_LADDER 를 따라 간격을 늘림
+ADAPTIVE_POLLING = os.environ.get("ADAPTIVE_POLLING", "0") == "1"
+POLL_INTERVALS = {"hot": 100, "normal": CHECK_INTERVAL, "quiet": 600}   # 국면별 폴링 간격(초)
+POLL_INTERVAL_LADDER = (100, 200, 300, 600, 900)   # 예산이 모자랄 때 올려 갈 간격 단계(초)
+POLL_DAILY_BUDGET = int(os.environ.get("EXCHANGERATE_DAILY_BUDGET", "600"))   # exchangerate.host 하루 요청 한도 (0 이면 제한 없음)
+POLL_BUDGET_PROVIDER = "exchangerate_host"         # 예산을 적용할 시세 공급자
+POLL_HOT_RATIO = 1.5              # 단기/기준 변동성 비가 이 이상이면 hot
+POLL_QUIET_RATIO = 0.8            # 모든 변동성 비가 이 이하면 quiet
+POLL_NEAR_BAND_Z = 1.8            # 볼린저 z-score 절댓값이 이 이상이면 돌파 근접 → hot
+POLL_RV_WINDOW = 1800             # 단기 실현 변동성 구간(초)
+POLL_RV_BASELINE = 21600          # 기준 실현 변동성 구간(초)
+
+# 30분 요약 스케줄러 (블록 경계마다 실행, 시세 루프와 별도 태스크)
+SUMMARY_SETTLE_TIMEOUT = 30       # 경계 시점에 분석 대기 중인 틱 처리를 기다리는 최대 시간(초)
+SUMMARY_CATCHUP_BLOCKS = 4        # 재시작/지연 시 보충 발송할 최근 블록 수 상한 (summary_log 기준)
+
+# === OHLC 캔들 설정 ===
+BAR_INTERVALS = (60, 300, 1800, 3600)   # 1분/5분/30분/1시간 (초)
+BAR_HISTORY = 512                       # 주기별 메모리 보관 캔들 수
+ATR_BAR_INTERVAL = 300                  # ATR(고저가 TR) 계산용 캔들 주기 (5분)
+
+# === 보관 주기 (원본 틱 → 캔들 롤업) ===
+RAW_RETENTION_DAYS = 120                # 원본 틱(rates) 보관 일수 - 볼린저/캔들 백필(90일)보다 길어야 함
+BAR_RETENTION_DAYS = {60: 180, 300: 730} # 주기별 캔들 보관 일수 (목록에 없는 주기는 영구 보관)
+RAW_ARCHIVE_DETACH = False              # True 면 오래된 월 파티션을 DROP 하지 않고 DETACH 만 (백업 후 수동 삭제)
+ROLLUP_MAX_POINTS = 1500                # 장기 구간 조회(get_rate_series) 최대 점 수 - 넘으면 더 긴 주기 캔들 사용
+
 # === 이동평균선(크로스) 세부 설정 ===
 EPSILON = 0.005                     # 단기/장기 평균선 동등 판단 오차 허용
 SPREAD_DIFF_THRESHOLD = 0.12        # 유지 상태 추세 강화/약화 판단 기준
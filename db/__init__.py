@@ -1,11 +1,25 @@
 from .connection import init_db_pool, close_db_pool, fetch_rows
-from .repository import store_rate, get_recent_rates, store_expected_range, get_today_expected_range, \
-    get_bounce_probability_from_rates, get_reversal_probability_from_rates, insert_breakout_event, get_recent_breakout_events, get_pending_breakouts, mark_breakout_resolved
+from .write_behind import WriteBehindBuffer, get_write_buffer, set_write_buffer
+from .migrations import run_migrations, ensure_rate_partitions
+from .repository import store_rate, get_recent_rates, get_recent_rate_rows, store_expected_range, get_today_expected_range, get_expected_ranges, \
+    get_bounce_probability_from_rates, get_reversal_probability_from_rates, insert_breakout_event, get_recent_breakout_events, get_pending_breakouts, mark_breakout_resolved, \
+    backfill_bollinger_history, update_bollinger_history, flush_bollinger_history, warm_breakout_index, backfill_bars, upsert_bars, get_recent_bars, \
+    rollup_rates_to_bars, raw_retention_cutoff, get_rollup_rates, get_rate_series, iter_rates, iter_rate_arrays, \
+    get_last_summary_block, record_summary_sent
+from .streaming import stream_rows, stream_copy_arrays
+from .retention import run_retention
 
 __all__ = [
     "init_db_pool", "close_db_pool", "fetch_rows",
-    "store_rate", "get_recent_rates", "store_expected_range", "get_today_expected_range",
+    "WriteBehindBuffer", "get_write_buffer", "set_write_buffer",
+    "run_migrations", "ensure_rate_partitions", "run_retention",
+    "store_rate", "get_recent_rates", "get_recent_rate_rows", "store_expected_range", "get_today_expected_range", "get_expected_ranges",
     "get_bounce_probability_from_rates", "get_reversal_probability_from_rates",
     "insert_breakout_event", "get_recent_breakout_events", 
-    "get_pending_breakouts", "mark_breakout_resolved"
+    "get_pending_breakouts", "mark_breakout_resolved",
+    "backfill_bollinger_history", "update_bollinger_history", "flush_bollinger_history", "warm_breakout_index",
+    "backfill_bars", "upsert_bars", "get_recent_bars",
+    "rollup_rates_to_bars", "raw_retention_cutoff", "get_rollup_rates", "get_rate_series",
+    "stream_rows", "stream_copy_arrays", "iter_rates", "iter_rate_arrays",
+    "get_last_summary_block", "record_summary_sent"
 ]
\ No newline at end of file
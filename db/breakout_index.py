@@ -0,0 +1,181 @@
+# db/breakout_index.py
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from datetime import datetime, timedelta
+
+LOOKBACK = timedelta(days=90)   # 확률 조회 대상 기간 (SQL 쿼리와 동일)
+RESOLVE_WINDOW = timedelta(minutes=30)   # 밴드 안쪽 복귀 판정 구간
+
+
+class _SideIndex:
+    """
+    한쪽 밴드(상단/하단)의 이탈 폭 정렬 배열
+    - deviations: 전체 이탈 폭
+    - hits: 30분 내 밴드 안쪽으로 복귀한 이탈 폭
+    """
+    def __init__(self):
+        self.deviations: list[float] = []
+        self.hits: list[float] = []
+
+    def add(self, deviation: float):
+        insort(self.deviations, deviation)
+
+    def add_hit(self, deviation: float):
+        insort(self.hits, deviation)
+
+    def remove(self, deviation: float, hit: bool):
+        del self.deviations[bisect_left(self.deviations, deviation)]
+        if hit:
+            del self.hits[bisect_left(self.hits, deviation)]
+
+    def count(self, lo: float, hi: float) -> tuple[int, int]:
+        total = bisect_right(self.deviations, hi) - bisect_left(self.deviations, lo)
+        matched = bisect_right(self.hits, hi) - bisect_left(self.hits, lo)
+        return total, matched
+
+
+class BreakoutOutcomeIndex:
+    """
+    bollinger_history 의 인메모리 사본 (period 별 1개)
+    - 상단/하단 이탈 폭을 정렬 배열로 보관해 이분 탐색으로 확률 계산
+    - 시작 시 DB에서 한 번 적재(warm), 이후 BandOutcomeTracker 가 틱마다 갱신
+    - 90일이 지난 항목은 새 틱 추가 시 제거
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self.warm = False
+        self.upper = _SideIndex()
+        self.lower = _SideIndex()
+        # timestamp -> [upper_dev, lower_dev, upper_reverted, lower_rebounded]
+        self._entries: dict[datetime, list] = {}
+        self._order: deque[datetime] = deque()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, timestamp: datetime, upper_deviation: float, lower_deviation: float,
+            upper_reverted: bool | None = None, lower_rebounded: bool | None = None):
+        if timestamp in self._entries:
+            return
+        self._entries[timestamp] = [upper_deviation, lower_deviation, False, False]
+        self._order.append(timestamp)
+        self.upper.add(upper_deviation)
+        self.lower.add(lower_deviation)
+        self.resolve(timestamp, upper_reverted, lower_rebounded)
+        self.evict(timestamp - LOOKBACK)
+
+    def resolve(self, timestamp: datetime, upper_reverted: bool | None = None,
+                lower_rebounded: bool | None = None):
+        """30분 내 복귀가 확인된 쪽만 hits 에 반영 (중복 호출 안전)"""
+        entry = self._entries.get(timestamp)
+        if entry is None:
+            return
+        if upper_reverted and not entry[2]:
+            entry[2] = True
+            self.upper.add_hit(entry[0])
+        if lower_rebounded and not entry[3]:
+            entry[3] = True
+            self.lower.add_hit(entry[1])
+
+    def evict(self, cutoff: datetime):
+        while self._order and self._order[0] < cutoff:
+            ts = self._order.popleft()
+            upper_dev, lower_dev, upper_hit, lower_hit = self._entries.pop(ts)
+            self.upper.remove(upper_dev, upper_hit)
+            self.lower.remove(lower_dev, lower_hit)
+
+    def probability(self, side: str, deviation: float, tolerance: float) -> float:
+        """
+        deviation ± tolerance 범위의 과거 이탈 중 30분 내 복귀 비율(%)
+        :param side: "upper" | "lower"
+        """
+        index = self.upper if side == "upper" else self.lower
+        total, matched = index.count(deviation - tolerance, deviation + tolerance)
+        if total > 0:
+            return round(matched / total * 100, 1)
+        return 0.0
+
+
+class BandOutcomeTracker:
+    """
+    bollinger_history 행의 30분 복귀 판정을 메모리에서 진행
+    - 밴드(ma/std)는 호출 측 이동 통계에서 받아 틱마다 DB 조회 없이 행 생성
+    - 판정 대기 행(최근 30분)을 시간 순 deque 로 보관, 새 틱으로 밴드 안쪽 복귀가 확인되면 인덱스 hits 즉시 반영
+    - 30분이 지난 행은 최종 판정(복귀 없으면 FALSE)으로 반환 → 행마다 DB 쓰기 1회
+    - 행: [timestamp, rate, ma, std, upper, lower, upper_reverted, lower_rebounded] (판정 전 None)
+    """
+    def __init__(self, index: BreakoutOutcomeIndex | None, window: timedelta = RESOLVE_WINDOW):
+        self.index = index
+        self.window = window
+        self._pending: deque[list] = deque()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def seed(self, rows):
+        """DB 에 판정 대기(NULL)로 남은 행 적재 (오래된 순, 종료 시 drain 분 이어받기)"""
+        for r in rows:
+            self._pending.append([
+                r["timestamp"], r["rate"], r["ma"], r["std"], r["upper"], r["lower"],
+                r["upper_reverted"], r["lower_rebounded"],
+            ])
+
+    def observe(self, timestamp: datetime, rate: float, ma: float | None, std: float | None) -> list[list]:
+        """새 틱 1건 반영 후 판정이 끝난 행 반환 (ma/std 가 None 이면 밴드 행은 만들지 않음)"""
+        cutoff = timestamp - self.window
+        finished = []
+        while self._pending and self._pending[0][0] < cutoff:
+            row = self._pending.popleft()
+            row[6] = bool(row[6])
+            row[7] = bool(row[7])
+            finished.append(row)
+
+        for row in self._pending:
+            up = row[6] is None and row[4] >= rate
+            low = row[7] is None and row[5] <= rate
+            if up or low:
+                if self.index is not None:
+                    self.index.resolve(row[0], up or None, low or None)
+                row[6] = True if up else row[6]
+                row[7] = True if low else row[7]
+
+        if ma is not None and std is not None:
+            upper = ma + 2 * std
+            lower = ma - 2 * std
+            if self.index is not None:
+                self.index.add(timestamp, rate - upper, lower - rate)
+            self._pending.append([timestamp, rate, ma, std, upper, lower, None, None])
+        return finished
+
+    def drain(self) -> list[list]:
+        """판정 대기 행 전부 반환 (종료 시 저장용, 미판정 쪽은 None 유지)"""
+        rows = list(self._pending)
+        self._pending.clear()
+        return rows
+
+
+# period -> index
+_INDEXES: dict[int, BreakoutOutcomeIndex] = {}
+_TRACKERS: dict[int, BandOutcomeTracker] = {}
+
+
+def get_breakout_index(period: int, create: bool = False) -> BreakoutOutcomeIndex | None:
+    """period 에 해당하는 인덱스 반환 (create=False 면 없을 때 None)"""
+    index = _INDEXES.get(period)
+    if index is None and create:
+        index = _INDEXES[period] = BreakoutOutcomeIndex(period)
+    return index
+
+
+def get_warm_breakout_index(period: int) -> BreakoutOutcomeIndex | None:
+    """적재 완료된 인덱스만 반환 (미적재 시 None → SQL 폴백)"""
+    index = _INDEXES.get(period)
+    return index if index is not None and index.warm else None
+
+
+def get_band_tracker(period: int) -> BandOutcomeTracker:
+    """period 에 해당하는 판정 추적기 (없으면 인덱스와 함께 생성)"""
+    tracker = _TRACKERS.get(period)
+    if tracker is None:
+        tracker = _TRACKERS[period] = BandOutcomeTracker(get_breakout_index(period, create=True))
+    return tracker
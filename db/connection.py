@@ -1,11 +1,15 @@
 import asyncpg
 from config import DB_URL, DB_URL_MASKED
 
+# 가장 최근에 초기화한 풀 (fetch_rows 처럼 풀을 인자로 받지 않는 헬퍼용)
+_DB_POOL = None
+
 
 async def init_db_pool(min_size=1, max_size=5):
     """
     DB 커넥션 풀 초기화 (명시적 반환)
     """
+    global _DB_POOL
     print(f"📡 DB 풀 초기화 중: {DB_URL_MASKED}")
     try:
         db_pool = await asyncpg.create_pool(
@@ -15,6 +19,7 @@ async def init_db_pool(min_size=1, max_size=5):
             statement_cache_size=0,
             timeout=10
         )
+        _DB_POOL = db_pool
         print("✅ DB 풀 초기화 완료")
         return db_pool
     except Exception as e:
@@ -26,24 +31,26 @@ async def close_db_pool(pool):
     """
     DB 커넥션 풀 종료
     """
+    global _DB_POOL
     if pool:
         await pool.close()
+        if pool is _DB_POOL:
+            _DB_POOL = None
         print("✅ DB 풀 종료 완료")
         
 
 async def fetch_rows(query: str, *args):
     """
-    쿼리 실행 후 결과 fetch
+    쿼리 실행 후 (timestamp, rate) 목록 반환 - 결과가 큰 조회는 db.streaming 사용
     """
-    global db_pool
-    if db_pool is None:
+    if _DB_POOL is None:
         raise RuntimeError("DB 풀이 초기화되지 않았습니다.")
-    
-    async with db_pool.acquire() as conn:
+
+    async with _DB_POOL.acquire() as conn:
         try:
             async with conn.transaction():
                 rows = await conn.fetch(query, *args)
                 return [(row["timestamp"], row["rate"]) for row in rows]
         except Exception as e:
             print(f"❌ 쿼리 실행 실패: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,189 @@
+# db/explain_check.py
+"""
+저장소 쿼리 실행 계획 점검 (EXPLAIN ANALYZE 회귀 검사)
+
+- db.repository 의 실제 함수를 대표 인자로 호출하되, 연결을 _ExplainConn 으로 감싸
+  각 SQL 을 EXPLAIN (ANALYZE, FORMAT JSON) 으로 한 번 더 실행해 계획을 수집
+- enable_seqscan=off 상태에서도 대상 테이블에 Seq Scan 이 남으면 쓸 수 있는 인덱스가 없다는 뜻 → 실패
+  (작은 개발 DB 에서 플래너가 Seq Scan 을 고르는 경우와 구분하기 위함)
+- 전체를 한 트랜잭션에서 실행 후 롤백 → 점검용 INSERT/UPDATE 는 남지 않음
+- executemany 는 첫 행 인자로, 서버 측 커서/COPY 스트리밍은 내부 SELECT 로 계획 수집
+- 인메모리 인덱스를 만드는 호출(warm_breakout_index)은 점검용 period 로 실행 후 전역 상태에서 제거
+
+예) python -m db.migrations --explain
+"""
+import json
+from datetime import timedelta
+
+from config import BAR_INTERVALS, MOVING_AVERAGE_PERIOD
+
+# 인덱스 없이 전체 스캔하면 안 되는 테이블 (rates 는 파티션 이름도 포함)
+GUARDED_TABLES = ("rates", "breakout_events", "expected_ranges", "bollinger_history", "bars", "summary_log")
+# 실제로 쓰지 않는 볼린저 period → 최초 백필/인덱스 적재 경로까지 실행 (트랜잭션 롤백으로 흔적 없음)
+PROBE_PERIOD = 2
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _ExplainConn:
+    """asyncpg 연결 래퍼: 쿼리마다 실행 계획을 기록한 뒤 결과가 필요한 조회는 원래 쿼리로 다시 실행"""
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans: list[tuple[str, dict]] = []
+        self.label = ""
+
+    async def _explain(self, query: str, args):
+        rows = await self._conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", *args)
+        plan = json.loads(rows)[0] if isinstance(rows, str) else rows[0]
+        self.plans.append((self.label, plan))
+
+    async def fetch(self, query, *args):
+        await self._explain(query, args)
+        return await self._conn.fetch(query, *args)
+
+    async def fetchrow(self, query, *args):
+        await self._explain(query, args)
+        return await self._conn.fetchrow(query, *args)
+
+    async def fetchval(self, query, *args):
+        await self._explain(query, args)
+        return await self._conn.fetchval(query, *args)
+
+    async def execute(self, query, *args):
+        # EXPLAIN ANALYZE 가 이미 문장을 실행하므로 다시 실행하지 않음 (INSERT 중복 방지)
+        await self._explain(query, args)
+        return "EXPLAIN"
+
+    async def executemany(self, query, args):
+        # 첫 행은 EXPLAIN ANALYZE 가 실행, 나머지만 그대로 실행
+        args = list(args)
+        if args:
+            await self._explain(query, args[0])
+            await self._conn.executemany(query, args[1:])
+
+    def cursor(self, query, *args, **kwargs):
+        async def rows():
+            await self._explain(query, args)
+            async for row in self._conn.cursor(query, *args, **kwargs):
+                yield row
+        return rows()
+
+    async def copy_from_query(self, query, *args, **kwargs):
+        await self._explain(query, args)
+        return await self._conn.copy_from_query(query, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _seq_scans(node: dict) -> list[str]:
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        relation = node.get("Relation Name", "")
+        if any(relation == t or relation.startswith(f"{t}_") for t in GUARDED_TABLES):
+            found.append(relation)
+    for child in node.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def _drain(rows):
+    return [row async for row in rows]
+
+
+async def _warm_probe_index(conn):
+    from db import breakout_index
+    from db import repository as repo
+    try:
+        await repo.warm_breakout_index(conn, PROBE_PERIOD)
+    finally:
+        breakout_index._INDEXES.pop(PROBE_PERIOD, None)
+        breakout_index._TRACKERS.pop(PROBE_PERIOD, None)
+
+
+async def _exercise(conn):
+    """
+    repository 의 조회/쓰기 함수를 대표 인자로 한 번씩 호출 (라벨 = 함수명)
+    - 실제 작업량이 큰 호출(롤업/스트리밍 등)은 최근 짧은 구간으로 한정
+    """
+    from db import repository as repo
+    from strategies.summary import get_recent_major_events
+    from utils.bars import Bar
+    from utils.tick_buffer import _to_us
+    from utils.time import now_kst
+
+    now = now_kst()
+    hour_ago = now - timedelta(hours=1)
+    band_row = [hour_ago, 1400.0, 1399.0, 0.5, 1400.0, 1398.0, True, None]
+    bar = Bar(60, _to_us(hour_ago.replace(second=0, microsecond=0)), 1400.0, 1401.0, 1399.0, 1400.5, 3)
+    calls = [
+        ("store_rate", lambda: repo.store_rate(conn, 1400.0)),
+        ("get_recent_rates", lambda: repo.get_recent_rates(conn, 306)),
+        ("get_recent_rate_rows", lambda: repo.get_recent_rate_rows(conn, 1024)),
+        ("get_recent_rates_for_summary", lambda: repo.get_recent_rates_for_summary(conn, now - timedelta(minutes=30))),
+        ("get_rates_in_block", lambda: repo.get_rates_in_block(conn, now - timedelta(minutes=30), now)),
+        ("store_expected_range", lambda: repo.store_expected_range(conn, now.date(), 1390.0, 1410.0, "explain_check")),
+        ("get_today_expected_range", lambda: repo.get_today_expected_range(conn)),
+        ("get_expected_ranges", lambda: repo.get_expected_ranges(conn, now.date() - timedelta(days=30), now.date())),
+        ("get_bounce_probability_from_rates", lambda: repo.get_bounce_probability_from_rates(conn, 1390.0, 0.5, 0.1, MOVING_AVERAGE_PERIOD)),
+        ("get_reversal_probability_from_rates", lambda: repo.get_reversal_probability_from_rates(conn, 1410.0, 0.5, 0.1, MOVING_AVERAGE_PERIOD)),
+        ("insert_breakout_event", lambda: repo.insert_breakout_event(conn, "upper_breakout", now, 1410.0, 1410.0)),
+        ("get_recent_breakout_events", lambda: repo.get_recent_breakout_events(conn, now - timedelta(minutes=30))),
+        ("get_pending_breakouts", lambda: repo.get_pending_breakouts(conn)),
+        ("mark_breakout_resolved", lambda: repo.mark_breakout_resolved(conn, 0)),
+        ("get_recent_major_events", lambda: get_recent_major_events(conn, now)),
+        ("get_recent_bars", lambda: repo.get_recent_bars(conn, 300, 15)),
+        ("get_last_summary_block", lambda: repo.get_last_summary_block(conn)),
+        ("record_summary_sent", lambda: repo.record_summary_sent(conn, now - timedelta(minutes=30), now)),
+        ("get_rate_series", lambda: repo.get_rate_series(conn, now - timedelta(days=28), now)),
+        ("get_rates_in_block(rollup)", lambda: repo.get_rates_in_block(conn, now - timedelta(days=200), now - timedelta(days=199))),
+        # update/flush_bollinger_history 는 _write_bollinger_rows 로만 SQL 실행
+        ("_write_bollinger_rows", lambda: repo._write_bollinger_rows(conn, MOVING_AVERAGE_PERIOD, [band_row])),
+        ("backfill_bollinger_history", lambda: repo.backfill_bollinger_history(conn, PROBE_PERIOD)),
+        ("warm_breakout_index", lambda: _warm_probe_index(conn)),
+        ("backfill_bars", lambda: repo.backfill_bars(conn, BAR_INTERVALS)),
+        ("rollup_rates_to_bars", lambda: repo.rollup_rates_to_bars(conn, BAR_INTERVALS, hour_ago, now)),
+        ("rollup_rates_to_bars(open end)", lambda: repo.rollup_rates_to_bars(conn, (60,), hour_ago, None, overwrite=False)),
+        ("upsert_bars", lambda: repo.upsert_bars(conn, [bar])),
+        ("get_rollup_rates", lambda: repo.get_rollup_rates(conn, 300, now - timedelta(days=1), now)),
+        ("get_rollup_rates(open end)", lambda: repo.get_rollup_rates(conn, 300, now - timedelta(days=1), None)),
+        ("_fetch_raw_rates", lambda: repo._fetch_raw_rates(conn, hour_ago, now)),
+        ("_fetch_raw_rates(open end)", lambda: repo._fetch_raw_rates(conn, hour_ago, None)),
+        ("iter_rates", lambda: _drain(repo.iter_rates(conn, hour_ago, now))),
+        ("iter_rate_arrays", lambda: _drain(repo.iter_rate_arrays(conn, hour_ago, now))),
+    ]
+    for label, call in calls:
+        conn.label = label
+        await call()
+
+
+async def check_query_plans(conn) -> bool:
+    """모든 저장소 쿼리의 실행 계획을 출력하고 가드 테이블 Seq Scan 이 없으면 True"""
+    from db.breakout_index import get_breakout_index
+    from db.write_behind import get_write_buffer
+
+    if get_write_buffer() is not None or get_breakout_index(MOVING_AVERAGE_PERIOD) is not None:
+        raise RuntimeError("워처 프로세스 밖에서 실행하세요 (지연 저장/인메모리 인덱스가 SQL 경로를 가림)")
+
+    wrapped = _ExplainConn(conn)
+    try:
+        async with conn.transaction():
+            await conn.execute("SET LOCAL enable_seqscan = off")
+            await _exercise(wrapped)
+            raise _Rollback()
+    except _Rollback:
+        pass
+
+    ok = True
+    for label, plan in wrapped.plans:
+        scans = _seq_scans(plan["Plan"])
+        elapsed = plan.get("Execution Time", 0.0)
+        mark = "❌" if scans else "✅"
+        detail = f" Seq Scan: {', '.join(sorted(set(scans)))}" if scans else ""
+        print(f"{mark} {label:<38} {elapsed:8.2f}ms{detail}")
+        ok = ok and not scans
+    print("🔚 실행 계획 점검 " + ("통과" if ok else "실패"))
+    return ok
+
@@ -0,0 +1,327 @@
+# db/migrations.py
+"""
+DB 스키마 버전 관리
+
+- schema_migrations 테이블에 적용된 버전을 기록하고, 미적용 마이그레이션만 순서대로 적용
+- 각 마이그레이션은 한 트랜잭션 (advisory lock 으로 동시 실행 방지)
+- rates 는 월 단위 RANGE 파티션 (ensure_rate_partitions 로 앞으로 쓸 달을 미리 생성)
+
+예)
+  python -m db.migrations            # 미적용 마이그레이션 적용
+  python -m db.migrations --status   # 적용 이력 출력
+  python -m db.migrations --explain  # 저장소 쿼리 실행 계획 점검 (db.explain_check)
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from utils.time import now_kst
+
+# pg_advisory_xact_lock 키 (임의 고정값)
+_LOCK_KEY = 7_204_511
+# 현재 달 이후 미리 만들어 둘 파티션 수
+PARTITION_MONTHS_AHEAD = 2
+
+
+def _month_start(d: date, offset: int = 0) -> date:
+    index = d.year * 12 + (d.month - 1) + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"rates_y{month.year:04d}m{month.month:02d}"
+
+
+async def _create_rate_partition(conn, month: date) -> bool:
+    """month 의 파티션 생성 (경계는 KST 자정 기준), 새로 만들었으면 True"""
+    name = _partition_name(month)
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name)
+    if exists:
+        return False
+    start = f"{month.isoformat()} 00:00:00+09"
+    end = f"{_month_start(month, 1).isoformat()} 00:00:00+09"
+    await conn.execute(
+        f"CREATE TABLE {name} PARTITION OF rates FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    return True
+
+
+async def ensure_rate_partitions(conn, months_ahead: int = PARTITION_MONTHS_AHEAD) -> list[str]:
+    """
+    이번 달 ~ months_ahead 달 뒤까지 rates 파티션 생성
+    - 기본(DEFAULT) 파티션에 해당 달 행이 이미 있으면 생성이 실패하므로 경고만 출력
+    """
+    this_month = _month_start(now_kst().date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _month_start(this_month, offset)
+        try:
+            async with conn.transaction():
+                if await _create_rate_partition(conn, month):
+                    created.append(_partition_name(month))
+        except Exception as e:
+            print(f"⚠️ rates 파티션 생성 실패 ({_partition_name(month)}): {e}")
+    if created:
+        print(f"✅ rates 파티션 생성: {', '.join(created)}")
+    return created
+
+
+# === 마이그레이션 ===
+
+async def _m001_base_tables(conn):
+    """rates(월 파티션) / expected_ranges / breakout_events 기본 테이블"""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rates (
+          timestamp TIMESTAMPTZ NOT NULL,
+          rate DOUBLE PRECISION NOT NULL
+        ) PARTITION BY RANGE (timestamp);
+
+        CREATE TABLE IF NOT EXISTS expected_ranges (
+          date DATE PRIMARY KEY,
+          low DOUBLE PRECISION NOT NULL,
+          high DOUBLE PRECISION NOT NULL,
+          source TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS breakout_events (
+          id SERIAL PRIMARY KEY,
+          event_type TEXT NOT NULL,
+          timestamp TIMESTAMPTZ NOT NULL,
+          boundary DOUBLE PRECISION NOT NULL,
+          threshold DOUBLE PRECISION NOT NULL,
+          resolved BOOLEAN NOT NULL DEFAULT FALSE,
+          resolved_at TIMESTAMPTZ
+        );
+        """
+    )
+
+
+async def _m002_partition_rates(conn):
+    """
+    기존 단일 rates 테이블을 월 파티션 테이블로 이관
+    - 이미 파티션 테이블(001 에서 새로 생성)이면 건너뜀
+    - timestamp/rate 외 컬럼(id, pair 등)이 있으면 옮기지 못하고 지워지므로 이관하지 않고 중단
+      (마이그레이션 트랜잭션 롤백 → 운영자가 컬럼을 정리하거나 직접 이관한 뒤 다시 실행)
+    """
+    relkind = await conn.fetchval("SELECT relkind::text FROM pg_class WHERE oid = 'rates'::regclass")
+    if relkind == "p":
+        return
+
+    columns = await conn.fetch(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'rates'
+        ORDER BY ordinal_position
+        """
+    )
+    extra = [r["column_name"] for r in columns if r["column_name"] not in ("timestamp", "rate")]
+    if extra:
+        raise RuntimeError(
+            f"rates 에 timestamp/rate 외 컬럼이 있어 파티션 이관 중단: {', '.join(extra)} "
+            "(컬럼을 정리하거나 직접 이관 후 다시 실행하세요)"
+        )
+
+    print("⏳ rates 월 파티션 이관 중")
+    await conn.execute("ALTER TABLE rates RENAME TO rates_unpartitioned")
+    await conn.execute(
+        """
+        CREATE TABLE rates (
+          timestamp TIMESTAMPTZ NOT NULL,
+          rate DOUBLE PRECISION NOT NULL
+        ) PARTITION BY RANGE (timestamp)
+        """
+    )
+    first, last = await conn.fetchrow(
+        "SELECT MIN(timestamp AT TIME ZONE 'Asia/Seoul')::date, MAX(timestamp AT TIME ZONE 'Asia/Seoul')::date FROM rates_unpartitioned"
+    )
+    if first is not None:
+        month, end = _month_start(first), _month_start(last)
+        while month <= end:
+            await _create_rate_partition(conn, month)
+            month = _month_start(month, 1)
+    await conn.execute("CREATE TABLE IF NOT EXISTS rates_default PARTITION OF rates DEFAULT")
+    moved = await conn.execute(
+        "INSERT INTO rates (timestamp, rate) SELECT timestamp, rate FROM rates_unpartitioned"
+    )
+    await conn.execute("DROP TABLE rates_unpartitioned")
+    print(f"✅ rates 이관 완료 ({moved})")
+
+
+async def _m003_time_indexes(conn):
+    """시간 기준 인덱스: 최근 N건(B-tree), 90일 구간 스캔(BRIN), 미해결 breakout 부분 인덱스"""
+    await conn.execute("CREATE TABLE IF NOT EXISTS rates_default PARTITION OF rates DEFAULT")
+    await conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_rates_timestamp ON rates (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_rates_timestamp_brin ON rates USING BRIN (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_breakout_events_timestamp ON breakout_events (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_breakout_events_unresolved
+          ON breakout_events (timestamp) WHERE resolved = FALSE;
+        """
+    )
+
+
+async def _m004_summary_log(conn):
+    """30분 요약 발송 기록 (재시작 후 놓친 블록 보충용)"""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary_log (
+          block_end TIMESTAMPTZ PRIMARY KEY,
+          block_start TIMESTAMPTZ NOT NULL,
+          sent_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+
+async def _m005_bollinger_history(conn):
+    """
+    볼린저 확률 조회용 틱별 밴드 이력 (이전에는 워처 시작 시 ensure_bollinger_history 가 생성)
+    - 틱별 이동평균/표준편차/밴드와 밴드 대비 이탈 폭, 30분 내 복귀 여부 (NULL = 판정 대기)
+    - 데이터 백필은 period 별로 repository.backfill_bollinger_history
+    """
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bollinger_history (
+          timestamp TIMESTAMPTZ NOT NULL,
+          period INTEGER NOT NULL,
+          rate DOUBLE PRECISION NOT NULL,
+          ma DOUBLE PRECISION NOT NULL,
+          std DOUBLE PRECISION NOT NULL,
+          upper DOUBLE PRECISION NOT NULL,
+          lower DOUBLE PRECISION NOT NULL,
+          upper_deviation DOUBLE PRECISION NOT NULL,
+          lower_deviation DOUBLE PRECISION NOT NULL,
+          upper_reverted BOOLEAN,
+          lower_rebounded BOOLEAN,
+          PRIMARY KEY (period, timestamp)
+        );
+        CREATE INDEX IF NOT EXISTS idx_bollinger_history_upper_dev
+          ON bollinger_history (period, upper_deviation, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_bollinger_history_lower_dev
+          ON bollinger_history (period, lower_deviation, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_bollinger_history_pending
+          ON bollinger_history (period, timestamp)
+          WHERE upper_reverted IS NULL OR lower_rebounded IS NULL;
+        """
+    )
+
+
+async def _m006_bars(conn):
+    """
+    OHLC 캔들 (이전에는 워처/보관 작업 시작 시 ensure_bars_table 이 생성)
+    - interval: 캔들 주기(초), start_ts: 구간 시작 시각 (epoch 기준 정렬)
+    - 데이터 백필은 interval 별로 repository.backfill_bars
+    """
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bars (
+          interval INTEGER NOT NULL,
+          start_ts TIMESTAMPTZ NOT NULL,
+          open DOUBLE PRECISION NOT NULL,
+          high DOUBLE PRECISION NOT NULL,
+          low DOUBLE PRECISION NOT NULL,
+          close DOUBLE PRECISION NOT NULL,
+          tick_count INTEGER NOT NULL,
+          PRIMARY KEY (interval, start_ts)
+        );
+        """
+    )
+
+
+async def _m007_retention_log(conn):
+    """보관 작업 실행 기록 (캔들 확정 집계를 마친 원본 경계 → 다음 실행은 그 이후만 집계)"""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS retention_log (
+          cutoff TIMESTAMPTZ PRIMARY KEY,
+          ran_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+
+# (버전, 이름, 적용 함수) - 버전은 증가 순서로만 추가
+MIGRATIONS = [
+    (1, "base_tables", _m001_base_tables),
+    (2, "partition_rates", _m002_partition_rates),
+    (3, "time_indexes", _m003_time_indexes),
+    (4, "summary_log", _m004_summary_log),
+    (5, "bollinger_history", _m005_bollinger_history),
+    (6, "bars", _m006_bars),
+    (7, "retention_log", _m007_retention_log),
+]
+
+
+async def _ensure_version_table(conn):
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+
+
+async def get_applied_versions(conn) -> dict[int, dict]:
+    await _ensure_version_table(conn)
+    rows = await conn.fetch("SELECT version, name, applied_at FROM schema_migrations ORDER BY version")
+    return {r["version"]: dict(r) for r in rows}
+
+
+async def run_migrations(conn) -> list[int]:
+    """미적용 마이그레이션을 순서대로 적용하고 이번 달 전후 rates 파티션을 보장, 적용한 버전 목록 반환"""
+    applied = await get_applied_versions(conn)
+    done = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", _LOCK_KEY)
+            # 다른 프로세스가 먼저 적용했는지 잠금 후 재확인
+            if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM schema_migrations WHERE version = $1)", version):
+                continue
+            print(f"⏳ 마이그레이션 {version:03d}_{name} 적용 중")
+            await migrate(conn)
+            await conn.execute("INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", version, name)
+        done.append(version)
+        print(f"✅ 마이그레이션 {version:03d}_{name} 적용 완료")
+    await ensure_rate_partitions(conn)
+    return done
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 이력만 출력")
+    parser.add_argument("--explain", action="store_true", help="저장소 쿼리 EXPLAIN ANALYZE 점검")
+    args = parser.parse_args()
+
+    from db.connection import init_db_pool, close_db_pool
+
+    pool = await init_db_pool()
+    failed = False
+    try:
+        async with pool.acquire() as conn:
+            if args.status:
+                applied = await get_applied_versions(conn)
+                for version, name, _ in MIGRATIONS:
+                    row = applied.get(version)
+                    mark = f"✅ {row['applied_at']}" if row else "⏸️ 미적용"
+                    print(f"{version:03d}_{name}: {mark}")
+            elif args.explain:
+                from db.explain_check import check_query_plans
+                failed = not await check_query_plans(conn)
+            else:
+                done = await run_migrations(conn)
+                print(f"🔚 적용 {len(done)}건" if done else "🔚 최신 상태")
+    finally:
+        await close_db_pool(pool)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,12 +1,247 @@
-from datetime import datetime
+from contextlib import aclosing
+from datetime import datetime, timedelta
 import pytz
+from config import MOVING_AVERAGE_PERIOD, CHECK_INTERVAL, BAR_INTERVALS, RAW_RETENTION_DAYS, BAR_RETENTION_DAYS, ROLLUP_MAX_POINTS, \
+    STREAM_PREFETCH, STREAM_CHUNK_ROWS
+from db.breakout_index import LOOKBACK, get_breakout_index, get_warm_breakout_index, get_band_tracker
+from db.streaming import stream_rows, stream_copy_arrays
+from db.write_behind import BOLLINGER_HISTORY_UPSERT, get_write_buffer
+from utils.time import now_kst, TIMEZONE
 
 async def store_rate(conn, rate: float):
     """
     DB에 환율 저장
+    - 지연 저장 버퍼가 설치돼 있으면 큐에 넣고 즉시 진행 (flush 는 백그라운드)
+    - 저장된 시각(KST)을 반환
     """
-    now = datetime.now(pytz.timezone("Asia/Seoul"))
-    await conn.execute("INSERT INTO rates (timestamp, rate) VALUES ($1, $2)", now, rate)
+    now = now_kst()
+    buffer = get_write_buffer()
+    if buffer is not None:
+        buffer.add_rate(now, rate)
+    else:
+        await conn.execute("INSERT INTO rates (timestamp, rate) VALUES ($1, $2)", now, rate)
+    return now
+
+
+async def backfill_bollinger_history(conn, period: int):
+    """
+    bollinger_history 최초 1회 백필 (테이블/인덱스는 마이그레이션 005)
+    - period 행이 하나도 없을 때만 최근 90일 rates 로 계산 (MOVING_AVERAGE_PERIOD 변경 시에도 새 period 로 채움)
+    - 복귀 여부 NULL = 아직 30분이 지나지 않아 판정 대기
+    """
+    exists = await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM bollinger_history WHERE period = $1)", period
+    )
+    if exists:
+        return
+
+    # 최초 1회: 최근 90일 구간을 윈도 함수로 한 번에 계산해 채움
+    print(f"⏳ bollinger_history 백필 중 (period={period})")
+    await conn.execute(
+        f"""
+        WITH bollinger_calc AS (
+          SELECT
+            r.timestamp,
+            r.rate,
+            AVG(r.rate) OVER w AS ma,
+            STDDEV_SAMP(r.rate) OVER w AS std,
+            COUNT(*) OVER w AS n
+          FROM rates r
+          WHERE r.timestamp >= NOW() - INTERVAL '91 days'
+          WINDOW w AS (
+            ORDER BY r.timestamp
+            ROWS BETWEEN {period - 1} PRECEDING AND CURRENT ROW
+          )
+        ),
+        bands AS (
+          SELECT timestamp, rate, ma, std, ma + 2 * std AS upper, ma - 2 * std AS lower
+          FROM bollinger_calc
+          WHERE n = {period}   -- 틱 처리 경로와 같이 윈도가 찬 행부터
+        )
+        INSERT INTO bollinger_history (
+          timestamp, period, rate, ma, std, upper, lower,
+          upper_deviation, lower_deviation, upper_reverted, lower_rebounded
+        )
+        SELECT
+          b.timestamp, $1, b.rate, b.ma, b.std, b.upper, b.lower,
+          b.rate - b.upper, b.lower - b.rate,
+          CASE
+            WHEN EXISTS (
+              SELECT 1 FROM rates r2
+              WHERE r2.timestamp > b.timestamp
+                AND r2.timestamp <= b.timestamp + INTERVAL '30 minutes'
+                AND r2.rate <= b.upper
+            ) THEN TRUE
+            WHEN b.timestamp < NOW() - INTERVAL '30 minutes' THEN FALSE
+          END,
+          CASE
+            WHEN EXISTS (
+              SELECT 1 FROM rates r2
+              WHERE r2.timestamp > b.timestamp
+                AND r2.timestamp <= b.timestamp + INTERVAL '30 minutes'
+                AND r2.rate >= b.lower
+            ) THEN TRUE
+            WHEN b.timestamp < NOW() - INTERVAL '30 minutes' THEN FALSE
+          END
+        FROM bands b
+        ON CONFLICT (period, timestamp) DO NOTHING
+        """,
+        period
+    )
+    print("✅ bollinger_history 백필 완료")
+
+
+def bollinger_history_records(period: int, rows) -> list[tuple]:
+    """BandOutcomeTracker 행 → BOLLINGER_HISTORY_UPSERT 인자"""
+    return [
+        (ts, period, rate, ma, std, upper, lower, rate - upper, lower - rate, up, low)
+        for ts, rate, ma, std, upper, lower, up, low in rows
+    ]
+
+
+async def update_bollinger_history(conn, timestamp: datetime, rate: float, ma: float | None, std: float | None,
+                                   period: int = MOVING_AVERAGE_PERIOD):
+    """
+    새 틱 1건에 대한 bollinger_history 증분 갱신
+    - 밴드는 호출 측 이동 통계(RollingStats)의 ma/std 로 계산 (rates 조회 없음)
+    - 30분 복귀 판정은 BandOutcomeTracker 가 메모리에서 진행, 인메모리 인덱스도 함께 갱신
+    - 판정이 끝난 행만 1회 저장 (틱당 보통 1행, 지연 저장 버퍼가 있으면 큐에 적재)
+    """
+    rows = get_band_tracker(period).observe(timestamp, rate, ma, std)
+    if rows:
+        await _write_bollinger_rows(conn, period, rows)
+
+
+async def flush_bollinger_history(conn, period: int = MOVING_AVERAGE_PERIOD):
+    """
+    종료 시 판정 대기 행 저장 (미판정 쪽은 NULL, 다음 시작 시 warm_breakout_index 가 이어받음)
+    - 지연 저장 버퍼가 설치돼 있으면 큐에만 넣으므로 버퍼 close() 전에 호출
+    """
+    rows = get_band_tracker(period).drain()
+    if rows:
+        await _write_bollinger_rows(conn, period, rows)
+    return len(rows)
+
+
+async def _write_bollinger_rows(conn, period: int, rows):
+    records = bollinger_history_records(period, rows)
+    buffer = get_write_buffer()
+    if buffer is not None:
+        buffer.add_bollinger_rows(records)
+    else:
+        await conn.executemany(BOLLINGER_HISTORY_UPSERT, records)
+
+
+async def warm_breakout_index(conn, period: int):
+    """
+    최근 90일 bollinger_history 를 인메모리 인덱스로 적재
+    - 적재 이후 확률 조회는 DB 왕복 없이 이분 탐색으로 처리
+    - 판정 대기(NULL)로 남은 행은 BandOutcomeTracker 로 넘겨 이어서 판정
+    """
+    index = get_breakout_index(period, create=True)
+    rows = await conn.fetch(
+        """
+        SELECT timestamp, upper_deviation, lower_deviation, upper_reverted, lower_rebounded
+        FROM bollinger_history
+        WHERE period = $1 AND timestamp >= $2
+        ORDER BY timestamp ASC
+        """,
+        period, datetime.now(pytz.timezone("Asia/Seoul")) - LOOKBACK
+    )
+    for r in rows:
+        index.add(
+            r["timestamp"], r["upper_deviation"], r["lower_deviation"],
+            r["upper_reverted"], r["lower_rebounded"]
+        )
+    pending = await conn.fetch(
+        """
+        SELECT timestamp, rate, ma, std, upper, lower, upper_reverted, lower_rebounded
+        FROM bollinger_history
+        WHERE period = $1 AND (upper_reverted IS NULL OR lower_rebounded IS NULL)
+        ORDER BY timestamp ASC
+        """,
+        period
+    )
+    get_band_tracker(period).seed(pending)
+    index.warm = True
+    print(f"✅ 돌파 결과 인덱스 적재 완료 (period={period}, {len(index)}건)")
+    return index
+
+
+async def backfill_bars(conn, intervals: tuple[int, ...]):
+    """
+    bars(OHLC 캔들) 최초 1회 rates 로부터 백필 (테이블은 마이그레이션 006)
+    - interval 별로 행이 하나도 없을 때만 최근 90일 집계
+    """
+    for interval in intervals:
+        exists = await conn.fetchval("SELECT EXISTS (SELECT 1 FROM bars WHERE interval = $1)", interval)
+        if exists:
+            continue
+        print(f"⏳ bars 백필 중 (interval={interval}s)")
+        await rollup_rates_to_bars(conn, (interval,), now_kst() - timedelta(days=90), None, overwrite=False)
+
+
+async def rollup_rates_to_bars(conn, intervals, start: datetime | None, end: datetime | None, overwrite: bool = True) -> None:
+    """
+    rates [start, end) 를 주기별 캔들로 집계해 bars 에 저장 (None 이면 해당 방향 제한 없음)
+    - overwrite=True: 원본 틱 기준으로 기존 캔들을 덮어씀 (보관 작업에서 원본 삭제 직전 확정용)
+    - 경계가 캔들 주기에 맞지 않으면 첫/마지막 캔들은 구간 안의 틱만으로 집계됨
+    """
+    conflict = (
+        "DO UPDATE SET open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low, "
+        "close = EXCLUDED.close, tick_count = EXCLUDED.tick_count"
+        if overwrite else "DO NOTHING"
+    )
+    for interval in intervals:
+        await conn.execute(
+            f"""
+            INSERT INTO bars (interval, start_ts, open, high, low, close, tick_count)
+            SELECT $1::int,
+                   to_timestamp(floor(extract(epoch FROM timestamp) / $1::int) * $1::int) AS start_ts,
+                   (array_agg(rate ORDER BY timestamp ASC))[1],
+                   MAX(rate), MIN(rate),
+                   (array_agg(rate ORDER BY timestamp DESC))[1],
+                   COUNT(*)
+            FROM rates
+            WHERE ($2::timestamptz IS NULL OR timestamp >= $2)
+              AND ($3::timestamptz IS NULL OR timestamp < $3)
+            GROUP BY start_ts
+            ON CONFLICT (interval, start_ts) {conflict}
+            """,
+            interval, start, end
+        )
+
+
+async def upsert_bars(conn, bars) -> None:
+    """마감된(또는 늦은 틱으로 갱신된) 캔들 저장"""
+    if not bars:
+        return
+    await conn.executemany(
+        """
+        INSERT INTO bars (interval, start_ts, open, high, low, close, tick_count)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (interval, start_ts) DO UPDATE
+        SET high = EXCLUDED.high, low = EXCLUDED.low, close = EXCLUDED.close, tick_count = EXCLUDED.tick_count
+        """,
+        [(b.interval, b.start, b.open, b.high, b.low, b.close, b.count) for b in bars]
+    )
+
+
+async def get_recent_bars(conn, interval: int, limit: int) -> list[dict]:
+    """
+    최근 캔들 조회 (가장 오래된 순으로 반환)
+    """
+    rows = await conn.fetch(
+        """
+        SELECT start_ts, open, high, low, close, tick_count
+        FROM bars
+        WHERE interval = $1
+        ORDER BY start_ts DESC
+        LIMIT $2
+        """,
+        interval, limit
+    )
+    return [dict(r) for r in reversed(rows)]
 
 
 async def get_recent_rates(conn, limit: int):
@@ -18,6 +253,15 @@ async def get_recent_rates(conn, limit: int):
     )
     return [r["rate"] for r in reversed(rows)]
 
+async def get_recent_rate_rows(conn, limit: int) -> list[tuple[datetime, float]]:
+    """
+    최신 환율 데이터를 시각과 함께 조회 (가장 오래된 순으로 반환)
+    """
+    rows = await conn.fetch(
+        "SELECT timestamp, rate FROM rates ORDER BY timestamp DESC LIMIT $1", limit
+    )
+    return [(r["timestamp"], r["rate"]) for r in reversed(rows)]
+
 async def store_expected_range(conn, date, low: float, high: float, source: str):
     """
     예상 환율 범위를 DB에 저장 (동일 날짜는 업데이트)
@@ -38,7 +282,7 @@ async def get_today_expected_range(conn):
     """
     오늘 날짜의 예상 환율 범위를 조회합니다.
     """
-    today = datetime.now(pytz.timezone("Asia/Seoul")).date()
+    today = now_kst().date()
     row = await conn.fetchrow(
         "SELECT date, low, high, source FROM expected_ranges WHERE date = $1", today
     )
@@ -51,6 +295,20 @@ async def get_today_expected_range(conn):
         }
     return None
 
+async def get_expected_ranges(conn, start_date, end_date) -> dict:
+    """
+    기간 내 예상 환율 범위 일괄 조회 (리플레이용)
+    :return: {date: {"date", "low", "high", "source"}}
+    """
+    rows = await conn.fetch(
+        "SELECT date, low, high, source FROM expected_ranges WHERE date BETWEEN $1 AND $2",
+        start_date, end_date
+    )
+    return {
+        r["date"]: {"date": r["date"], "low": r["low"], "high": r["high"], "source": r["source"]}
+        for r in rows
+    }
+
 async def get_bounce_probability_from_rates(
     conn,
     lower_bound: float,
@@ -61,6 +319,7 @@ async def get_bounce_probability_from_rates(
     """
     볼린저 밴드 하단에서 일정 금액 이탈한 경우,
     과거 동일한 이탈 폭 범위 조건에서 30분 내 반등 확률 계산
+    - 인메모리 인덱스가 적재돼 있으면 이분 탐색, 아니면 bollinger_history 인덱스 범위 카운트
 
     Args:
         conn: PostgreSQL connection
@@ -72,53 +331,23 @@ async def get_bounce_probability_from_rates(
     Returns:
         반등 확률 (0~100 사이 소수점 포함 백분율)
     """
-    query = f"""
-        WITH params AS (
-          SELECT $1::double precision AS lower_bound,
-                 $2::double precision AS deviation,
-                 $3::double precision AS tolerance
-        ),
-        bollinger_calc AS (
-          SELECT
-            r.timestamp,
-            r.rate,
-            AVG(r.rate) OVER w AS ma,
-            STDDEV_SAMP(r.rate) OVER w AS std
-          FROM rates r
-          WINDOW w AS (
-            ORDER BY r.timestamp
-            ROWS BETWEEN {moving_average_period - 1} PRECEDING AND CURRENT ROW
-          )
-        ),
-        lower_breaks AS (
-          SELECT
-            b.timestamp AS break_time,
-            b.rate,
-            (b.ma - 2 * b.std) AS lower_band,
-            (b.ma - 2 * b.std) - b.rate AS actual_deviation
-          FROM bollinger_calc b, params p
-          WHERE b.std IS NOT NULL
-            AND (b.ma - 2 * b.std) - b.rate BETWEEN p.deviation - p.tolerance AND p.deviation + p.tolerance
-            AND b.timestamp >= NOW() - INTERVAL '90 days'
-        ),
-        rebounds AS (
-          SELECT
-            b.break_time,
-            MIN(r2.timestamp) AS rebound_time
-          FROM lower_breaks b
-          JOIN rates r2
-            ON r2.timestamp > b.break_time
-           AND r2.timestamp <= b.break_time + INTERVAL '30 minutes'
-           AND r2.rate >= b.lower_band
-          GROUP BY b.break_time
-        )
+    index = get_warm_breakout_index(moving_average_period)
+    if index is not None:
+        return index.probability("lower", deviation, tolerance)
+
+    row = await conn.fetchrow(
+        """
         SELECT
           COUNT(*) AS total_matched,
-          COUNT(r.rebound_time) AS rebound_count
-        FROM lower_breaks b
-        LEFT JOIN rebounds r ON b.break_time = r.break_time;
-    """
-    row = await conn.fetchrow(query, lower_bound, deviation, tolerance)
+          COUNT(*) FILTER (WHERE lower_rebounded) AS rebound_count
+        FROM bollinger_history
+        WHERE period = $1
+          AND lower_deviation BETWEEN $2::double precision - $3::double precision
+                                  AND $2::double precision + $3::double precision
+          AND timestamp >= NOW() - INTERVAL '90 days'
+        """,
+        moving_average_period, deviation, tolerance
+    )
     if row and row["total_matched"] > 0:
         return round(row["rebound_count"] / row["total_matched"] * 100, 1)
     return 0.0
@@ -134,6 +363,7 @@ async def get_reversal_probability_from_rates(
     """
     볼린저 밴드 상단에서 일정 금액 돌파한 경우,
     과거 동일한 초과 폭 범위 조건에서 30분 내 조정 확률 계산
+    - 인메모리 인덱스가 적재돼 있으면 이분 탐색, 아니면 bollinger_history 인덱스 범위 카운트
 
     Args:
         conn: PostgreSQL connection
@@ -145,53 +375,23 @@ async def get_reversal_probability_from_rates(
     Returns:
         조정 확률 (0~100 사이 소수점 포함 백분율)
     """
-    query = f"""
-        WITH params AS (
-          SELECT $1::double precision AS upper_bound,
-                 $2::double precision AS deviation,
-                 $3::double precision AS tolerance
-        ),
-        bollinger_calc AS (
-          SELECT
-            r.timestamp,
-            r.rate,
-            AVG(r.rate) OVER w AS ma,
-            STDDEV_SAMP(r.rate) OVER w AS std
-          FROM rates r
-          WINDOW w AS (
-            ORDER BY r.timestamp
-            ROWS BETWEEN {moving_average_period - 1} PRECEDING AND CURRENT ROW
-          )
-        ),
-        upper_breaks AS (
-          SELECT
-            b.timestamp AS break_time,
-            b.rate,
-            (b.ma + 2 * b.std) AS upper_band,
-            b.rate - (b.ma + 2 * b.std) AS actual_deviation
-          FROM bollinger_calc b, params p
-          WHERE b.std IS NOT NULL
-            AND b.rate - (b.ma + 2 * b.std) BETWEEN p.deviation - p.tolerance AND p.deviation + p.tolerance
-            AND b.timestamp >= NOW() - INTERVAL '90 days'
-        ),
-        corrections AS (
-          SELECT
-            b.break_time,
-            MIN(r2.timestamp) AS correction_time
-          FROM upper_breaks b
-          JOIN rates r2
-            ON r2.timestamp > b.break_time
-           AND r2.timestamp <= b.break_time + INTERVAL '30 minutes'
-           AND r2.rate <= b.upper_band
-          GROUP BY b.break_time
-        )
+    index = get_warm_breakout_index(moving_average_period)
+    if index is not None:
+        return index.probability("upper", deviation, tolerance)
+
+    row = await conn.fetchrow(
+        """
         SELECT
           COUNT(*) AS total_matched,
-          COUNT(r.correction_time) AS correction_count
-        FROM upper_breaks b
-        LEFT JOIN corrections r ON b.break_time = r.break_time;
-    """
-    row = await conn.fetchrow(query, upper_bound, deviation, tolerance)
+          COUNT(*) FILTER (WHERE upper_reverted) AS correction_count
+        FROM bollinger_history
+        WHERE period = $1
+          AND upper_deviation BETWEEN $2::double precision - $3::double precision
+                                  AND $2::double precision + $3::double precision
+          AND timestamp >= NOW() - INTERVAL '90 days'
+        """,
+        moving_average_period, deviation, tolerance
+    )
     if row and row["total_matched"] > 0:
         return round(row["correction_count"] / row["total_matched"] * 100, 1)
     return 0.0
@@ -200,7 +400,12 @@ async def get_reversal_probability_from_rates(
 async def insert_breakout_event(conn, event_type: str, timestamp: datetime, boundary: float, threshold: float):
     """
     breakout_events 테이블에 이벤트 기록
+    - 지연 저장 버퍼가 설치돼 있으면 큐에 넣고 즉시 반환
     """
+    buffer = get_write_buffer()
+    if buffer is not None:
+        buffer.add_breakout_event(event_type, timestamp, boundary, threshold)
+        return
     await conn.execute(
         """
         INSERT INTO breakout_events (event_type, timestamp, boundary, threshold)
@@ -225,6 +430,7 @@ async def get_recent_breakout_events(conn, cutoff_time):
 async def get_pending_breakouts(conn) -> list[dict]:
     """
     아직 해결되지 않은 최근 30분 이내 이벤트 불러오기
+    - 지연 저장 버퍼의 미저장 이벤트(임시 id, 음수)도 함께 반환
     """
     query = """
         SELECT id, event_type, timestamp, boundary, threshold
@@ -233,13 +439,29 @@ async def get_pending_breakouts(conn) -> list[dict]:
           AND timestamp >= NOW() - INTERVAL '30 minutes'
         ORDER BY timestamp ASC
     """
-    return await conn.fetch(query)
+    rows = await conn.fetch(query)
+    buffer = get_write_buffer()
+    if buffer is None:
+        return rows
+    # flush 커밋 직후에는 같은 이벤트가 DB 와 버퍼 양쪽에 보일 수 있음 → (종류, 시각)으로 중복 제거
+    stored = {(r["event_type"], r["timestamp"]) for r in rows}
+    pending = [
+        e for e in buffer.pending_breakouts(since=now_kst() - timedelta(minutes=30))
+        if (e["event_type"], e["timestamp"]) not in stored
+    ]
+    return sorted([*rows, *pending], key=lambda e: e["timestamp"])
 
 
 async def mark_breakout_resolved(conn, event_id: int) -> None:
     """
     breakout 이벤트를 해결(resolved) 상태로 변경
+    - 음수 id 는 지연 저장 버퍼의 임시 id
     """
+    if event_id < 0:
+        buffer = get_write_buffer()
+        if buffer is not None:
+            await buffer.resolve_event(conn, event_id)
+        return
     query = """
         UPDATE breakout_events
         SET resolved = TRUE, resolved_at = NOW()
@@ -251,30 +473,163 @@ async def mark_breakout_resolved(conn, event_id: int) -> None:
 async def get_recent_rates_for_summary(conn, since: datetime) -> list[tuple[datetime, float]]:
     """
     최근 특정 시간 범위(예: 30분) 동안의 환율 데이터 조회
+    - 원본 보관 기간보다 오래된 구간은 캔들 종가로 대체 (_tiered_rates)
+    """
+    return await _tiered_rates(conn, since, None)
+
+
+async def get_rates_in_block(conn, start: datetime, end: datetime) -> list[tuple[datetime, float]]:
+    """
+    지정된 시작~종료 시간 블록 내 환율 데이터 조회
+    - 원본 보관 기간보다 오래된 구간은 캔들 종가로 대체 (_tiered_rates)
+    """
+    return await _tiered_rates(conn, start, end)
+
+
+
+async def get_last_summary_block(conn) -> datetime | None:
+    """마지막으로 발송한 30분 요약 블록의 종료 시각 (기록 없으면 None)"""
+    return await conn.fetchval("SELECT MAX(block_end) FROM summary_log")
+
+
+async def record_summary_sent(conn, block_start: datetime, block_end: datetime) -> None:
+    """30분 요약 발송 기록"""
+    await conn.execute(
+        """
+        INSERT INTO summary_log (block_end, block_start)
+        VALUES ($1, $2)
+        ON CONFLICT (block_end) DO NOTHING
+        """,
+        block_end, block_start
+    )
+
+# === 보관 계층 (원본 틱 → 캔들 롤업) ===
+
+def raw_retention_cutoff(now: datetime | None = None) -> datetime:
+    """원본 틱 보관 경계 (KST 자정 정렬) - 이보다 오래된 조회는 bars 롤업을 사용"""
+    day = ((now or now_kst()) - timedelta(days=RAW_RETENTION_DAYS)).astimezone(TIMEZONE).date()
+    return TIMEZONE.localize(datetime(day.year, day.month, day.day))
+
+
+def rollup_interval_for(start: datetime, now: datetime | None = None) -> int:
+    """start 시점 캔들이 아직 남아 있는 가장 짧은 주기"""
+    now = now or now_kst()
+    for interval in sorted(BAR_INTERVALS):
+        days = BAR_RETENTION_DAYS.get(interval)
+        if days is None or start >= now - timedelta(days=days):
+            return interval
+    return max(BAR_INTERVALS)
+
+
+async def _fetch_raw_rates(conn, start: datetime, end: datetime | None) -> list[tuple[datetime, float]]:
+    if end is None:
+        rows = await conn.fetch(
+            """
+            SELECT timestamp, rate
+            FROM rates
+            WHERE timestamp >= $1
+            ORDER BY timestamp ASC
+            """,
+            start
+        )
+    else:
+        rows = await conn.fetch(
+            """
+            SELECT timestamp, rate
+            FROM rates
+            WHERE timestamp >= $1 AND timestamp < $2
+            ORDER BY timestamp ASC
+            """,
+            start, end
+        )
+    return [(r["timestamp"], r["rate"]) for r in rows]
+
+
+async def get_rollup_rates(conn, interval: int, start: datetime, end: datetime | None) -> list[tuple[datetime, float]]:
+    """
+    bars 종가 시계열 (캔들 시작 시각, 종가) - 오래된 순
     """
     rows = await conn.fetch(
+        """
+        SELECT start_ts, close
+        FROM bars
+        WHERE interval = $1 AND start_ts >= $2 AND ($3::timestamptz IS NULL OR start_ts < $3)
+        ORDER BY start_ts ASC
+        """,
+        interval, start, end
+    )
+    return [(r["start_ts"], r["close"]) for r in rows]
+
+
+async def _tiered_rates(conn, start: datetime, end: datetime | None) -> list[tuple[datetime, float]]:
+    """보관 경계 이후는 원본 틱, 이전은 그 시점에 남아 있는 가장 짧은 주기 캔들 종가"""
+    cutoff = raw_retention_cutoff()
+    if start >= cutoff:
+        return await _fetch_raw_rates(conn, start, end)
+    old_end = cutoff if end is None else min(end, cutoff)
+    rows = await get_rollup_rates(conn, rollup_interval_for(start), start, old_end)
+    if not rows:
+        # 보관 작업이 아직 한 번도 돌지 않아 캔들이 없으면 남아 있는 원본으로 대체
+        rows = await _fetch_raw_rates(conn, start, old_end)
+    if end is None or end > cutoff:
+        rows += await _fetch_raw_rates(conn, cutoff, end)
+    return rows
+
+
+async def get_rate_series(conn, start: datetime, end: datetime, max_points: int = ROLLUP_MAX_POINTS) -> list[tuple[datetime, float]]:
+    """
+    장기 구간(수 주 요약/차트 등) 환율 시계열
+    - 틱 수가 max_points 이하로 예상되고 원본 보관 기간 안이면 원본 틱
+    - 아니면 점 수가 max_points 이하가 되는 가장 짧은 주기 캔들 종가 (남아 있는 주기 중)
+    """
+    span = (end - start).total_seconds()
+    if start >= raw_retention_cutoff() and span / CHECK_INTERVAL <= max_points:
+        return await _fetch_raw_rates(conn, start, end)
+    finest = rollup_interval_for(start)
+    candidates = [iv for iv in sorted(BAR_INTERVALS) if iv >= finest]
+    interval = next((iv for iv in candidates if span / iv <= max_points), candidates[-1])
+    return await get_rollup_rates(conn, interval, start, end)
+
+
+# === 대용량 이력 스트리밍 (연구/백필용, 원본 틱만) ===
+
+async def iter_rates(conn, start: datetime, end: datetime, prefetch: int = STREAM_PREFETCH):
+    """
+    [start, end) 원본 틱을 (timestamp, rate) 로 하나씩 yield (서버 측 커서, 상수 메모리)
+    """
+    rows = stream_rows(
+        conn,
         """
         SELECT timestamp, rate
         FROM rates
-        WHERE timestamp >= $1
+        WHERE timestamp >= $1 AND timestamp < $2
         ORDER BY timestamp ASC
         """,
-        since
+        start, end,
+        prefetch=prefetch,
     )
-    return [(r["timestamp"], r["rate"]) for r in rows]
+    async with aclosing(rows):
+        async for r in rows:
+            yield r["timestamp"], r["rate"]
 
 
-async def get_rates_in_block(conn, start: datetime, end: datetime) -> list[tuple[datetime, float]]:
+async def iter_rate_arrays(conn, start: datetime, end: datetime, chunk_rows: int = STREAM_CHUNK_ROWS):
     """
-    지정된 시작~종료 시간 블록 내 환율 데이터 조회
+    [start, end) 원본 틱을 (epoch 마이크로초 int64 배열, 환율 float64 배열) 묶음으로 yield
+    - 바이너리 COPY 경로: 수백만 행도 chunk_rows 단위 상수 메모리
     """
-    rows = await conn.fetch(
+    chunks = stream_copy_arrays(
+        conn,
         """
         SELECT timestamp, rate
         FROM rates
         WHERE timestamp >= $1 AND timestamp < $2
         ORDER BY timestamp ASC
         """,
-        start, end
+        start, end,
+        columns=[("timestamp", "timestamptz"), ("rate", "float8")],
+        chunk_rows=chunk_rows,
     )
-    return [(r["timestamp"], r["rate"]) for r in rows]
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            yield chunk["timestamp"], chunk["rate"]
@@ -0,0 +1,145 @@
+# db/retention.py
+"""
+원본 틱 보관 주기 관리 (계층형 보관)
+
+- 원본 틱(rates): RAW_RETENTION_DAYS 까지 보관
+  · 경계 이전 틱을 bars(1m/5m/30m/1h) 로 확정 집계한 뒤
+    (retention_log 에 기록된 지난 경계 이후만 → 매일 새로 경계를 넘은 하루치만 다시 읽음)
+  · 경계보다 완전히 오래된 월 파티션은 DETACH 후 DROP (RAW_ARCHIVE_DETACH 면 DETACH 만)
+  · 기본(DEFAULT) 파티션의 오래된 행은 DELETE
+  · 경계에 걸친 파티션은 그대로 두고 다음 달에 통째로 정리 (행 단위 삭제로 인한 bloat 방지)
+- 캔들(bars): BAR_RETENTION_DAYS 에 지정된 주기만 기간 경과분 삭제 (나머지는 영구)
+- 조회 측(get_rates_in_block 등)은 raw_retention_cutoff 이전 구간을 자동으로 bars 에서 읽음
+
+예)
+  python -m db.retention            # 보관 작업 실행
+  python -m db.retention --dry-run  # 정리 대상만 출력
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta
+
+from config import BAR_INTERVALS, BAR_RETENTION_DAYS, RAW_ARCHIVE_DETACH
+from db.migrations import _month_start, run_migrations
+from db.repository import backfill_bars, raw_retention_cutoff, rollup_rates_to_bars
+from utils.time import now_kst
+
+# pg_advisory_xact_lock 키 (마이그레이션과 다른 임의 고정값)
+_LOCK_KEY = 7_204_512
+
+
+async def _rate_partitions(conn) -> list[tuple[str, date]]:
+    """rates 에 붙어 있는 월 파티션 (이름, 시작 월) - 이름 규칙 rates_yYYYYmMM 만 대상"""
+    rows = await conn.fetch(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'rates'::regclass
+        ORDER BY c.relname
+        """
+    )
+    parts = []
+    for r in rows:
+        name = r["relname"]
+        if len(name) == 14 and name.startswith("rates_y") and name[11] == "m":
+            parts.append((name, date(int(name[7:11]), int(name[12:14]), 1)))
+    return parts
+
+
+async def run_retention(conn, now: datetime | None = None, dry_run: bool = False) -> dict:
+    """
+    보관 작업 1회 실행 (한 트랜잭션, advisory lock 으로 동시 실행 방지)
+    반환: {"cutoff", "rolled_from", "partitions", "default_deleted", "bars_deleted"}
+    - rolled_from: 이번에 캔들로 확정 집계한 구간 시작 (지난 경계 이후 새로 넘어온 구간이 없으면 None)
+    """
+    now = now or now_kst()
+    cutoff = raw_retention_cutoff(now)
+    report = {"cutoff": cutoff, "rolled_from": None, "partitions": [], "default_deleted": 0, "bars_deleted": {}}
+
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", _LOCK_KEY)
+
+        oldest = await conn.fetchval("SELECT MIN(timestamp) FROM rates")
+        # 지난 실행에서 이미 캔들로 확정한 구간은 건너뜀 (첫 실행/기록 없음이면 가장 오래된 틱부터)
+        rolled_until = await conn.fetchval("SELECT MAX(cutoff) FROM retention_log")
+        start = oldest if rolled_until is None or oldest is None else max(oldest, rolled_until)
+        expired = [
+            name for name, month in await _rate_partitions(conn)
+            if _month_start(month, 1) <= cutoff.date()
+        ]
+        report["partitions"] = expired
+
+        if start is not None and start < cutoff:
+            report["rolled_from"] = start
+            if not dry_run:
+                # 원본을 지우기 전에 경계 이전 캔들을 원본 기준으로 확정 (실시간 저장분 보정 포함)
+                # 경계는 KST 자정 정렬 → 지난 경계부터 이어 집계해도 캔들 주기 경계와 맞아 양 끝 캔들이 잘리지 않음
+                await rollup_rates_to_bars(conn, BAR_INTERVALS, start, cutoff)
+                await conn.execute(
+                    "INSERT INTO retention_log (cutoff) VALUES ($1) ON CONFLICT (cutoff) DO NOTHING", cutoff
+                )
+
+        # 경계 이전 원본은 이번 또는 지난 실행에서 캔들로 확정됨
+        if oldest is not None and oldest < cutoff and not dry_run:
+            if await conn.fetchval("SELECT to_regclass('rates_default') IS NOT NULL"):
+                status = await conn.execute("DELETE FROM rates_default WHERE timestamp < $1", cutoff)
+                report["default_deleted"] = int(status.split()[-1])
+
+        if not dry_run:
+            for name in expired:
+                await conn.execute(f"ALTER TABLE rates DETACH PARTITION {name}")
+                if not RAW_ARCHIVE_DETACH:
+                    await conn.execute(f"DROP TABLE {name}")
+
+        for interval, days in sorted(BAR_RETENTION_DAYS.items()):
+            bar_cutoff = now - timedelta(days=days)
+            if dry_run:
+                count = await conn.fetchval(
+                    "SELECT COUNT(*) FROM bars WHERE interval = $1 AND start_ts < $2", interval, bar_cutoff
+                )
+            else:
+                status = await conn.execute(
+                    "DELETE FROM bars WHERE interval = $1 AND start_ts < $2", interval, bar_cutoff
+                )
+                count = int(status.split()[-1])
+            report["bars_deleted"][interval] = count
+
+    return report
+
+
+def _print_report(report: dict, dry_run: bool):
+    head = "🧪 보관 작업 (dry-run)" if dry_run else "🗄️ 보관 작업"
+    print(f"{head}: 원본 경계 {report['cutoff']}")
+    if report["rolled_from"] is not None:
+        print(f"  - 캔들 확정 집계: {report['rolled_from']} ~ {report['cutoff']}")
+    action = "DETACH" if RAW_ARCHIVE_DETACH else "DROP"
+    for name in report["partitions"]:
+        print(f"  - 파티션 {action}: {name}")
+    if report["default_deleted"]:
+        print(f"  - rates_default 삭제: {report['default_deleted']}행")
+    for interval, count in report["bars_deleted"].items():
+        if count:
+            print(f"  - bars({interval}s) 삭제: {count}행")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="원본 틱 보관 주기 관리 (캔들 롤업 후 오래된 파티션 정리)")
+    parser.add_argument("--dry-run", action="store_true", help="정리 대상만 출력")
+    args = parser.parse_args()
+
+    from db.connection import init_db_pool, close_db_pool
+
+    pool = await init_db_pool()
+    try:
+        async with pool.acquire() as conn:
+            await run_migrations(conn)
+            await backfill_bars(conn, BAR_INTERVALS)
+            report = await run_retention(conn, dry_run=args.dry_run)
+            _print_report(report, args.dry_run)
+    finally:
+        await close_db_pool(pool)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+# db/streaming.py
+"""
+대용량 이력 스트리밍 조회 (상수 메모리)
+
+- stream_rows: asyncpg 서버 측 커서로 prefetch 행씩 받아 한 행씩 yield
+- stream_copy_arrays: COPY (query) TO STDOUT (FORMAT binary) 를 받아 NumPy 배열 묶음으로 yield
+  · NULL 없는 고정 폭 컬럼(timestamptz/float8/int8/int4)만 지원 → 행 단위 파싱 없이 frombuffer 로 해석
+  · 소비 측이 느리면 수신 큐(_QUEUE_CHUNKS)가 차서 COPY 수신이 멈춤 → 메모리 상한 유지
+- 중간에 그만 읽을 때는 contextlib.aclosing 으로 감싸 커서 트랜잭션/COPY 를 바로 정리할 것
+  (COPY 는 남은 데이터를 해석 없이 끝까지 받아 버린 뒤 연결을 돌려줌)
+
+예)
+  async with aclosing(iter_rate_arrays(conn, start, end)) as chunks:
+      async for ts_us, rates in chunks:
+          ...
+"""
+import asyncio
+import struct
+from typing import AsyncIterator
+
+import numpy as np
+
+from config import STREAM_PREFETCH, STREAM_CHUNK_ROWS
+
+# PostgreSQL 바이너리 COPY 헤더 서명, timestamptz 기준 시각(2000-01-01 UTC)의 epoch 마이크로초
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_PG_EPOCH_US = 946_684_800_000_000
+# COPY 수신 큐에 쌓아 둘 네트워크 청크 수
+_QUEUE_CHUNKS = 8
+
+# 지원 컬럼 타입 → 빅엔디언 dtype
+_COPY_TYPES = {
+    "timestamptz": ">i8",
+    "float8": ">f8",
+    "int8": ">i8",
+    "int4": ">i4",
+}
+
+
+async def stream_rows(conn, query: str, *args, prefetch: int = STREAM_PREFETCH) -> AsyncIterator:
+    """서버 측 커서로 한 행씩 (트랜잭션 밖이면 읽기 전용 트랜잭션을 열어 커서 유지)"""
+    if conn.is_in_transaction():
+        async for row in conn.cursor(query, *args, prefetch=prefetch):
+            yield row
+        return
+    async with conn.transaction(readonly=True):
+        async for row in conn.cursor(query, *args, prefetch=prefetch):
+            yield row
+
+
+def _row_dtype(columns: list[tuple[str, str]]) -> np.dtype:
+    fields = [("_fields", ">i2")]
+    for i, (name, pg_type) in enumerate(columns):
+        if pg_type not in _COPY_TYPES:
+            raise ValueError(f"바이너리 COPY 미지원 타입: {pg_type}")
+        fields += [(f"_len{i}", ">i4"), (name, _COPY_TYPES[pg_type])]
+    return np.dtype(fields)
+
+
+def _skip_header(buf: bytearray) -> int | None:
+    """헤더 길이 (아직 다 받지 못했으면 None)"""
+    if len(buf) < 19:
+        return None
+    if bytes(buf[:11]) != _COPY_SIGNATURE:
+        raise ValueError("바이너리 COPY 헤더가 아닙니다")
+    ext_len = struct.unpack_from(">i", buf, 15)[0]
+    size = 19 + ext_len
+    return size if len(buf) >= size else None
+
+
+def _decode(raw: bytes, dtype: np.dtype, columns: list[tuple[str, str]]) -> dict[str, np.ndarray]:
+    rec = np.frombuffer(raw, dtype=dtype)
+    if np.any(rec["_fields"] != len(columns)):
+        raise ValueError("바이너리 COPY 컬럼 수 불일치")
+    out = {}
+    for i, (name, pg_type) in enumerate(columns):
+        if np.any(rec[f"_len{i}"] != dtype[name].itemsize):
+            raise ValueError(f"바이너리 COPY 에 NULL 또는 가변 길이 값이 있습니다: {name}")
+        values = rec[name].astype(dtype[name].newbyteorder("="))
+        if pg_type == "timestamptz":
+            values += _PG_EPOCH_US   # → epoch 마이크로초 (utils.tick_buffer 와 같은 단위)
+        out[name] = values
+    return out
+
+
+async def stream_copy_arrays(
+    conn,
+    query: str,
+    *args,
+    columns: list[tuple[str, str]],
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> AsyncIterator[dict[str, np.ndarray]]:
+    """
+    query 결과를 바이너리 COPY 로 받아 최대 chunk_rows 행씩 {컬럼명: 배열} 로 yield
+    - columns: SELECT 순서대로 (이름, PostgreSQL 타입) - timestamptz 는 epoch 마이크로초 int64 로 변환
+    """
+    dtype = _row_dtype(columns)
+    row_size = dtype.itemsize
+    queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=_QUEUE_CHUNKS)
+    discard = False
+
+    async def sink(data: bytes):
+        if not discard:
+            await queue.put(data)
+
+    copy_task = asyncio.create_task(
+        conn.copy_from_query(query, *args, output=sink, format="binary")
+    )
+
+    buf = bytearray()
+    header_done = False
+    try:
+        while True:
+            if queue.empty() and copy_task.done():
+                break
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, copy_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                continue
+            buf += getter.result()
+
+            if not header_done:
+                size = _skip_header(buf)
+                if size is None:
+                    continue
+                del buf[:size]
+                header_done = True
+
+            rows = len(buf) // row_size
+            # 마지막 2바이트(-1)는 종료 표시 → 청크가 찰 때까지 또는 종료 시점에 해석
+            if rows >= chunk_rows:
+                take = rows - rows % chunk_rows
+                raw = bytes(buf[:take * row_size])
+                del buf[:take * row_size]
+                for start in range(0, take * row_size, chunk_rows * row_size):
+                    yield _decode(raw[start:start + chunk_rows * row_size], dtype, columns)
+
+        copy_task.result()   # COPY 실패 시 여기서 예외 전파
+        if header_done:
+            if bytes(buf[-2:]) != b"\xff\xff":
+                raise ValueError("바이너리 COPY 종료 표시가 없습니다")
+            del buf[-2:]
+            if len(buf) % row_size:
+                raise ValueError("바이너리 COPY 행 길이 불일치")
+            if buf:
+                yield _decode(bytes(buf), dtype, columns)
+    finally:
+        if not copy_task.done():
+            # COPY 를 취소하면 asyncpg 연결이 한동안 사용 불가 상태로 남으므로, 남은 데이터는 해석 없이 받아 버림
+            discard = True
+            while not queue.empty():
+                queue.get_nowait()
+            try:
+                await copy_task
+            except Exception:
+                pass
@@ -0,0 +1,244 @@
+# db/write_behind.py
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from config import WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_MAX_PENDING
+from utils.time import now_kst
+
+# 임시 id → 실제 id 매핑 보관 기간 (breakout 판정 구간 30분 + 여유)
+_ID_MAP_TTL = timedelta(hours=1)
+
+# 판정이 끝난 bollinger_history 행 저장 (종료 시 저장된 미판정 행은 재시작 후 판정 결과로 덮어씀)
+BOLLINGER_HISTORY_UPSERT = """
+    INSERT INTO bollinger_history (
+      timestamp, period, rate, ma, std, upper, lower,
+      upper_deviation, lower_deviation, upper_reverted, lower_rebounded
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+    ON CONFLICT (period, timestamp) DO UPDATE
+    SET upper_reverted = EXCLUDED.upper_reverted,
+        lower_rebounded = EXCLUDED.lower_rebounded
+"""
+
+
+class WriteBehindBuffer:
+    """
+    rates / bollinger_history / breakout_events 지연 일괄 저장 (write-behind)
+    - store_rate / update_bollinger_history / insert_breakout_event 는 메모리 큐에 넣고 즉시 반환
+    - 행 수(batch_size) 또는 경과 시간(flush_interval) 조건에서 한 트랜잭션으로 flush
+      · rates: COPY (copy_records_to_table)
+      · bollinger_history: executemany upsert (종료 시 저장한 미판정 행을 판정 결과로 덮어써야 해서 COPY 불가)
+      · breakout_events: 행마다 INSERT ... RETURNING id (드물게 발생, 임시 id → 실제 id 매핑용)
+    - 아직 저장 안 된 이벤트는 pending_breakouts 로 조회 (read-your-writes, 틱 시세는 TickBuffer 가 보유)
+    - close() 에서 남은 행을 모두 flush (종료 시 유실 방지), 실패한 배치는 큐 앞에 되돌려 재시도
+    - 재시도 큐는 max_pending 행까지만 유지, 초과분은 오래된 rates / bollinger_history 부터 폐기하고 범위를 로그로 남김
+      (breakout_events 는 임시 id 매핑 때문에 폐기하지 않음)
+    """
+    def __init__(self, pool, batch_size: int = WRITE_BEHIND_BATCH_SIZE, flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._rates: list[tuple[datetime, float]] = []
+        self._bands: list[tuple] = []
+        self._events: list[dict] = []
+        # flush 중(커밋 전)인 이벤트 - 조회 시 DB 와 함께 보이도록 유지
+        self._inflight_events: list[dict] = []
+        self._id_map: dict[int, tuple[int, datetime]] = {}
+        self._next_temp_id = -1
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._oldest: float | None = None
+        self.flushed_rows = 0
+        self.flushes = 0
+        self.dropped_rows = 0
+
+    # --- 쓰기 (큐 적재) ---
+    def add_rate(self, timestamp: datetime, rate: float):
+        self._rates.append((timestamp, rate))
+        self._touched()
+
+    def add_bollinger_rows(self, records: list[tuple]):
+        """BOLLINGER_HISTORY_UPSERT 인자 튜플 목록 적재"""
+        self._bands.extend(records)
+        self._touched()
+
+    def add_breakout_event(self, event_type: str, timestamp: datetime, boundary: float, threshold: float) -> int:
+        """이벤트를 큐에 넣고 임시 id(음수) 반환"""
+        temp_id = self._next_temp_id
+        self._next_temp_id -= 1
+        self._events.append({
+            "id": temp_id,
+            "event_type": event_type,
+            "timestamp": timestamp,
+            "boundary": boundary,
+            "threshold": threshold,
+            "resolved": False,
+            "resolved_at": None,
+        })
+        self._touched()
+        return temp_id
+
+    def __len__(self):
+        return len(self._rates) + len(self._bands) + len(self._events)
+
+    def _touched(self):
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if len(self) >= self.batch_size:
+            self._wakeup.set()
+
+    def _enforce_limit(self):
+        """재시도 큐가 max_pending 을 넘으면 오래된 rates → bollinger_history 순으로 폐기"""
+        excess = len(self) - self.max_pending
+        if excess <= 0:
+            return
+        dropped = {}
+        for name in ("_rates", "_bands"):
+            rows = getattr(self, name)
+            n = min(excess, len(rows))
+            if n:
+                dropped[name] = rows[:n]
+                setattr(self, name, rows[n:])
+                excess -= n
+        for name, rows in dropped.items():
+            label = "rates" if name == "_rates" else "bollinger_history"
+            print(f"[{now_kst()}] 🗑️ 지연 저장 큐 한도({self.max_pending}) 초과: {label} {len(rows)}건 폐기 ({rows[0][0]} ~ {rows[-1][0]})")
+            self.dropped_rows += len(rows)
+
+    # --- 읽기 (미저장분) ---
+    def pending_breakouts(self, since: datetime) -> list[dict]:
+        """since 이후 미해결 이벤트 중 아직 DB 에 없는 것 (flush 중 포함)"""
+        return [
+            dict(e) for e in self._inflight_events + self._events
+            if not e["resolved"] and e["timestamp"] >= since
+        ]
+
+    def real_event_id(self, temp_id: int) -> int | None:
+        entry = self._id_map.get(temp_id)
+        return entry[0] if entry else None
+
+    def _flag_queued(self, temp_id: int) -> bool:
+        for e in self._events:
+            if e["id"] == temp_id:
+                e["resolved"] = True
+                e["resolved_at"] = now_kst()
+                return True
+        return False
+
+    async def resolve_event(self, conn, temp_id: int):
+        """임시 id 이벤트 해결 처리: 큐에 있으면 플래그만, 이미 flush 됐으면 실제 id 로 UPDATE"""
+        if self._flag_queued(temp_id):
+            return
+        # flush 진행 중이면 끝날 때까지 기다린 뒤 매핑 조회 (flush 실패 시 큐로 되돌아와 있음)
+        async with self._lock:
+            real_id = self.real_event_id(temp_id)
+            if real_id is None:
+                self._flag_queued(temp_id)
+        if real_id is not None:
+            await conn.execute(
+                "UPDATE breakout_events SET resolved = TRUE, resolved_at = NOW() WHERE id = $1", real_id
+            )
+
+    # --- flush ---
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            due = self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+            if due or len(self) >= self.batch_size:
+                try:
+                    await self.flush()
+                except Exception:
+                    pass   # 로그는 flush 에서 출력, 행은 큐에 남아 다음 주기에 재시도
+
+    async def flush(self) -> int:
+        """큐에 쌓인 행을 한 트랜잭션으로 저장, 저장한 행 수 반환"""
+        async with self._lock:
+            if not len(self):
+                return 0
+            rates, self._rates = self._rates, []
+            bands, self._bands = self._bands, []
+            events, self._events = self._events, []
+            self._oldest = None
+            self._inflight_events = events
+            try:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        if rates:
+                            await conn.copy_records_to_table("rates", records=rates, columns=["timestamp", "rate"])
+                        if bands:
+                            await conn.executemany(BOLLINGER_HISTORY_UPSERT, bands)
+                        ids = []
+                        for e in events:
+                            ids.append(await conn.fetchval(
+                                """
+                                INSERT INTO breakout_events (event_type, timestamp, boundary, threshold, resolved, resolved_at)
+                                VALUES ($1, $2, $3, $4, $5, $6)
+                                RETURNING id
+                                """,
+                                e["event_type"], e["timestamp"], e["boundary"], e["threshold"], e["resolved"], e["resolved_at"]
+                            ))
+            except Exception as ex:
+                # 실패한 배치는 큐 앞에 되돌려 다음 flush 에서 재시도 (한도 초과분은 폐기)
+                self._rates = rates + self._rates
+                self._bands = bands + self._bands
+                self._events = events + self._events
+                self._oldest = self._oldest or time.monotonic()
+                print(
+                    f"[{now_kst()}] ❌ 지연 저장 실패 "
+                    f"(rates {len(rates)}건, bollinger_history {len(bands)}건, events {len(events)}건): {ex}"
+                )
+                self._enforce_limit()
+                raise
+            finally:
+                self._inflight_events = []
+
+            for e, real_id in zip(events, ids):
+                self._id_map[e["id"]] = (real_id, e["timestamp"])
+            cutoff = now_kst() - _ID_MAP_TTL
+            for temp_id in [t for t, (_, ts) in self._id_map.items() if ts < cutoff]:
+                del self._id_map[temp_id]
+
+            saved = len(rates) + len(bands) + len(events)
+            self.flushes += 1
+            self.flushed_rows += saved
+            return saved
+
+    async def close(self):
+        """백그라운드 flush 중단 후 남은 행 모두 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            print(f"[{now_kst()}] ⚠️ 종료 시 지연 저장 실패: {len(self)}건 미저장")
+            raise
+
+
+# 프로세스 전역 지연 저장 버퍼 (워처가 설치, 없으면 repository 가 즉시 INSERT)
+_WRITE_BUFFER: WriteBehindBuffer | None = None
+
+
+def get_write_buffer() -> WriteBehindBuffer | None:
+    return _WRITE_BUFFER
+
+
+def set_write_buffer(buffer: WriteBehindBuffer | None):
+    global _WRITE_BUFFER
+    _WRITE_BUFFER = buffer
@@ -7,6 +7,7 @@ from utils.message_templates import build_combo_message
 from strategies.utils.types import ComboResult
 from strategies.feedback import log_decision
 from datetime import datetime, timedelta
+from utils.time import now_kst
 from config import COOLDOWN_SECONDS, DEBOUNCE_REQUIRED, HYSTERESIS_P_DELTA, HYSTERESIS_AGREE_DELTA
 
 # Module-level state for debounce/cooldown
@@ -184,7 +185,7 @@ def make_decision(
             gate_action = "hold"
             gate_reason = "히스테리시스(추가 확신 대기)"
 
-    now = datetime.now()
+    now = now_kst()
 
     # 디바운스: 전환 시 연속 동일 판단 필요
     if gate_action in ("buy", "sell"):
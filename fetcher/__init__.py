@@ -1,4 +1,9 @@
-from .rate_fetcher import get_usdkrw_rate
+from .rate_fetcher import get_usdkrw_rate, get_http_session, close_http_session
+from .quote_aggregator import QuoteAggregator, QuoteProvider, build_provider, get_consensus_rate
 from .expected_range_fetcher import fetch_expected_range
 
-__all__ = ["get_usdkrw_rate", "fetch_expected_range"]
\ No newline at end of file
+__all__ = [
+    "get_usdkrw_rate", "get_http_session", "close_http_session",
+    "QuoteAggregator", "QuoteProvider", "build_provider", "get_consensus_rate",
+    "fetch_expected_range",
+]
\ No newline at end of file
@@ -1,18 +1,191 @@
 from curl_cffi import requests # 변경
 from bs4 import BeautifulSoup
+import asyncio
 import re
 from datetime import datetime
 import pytz
-import time as pytime
 from typing import Optional
 
-def fetch_expected_range():
-    # 헤더는 그대로 두거나 최소화해도 됨 (impersonate가 알아서 처리함)
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Referer": "https://news.einfomax.co.kr/",
-    }
-    
+# 후보 기사 동시 조회 수 / 최대 조회 기사 수
+PROBE_CONCURRENCY = 4
+MAX_PROBE = 12
+
+# 헤더는 그대로 두거나 최소화해도 됨 (impersonate가 알아서 처리함)
+HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Referer": "https://news.einfomax.co.kr/",
+}
+
+# 유료 단말기 안내 문구/무관 기사/차단 페이지 판별용
+PAYWALL_HINTS = [
+    "인포맥스 금융정보 단말기",
+    "무단전재",
+    "AI 학습 및 활용 금지",
+]
+
+
+async def _get(session, url: str, *, timeout: int = 15, retries: int = 3):
+    last_err: Optional[Exception] = None
+    for i in range(retries):
+        try:
+            # impersonate="chrome" 옵션이 핵심입니다.
+            r = await session.get(
+                url,
+                headers=HEADERS,
+                impersonate="chrome",
+                timeout=timeout,
+                allow_redirects=True
+            )
+            if r.status_code >= 400:
+                r.raise_for_status()
+            return r
+        except Exception as e:
+            last_err = e
+            print(f"Retry {i+1} failed: {e}")
+            await asyncio.sleep(1)
+    raise last_err
+
+
+def _extract_article_text(soup: BeautifulSoup) -> str:
+    """Extract main article text as reliably as possible.
+
+    Einfomax pages sometimes include a lot of navigation/boilerplate; also some environments
+    may receive a 'block/interstitial' HTML with 200. We try common article containers first.
+    """
+    candidates = [
+        "div#article-view-content-div",          # common on many Korean news CMS
+        "div#articleBody",                      # fallback
+        "section#article-view-content-div",     # variant
+        "div.article-body",                     # generic
+        "div.view_cont",                        # generic
+        "article",                              # last resort
+    ]
+    for sel in candidates:
+        el = soup.select_one(sel)
+        if el:
+            txt = el.get_text("\n", strip=True)
+            if txt and len(txt) > 200:
+                return txt
+
+    # Fallback 1) meta description / og:description
+    for meta_sel in [
+        ("meta", {"property": "og:description"}),
+        ("meta", {"name": "description"}),
+    ]:
+        m = soup.find(*meta_sel)
+        if m and m.get("content"):
+            txt = m.get("content").strip()
+            if txt and len(txt) > 80:
+                return txt
+
+    # Fallback 2) JSON-LD (application/ld+json)
+    try:
+        import json
+        for sc in soup.select("script[type='application/ld+json']"):
+            raw = (sc.string or "").strip()
+            if not raw:
+                continue
+            try:
+                data = json.loads(raw)
+            except Exception:
+                continue
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                body = item.get("articleBody") or item.get("description")
+                if isinstance(body, str) and len(body.strip()) > 120:
+                    return body.strip()
+    except Exception:
+        pass
+
+    return soup.get_text("\n", strip=True)
+
+def _debug_context(text: str, keyword: str, width: int = 200) -> str:
+    i = text.find(keyword)
+    if i < 0:
+        return ""
+    start = max(0, i - width)
+    end = min(len(text), i + len(keyword) + width)
+    return text[start:end]
+
+
+def _probe_article(html: str) -> tuple[BeautifulSoup, str] | None:
+    """
+    후보 기사 HTML에서 '예상 레인지/범위' 키워드와 숫자 레인지가 모두 있으면 (soup, 본문) 반환
+    - 유료 단말기 안내/무관 기사/차단 페이지는 None
+    """
+    s = BeautifulSoup(html, "html.parser")
+
+    # 본문 텍스트 추출
+    tmp_body = None
+    try:
+        tmp_body = _extract_article_text(s)
+    except Exception:
+        tmp_body = s.get_text("\n", strip=True)
+
+    # 유료/단말기 안내 페이지는 스킵(단, 본문에 실제 숫자 레인지가 있으면 통과 가능하도록 아래에서 최종 판별)
+    if any(hint in (tmp_body or "") for hint in PAYWALL_HINTS):
+        # 여기서는 일단 표시만 하고, 실제 채택 여부는 '숫자 레인지 존재'로 결정
+        print("[EXPECTED_RANGE] note: paywall/terminal hint detected")
+
+    probe_text = tmp_body or ""
+
+    # 1) 키워드(레인지/범위) 존재 여부
+    probe_patterns = [
+        r"오늘\s*외환딜러\s*환율\s*예상\s*(?:레인지|범위)",
+        r"오늘\s*외환딜러\s*환율\s*예상(?:레인지|범위)",
+        r"외환딜러\s*환율\s*예상\s*(?:레인지|범위)",
+        r"\[\s*오늘\s*외환딜러\s*환율\s*예상\s*(?:레인지|범위)\s*\]",
+        r"예상\s*(?:환율\s*)?(?:레인지|범위)",
+        r"예상(?:환율)?(?:레인지|범위)",
+        r"환율\s*예상\s*(?:레인지|범위)",
+        r"환율예상(?:레인지|범위)",
+    ]
+    if not any(re.search(p, probe_text) for p in probe_patterns):
+        snippet = (probe_text or "")[:220]
+        print("[EXPECTED_RANGE] keyword-miss snippet=", snippet)
+        print("[EXPECTED_RANGE] skip: keyword pattern not found")
+        return None
+
+    # 2) 숫자 레인지(예: 1,445~1,455) 실제 포함 여부 (가장 중요)
+    range_probe_patterns = [
+        r"([\d,]{3,5}(?:\.[\d]+)?)\s*[~\-–]\s*([\d,]{3,5}(?:\.[\d]+)?)\s*원?",
+        r"예상\s*(?:환율\s*)?(?:레인지|범위)\s*[:：]?\s*([\d,\.]+)\s*[~\-–]\s*([\d,\.]+)",
+    ]
+    has_numeric_range = False
+    for pat in range_probe_patterns:
+        if re.search(pat, probe_text):
+            has_numeric_range = True
+            break
+
+    # 유료/단말기 안내 페이지는 '키워드만 있고 숫자가 없는' 경우가 많아 숫자 레인지가 없으면 스킵
+    if any(hint in probe_text for hint in PAYWALL_HINTS) and not has_numeric_range:
+        print("[EXPECTED_RANGE] skip: paywall/terminal-only and no numeric range")
+        return None
+
+    if not has_numeric_range:
+        print("[EXPECTED_RANGE] skip: no numeric range in article")
+        return None
+
+    # 후보 채택 (키워드 + 숫자 레인지 모두 존재)
+    return s, tmp_body
+
+
+async def _probe_candidate(session, sem: asyncio.Semaphore, idx: int, total: int, url: str):
+    async with sem:
+        try:
+            print(f"[EXPECTED_RANGE] probe {idx}/{total}: {url}")
+            r = await _get(session, url)
+            r.raise_for_status()
+            # HTML 파싱은 CPU 작업이므로 이벤트 루프 밖(스레드)에서 수행
+            return await asyncio.to_thread(_probe_article, r.text)
+        except Exception as e:
+            print(f"[EXPECTED_RANGE] probe error: {type(e).__name__} - {e}")
+            return None
+
+
+async def fetch_expected_range():
     # 더 구체적인 키워드로 검색 (배포 환경에서 무관 기사/관련기사 묶음으로 빠지는 문제 방지)
     # '오늘 외환딜러 환율 예상레인지' 코너를 직접 겨냥
     search_url = (
@@ -20,32 +193,14 @@ def fetch_expected_range():
         "%EC%98%A4%EB%8A%98+%EC%99%B8%ED%99%98%EB%94%9C%EB%9F%AC+%ED%99%98%EC%9C%A8+%EC%98%88%EC%83%81%EB%A0%88%EC%9D%B8%EC%A7%80"
     )
 
-    # requests.Session() 대신 curl_cffi 사용
-    session = requests.Session()
+    # requests.Session() 대신 curl_cffi 비동기 세션 사용
+    async with requests.AsyncSession() as session:
+        return await _fetch_expected_range(session, search_url)
 
-    def _get(url: str, *, timeout: int = 15, retries: int = 3):
-        last_err: Optional[Exception] = None
-        for i in range(retries):
-            try:
-                # impersonate="chrome" 옵션이 핵심입니다.
-                r = session.get(
-                    url, 
-                    headers=headers, 
-                    impersonate="chrome", 
-                    timeout=timeout, 
-                    allow_redirects=True
-                )
-                if r.status_code >= 400:
-                    r.raise_for_status()
-                return r
-            except Exception as e:
-                last_err = e
-                print(f"Retry {i+1} failed: {e}")
-                pytime.sleep(1)
-        raise last_err
-
-    # ... (나머지 로직은 동일) ...
-    res = _get(search_url)
+
+async def _fetch_expected_range(session, search_url: str):
+    """검색 → 후보 기사 동시 조회 → 레인지 추출"""
+    res = await _get(session, search_url)
     
     # 디버깅용 로그 (배포 환경에서 확인용)
     if "예상" not in res.text and "레인지" not in res.text:
@@ -95,148 +250,29 @@ def fetch_expected_range():
     if "예상" not in res.text and "레인지" not in res.text and "범위" not in res.text:
         print(f"⚠️ 경고: 검색 결과 페이지가 의심스럽습니다. Status: {res.status_code}")
 
-    def _extract_article_text(soup: BeautifulSoup) -> str:
-        """Extract main article text as reliably as possible.
-
-        Einfomax pages sometimes include a lot of navigation/boilerplate; also some environments
-        may receive a 'block/interstitial' HTML with 200. We try common article containers first.
-        """
-        candidates = [
-            "div#article-view-content-div",          # common on many Korean news CMS
-            "div#articleBody",                      # fallback
-            "section#article-view-content-div",     # variant
-            "div.article-body",                     # generic
-            "div.view_cont",                        # generic
-            "article",                              # last resort
-        ]
-        for sel in candidates:
-            el = soup.select_one(sel)
-            if el:
-                txt = el.get_text("\n", strip=True)
-                if txt and len(txt) > 200:
-                    return txt
-
-        # Fallback 1) meta description / og:description
-        for meta_sel in [
-            ("meta", {"property": "og:description"}),
-            ("meta", {"name": "description"}),
-        ]:
-            m = soup.find(*meta_sel)
-            if m and m.get("content"):
-                txt = m.get("content").strip()
-                if txt and len(txt) > 80:
-                    return txt
-
-        # Fallback 2) JSON-LD (application/ld+json)
-        try:
-            import json
-            for sc in soup.select("script[type='application/ld+json']"):
-                raw = (sc.string or "").strip()
-                if not raw:
-                    continue
-                try:
-                    data = json.loads(raw)
-                except Exception:
-                    continue
-                items = data if isinstance(data, list) else [data]
-                for item in items:
-                    if not isinstance(item, dict):
-                        continue
-                    body = item.get("articleBody") or item.get("description")
-                    if isinstance(body, str) and len(body.strip()) > 120:
-                        return body.strip()
-        except Exception:
-            pass
-
-        return soup.get_text("\n", strip=True)
-
-    def _debug_context(text: str, keyword: str, width: int = 200) -> str:
-        i = text.find(keyword)
-        if i < 0:
-            return ""
-        start = max(0, i - width)
-        end = min(len(text), i + len(keyword) + width)
-        return text[start:end]
-
-    # 3. 후보 기사들을 순회하며 '예상 레인지/범위' 패턴이 실제로 존재하는 기사만 채택
-    #    (유료 단말기 안내 문구/무관 기사/차단 페이지는 스킵)
-    PAYWALL_HINTS = [
-        "인포맥스 금융정보 단말기",
-        "무단전재",
-        "AI 학습 및 활용 금지",
-    ]
-
+    # 3. 후보 기사들을 동시에(최대 PROBE_CONCURRENCY개) 조회하되, 검색 순위가 높은 기사부터
+    #    '예상 레인지/범위' 패턴이 실제로 존재하는지 확인해 첫 번째로 통과한 기사를 채택
+    #    (유료 단말기 안내 문구/무관 기사/차단 페이지는 스킵, 채택 즉시 나머지 조회 취소)
     article_url = None
     article_soup = None
     body_text = None
 
-    max_probe = min(12, len(candidates))
-    for idx, url in enumerate(candidates[:max_probe], start=1):
-        try:
-            print(f"[EXPECTED_RANGE] probe {idx}/{max_probe}: {url}")
-            r = _get(url)
-            r.raise_for_status()
-            s = BeautifulSoup(r.text, "html.parser")
-
-            # 본문 텍스트 추출
-            tmp_body = None
-            try:
-                tmp_body = _extract_article_text(s)
-            except Exception:
-                tmp_body = s.get_text("\n", strip=True)
-
-            # 유료/단말기 안내 페이지는 스킵(단, 본문에 실제 숫자 레인지가 있으면 통과 가능하도록 아래에서 최종 판별)
-            if any(hint in (tmp_body or "") for hint in PAYWALL_HINTS):
-                # 여기서는 일단 표시만 하고, 실제 채택 여부는 '숫자 레인지 존재'로 결정
-                print("[EXPECTED_RANGE] note: paywall/terminal hint detected")
-
-            probe_text = tmp_body or ""
-
-            # 1) 키워드(레인지/범위) 존재 여부
-            probe_patterns = [
-                r"오늘\s*외환딜러\s*환율\s*예상\s*(?:레인지|범위)",
-                r"오늘\s*외환딜러\s*환율\s*예상(?:레인지|범위)",
-                r"외환딜러\s*환율\s*예상\s*(?:레인지|범위)",
-                r"\[\s*오늘\s*외환딜러\s*환율\s*예상\s*(?:레인지|범위)\s*\]",
-                r"예상\s*(?:환율\s*)?(?:레인지|범위)",
-                r"예상(?:환율)?(?:레인지|범위)",
-                r"환율\s*예상\s*(?:레인지|범위)",
-                r"환율예상(?:레인지|범위)",
-            ]
-            if not any(re.search(p, probe_text) for p in probe_patterns):
-                snippet = (probe_text or "")[:220]
-                print("[EXPECTED_RANGE] keyword-miss snippet=", snippet)
-                print("[EXPECTED_RANGE] skip: keyword pattern not found")
-                continue
-
-            # 2) 숫자 레인지(예: 1,445~1,455) 실제 포함 여부 (가장 중요)
-            range_probe_patterns = [
-                r"([\d,]{3,5}(?:\.[\d]+)?)\s*[~\-–]\s*([\d,]{3,5}(?:\.[\d]+)?)\s*원?",
-                r"예상\s*(?:환율\s*)?(?:레인지|범위)\s*[:：]?\s*([\d,\.]+)\s*[~\-–]\s*([\d,\.]+)",
-            ]
-            has_numeric_range = False
-            for pat in range_probe_patterns:
-                if re.search(pat, probe_text):
-                    has_numeric_range = True
-                    break
-
-            # 유료/단말기 안내 페이지는 '키워드만 있고 숫자가 없는' 경우가 많아 숫자 레인지가 없으면 스킵
-            if any(hint in probe_text for hint in PAYWALL_HINTS) and not has_numeric_range:
-                print("[EXPECTED_RANGE] skip: paywall/terminal-only and no numeric range")
-                continue
-
-            if not has_numeric_range:
-                print("[EXPECTED_RANGE] skip: no numeric range in article")
-                continue
-
-            # 후보 채택 (키워드 + 숫자 레인지 모두 존재)
-            article_url = url
-            article_soup = s
-            body_text = tmp_body
-            break
-        except Exception as e:
-            print(f"[EXPECTED_RANGE] probe error: {type(e).__name__} - {e}")
-            continue
+    max_probe = min(MAX_PROBE, len(candidates))
+    sem = asyncio.Semaphore(PROBE_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_probe_candidate(session, sem, idx, max_probe, url))
+        for idx, url in enumerate(candidates[:max_probe], start=1)
+    ]
+    try:
+        for url, task in zip(candidates[:max_probe], tasks):
+            probed = await task
+            if probed:
+                article_url = url
+                article_soup, body_text = probed
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
 
     if not article_url or not article_soup:
         raise ValueError("❌ 기사 링크를 찾았지만, 예상 레인지/범위 패턴이 있는 기사를 찾지 못했습니다.")
@@ -0,0 +1,270 @@
+# fetcher/quote_aggregator.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from statistics import median
+from typing import Callable, Optional
+
+import aiohttp
+
+from config import (
+    ACCESS_KEY, QUOTE_PROVIDERS, QUOTE_LATENCY_BUDGET, QUOTE_MIN_RESPONSES,
+    QUOTE_OUTLIER_PCT, QUOTE_MAX_STALENESS, QUOTE_PROVIDER_MAX_STALENESS
+)
+from fetcher.rate_fetcher import get_http_session
+
+LATENCY_EWMA_ALPHA = 0.2   # 공급자별 평균 지연 평활 계수
+
+
+@dataclass
+class QuoteProvider:
+    """
+    시세 공급자 정의
+    - parse: 응답 JSON → (USD/KRW 환율, 공급자 기준 시세 시각 epoch초 또는 None)
+    - max_staleness: 공급자별 시세 지연 허용치(초) - None 이면 집계기 기본값 사용
+      (일 1회 갱신 피드는 실시간 피드와 같은 기준이면 항상 제외되므로 따로 지정)
+    """
+    name: str
+    url: str
+    parse: Callable[[dict], tuple[Optional[float], Optional[float]]]
+    max_staleness: Optional[float] = None
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    failures: int = 0
+    latency_ewma: Optional[float] = None     # 초
+    last_latency: Optional[float] = None
+    last_staleness: Optional[float] = None   # 초 (응답 시세 시각 기준)
+    last_ok_at: Optional[float] = None       # epoch초
+
+
+@dataclass
+class Quote:
+    provider: str
+    rate: float
+    latency: float
+    staleness: Optional[float] = None
+
+
+@dataclass
+class ConsensusResult:
+    rate: Optional[float]
+    quotes: list[Quote] = field(default_factory=list)      # 채택된 시세
+    rejected: list[Quote] = field(default_factory=list)    # 이상치/오래된 시세
+    fallback: bool = False                                  # 합의 없이 가장 최신 시세 하나를 사용했는지
+
+
+def _parse_exchangerate_host(data: dict):
+    rate = (data.get("quotes") or {}).get("USDKRW")
+    return (float(rate) if rate is not None else None), data.get("timestamp")
+
+
+def _parse_open_er_api(data: dict):
+    rate = (data.get("rates") or {}).get("KRW")
+    return (float(rate) if rate is not None else None), data.get("time_last_update_unix")
+
+
+def _parse_frankfurter(data: dict):
+    rate = (data.get("rates") or {}).get("KRW")
+    ts = None
+    if data.get("date"):
+        ts = datetime.strptime(data["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+    return (float(rate) if rate is not None else None), ts
+
+
+def build_provider(name: str) -> QuoteProvider:
+    """설정 이름 → 공급자 객체 (필요한 API 키가 없으면 ValueError)"""
+    staleness = QUOTE_PROVIDER_MAX_STALENESS.get(name)
+    if name == "exchangerate_host":
+        if not ACCESS_KEY:
+            raise ValueError("ACCESS_KEY(EXCHANGERATE_API_KEY)가 설정되지 않았습니다.")
+        return QuoteProvider(
+            name, f"https://api.exchangerate.host/live?access_key={ACCESS_KEY}&currencies=KRW",
+            _parse_exchangerate_host, staleness,
+        )
+    if name == "open_er_api":
+        return QuoteProvider(name, "https://open.er-api.com/v6/latest/USD", _parse_open_er_api, staleness)
+    if name == "frankfurter":
+        return QuoteProvider(name, "https://api.frankfurter.app/latest?from=USD&to=KRW", _parse_frankfurter, staleness)
+    raise ValueError(f"알 수 없는 시세 공급자: {name}")
+
+
+class QuoteAggregator:
+    """
+    여러 시세 공급자에 동시에 요청해 합의 환율을 산출
+    - 지연 예산(latency_budget) 안에서 먼저 도착한 min_responses 개를 모으면 즉시 종료
+    - 너무 오래된 시세(공급자별 max_staleness) 및 중앙값 대비 outlier_pct 이상 벗어난 시세 제외
+      · 오래된 시세는 기준 안에 있으면서 그보다 최신인 다른 시세가 있을 때만 제외
+        (단독 공급자/모두 오래된 경우, 1시간 지난 실시간 시세 vs 20시간 지난 일 단위 시세 등은 그대로 후보)
+    - 남은 시세의 중앙값을 합의 환율로 사용 (1개만 오면 그 값으로 동작)
+    - 서로 outlier_pct 이상 벌어져 중앙값 근처에 남는 시세가 없으면(공급자 2곳 불일치 등)
+      가장 최신(같으면 응답이 빠른) 시세 하나로 동작 → 실시간 피드가 일 단위 피드보다 우선 (fallback=True)
+    """
+    def __init__(
+        self,
+        providers: list[QuoteProvider],
+        latency_budget: float = QUOTE_LATENCY_BUDGET,
+        min_responses: int = QUOTE_MIN_RESPONSES,
+        outlier_pct: float = QUOTE_OUTLIER_PCT,
+        max_staleness: float | None = QUOTE_MAX_STALENESS,
+    ):
+        if not providers:
+            raise ValueError("시세 공급자가 최소 1개 필요합니다.")
+        self.providers = providers
+        self.latency_budget = latency_budget
+        self.min_responses = max(1, min(min_responses, len(providers)))
+        self.outlier_pct = outlier_pct
+        self.max_staleness = max_staleness
+        self.stats: dict[str, ProviderStats] = {p.name: ProviderStats() for p in providers}
+        self._staleness = {
+            p.name: p.max_staleness if p.max_staleness is not None else max_staleness for p in providers
+        }
+
+    async def _fetch_one(self, provider: QuoteProvider) -> Optional[Quote]:
+        st = self.stats[provider.name]
+        st.requests += 1
+        started = time.monotonic()
+        try:
+            session = get_http_session()
+            async with session.get(
+                provider.url, timeout=aiohttp.ClientTimeout(total=self.latency_budget)
+            ) as res:
+                res.raise_for_status()
+                data = await res.json(content_type=None)
+            rate, quoted_at = provider.parse(data)
+        except Exception as e:
+            st.failures += 1
+            print(f"❌ 시세 조회 실패 ({provider.name}): {type(e).__name__} {e}")
+            return None
+
+        latency = time.monotonic() - started
+        st.last_latency = latency
+        st.latency_ewma = latency if st.latency_ewma is None else (
+            LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * st.latency_ewma
+        )
+        if rate is None:
+            st.failures += 1
+            print(f"⚠️ 응답에 USDKRW 정보 없음 ({provider.name})")
+            return None
+
+        staleness = max(0.0, time.time() - float(quoted_at)) if quoted_at else None
+        st.last_staleness = staleness
+        st.last_ok_at = time.time()
+        return Quote(provider.name, rate, latency, staleness)
+
+    async def fetch(self) -> ConsensusResult:
+        tasks = {asyncio.create_task(self._fetch_one(p)) for p in self.providers}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.latency_budget
+        quotes: list[Quote] = []
+        pending = tasks
+        try:
+            while pending and len(quotes) < self.min_responses:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for t in done:
+                    q = t.result()
+                    if q is not None:
+                        quotes.append(q)
+        finally:
+            for t in pending:
+                t.cancel()
+        return self.consensus(quotes)
+
+    @staticmethod
+    def _freshness(q: Quote):
+        """최신 시세 우선 (시세 시각을 모르면 뒤로), 같으면 응답이 빠른 쪽"""
+        return (q.staleness is None, q.staleness or 0.0, q.latency)
+
+    def consensus(self, quotes: list[Quote]) -> ConsensusResult:
+        if not quotes:
+            return ConsensusResult(None)
+        fresh, stale = [], []
+        for q in quotes:
+            limit = self._staleness.get(q.provider, self.max_staleness)
+            if limit is not None and q.staleness is not None and q.staleness > limit:
+                stale.append(q)
+            else:
+                fresh.append(q)
+
+        candidates, rejected = list(fresh), []
+        for q in stale:
+            if any(f.staleness is not None and f.staleness < q.staleness for f in fresh):
+                rejected.append(q)
+            else:
+                # 예) 시간 단위로 갱신되는 요금제의 exchangerate_host 단독 → 기준보다 오래됐어도 가장 최신 시세
+                candidates.append(q)
+
+        mid = median(q.rate for q in candidates)
+        accepted = []
+        for q in candidates:
+            if abs(q.rate - mid) / mid > self.outlier_pct:
+                rejected.append(q)
+            else:
+                accepted.append(q)
+        if not accepted:
+            # 예) 공급자 2곳이 1380 / 1390 → 둘 다 중앙값에서 0.36% → 다수결 불가, 가장 최신 시세 사용
+            best = min(candidates, key=self._freshness)
+            return ConsensusResult(best.rate, [best], [q for q in quotes if q is not best], fallback=True)
+        return ConsensusResult(median(q.rate for q in accepted), accepted, rejected)
+
+    def report(self) -> str:
+        """공급자별 요청/실패/지연/시세 지연 요약 (로그용)"""
+        parts = []
+        for name, st in self.stats.items():
+            lat = f"{st.latency_ewma * 1000:.0f}ms" if st.latency_ewma is not None else "-"
+            stale = f"{st.last_staleness:.0f}s" if st.last_staleness is not None else "-"
+            parts.append(f"{name}(req={st.requests}, fail={st.failures}, lat={lat}, stale={stale})")
+        return ", ".join(parts)
+
+
+_default_aggregator: QuoteAggregator | None = None
+
+
+def get_default_aggregator() -> QuoteAggregator:
+    global _default_aggregator
+    if _default_aggregator is None:
+        providers = []
+        for name in QUOTE_PROVIDERS:
+            try:
+                providers.append(build_provider(name))
+            except ValueError as e:
+                print(f"⚠️ 시세 공급자 제외 ({name}): {e}")
+        _default_aggregator = QuoteAggregator(providers)
+    return _default_aggregator
+
+
+async def get_consensus_rate(retries=3, delay=2):
+    """
+    설정된 공급자들의 합의 환율 조회: 아무도 응답하지 않으면 최대 `retries`만큼 재시도
+    - 합의가 안 되면(불일치/모두 오래됨) 가장 최신 시세로 동작 (QuoteAggregator.consensus)
+    :return: 환율 (float) 또는 None (get_usdkrw_rate 와 동일한 규약)
+    """
+    agg = get_default_aggregator()
+    for attempt in range(1, retries + 1):
+        result = await agg.fetch()
+        if result.rate is not None:
+            break
+        if result.rejected:
+            dropped = ", ".join(f"{q.provider}={q.rate:.2f}" for q in result.rejected)
+            print(f"⚠️ 합의 가능한 시세 없음 (제외: {dropped})")
+        if attempt < retries:
+            wait = delay * 2 ** (attempt - 1)
+            print(f"⏳ 합의 환율 산출 실패 (시도 {attempt}), {wait}초 후 재시도...")
+            await asyncio.sleep(wait)
+    else:
+        print(f"🚫 합의 환율 산출 실패 - {agg.report()}")
+        return None
+    if len(agg.providers) > 1:
+        used = ", ".join(f"{q.provider}={q.rate:.2f}" for q in result.quotes)
+        dropped = ", ".join(f"{q.provider}={q.rate:.2f}" for q in result.rejected)
+        head = "⚠️ 합의 불가 → 최신 시세 사용" if result.fallback else "📡 합의 환율"
+        print(f"{head} {result.rate:.2f} (채택: {used}{f' / 제외: {dropped}' if dropped else ''})")
+    return result.rate
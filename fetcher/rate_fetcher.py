@@ -1,14 +1,39 @@
-import time
-import requests
+import asyncio
+import aiohttp
 
 from config import ACCESS_KEY
 
+# 프로세스 공용 keep-alive 세션 (첫 호출 시 현재 이벤트 루프에서 생성)
+_session: aiohttp.ClientSession | None = None
 
-def get_usdkrw_rate(retries=3, delay=2):
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    커넥션 풀을 재사용하는 공용 aiohttp 세션 반환
+    - 닫혀 있으면 새로 생성
     """
-    환율 API 호출: 실패 시 최대 `retries`만큼 재시도
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=300, ttl_dns_cache=300),
+        )
+    return _session
+
+
+async def close_http_session():
+    """공용 세션 종료 (워처 종료 시 호출)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def get_usdkrw_rate(retries=3, delay=2, timeout=10):
+    """
+    환율 API 호출: 실패 시 최대 `retries`만큼 재시도 (이벤트 루프를 막지 않음)
     :param retries: 최대 재시도 횟수
-    :param delay: 실패 후 대기 시간 (초)
+    :param delay: 첫 실패 후 대기 시간 (초), 이후 시도마다 2배씩 증가
+    :param timeout: 시도당 타임아웃 (초)
     :return: 환율 (float) 또는 None
     """
     if not ACCESS_KEY:
@@ -16,25 +41,28 @@ def get_usdkrw_rate(retries=3, delay=2):
         return None
 
     url = f"https://api.exchangerate.host/live?access_key={ACCESS_KEY}&currencies=KRW"
+    session = get_http_session()
 
     for attempt in range(1, retries + 1):
         try:
-            res = requests.get(url, timeout=10)
-            res.raise_for_status()
-            data = res.json()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as res:
+                res.raise_for_status()
+                data = await res.json(content_type=None)
             rate = data.get("quotes", {}).get("USDKRW")
             if rate is not None:
                 return float(rate)
             else:
                 print(f"⚠️ 응답에 USDKRW 정보 없음 (시도 {attempt})")
+        except asyncio.TimeoutError:
+            print(f"❌ API 호출 타임아웃 (시도 {attempt}, {timeout}초)")
         except Exception as e:
+            # CancelledError 는 Exception 이 아니므로 취소는 그대로 전파됨
             print(f"❌ API 호출 오류 (시도 {attempt}): {e}")
 
         if attempt < retries:
-            print(f"⏳ {delay}초 후 재시도...")
-            time.sleep(delay)
+            wait = delay * 2 ** (attempt - 1)
+            print(f"⏳ {wait}초 후 재시도...")
+            await asyncio.sleep(wait)
 
     print("🚫 모든 시도 실패 - 환율 조회 불가")
     return None
-
-
@@ -1,4 +1,8 @@
 # 텔레그램 알림 모듈
-from .telegram import send_telegram, send_start_message, send_photo
+from .telegram import send_telegram, send_start_message, send_photo, CAPTION_LIMIT
+from .dispatcher import TokenBucket, FanoutDispatcher, DeliveryReport, get_dispatcher
 
-__all__ = ["send_telegram", "send_start_message", "send_photo"]
\ No newline at end of file
+__all__ = [
+    "send_telegram", "send_start_message", "send_photo", "CAPTION_LIMIT",
+    "TokenBucket", "FanoutDispatcher", "DeliveryReport", "get_dispatcher",
+]
\ No newline at end of file
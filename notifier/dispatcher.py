@@ -0,0 +1,187 @@
+# notifier/dispatcher.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+import httpx
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut, NetworkError
+
+from config import (
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_PER_CHAT_RATE, TELEGRAM_MAX_CONCURRENCY, TELEGRAM_MAX_RETRIES
+)
+
+
+class TokenBucket:
+    """
+    토큰 버킷 레이트 리미터
+    - 초당 rate 개씩 토큰이 차오르고 최대 capacity 개까지 모아둘 수 있음
+    - acquire() 는 토큰이 생길 때까지 비동기로 대기
+    """
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # 대기 순서를 보장하기 위해 락을 잡은 채로 기다림 (FIFO)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        """RetryAfter 수신 시: seconds 동안 토큰이 차오르지 않도록 비움"""
+        self._tokens = 0.0
+        self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+@dataclass
+class DeliveryReport:
+    """1회 팬아웃 전송 결과"""
+    sent: int = 0
+    failed: dict[str, str] = field(default_factory=dict)      # chat_id → 오류
+    latencies: dict[str, float] = field(default_factory=dict) # chat_id → 요청~전송 완료(초)
+    retries: int = 0
+    uncertain: int = 0   # 응답 시간 초과로 전달 여부를 알 수 없는 건 (failed 에도 포함)
+    elapsed: float = 0.0
+
+    def merge(self, other: "DeliveryReport"):
+        """여러 단계로 나눠 보낸 결과를 하나로 합침"""
+        self.sent += other.sent
+        self.failed.update(other.failed)
+        self.latencies.update(other.latencies)
+        self.retries += other.retries
+        self.uncertain += other.uncertain
+        self.elapsed += other.elapsed
+
+    def summary(self) -> str:
+        lat = sorted(self.latencies.values())
+        if lat:
+            p50 = lat[len(lat) // 2]
+            p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+            lat_txt = f"p50={p50 * 1000:.0f}ms, p95={p95 * 1000:.0f}ms, max={lat[-1] * 1000:.0f}ms"
+        else:
+            lat_txt = "-"
+        uncertain = f" (전달 여부 불명 {self.uncertain})" if self.uncertain else ""
+        return (
+            f"성공 {self.sent} / 실패 {len(self.failed)}{uncertain} / 재시도 {self.retries} "
+            f"({self.elapsed:.2f}s, {lat_txt})"
+        )
+
+
+def _retry_seconds(e: RetryAfter) -> float:
+    ra = e.retry_after
+    return ra.total_seconds() if isinstance(ra, timedelta) else float(ra)
+
+
+def _never_sent(e: Exception) -> bool:
+    """커넥션 풀 대기/연결 단계에서 실패 → 요청이 서버에 닿지 않았으므로 재시도해도 중복 전송 없음"""
+    return isinstance(e.__cause__, (httpx.PoolTimeout, httpx.ConnectTimeout, httpx.ConnectError))
+
+
+class FanoutDispatcher:
+    """
+    여러 채팅방에 동시에 전송하는 팬아웃 디스패처
+    - 전역 버킷(봇 전체 초당 한도) + 채팅방별 버킷(채팅방당 초당 한도) 동시 적용
+    - RetryAfter 는 해당 시간만큼 버킷을 비운 뒤 자동 재시도, 네트워크 일시 오류도 재시도
+    - BadRequest/Forbidden(잘못된 chat_id, 차단, 형식 오류)은 재시도하지 않음
+    - 응답 대기 중 TimedOut 은 이미 전달됐을 수 있어 재시도하지 않고 "전달 여부 불명" 으로 실패 처리
+      (풀 대기/연결 단계 타임아웃은 요청이 나가지 않았으므로 재시도)
+    - 그 밖의 NetworkError 는 재시도: 응답 수신 중 연결이 끊긴 경우에는 드물게 중복 전송될 수 있음
+    - 채팅방별 전송 지연(요청 시작~완료)을 DeliveryReport 로 반환
+    """
+    def __init__(
+        self,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        per_chat_rate: float = TELEGRAM_PER_CHAT_RATE,
+        max_concurrency: int = TELEGRAM_MAX_CONCURRENCY,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate, capacity=1.0)
+        return bucket
+
+    async def _deliver(self, chat_id: str, send: Callable[[str], Awaitable], report: DeliveryReport):
+        started = time.monotonic()
+        chat_bucket = self._chat_bucket(chat_id)
+        for attempt in range(self.max_retries + 1):
+            # 채팅방 한도 → 전역 한도 순으로 토큰 확보 (전역 토큰을 오래 쥐고 있지 않도록)
+            await chat_bucket.acquire()
+            await self.global_bucket.acquire()
+            try:
+                async with self._sem:
+                    await send(chat_id)
+                report.sent += 1
+                report.latencies[chat_id] = time.monotonic() - started
+                return
+            except RetryAfter as e:
+                wait = _retry_seconds(e)
+                # 전역 flood 제한인지 채팅방 제한인지 구분되지 않으므로 둘 다 쉬게 함
+                chat_bucket.penalize(wait)
+                self.global_bucket.penalize(wait)
+                error = e
+            except (BadRequest, Forbidden) as e:
+                # 차단/잘못된 chat_id 등은 재시도해도 소용 없음 (BadRequest 는 NetworkError 하위라 먼저 처리)
+                report.failed[chat_id] = str(e)
+                print(f"❌ 전송 실패 ({chat_id}):", e)
+                return
+            except TimedOut as e:
+                if not _never_sent(e):
+                    # 서버가 이미 처리했을 수 있음 → 재시도하면 중복 전송 위험
+                    report.failed[chat_id] = f"응답 시간 초과 (전달 여부 불명): {e}"
+                    report.uncertain += 1
+                    print(f"⚠️ 전송 응답 시간 초과 ({chat_id}, 전달 여부 불명, 재시도 안 함):", e)
+                    return
+                error = e
+            except NetworkError as e:
+                error = e
+            except Exception as e:
+                report.failed[chat_id] = str(e)
+                print(f"❌ 전송 실패 ({chat_id}):", e)
+                return
+            if attempt < self.max_retries:
+                report.retries += 1
+        report.failed[chat_id] = str(error)
+        print(f"❌ 전송 실패 ({chat_id}, 재시도 {self.max_retries}회 초과):", error)
+
+    async def broadcast(self, chat_ids: list[str], send: Callable[[str], Awaitable]) -> DeliveryReport:
+        """
+        chat_ids 각각에 send(chat_id) 를 동시에 수행
+        :param send: chat_id 를 받아 실제 전송을 수행하는 코루틴 함수
+        """
+        report = DeliveryReport()
+        started = time.monotonic()
+        await asyncio.gather(*(self._deliver(cid, send, report) for cid in chat_ids))
+        report.elapsed = time.monotonic() - started
+        return report
+
+
+_dispatcher: FanoutDispatcher | None = None
+
+
+def get_dispatcher() -> FanoutDispatcher:
+    """프로세스 공용 디스패처 (채팅방별 버킷 상태를 전송 간에 유지)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = FanoutDispatcher()
+    return _dispatcher
@@ -3,10 +3,36 @@ import os
 import pytz
 from datetime import datetime
 from telegram import Bot
-from config import TELEGRAM_TOKEN, CHAT_IDS, CHECK_INTERVAL
+from telegram.request import HTTPXRequest
+from config import TELEGRAM_TOKEN, TELEGRAM_BASE_URL, TELEGRAM_MAX_CONCURRENCY, CHAT_IDS, CHECK_INTERVAL
+from notifier.dispatcher import DeliveryReport, get_dispatcher
 from utils import is_sleep_time
 
-bot = Bot(token=TELEGRAM_TOKEN)
+bot: Bot | None = None
+
+
+def get_bot() -> Bot:
+    """
+    공용 Bot 인스턴스 (첫 전송 시 생성 → 토큰 없이도 모듈 import 가능, 예: 리플레이)
+    - 동시 전송을 위해 커넥션 풀을 동시 전송 수만큼 확보 (기본값 1이면 요청이 직렬화됨)
+    """
+    global bot
+    if bot is None:
+        bot = Bot(
+            token=TELEGRAM_TOKEN,
+            base_url=TELEGRAM_BASE_URL,
+            request=HTTPXRequest(connection_pool_size=TELEGRAM_MAX_CONCURRENCY, pool_timeout=30.0),
+        )
+    return bot
+
+
+CAPTION_LIMIT = 1024   # 텔레그램 사진 캡션 최대 길이
+
+
+def _recipients(target_chat_ids: list[str] | None) -> list[str]:
+    """수신 대상 chat_id 목록 (공백/빈 값 제거, 중복 제거)"""
+    ids = target_chat_ids if target_chat_ids else CHAT_IDS
+    return list(dict.fromkeys(cid.strip() for cid in ids if cid and cid.strip()))
 
 async def send_start_message():
     if is_sleep_time():
@@ -34,13 +60,15 @@ async def send_telegram(message: str, target_chat_ids: list[str] | None = None):
     if is_sleep_time():
         return
 
-    recipients = target_chat_ids if target_chat_ids else CHAT_IDS
+    recipients = _recipients(target_chat_ids)
+
+    async def _send(cid: str):
+        await get_bot().send_message(chat_id=cid, text=message, parse_mode="Markdown")
 
-    for cid in recipients:
-        try:
-            await bot.send_message(chat_id=cid.strip(), text=message, parse_mode="Markdown")
-        except Exception as e:
-            print(f"❌ 전송 실패 ({cid}):", e)
+    report = await get_dispatcher().broadcast(recipients, _send)
+    if len(recipients) > 1 or report.failed:
+        print(f"📨 텍스트 전송: {report.summary()}")
+    return report
 
 # ✅ 이미지 전송용 함수
 async def send_photo(photo_buf, caption: str | None = None, target_chat_ids: list[str] | None = None):
@@ -48,11 +76,12 @@ async def send_photo(photo_buf, caption: str | None = None, target_chat_ids: lis
     이미지 전송용 (알림 제한 시간 적용)
     :param photo_buf: BytesIO 객체 (예: matplotlib로 생성)
     :param caption: 선택적으로 짧은 설명 첨부 가능 (1024자 제한)
+    - 첫 수신자에게만 업로드하고, 나머지는 반환된 file_id 로 전송
     """
     if is_sleep_time():
         return
 
-    recipients = target_chat_ids if target_chat_ids else CHAT_IDS
+    recipients = _recipients(target_chat_ids)
 
     # ✅ 버퍼 비어 있는 경우 체크
     size = photo_buf.getbuffer().nbytes
@@ -60,16 +89,32 @@ async def send_photo(photo_buf, caption: str | None = None, target_chat_ids: lis
         print("❌ 전송 취소: 버퍼가 비어 있음")
         return
 
-    # ✅ 항상 시작 위치로 이동
-    photo_buf.seek(0)
-
-    for cid in recipients:
-        try:
-            await bot.send_photo(
-                chat_id=cid.strip(),
-                photo=photo_buf,
-                caption=caption if caption else None,
-                parse_mode="Markdown"
-            )
-        except Exception as e:
-            print(f"❌ 사진 전송 실패 ({cid}):", e)
+    # ✅ 업로드가 재시도돼도 처음부터 읽히도록 bytes 로 복사
+    photo_bytes = photo_buf.getvalue()
+    file_id: str | None = None
+
+    async def _send(cid: str):
+        nonlocal file_id
+        sent = await get_bot().send_photo(
+            chat_id=cid,
+            photo=file_id or photo_bytes,
+            caption=caption if caption else None,
+            parse_mode="Markdown"
+        )
+        if file_id is None and sent.photo:
+            # 가장 큰 해상도의 file_id 를 받아 이후 수신자에게 재사용
+            file_id = sent.photo[-1].file_id
+
+    # ✅ 1) 업로드는 한 번만: 성공할 때까지 수신자 한 명씩 업로드
+    dispatcher = get_dispatcher()
+    report = DeliveryReport()
+    remaining = list(recipients)
+    while remaining and file_id is None:
+        report.merge(await dispatcher.broadcast([remaining.pop(0)], _send))
+
+    # ✅ 2) 나머지 수신자에게는 file_id 로 동시 전송 (재업로드 없음)
+    if remaining:
+        report.merge(await dispatcher.broadcast(remaining, _send))
+    if len(recipients) > 1 or report.failed:
+        print(f"🖼️ 사진 전송: {report.summary()}")
+    return report
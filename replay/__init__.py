@@ -0,0 +1,10 @@
+# 과거 틱 리플레이/백테스트 엔진
+from .engine import replay, reset_strategy_state, ReplayResult
+from .sinks import MemoryRepository, AlertSink
+from .sources import iter_csv_ticks, iter_parquet_ticks, iter_file_ticks, iter_db_ticks, load_expected_ranges_csv
+
+__all__ = [
+    "replay", "reset_strategy_state", "ReplayResult",
+    "MemoryRepository", "AlertSink",
+    "iter_csv_ticks", "iter_parquet_ticks", "iter_file_ticks", "iter_db_ticks", "load_expected_ranges_csv",
+]
@@ -0,0 +1,70 @@
+# replay/__main__.py
+"""
+과거 틱 리플레이 실행기
+
+예)
+  python -m replay ticks.csv --expected-ranges ranges.csv --out alerts.jsonl
+  python -m replay ticks.parquet --out alerts.jsonl
+  python -m replay --db --start 2025-09-01 --end 2025-09-08 --out alerts.jsonl
+
+두 실행 결과의 alerts.jsonl 을 diff 하면 전략 변경에 따른 알림 차이를 바로 확인할 수 있음.
+"""
+import argparse
+import asyncio
+from contextlib import aclosing
+from datetime import datetime
+
+from config import LONG_TERM_PERIOD
+from replay.engine import replay
+from replay.sources import iter_db_ticks, iter_file_ticks, load_expected_ranges_csv, _as_kst
+
+
+async def _replay_db(start: datetime, end: datetime, expected_ranges: dict, **kwargs):
+    """rates 를 서버 측 커서로 흘려 보내며 재생 (수개월 구간도 틱 목록을 메모리에 올리지 않음)"""
+    from db.connection import init_db_pool, close_db_pool
+    from db.repository import get_expected_ranges
+
+    pool = await init_db_pool()
+    try:
+        async with pool.acquire() as conn:
+            db_ranges = await get_expected_ranges(conn, start.date(), end.date())
+            ticks = iter_db_ticks(conn, start, end)
+            async with aclosing(ticks):
+                return await replay(ticks, {**db_ranges, **expected_ranges}, **kwargs)
+    finally:
+        await close_db_pool(pool)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="USD/KRW 워처 리플레이")
+    parser.add_argument("source", nargs="?", help="틱 파일 (CSV/Parquet, 컬럼: timestamp, rate)")
+    parser.add_argument("--db", action="store_true", help="rates 테이블에서 읽기 (--start/--end 필요)")
+    parser.add_argument("--start", help="시작 시각 (ISO, KST)")
+    parser.add_argument("--end", help="종료 시각 (ISO, KST, 미포함)")
+    parser.add_argument("--expected-ranges", help="예상 범위 CSV (date, low, high[, source])")
+    parser.add_argument("--out", help="알림 JSONL 출력 경로")
+    parser.add_argument("--warmup", type=int, default=LONG_TERM_PERIOD, help="분석 없이 이력만 쌓을 선행 틱 수")
+    parser.add_argument("--verbose", action="store_true", help="전략 모듈 로그 출력")
+    args = parser.parse_args()
+
+    expected_ranges = load_expected_ranges_csv(args.expected_ranges) if args.expected_ranges else {}
+    if args.db:
+        if not (args.start and args.end):
+            parser.error("--db 사용 시 --start/--end 가 필요합니다.")
+        start, end = _as_kst(args.start), _as_kst(args.end)
+        # 워밍업 구간만큼 앞에서부터 읽지는 않음 → 필요하면 --start 를 앞당길 것
+        result, sink = await _replay_db(start, end, expected_ranges, warmup=args.warmup, quiet=not args.verbose)
+    elif args.source:
+        ticks = iter_file_ticks(args.source)
+        result, sink = await replay(ticks, expected_ranges, warmup=args.warmup, quiet=not args.verbose)
+    else:
+        parser.error("틱 파일 경로 또는 --db 를 지정하세요.")
+
+    print(result.summary())
+    if args.out:
+        sink.dump_jsonl(args.out)
+        print(f"📝 알림 {len(sink.alerts)}건 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
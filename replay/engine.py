@@ -0,0 +1,147 @@
+# replay/engine.py
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterable, Iterable
+
+from config import LONG_TERM_PERIOD, MOVING_AVERAGE_PERIOD
+from replay.sinks import AlertSink, MemoryRepository, installed
+from utils.time import set_clock
+
+
+@dataclass
+class ReplayResult:
+    ticks: int
+    alerts: int
+    elapsed: float
+    first_ts: datetime | None = None
+    last_ts: datetime | None = None
+    indicator_hits: int = 0
+    indicator_misses: int = 0
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        span = f"{self.first_ts} ~ {self.last_ts}" if self.first_ts else "-"
+        lookups = self.indicator_hits + self.indicator_misses
+        return (
+            f"🔁 리플레이 완료: 틱 {self.ticks:,}건 / 알림 {self.alerts:,}건 / "
+            f"{self.elapsed:.2f}s ({self.ticks_per_sec:,.0f} ticks/sec) [{span}]\n"
+            f"🧠 지표 메모: 조회 {lookups:,}회 / 캐시 적중 {self.indicator_hits:,}회"
+        )
+
+
+class _VirtualClock:
+    """now_kst() 대체용: 현재 재생 중인 틱 시각을 반환"""
+    def __init__(self):
+        self.now: datetime | None = None
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def reset_strategy_state():
+    """
+    전략/판단 모듈의 모듈 전역 상태(쿨다운, 확정 카운터, 밴드폭 이력 등) 초기화
+    - 같은 프로세스에서 리플레이를 여러 번 돌릴 때 실행 간 간섭 방지
+    """
+    import decision
+    from strategies import bollinger, crossover, expected_range, jump, trend_events
+
+    decision._last_action = None
+    decision._last_action_time = None
+    decision._prev_ai_action = None
+    decision._prev_same_count = 0
+
+    bollinger.reset_band_width_history()
+
+    crossover._confirm_counts.update({"golden": 0, "dead": 0})
+    crossover.last_report_time.update({"golden": None, "dead": None})
+
+    expected_range.was_below_expected = False
+    expected_range.was_above_expected = False
+    expected_range.last_expected_alert_time = None
+    expected_range.below_start_time = None
+    expected_range.above_start_time = None
+
+    jump._last_jump_time = None
+
+    trend_events._last_trend_event_time = None
+    trend_events._last_trend_event_type = None
+
+
+async def _iter_ticks(ticks):
+    if hasattr(ticks, "__aiter__"):
+        async for tick in ticks:
+            yield tick
+    else:
+        for tick in ticks:
+            yield tick
+
+
+async def replay(
+    ticks: Iterable[tuple[datetime, float]] | AsyncIterable[tuple[datetime, float]],
+    expected_ranges: dict | None = None,
+    warmup: int = LONG_TERM_PERIOD,
+    sink: AlertSink | None = None,
+    quiet: bool = True,
+    state=None,
+) -> tuple[ReplayResult, AlertSink]:
+    """
+    과거 틱을 실시간 워처와 동일한 파이프라인(process_tick)으로 재생
+    - 가상 시계: 각 틱의 시각을 now_kst() 로 사용
+    - DB 함수는 MemoryRepository, 텔레그램은 AlertSink 로 대체
+    - 처음 warmup 틱은 워처 시작 시 시드처럼 이력만 쌓고 분석하지 않음
+    - ticks 는 일반/비동기 이터러블 모두 가능 (DB 스트리밍 조회를 그대로 넘길 수 있음)
+    :param quiet: 전략 모듈의 print 출력 억제 (처리량 측정 시 권장)
+    :param state: 미리 구성한 WatcherState (스윕: replay.precomputed 의 사전 계산 통계/틱 버퍼), 없으면 새로 생성
+    """
+    from run_watcher import WatcherState, process_tick
+
+    repo = MemoryRepository(expected_ranges)
+    sink = sink or AlertSink()
+    state = state or WatcherState()
+    state.ticks.seed([], complete=True)   # 재생 구간은 버퍼가 전부 보장 → DB 조회 없음
+    clock = _VirtualClock()
+
+    reset_strategy_state()
+    set_clock(clock)
+    count = 0
+    first_ts = last_ts = None
+    devnull = open(os.devnull, "w") if quiet else None
+    started = time.perf_counter()
+    try:
+        with installed(repo), redirect_stdout(devnull or sys.stdout):
+            async for ts, rate in _iter_ticks(ticks):
+                clock.now = ts
+                if count < warmup:
+                    stored_at = await repo.store_rate(None, rate)
+                    state.ticks.append(stored_at, rate)
+                    state.stats.push(rate)
+                    await repo.update_bollinger_history(
+                        None, stored_at, rate,
+                        state.stats.mean(MOVING_AVERAGE_PERIOD), state.stats.stdev(MOVING_AVERAGE_PERIOD)
+                    )
+                    state.prev_rate = rate
+                else:
+                    await process_tick(None, state, rate, ts, send=sink.send)
+                count += 1
+                first_ts = first_ts or ts
+                last_ts = ts
+    finally:
+        elapsed = time.perf_counter() - started
+        set_clock(None)
+        if devnull is not None:
+            devnull.close()
+
+    result = ReplayResult(
+        count, len(sink.alerts), elapsed, first_ts, last_ts,
+        indicator_hits=sum(state.indicator_hits.values()),
+        indicator_misses=sum(state.indicator_misses.values()),
+    )
+    return result, sink
@@ -0,0 +1,139 @@
+# replay/precomputed.py
+"""
+스윕용 사전 계산: 파라미터 조합과 무관한 틱별 값을 한 번만 계산해 모든 조합이 재사용
+
+- 틱 시각(datetime): 조합마다 epoch → KST 변환을 반복하지 않도록 한 번만 생성
+- 이동 평균/표준편차: 스윕 그리드에 나오는 기간마다 전 구간 배열을 한 번 계산
+  (워처와 같은 RollingStats 로 채움 - batch 커널은 마지막 자리 반올림이 달라 알림 문구의 소수 둘째 자리가 바뀔 수 있음)
+- ATR(14): 캔들 집계(BAR_INTERVALS 는 스윕 대상 아님)와 틱 종가에만 의존 → 워처와 같은 경로로 한 번 계산
+- 전략 상태 머신(쿨다운/연속 이탈/확정 카운터 등)은 조합마다 다르므로 process_tick 그대로 실행
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from strategies.utils.rolling import RollingStats
+from utils.tick_buffer import TickBuffer, _EPOCH, _from_us
+from utils.time import TIMEZONE
+
+ATR_PERIOD = 14
+
+
+def tick_times(ts_us) -> list[datetime]:
+    """epoch 마이크로초 배열 → KST datetime 목록 (TickBuffer._from_us 와 같은 값)"""
+    return [(_EPOCH + timedelta(microseconds=us)).astimezone(TIMEZONE) for us in ts_us]
+
+
+def rolling_arrays(prices, periods) -> dict[str, np.ndarray]:
+    """기간별 {"mean:{p}": 이동 평균, "std:{p}": 표본표준편차} (윈도가 차기 전은 NaN)"""
+    periods = sorted(set(periods))
+    stats = RollingStats(periods)
+    out = {}
+    for p in periods:
+        out[f"mean:{p}"] = np.full(len(prices), np.nan)
+        out[f"std:{p}"] = np.full(len(prices), np.nan)
+    for i, x in enumerate(prices):
+        stats.push(x)
+        for p in periods:
+            if stats.ready(p):
+                out[f"mean:{p}"][i] = stats.mean(p)
+                out[f"std:{p}"][i] = stats.stdev(p)
+    return out
+
+
+def atr_array(times: list[datetime], prices, bar_intervals, bar_history: int, atr_bar_interval: int) -> np.ndarray:
+    """
+    틱마다 process_tick 이 구하는 IndicatorContext.atr(14) 값
+    - 캔들 고저가 TR 기준, 캔들이 모자라면 최근 틱 종가 차분 (ATR_PERIOD+1 개면 충분)
+    """
+    from strategies.utils.indicator_context import IndicatorContext
+    from utils.bars import BarBuilder
+
+    bars = BarBuilder(bar_intervals, history=bar_history)
+    ticks = TickBuffer(capacity=ATR_PERIOD + 1)
+    out = np.full(len(prices), np.nan)
+    for i, (ts, rate) in enumerate(zip(times, prices)):
+        ticks.append(ts, rate)
+        bars.update(ts, rate)
+        value = IndicatorContext(ticks.last(ATR_PERIOD + 1), None, bars, atr_bar_interval).atr(ATR_PERIOD)
+        if value is not None:
+            out[i] = value
+    return out
+
+
+class PrecomputedStats:
+    """
+    RollingStats 와 같은 조회 인터페이스 - 값은 미리 계산한 배열에서 현재 커서(푸시한 틱 수) 위치로 읽음
+    - push 는 커서만 옮김 (가격이 배열과 다르면 정렬이 어긋난 것이므로 ValueError)
+    - windows 는 이번 조합이 쓰는 기간만 노출 (나머지는 RollingStats 처럼 KeyError / IndicatorContext 직접 계산)
+    - atr(period) 는 atr_periods 에 든 기간만 제공
+    """
+    def __init__(self, prices, arrays: dict, periods, atr=None):
+        self._prices = prices
+        self.windows = {p: None for p in periods}
+        self._mean = {p: arrays[f"mean:{p}"] for p in self.windows}
+        self._std = {p: arrays[f"std:{p}"] for p in self.windows}
+        self._atr = atr
+        self.atr_periods = (ATR_PERIOD,) if atr is not None else ()
+        self.last: float | None = None
+        self.count = 0
+
+    def push(self, x: float):
+        x = float(x)
+        if self._prices[self.count] != x:
+            raise ValueError(f"사전 계산 배열과 틱 순서 불일치 (index {self.count}: {self._prices[self.count]} != {x})")
+        self.last = x
+        self.count += 1
+
+    def seed(self, series):
+        for x in series:
+            self.push(x)
+
+    def _at(self, table: dict, period: int) -> float | None:
+        values = table.get(period)
+        if values is None:
+            raise KeyError(f"등록되지 않은 기간: {period}")
+        if not self.count:
+            return None
+        v = values[self.count - 1]
+        return None if v != v else v
+
+    def ready(self, period: int) -> bool:
+        return period in self.windows and self.count >= period
+
+    def mean(self, period: int) -> float | None:
+        return self._at(self._mean, period)
+
+    sma = mean
+
+    def stdev(self, period: int) -> float | None:
+        return self._at(self._std, period)
+
+    def variance(self, period: int) -> float | None:
+        s = self.stdev(period)
+        return None if s is None else s * s
+
+    def zscore(self, period: int) -> float | None:
+        m, s = self.mean(period), self.stdev(period)
+        if m is None:
+            return None
+        if not s:
+            return 0.0
+        return (self.last - m) / s
+
+    def atr(self, period: int) -> float | None:
+        if period not in self.atr_periods:
+            raise KeyError(f"사전 계산하지 않은 ATR 기간: {period}")
+        v = self._atr[self.count - 1] if self.count else float("nan")
+        return None if v != v else v
+
+
+class ReplayTickBuffer(TickBuffer):
+    """조회 결과의 시각을 미리 만든 datetime 으로 돌려주는 TickBuffer (epoch → KST 변환 생략)"""
+    def __init__(self, times: dict[int, datetime], capacity: int = 1024):
+        super().__init__(capacity)
+        self._times = times
+
+    def _rows(self, lo: int, hi: int) -> list[tuple[datetime, float]]:
+        times, ts, px = self._times, self._ts, self._px
+        return [(times.get(ts[i]) or _from_us(ts[i]), px[i]) for i in range(lo, hi)]
@@ -0,0 +1,124 @@
+# replay/sinks.py
+import json
+from contextlib import contextmanager
+from datetime import datetime
+
+from config import MOVING_AVERAGE_PERIOD
+from db.breakout_index import RESOLVE_WINDOW, BandOutcomeTracker, BreakoutOutcomeIndex
+from utils.time import now_kst
+
+
+class MemoryRepository:
+    """
+    db.repository 의 리플레이용 인메모리 대체
+    - 워처가 틱마다 호출하는 함수만 같은 시그니처로 구현 (conn 인자는 무시)
+    - 저장 시각은 가상 시계(now_kst) 기준
+    - 볼린저 확률은 BreakoutOutcomeIndex / BandOutcomeTracker 로 계산 (실시간과 같은 코드, 밴드는 WatcherState 이동 통계)
+    """
+    def __init__(self, expected_ranges: dict | None = None, period: int | None = None):
+        self.period = period if period is not None else MOVING_AVERAGE_PERIOD
+        self.expected_ranges = expected_ranges or {}
+        self.index = BreakoutOutcomeIndex(self.period)
+        self.index.warm = True
+        # 30분 판정 대기 행 (실시간 워처와 같은 추적기)
+        self.tracker = BandOutcomeTracker(self.index)
+        self.breakouts: list[dict] = []
+        # 판정 창(RESOLVE_WINDOW)을 벗어난 앞쪽 이벤트는 다시 훑지 않음 (이벤트는 시각순으로 추가됨)
+        self._pending_from = 0
+        # (interval, start_us) → Bar (마감/갱신된 OHLC 캔들)
+        self.bars: dict[tuple[int, int], object] = {}
+
+    # --- rates / bollinger_history ---
+    async def store_rate(self, conn, rate: float):
+        return now_kst()
+
+    async def update_bollinger_history(self, conn, timestamp: datetime, rate: float, ma, std, period=None):
+        # 판정이 끝난 행은 저장할 곳이 없으므로 버림 (인덱스는 추적기가 갱신)
+        self.tracker.observe(timestamp, rate, ma, std)
+
+    async def get_bounce_probability_from_rates(self, conn, lower_bound, deviation, tolerance, moving_average_period):
+        return self.index.probability("lower", deviation, tolerance)
+
+    async def get_reversal_probability_from_rates(self, conn, upper_bound, deviation, tolerance, moving_average_period):
+        return self.index.probability("upper", deviation, tolerance)
+
+    # --- bars ---
+    async def upsert_bars(self, conn, bars) -> None:
+        for bar in bars:
+            self.bars[(bar.interval, bar.start_us)] = bar
+
+    # --- expected_ranges ---
+    async def get_today_expected_range(self, conn):
+        return self.expected_ranges.get(now_kst().date())
+
+    # --- breakout_events ---
+    async def insert_breakout_event(self, conn, event_type: str, timestamp: datetime, boundary: float, threshold: float):
+        self.breakouts.append({
+            "id": len(self.breakouts) + 1,
+            "event_type": event_type,
+            "timestamp": timestamp,
+            "boundary": boundary,
+            "threshold": threshold,
+            "resolved": False,
+        })
+
+    async def get_pending_breakouts(self, conn) -> list[dict]:
+        cutoff = now_kst() - RESOLVE_WINDOW
+        events = self.breakouts
+        while self._pending_from < len(events) and events[self._pending_from]["timestamp"] < cutoff:
+            self._pending_from += 1
+        return [e for e in events[self._pending_from:] if not e["resolved"] and e["timestamp"] >= cutoff]
+
+    async def mark_breakout_resolved(self, conn, event_id: int) -> None:
+        self.breakouts[event_id - 1]["resolved"] = True
+
+    async def get_rates_in_block(self, conn, start: datetime, end: datetime):
+        # 리플레이에서는 틱 버퍼가 항상 전 구간을 보장하므로 호출되지 않아야 함
+        raise RuntimeError("리플레이 중 rates 테이블 조회 시도")
+
+
+class AlertSink:
+    """
+    텔레그램 대체 알림 수집기
+    - 가상 시각과 함께 메모리에 보관, JSONL 로 저장 (run 간 diff 용)
+    """
+    def __init__(self):
+        self.alerts: list[dict] = []
+
+    async def send(self, message: str, target_chat_ids: list[str] | None = None):
+        self.alerts.append({"ts": now_kst().isoformat(), "message": message})
+
+    def dump_jsonl(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for alert in self.alerts:
+                f.write(json.dumps(alert, ensure_ascii=False, sort_keys=True) + "\n")
+
+
+# 리플레이 중 MemoryRepository 로 바꿔 끼울 (모듈, 이름) 목록
+# - 각 모듈이 `from db import ...` 로 가져간 이름까지 교체해야 함
+_PATCH_TARGETS = {
+    "run_watcher": ("store_rate", "update_bollinger_history", "get_today_expected_range", "upsert_bars"),
+    "strategies.bollinger": (
+        "get_bounce_probability_from_rates", "get_reversal_probability_from_rates",
+        "insert_breakout_event", "get_pending_breakouts", "mark_breakout_resolved",
+    ),
+    "db.repository": ("get_rates_in_block",),
+}
+
+
+@contextmanager
+def installed(repo: MemoryRepository):
+    """with 블록 동안 워처/전략 모듈의 DB 함수를 repo 의 메서드로 교체"""
+    import importlib
+
+    saved = []
+    try:
+        for module_name, names in _PATCH_TARGETS.items():
+            module = importlib.import_module(module_name)
+            for name in names:
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, getattr(repo, name))
+        yield repo
+    finally:
+        for module, name, original in reversed(saved):
+            setattr(module, name, original)
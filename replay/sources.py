@@ -0,0 +1,87 @@
+# replay/sources.py
+import csv
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import AsyncIterator, Iterator
+
+from utils.time import TIMEZONE
+
+try:
+    import pyarrow.parquet as pq
+except Exception:
+    pq = None
+
+
+def _as_kst(ts) -> datetime:
+    """문자열/naive datetime → KST tz-aware datetime (naive 는 KST 로 간주)"""
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.strip())
+    if ts.tzinfo is None:
+        return TIMEZONE.localize(ts)
+    return ts.astimezone(TIMEZONE)
+
+
+def _as_date(d) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d).strip())
+
+
+def iter_csv_ticks(path: str) -> Iterator[tuple[datetime, float]]:
+    """
+    CSV 틱 파일 스트리밍 (헤더 필수: timestamp, rate)
+    - timestamp 는 ISO 8601, 타임존이 없으면 KST
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield _as_kst(row["timestamp"]), float(row["rate"])
+
+
+def iter_parquet_ticks(path: str, batch_size: int = 65536) -> Iterator[tuple[datetime, float]]:
+    """Parquet 틱 파일 스트리밍 (컬럼: timestamp, rate) - pyarrow 필요"""
+    if pq is None:
+        raise RuntimeError("Parquet 입력에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    parquet = pq.ParquetFile(path)
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=["timestamp", "rate"]):
+        cols = batch.to_pydict()
+        for ts, rate in zip(cols["timestamp"], cols["rate"]):
+            yield _as_kst(ts), float(rate)
+
+
+def iter_file_ticks(path: str) -> Iterator[tuple[datetime, float]]:
+    """확장자로 CSV/Parquet 구분"""
+    if path.lower().endswith((".parquet", ".pq")):
+        return iter_parquet_ticks(path)
+    return iter_csv_ticks(path)
+
+
+async def iter_db_ticks(conn, start: datetime, end: datetime) -> AsyncIterator[tuple[datetime, float]]:
+    """
+    rates [start, end) 서버 측 커서 스트리밍 (db.repository.iter_rates)
+    - asyncpg 는 timestamptz 를 UTC 로 돌려주므로 파일 입력과 같이 KST 로 변환 (알림 시각/날짜 판단 일치)
+    """
+    from db.repository import iter_rates
+
+    async with aclosing(iter_rates(conn, start, end)) as rows:
+        async for ts, rate in rows:
+            yield ts.astimezone(TIMEZONE), rate
+
+
+def load_expected_ranges_csv(path: str) -> dict:
+    """
+    예상 범위 CSV 로드 (헤더: date, low, high[, source])
+    :return: {date: {"date", "low", "high", "source"}} (get_today_expected_range 와 같은 형태)
+    """
+    ranges = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            d = _as_date(row["date"])
+            ranges[d] = {
+                "date": d,
+                "low": float(row["low"]),
+                "high": float(row["high"]),
+                "source": row.get("source") or "replay",
+            }
+    return ranges
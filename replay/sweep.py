@@ -0,0 +1,412 @@
+# replay/sweep.py
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from multiprocessing import shared_memory
+from statistics import mean
+from typing import Iterable
+
+import numpy as np
+
+HIT_HORIZON = 1800        # 알림 방향 적중 판정 구간(초): 30분 뒤 가격
+ONSET_LOOKBACK = 1800     # 알림 지연 측정 구간(초): 직전 30분 내 반대 극값부터
+
+# 스윕 가능한 파라미터 → 값을 바꿔 넣을 (모듈, 속성) 목록
+# - `from config import X` 로 가져간 모듈마다 사본이 있으므로 모두 교체해야 함
+# - "gate.<필드>" 는 decision_gates.GATE_CONFIG 의 필드
+PARAM_TARGETS: dict[str, tuple[tuple[str, str], ...]] = {
+    "MOVING_AVERAGE_PERIOD": (
+        ("config", "MOVING_AVERAGE_PERIOD"), ("strategies.bollinger", "MOVING_AVERAGE_PERIOD"),
+        ("run_watcher", "MOVING_AVERAGE_PERIOD"), ("replay.sinks", "MOVING_AVERAGE_PERIOD"),
+        ("replay.engine", "MOVING_AVERAGE_PERIOD"),
+    ),
+    "SHORT_TERM_PERIOD": (
+        ("config", "SHORT_TERM_PERIOD"), ("strategies.crossover", "SHORT_TERM_PERIOD"),
+        ("run_watcher", "SHORT_TERM_PERIOD"),
+    ),
+    "LONG_TERM_PERIOD": (
+        ("config", "LONG_TERM_PERIOD"), ("strategies.crossover", "LONG_TERM_PERIOD"),
+        ("run_watcher", "LONG_TERM_PERIOD"),
+    ),
+    "JUMP_THRESHOLD": (("config", "JUMP_THRESHOLD"), ("strategies.jump", "JUMP_THRESHOLD")),
+    "REL_JUMP": (("strategies.jump", "REL_JUMP"),),
+    "SPREAD_MIN": (("strategies.crossover", "SPREAD_MIN"),),
+    "DIST_MIN": (("strategies.crossover", "DIST_MIN"),),
+    "CONFIRM_BARS": (("strategies.crossover", "CONFIRM_BARS"),),
+    "SQUEEZE_LOOKBACK": (("strategies.bollinger", "SQUEEZE_LOOKBACK"),),
+    "SQUEEZE_PCTL": (("strategies.bollinger", "SQUEEZE_PCTL"),),
+}
+
+
+@dataclass
+class SweepResult:
+    params: dict
+    ticks: int = 0
+    alerts: int = 0
+    directional: int = 0                  # 방향(매수/매도 성격)이 있는 알림 수
+    hit_rate: float | None = None         # 방향 알림 중 HIT_HORIZON 뒤 가격이 그 방향으로 움직인 비율
+    avg_latency: float | None = None      # 직전 반대 극값 → 알림까지 평균 지연(초)
+    elapsed: float = 0.0
+    error: str | None = None
+    extra: dict = field(default_factory=dict)
+
+    def sort_key(self):
+        """적중률 높은 순 → 지연 짧은 순 → 알림 적은 순 (오류/무알림은 맨 뒤)"""
+        if self.error or self.hit_rate is None:
+            return (1, 0.0, float("inf"), self.alerts)
+        return (0, -self.hit_rate, self.avg_latency if self.avg_latency is not None else float("inf"), self.alerts)
+
+
+def expand_grid(grid: dict[str, Iterable]) -> list[dict]:
+    """{"이름": [값...]} → 모든 조합의 파라미터 dict 목록"""
+    unknown = [k for k in grid if k not in PARAM_TARGETS and not k.startswith("gate.")]
+    if unknown:
+        raise ValueError(f"알 수 없는 스윕 파라미터: {', '.join(unknown)}")
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+# === 공유 메모리 (가격/시각 배열을 워커에 복사 없이 전달) ===
+
+class SharedTicks:
+    """
+    틱 배열을 shared_memory 한 블록에 [int64 epoch 마이크로초 × n | float64 가격 × n] 로 보관
+    - 부모가 create() 로 만들고, 워커는 이름으로 attach() 해 memoryview 로 그대로 읽음
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, n: int, owner: bool):
+        self.shm = shm
+        self.n = n
+        self.owner = owner
+        self.ts_us = shm.buf[: n * 8].cast("q")
+        self.prices = shm.buf[n * 8: n * 16].cast("d")
+
+    @classmethod
+    def create(cls, ticks: Iterable[tuple[datetime, float]]) -> "SharedTicks":
+        rows = list(ticks)
+        n = len(rows)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, n * 16))
+        obj = cls(shm, n, owner=True)
+        for i, (ts, rate) in enumerate(rows):
+            obj.ts_us[i] = int(ts.timestamp() * 1_000_000)
+            obj.prices[i] = float(rate)
+        return obj
+
+    @classmethod
+    def attach(cls, name: str, n: int) -> "SharedTicks":
+        return cls(shared_memory.SharedMemory(name=name), n, owner=False)
+
+    def iter_ticks(self):
+        from replay.precomputed import tick_times
+        return zip(tick_times(self.ts_us), self.prices)
+
+    def close(self):
+        self.ts_us.release()
+        self.prices.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedArrays:
+    """
+    틱별 사전 계산 배열(이동 평균/표준편차/ATR)을 shared_memory 한 블록에 이름 순서대로 [float64 × n] × k 로 보관
+    - 부모가 create() 로 한 번 계산해 넣고, 워커는 attach() 해 이름별 memoryview 로 읽음
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, names: list[str], n: int, owner: bool):
+        self.shm = shm
+        self.names = list(names)
+        self.n = n
+        self.owner = owner
+        self.arrays = {name: shm.buf[k * n * 8:(k + 1) * n * 8].cast("d") for k, name in enumerate(self.names)}
+
+    @classmethod
+    def create(cls, arrays: dict[str, np.ndarray], n: int) -> "SharedArrays":
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(arrays) * n * 8))
+        obj = cls(shm, list(arrays), n, owner=True)
+        for name, values in arrays.items():
+            np.frombuffer(obj.arrays[name], dtype=np.float64)[:] = values
+        return obj
+
+    @classmethod
+    def attach(cls, name: str, names: list[str], n: int) -> "SharedArrays":
+        return cls(shared_memory.SharedMemory(name=name), names, n, owner=False)
+
+    def close(self):
+        for view in self.arrays.values():
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _swept_values(grid: dict[str, Iterable], name: str) -> set:
+    """그리드에 나오는 값 + 기본값"""
+    import config
+    return {getattr(config, name), *grid.get(name, ())}
+
+
+def precompute_indicators(ticks: SharedTicks, grid: dict[str, Iterable]) -> dict[str, np.ndarray]:
+    """
+    모든 조합이 공유하는 틱별 지표 배열 (부모에서 한 번만 계산)
+    - 그리드에 나오는 MOVING_AVERAGE/SHORT_TERM/LONG_TERM 기간마다 이동 평균/표준편차
+    - ATR(14): 장기선 기간이 모두 15 이상일 때만 (그보다 짧으면 틱 종가 ATR 입력이 달라짐)
+    """
+    from config import BAR_INTERVALS, BAR_HISTORY, ATR_BAR_INTERVAL
+    from replay.precomputed import ATR_PERIOD, atr_array, rolling_arrays, tick_times
+
+    longs = _swept_values(grid, "LONG_TERM_PERIOD")
+    periods = longs | _swept_values(grid, "MOVING_AVERAGE_PERIOD") | _swept_values(grid, "SHORT_TERM_PERIOD")
+    arrays = rolling_arrays(ticks.prices, periods)
+    if min(longs) >= ATR_PERIOD + 1:
+        arrays[f"atr:{ATR_PERIOD}"] = atr_array(
+            tick_times(ticks.ts_us), ticks.prices, BAR_INTERVALS, BAR_HISTORY, ATR_BAR_INTERVAL
+        )
+    return arrays
+
+
+# === 워커 측 ===
+
+_worker_ticks: SharedTicks | None = None
+_worker_arrays: SharedArrays | None = None
+_worker_times: list[datetime] = []
+_worker_time_map: dict[int, datetime] = {}
+_worker_ranges: dict = {}
+_worker_defaults: dict = {}
+
+
+def _init_worker(shm_name: str, n: int, expected_ranges: dict, arrays_name: str | None = None, array_names: list[str] = ()):
+    global _worker_ticks, _worker_arrays, _worker_times, _worker_time_map, _worker_ranges
+    from replay.precomputed import tick_times
+
+    # 스윕 중 외부 LLM 호출 금지 (느리고 결과가 비결정적)
+    os.environ["USE_LLM_DECISION"] = "0"
+    _worker_ticks = SharedTicks.attach(shm_name, n)
+    if arrays_name:
+        _worker_arrays = SharedArrays.attach(arrays_name, list(array_names), n)
+    # 틱 시각은 워커마다 한 번만 만들어 모든 조합이 재사용
+    _worker_times = tick_times(_worker_ticks.ts_us)
+    _worker_time_map = dict(zip(_worker_ticks.ts_us, _worker_times))
+    _worker_ranges = expected_ranges
+
+
+def _apply_params(params: dict):
+    """파라미터 적용 (처음 바꾸는 값은 기본값을 기억해 두고, 이번 조합에 없는 값은 원복)"""
+    import importlib
+    from strategies import decision_gates
+
+    # 기본값은 어떤 값도 바꾸기 전에 모든 대상 모듈을 import 해서 한 번에 기억
+    # (나중에 import 되는 모듈이 이미 바뀐 config 값을 가져가지 않도록)
+    if not _worker_defaults:
+        for targets in PARAM_TARGETS.values():
+            for module_name, attr in targets:
+                module = importlib.import_module(module_name)
+                _worker_defaults[(module_name, attr)] = getattr(module, attr)
+
+    gate_fields = {}
+    for name, targets in PARAM_TARGETS.items():
+        for module_name, attr in targets:
+            module = importlib.import_module(module_name)
+            setattr(module, attr, params.get(name, _worker_defaults[(module_name, attr)]))
+    for name, value in params.items():
+        if name.startswith("gate."):
+            gate_fields[name[len("gate."):]] = value
+    decision_gates.GATE_CONFIG = replace(decision_gates.GateConfig(), **gate_fields)
+
+
+def _alert_direction(message: str) -> int:
+    from decision import _direction_from_text
+    if "관망 (Hold)" in message:
+        return 0
+    if "매수" in message:
+        return +1
+    if "매도" in message:
+        return -1
+    return _direction_from_text(message)
+
+
+def _score_alerts(ticks: SharedTicks, alerts: list[dict]) -> tuple[int, float | None, float | None]:
+    """방향 알림의 적중률/지연 계산 (공유 배열에서 이분 탐색)"""
+    ts_us, prices = ticks.ts_us, ticks.prices
+    hits = 0
+    judged = 0
+    latencies = []
+    for alert in alerts:
+        d = _alert_direction(alert["message"])
+        if d == 0:
+            continue
+        t_us = int(datetime.fromisoformat(alert["ts"]).timestamp() * 1_000_000)
+        i = bisect_right(ts_us, t_us) - 1
+        if i < 0:
+            continue
+        price = prices[i]
+
+        # 적중: HIT_HORIZON 뒤 가격이 알림 방향으로 움직였는가
+        j = bisect_left(ts_us, t_us + HIT_HORIZON * 1_000_000)
+        if j < ticks.n:
+            judged += 1
+            if (prices[j] - price) * d > 0:
+                hits += 1
+
+        # 지연: 직전 ONSET_LOOKBACK 내 반대 극값(상승 알림이면 저점) 이후 경과 시간
+        k = bisect_left(ts_us, t_us - ONSET_LOOKBACK * 1_000_000)
+        window = prices[k:i + 1]
+        if len(window):
+            extreme = min(window) if d > 0 else max(window)
+            onset = k + window.tolist().index(extreme)
+            latencies.append((t_us - ts_us[onset]) / 1_000_000)
+
+    hit_rate = round(hits / judged, 4) if judged else None
+    avg_latency = round(mean(latencies), 1) if latencies else None
+    return judged, hit_rate, avg_latency
+
+
+def _precomputed_state():
+    """이번 조합의 기간으로 사전 계산 배열을 읽는 WatcherState (배열이 없으면 None → 일반 경로)"""
+    import run_watcher
+    from replay.precomputed import ATR_PERIOD, PrecomputedStats, ReplayTickBuffer
+
+    if _worker_arrays is None:
+        return None
+    periods = (run_watcher.MOVING_AVERAGE_PERIOD, run_watcher.SHORT_TERM_PERIOD, run_watcher.LONG_TERM_PERIOD)
+    arrays = _worker_arrays.arrays
+    return run_watcher.WatcherState(
+        stats=PrecomputedStats(_worker_ticks.prices, arrays, periods, arrays.get(f"atr:{ATR_PERIOD}")),
+        ticks=ReplayTickBuffer(_worker_time_map, run_watcher.TICK_BUFFER_SIZE),
+    )
+
+
+def _run_combo(params: dict, warmup: int | None) -> SweepResult:
+    from replay.engine import replay
+
+    started = time.perf_counter()
+    try:
+        _apply_params(params)
+        import run_watcher
+        result, sink = asyncio.run(replay(
+            zip(_worker_times, _worker_ticks.prices), _worker_ranges,
+            warmup=warmup if warmup is not None else run_watcher.LONG_TERM_PERIOD,
+            state=_precomputed_state(),
+        ))
+        directional, hit_rate, avg_latency = _score_alerts(_worker_ticks, sink.alerts)
+        return SweepResult(
+            params, result.ticks, result.alerts, directional, hit_rate, avg_latency,
+            time.perf_counter() - started,
+        )
+    except Exception as e:
+        return SweepResult(params, elapsed=time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+
+
+# === 부모 측 ===
+
+def run_sweep(
+    ticks: Iterable[tuple[datetime, float]],
+    grid: dict[str, Iterable],
+    expected_ranges: dict | None = None,
+    workers: int | None = None,
+    warmup: int | None = None,
+) -> list[SweepResult]:
+    """
+    파라미터 그리드를 CPU 코어 수만큼의 프로세스로 나눠 리플레이
+    - 틱 배열은 공유 메모리 한 벌만 만들어 모든 워커가 복사 없이 읽음
+    - 조합과 무관한 틱별 지표(이동 평균/표준편차/ATR)도 부모에서 한 번 계산해 공유 메모리로 전달
+    - 결과는 SweepResult.sort_key 순으로 정렬해 반환
+    """
+    combos = expand_grid(grid)
+    shared = SharedTicks.create(ticks)
+    workers = workers or os.cpu_count() or 1
+    print(f"🧮 스윕 시작: 조합 {len(combos):,}개 × 틱 {shared.n:,}건, 워커 {workers}개")
+
+    results: list[SweepResult] = []
+    started = time.perf_counter()
+    indicators = None
+    try:
+        indicators = SharedArrays.create(precompute_indicators(shared, grid), shared.n)
+        print(f"  📐 사전 계산 지표 {len(indicators.names)}종 ({time.perf_counter() - started:.1f}s)")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shared.shm.name, shared.n, expected_ranges or {}, indicators.shm.name, indicators.names),
+        ) as pool:
+            futures = [pool.submit(_run_combo, params, warmup) for params in combos]
+            for done, future in enumerate(as_completed(futures), start=1):
+                results.append(future.result())
+                if done % max(1, len(combos) // 20) == 0 or done == len(combos):
+                    print(f"  ⏳ {done}/{len(combos)} 완료 ({time.perf_counter() - started:.0f}s)")
+    finally:
+        if indicators is not None:
+            indicators.close()
+        shared.close()
+
+    results.sort(key=SweepResult.sort_key)
+    return results
+
+
+def format_results(results: list[SweepResult], top: int = 20) -> str:
+    lines = []
+    for rank, r in enumerate(results[:top], start=1):
+        if r.error:
+            lines.append(f"{rank:>3}. ❌ {r.params} → {r.error}")
+            continue
+        hit = f"{r.hit_rate * 100:.1f}%" if r.hit_rate is not None else "-"
+        lat = f"{r.avg_latency:.0f}s" if r.avg_latency is not None else "-"
+        lines.append(
+            f"{rank:>3}. 적중 {hit} (방향 알림 {r.directional}) / 지연 {lat} / 알림 {r.alerts} ← {r.params}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(results: list[SweepResult], path: str):
+    keys = sorted({k for r in results for k in r.params})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["rank", *keys, "alerts", "directional", "hit_rate", "avg_latency", "elapsed", "error"])
+        for rank, r in enumerate(results, start=1):
+            w.writerow([
+                rank, *(r.params.get(k, "") for k in keys),
+                r.alerts, r.directional, r.hit_rate, r.avg_latency, round(r.elapsed, 2), r.error or "",
+            ])
+
+
+def main():
+    """
+    예)
+      python -m replay.sweep ticks.csv --grid grid.json --out sweep.csv
+      grid.json: {"MOVING_AVERAGE_PERIOD": [30, 45, 60], "CONFIRM_BARS": [1, 2, 3], "gate.p_base": [0.55, 0.6]}
+    """
+    from replay.sources import iter_file_ticks, load_expected_ranges_csv
+
+    parser = argparse.ArgumentParser(description="전략 파라미터 병렬 스윕")
+    parser.add_argument("source", help="틱 파일 (CSV/Parquet, 컬럼: timestamp, rate)")
+    parser.add_argument("--grid", required=True, help="파라미터 그리드 JSON 파일 경로 또는 JSON 문자열")
+    parser.add_argument("--expected-ranges", help="예상 범위 CSV (date, low, high[, source])")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--warmup", type=int, help="분석 없이 이력만 쌓을 선행 틱 수 (기본: LONG_TERM_PERIOD)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    parser.add_argument("--out", help="전체 결과 CSV 출력 경로")
+    args = parser.parse_args()
+
+    grid_src = args.grid
+    grid = json.loads(open(grid_src, encoding="utf-8").read() if os.path.exists(grid_src) else grid_src)
+    expected_ranges = load_expected_ranges_csv(args.expected_ranges) if args.expected_ranges else {}
+
+    started = time.perf_counter()
+    results = run_sweep(iter_file_ticks(args.source), grid, expected_ranges, args.workers, args.warmup)
+    print(f"✅ 스윕 완료 ({time.perf_counter() - started:.1f}s)")
+    print(format_results(results, args.top))
+    if args.out:
+        write_csv(results, args.out)
+        print(f"📝 전체 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
 import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
-from config import CHECK_INTERVAL, ENVIRONMENT, LONG_TERM_PERIOD, SUMMARY_INTERVAL
+from config import (
+    CHECK_INTERVAL, ENVIRONMENT, LONG_TERM_PERIOD, SUMMARY_INTERVAL, MOVING_AVERAGE_PERIOD, SHORT_TERM_PERIOD,
+    BAR_INTERVALS, BAR_HISTORY, ATR_BAR_INTERVAL,
+    TICK_QUEUE_SIZE, NOTIFY_QUEUE_SIZE, PIPELINE_REPORT_INTERVAL,
+    SUMMARY_SETTLE_TIMEOUT, SUMMARY_CATCHUP_BLOCKS, QUOTE_PROVIDERS,
+    ADAPTIVE_POLLING, POLL_INTERVALS, POLL_INTERVAL_LADDER, POLL_DAILY_BUDGET, POLL_BUDGET_PROVIDER
+)
 from db.repository import (
-    get_rates_in_block, store_rate, get_recent_rates, store_expected_range,
-    get_today_expected_range, get_recent_rates_for_summary
+    get_rates_in_block, store_rate, get_recent_rate_rows, store_expected_range,
+    get_today_expected_range, get_recent_rates_for_summary, backfill_bollinger_history,
+    update_bollinger_history, flush_bollinger_history, warm_breakout_index, backfill_bars, upsert_bars, get_last_summary_block, record_summary_sent
 )
+from db.write_behind import WriteBehindBuffer, set_write_buffer
+from db.migrations import run_migrations, ensure_rate_partitions
+from db.retention import run_retention
 from decision import make_decision
+from strategies.ai.ai_decider import llm_decision_enabled
 from strategies.summary import get_recent_major_events
-from strategies.utils.signal_utils import atr_from_rates
-from utils import is_weekend, now_kst, is_scrape_time
-from fetcher import get_usdkrw_rate, fetch_expected_range
-from notifier import send_telegram, send_start_message, send_photo
+from strategies.utils.indicator_context import IndicatorContext
+from strategies.utils.rolling import RollingStats
+from strategies.utils.volatility_regime import VolatilityRegime
+from utils import now_kst, is_scrape_time, TickBuffer, BarBuilder, shutdown_chart_pool, get_market_calendar
+from utils.pipeline import StageStats, put_with_backpressure
+from fetcher import get_consensus_rate, fetch_expected_range, close_http_session
+from fetcher.quote_aggregator import get_default_aggregator
+from notifier import send_telegram, send_start_message, send_photo, CAPTION_LIMIT
 from strategies import (
     analyze_bollinger,
     analyze_jump,
@@ -22,12 +40,164 @@ from strategies import (
     generate_30min_chart,
     send_30min_summary_then_chart
 )
-from utils.time import get_recent_completed_30min_block
+from utils.time import TIMEZONE, get_last_completed_block
+from utils.scheduler import AlignedScheduler, AdaptivePoller
 from strategies.trend_events import detect_and_format_10min_trend_event
 
 
-# 글로벌 상태 변수
-last_summary_sent = None
+# 인메모리 틱 버퍼 크기 (장기선 306틱 + 30분 요약 구간을 여유 있게 포함)
+TICK_BUFFER_SIZE = 1024
+
+
+def _budget_requests() -> int:
+    """예산 대상 공급자(exchangerate.host)의 누적 요청 수 (재시도 포함)"""
+    stats = get_default_aggregator().stats.get(POLL_BUDGET_PROVIDER)
+    return stats.requests if stats else 0
+
+
+@dataclass
+class WatcherState:
+    """틱 간에 유지되는 분석 상태 (실시간 워처와 리플레이가 공유)"""
+    stats: RollingStats = field(
+        default_factory=lambda: RollingStats((MOVING_AVERAGE_PERIOD, SHORT_TERM_PERIOD, LONG_TERM_PERIOD))
+    )
+    ticks: TickBuffer = field(default_factory=lambda: TickBuffer(capacity=TICK_BUFFER_SIZE))
+    bars: BarBuilder = field(default_factory=lambda: BarBuilder(BAR_INTERVALS, history=BAR_HISTORY))
+    prev_rate: float | None = None
+    upper_streak: int = 0
+    lower_streak: int = 0
+    prev_upper_level: float = 0
+    prev_lower_level: float = 0
+    temp_state: dict = field(default_factory=lambda: {
+        "short_avg": None,
+        "long_avg": None,
+        "type": None,
+        "b_status": None,
+    })
+    # 부팅 직후에는 크로스오버 알림(상태 유지/전환)을 한 번 무음 처리
+    startup_mute_crossover: bool = True
+    # 지표 메모 누적 적중/계산 횟수 (지표명별)
+    indicator_hits: Counter = field(default_factory=Counter)
+    indicator_misses: Counter = field(default_factory=Counter)
+
+
+async def decide(*args, **kwargs):
+    """
+    make_decision 실행
+    - LLM 판단 설명(동기 OpenAI 호출, 수 초~수십 초)이 켜져 있으면 스레드에서 실행해 이벤트 루프(fetch 단계 등)를 막지 않음
+      (analyze 단계는 틱을 하나씩 처리 → decision 모듈 상태를 동시에 건드리지 않음)
+    - 꺼져 있으면(리플레이/스윕 포함) 그대로 호출
+    """
+    if llm_decision_enabled():
+        return await asyncio.to_thread(make_decision, *args, **kwargs)
+    return make_decision(*args, **kwargs)
+
+
+async def process_tick(conn, state: WatcherState, rate: float, now: datetime, send=send_telegram):
+    """
+    새 환율 1틱 처리: 저장 → 전략 분석 → 종합 판단 → 알림 전송
+    - 실시간 루프와 리플레이 엔진이 동일하게 사용
+    :param send: 알림 전송 코루틴 함수 (기본: 텔레그램)
+    """
+    temp_state = state.temp_state
+
+    stored_at = await store_rate(conn, rate)
+    state.ticks.append(stored_at, rate)
+    state.stats.push(rate)
+    # 볼린저 이력: 이번 틱까지 반영된 이동 통계로 밴드 계산 (rates 재조회 없음)
+    await update_bollinger_history(
+        conn, stored_at, rate,
+        state.stats.mean(MOVING_AVERAGE_PERIOD), state.stats.stdev(MOVING_AVERAGE_PERIOD)
+    )
+    closed_bars = state.bars.update(stored_at, rate)
+    if closed_bars:
+        await upsert_bars(conn, closed_bars)
+
+    rates = state.ticks.last(LONG_TERM_PERIOD)
+    # 이번 틱 공용 지표 메모: 각 지표는 틱당 최대 1회 계산
+    indicators = IndicatorContext(rates, state.stats, state.bars, ATR_BAR_INTERVAL)
+    # ATR: 5분 캔들 고저가 TR 기준 (캔들이 모자라면 틱 종가 차분으로 대체)
+    atr_val = indicators.atr(14)
+    if len(rates) >= 15:
+        # 10분 추세 이벤트 감지
+        trend_msg = await detect_and_format_10min_trend_event(conn, now, atr_val, ticks=state.ticks)
+        if trend_msg:
+            await send(trend_msg)
+
+    reversal_msgs = await check_breakout_reversals(conn, rate, now)
+    for r_msg in reversal_msgs:
+        await send(r_msg)
+
+    expected_range = await get_today_expected_range(conn)
+    e_msg, e_struct = analyze_expected_range(rate, expected_range, now)
+    j_msg, j_struct = analyze_jump(state.prev_rate, rate, indicators=indicators)
+
+    c_msg, temp_state["short_avg"], temp_state["long_avg"], temp_state["type"], c_struct = analyze_crossover(
+        rates=rates,
+        prev_short_avg=temp_state["short_avg"],
+        prev_long_avg=temp_state["long_avg"],
+        prev_signal_type=temp_state["type"],
+        prev_price=state.prev_rate,
+        current_price=rate,
+        indicators=indicators
+    )
+
+    b_status, b_msgs, state.upper_streak, state.lower_streak, state.prev_upper_level, state.prev_lower_level, b_struct = await analyze_bollinger(
+        conn=conn,
+        rates=rates,
+        current=rate,
+        prev=state.prev_rate,
+        prev_upper=state.prev_upper_level,
+        prev_lower=state.prev_lower_level,
+        cross_msg=c_msg,
+        jump_msg=j_msg,
+        prev_status=temp_state.get("b_status"),
+        indicators=indicators
+    )
+    temp_state["b_status"] = b_status
+
+    # 부팅 직후에는 크로스오버 알림(상태 유지/전환)을 한 번 무음 처리
+    if state.startup_mute_crossover:
+        single_msgs = [msg for msg in [j_msg, e_msg] if msg]
+    else:
+        single_msgs = [msg for msg in [j_msg, c_msg, e_msg] if msg]
+
+    single_msgs.extend(b_msgs)
+
+    decision_result = await decide(
+        b_status,
+        b_msgs[0] if b_msgs else None,
+        j_msg,
+        c_msg,
+        e_msg,
+        state.upper_streak,
+        state.lower_streak,
+        state.prev_upper_level,
+        state.prev_lower_level,
+        b_struct=b_struct,
+        j_struct=j_struct,
+        c_struct=c_struct,
+        e_struct=e_struct,
+        # context for gates/decider
+        current_price=rate,
+        current_atr=atr_val,
+        near_event=False,
+    )
+
+    if decision_result:
+        state.prev_upper_level = decision_result["new_upper_level"]
+        state.prev_lower_level = decision_result["new_lower_level"]
+        await send(decision_result["message"])
+    else:
+        for msg in single_msgs:
+            await send(msg)
+
+    state.indicator_hits.update(indicators.hits)
+    state.indicator_misses.update(indicators.misses)
+    state.prev_rate = rate
+    # 최초 루프 완료 후 크로스오버 무음 해제
+    if state.startup_mute_crossover:
+        state.startup_mute_crossover = False
 
 
 # ▶️ One-off 30m summary runner
@@ -35,7 +205,7 @@ async def run_summary_once(db_pool):
     """Fetch the most recent completed 30m block and send summary + chart once."""
     now = now_kst()
     current = now_kst()
-    block_start, block_end = get_recent_completed_30min_block(current)
+    block_start, block_end = get_last_completed_block(current, SUMMARY_INTERVAL)
     print(f"[${now}] ▶️ 임시 30분 요약 실행: {block_start.strftime('%H:%M')} ~ {block_end.strftime('%H:%M')}")
     async with db_pool.acquire() as conn:
         recent_rates = await get_rates_in_block(conn, block_start, block_end)
@@ -48,6 +218,8 @@ async def run_summary_once(db_pool):
             await send_telegram(msg)
         async def _send_photo(buf):
             await send_photo(buf)
+        async def _send_photo_with_caption(buf, caption: str):
+            await send_photo(buf, caption=caption)
 
         await send_30min_summary_then_chart(
             start_time=block_start,
@@ -56,224 +228,396 @@ async def run_summary_once(db_pool):
             major_events=major_events,
             send_text=_send_text,
             send_photo=_send_photo,
-            ensure_gap_ms=150,
+            send_photo_with_caption=_send_photo_with_caption,
+            caption_limit=CAPTION_LIMIT,
         )
+        await record_summary_sent(conn, block_start, block_end)
         print(f"[${now}] ✅ 임시 요약/차트 전송 완료 ({block_end.strftime('%H:%M')})")
 
 
-async def run_watcher(db_pool):
+async def run_expected_range_scrape(db_pool):
     """
-    환율 모니터링 메인 루프
-    - 실시간 환율 수집 및 저장
-    - 다양한 전략 분석 수행 및 Telegram 알림 전송
-    - 30분 요약 메시지 및 차트 자동 전송
+    오늘의 예상 범위 스크래핑 (백그라운드 태스크)
+    - 결과는 store_expected_range 로 저장 → 루프가 get_today_expected_range 로 읽어 사용
+    - 성공 시 수집 날짜, 실패 시 None 반환 (다음 틱에 재시도)
     """
-    global last_summary_sent
+    try:
+        result = await fetch_expected_range()
+        msg = (
+            "📊 *오늘의 환율 예상 범위 (전문가 제시)*\n\n"
+            "📌 *주요 외환 딜러들의 예측*\n"
+            f"- 예상 하단: *{result['low']:.2f}원*\n"
+            f"- 예상 상단: *{result['high']:.2f}원*\n\n"
+            "💡 이 수치는 주요 은행 및 글로벌 외환 딜러들이 제시한 예측값으로,\n"
+            "   하루 환율 흐름을 가늠할 수 있는 *신뢰도 높은 참고 지표*입니다.\n"
+            f"(출처: {result['source']})"
+        )
 
-    print(f"[{now_kst()}] 🏋️️ 워치 시작")
-    await send_start_message()
+        print(msg)
+        async with db_pool.acquire() as conn:
+            await store_expected_range(conn, result["date"], result["low"], result["high"], result["source"])
+        await send_telegram(msg)
+        return result["date"]
+    except Exception as e:
+        err_msg = f"⚠️ 예상 범위 스크래핑 실패: {e}"
+        print(err_msg)
+        await send_telegram(err_msg, target_chat_ids=["7650730456"])
+        return None
 
-    # 분석 상태 초기화
-    prev_rate = None
-    upper_streak = 0
-    lower_streak = 0
-    prev_upper_level = 0
-    prev_lower_level = 0
-    last_scraped_date = None
 
-    temp_state = {
-        "short_avg": None,
-        "long_avg": None,
-        "type": None,
-        "b_status": None,
-    }
-    startup_mute_crossover = True
+class WatcherPipeline:
+    """
+    워처 루프를 단계별 asyncio 태스크로 분리
+    - fetch:   AlignedScheduler 로 폴링 간격 벽시계 경계마다 환율 수집 (+ 예상 범위 스크래핑/일일 DB 관리 태스크 기동)
+      · 주말 등 MarketCalendar 의 수집 구간 밖이면 다음 구간 시작까지 한 번에 대기
+      · 간격은 AdaptivePoller 가 변동성 국면(VolatilityRegime)과 하루 요청 예산으로 틱마다 조정
+    - analyze: 저장(write-behind) + 전략 분석 + 종합 판단 (process_tick), 틱마다 DB 연결을 잠깐만 사용
+    - notify:  알림 텔레그램 전송 (순서 보장, 느려도 다음 시세 수집에 영향 없음)
+    - summary: 별도 AlignedScheduler 로 SUMMARY_INTERVAL 블록 경계마다 30분 요약/차트 발송
+      (틱 도착 시점과 무관, 발송 기록은 summary_log → 재시작 시 놓친 블록 보충)
+    - 단계 사이는 크기 제한 큐: 가득 차면 앞 단계가 기다리고(backpressure) StageStats 에 overrun/대기 시간 기록
+    """
+    def __init__(self, db_pool, state: WatcherState):
+        self.db_pool = db_pool
+        self.state = state
+        self.tick_queue: asyncio.Queue[tuple[datetime, float]] = asyncio.Queue(maxsize=TICK_QUEUE_SIZE)
+        self.notify_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        self.stats = {name: StageStats(name) for name in ("fetch", "analyze", "notify", "summary")}
+        self.calendar = get_market_calendar()
+        self.scheduler = AlignedScheduler(CHECK_INTERVAL)
+        self.regime = VolatilityRegime()
+        self.poller = AdaptivePoller(
+            self.scheduler,
+            POLL_INTERVALS if ADAPTIVE_POLLING else {name: CHECK_INTERVAL for name in POLL_INTERVALS},
+            POLL_INTERVAL_LADDER,
+            CHECK_INTERVAL,
+            daily_budget=POLL_DAILY_BUDGET,
+            count_requests=_budget_requests if POLL_BUDGET_PROVIDER in QUOTE_PROVIDERS else None,
+        )
+        self._tick_alerts = 0
+        self._last_tick_at: datetime | None = None
+        self.summary_scheduler = AlignedScheduler(SUMMARY_INTERVAL)
+        # 요약 처리를 마친(발송 또는 알림 제한/데이터 없음으로 생략) 마지막 블록 종료 시각 (실패 블록은 제외)
+        self.summary_done_until: datetime | None = None
+        self._background: set[asyncio.Task] = set()
+
+    # --- fetch ---
+    async def fetch_stage(self):
+        stats = self.stats["fetch"]
+        last_scraped_date = None
+        last_partition_check = now_kst().date()
+        scrape_task: asyncio.Task | None = None
+        try:
+            while True:
+                overruns, skipped = self.scheduler.overruns, self.scheduler.skipped
+                await self.scheduler.wait()
+                now = now_kst()
+                if self.scheduler.overruns > overruns:
+                    # 이전 틱 처리가 경계를 넘김 → 즉시 실행, 한 주기 이상 밀린 경계는 합침
+                    missed = self.scheduler.skipped - skipped
+                    print(f"[{now}] ⚠️ [fetch] 예정 시각 초과 (jitter {self.scheduler.last_jitter:.1f}s, 건너뛴 틱 {missed}회, 누적 overrun {self.scheduler.overruns}회)")
+
+                # 주말 등 수집 구간 밖이면 다음 구간 시작까지 한 번에 대기 (중간에 깨지 않음)
+                if not self.calendar.is_active("watch", now):
+                    resume = self.calendar.next_active_at("watch", now)
+                    print(f"[{now}] ⏸️ 휴장 구간 - {resume.strftime('%Y-%m-%d %H:%M')} 까지 수집 중지")
+                    self.scheduler.resume_at(resume)
+                    continue
 
-    try:
+                if self.poller.exhausted(now):
+                    resume = TIMEZONE.localize(datetime.combine(now.date() + timedelta(days=1), datetime.min.time()))
+                    print(f"[{now}] ⏸️ 오늘 시세 요청 예산 소진 ({self.poller.budget_text()}) - 자정(KST)까지 조회 중지")
+                    self.scheduler.resume_at(resume)
+                    continue
+
+                # 예상 범위 스크래핑은 백그라운드 태스크로 수행 (틱 수집을 막지 않음)
+                if scrape_task is not None and scrape_task.done():
+                    scraped_date = scrape_task.result()
+                    scrape_task = None
+                    if scraped_date:
+                        last_scraped_date = scraped_date
+                if scrape_task is None and is_scrape_time(last_scraped_date):
+                    scrape_task = asyncio.create_task(run_expected_range_scrape(self.db_pool))
+
+                # 날짜가 바뀌면 다음 달들 rates 파티션 미리 확보 + 보관 기간 지난 원본 틱 정리(캔들 롤업)
+                if now.date() != last_partition_check:
+                    self._spawn(run_daily_maintenance(self.db_pool))
+                    last_partition_check = now.date()
+
+                started = time.monotonic()
+                try:
+                    rate = await get_consensus_rate()
+                except Exception as e:
+                    print(f"[{now}] ❌ 환율 조회 오류: {e}")
+                    rate = None
+                stats.record(time.monotonic() - started, ok=bool(rate))
+                self.poller.sync(now)
+                if rate:
+                    print(f"[{now}] 📈 현재 환율: {rate} (간격 {self.scheduler.interval:.0f}s, jitter {self.scheduler.last_jitter * 1000:+.0f}ms)")
+                    await put_with_backpressure(self.tick_queue, (now, rate), stats)
+                else:
+                    print(f"[{now}] ❌ 환율 조회 실패")
+        finally:
+            if scrape_task is not None and not scrape_task.done():
+                scrape_task.cancel()
+
+    # --- analyze ---
+    async def notify(self, message: str):
+        """process_tick 의 send: 전송 큐에 넣고 바로 반환 (가득 차면 대기)"""
+        self._tick_alerts += 1
+        await put_with_backpressure(self.notify_queue, message, self.stats["analyze"])
+
+    async def analyze_stage(self):
+        stats = self.stats["analyze"]
         while True:
+            now, rate = await self.tick_queue.get()
+            started = time.monotonic()
+            ok = True
+            self._tick_alerts = 0
             try:
-                now = now_kst()
+                async with self.db_pool.acquire() as conn:
+                    await process_tick(conn, self.state, rate, now, send=self.notify)
+                self._plan_next_poll(now)
+            except Exception as e:
+                ok = False
+                print(f"[{now_kst()}] ❌ 분석 단계 오류: {e}")
+            finally:
+                self.tick_queue.task_done()
+            stats.record(time.monotonic() - started, self.scheduler.interval, ok)
+
+    def _plan_next_poll(self, now: datetime):
+        """이번 틱의 알림/간격 기록 후 변동성 국면으로 다음 폴링 간격 결정"""
+        gap = (now - self._last_tick_at).total_seconds() if self._last_tick_at is not None else None
+        self._last_tick_at = now
+        self.poller.record_tick(gap, self._tick_alerts)
+
+        state = self.state
+        reading = self.regime.update(state.ticks, state.stats, state.bars, now)
+        if reading.regime != self.poller.regime:
+            print(f"[{now}] 🌡️ 변동성 국면 전환: {self.poller.regime} → {reading.describe()}")
+        self.poller.observe(reading.regime, now)
+
+    # --- notify ---
+    async def notify_stage(self):
+        stats = self.stats["notify"]
+        while True:
+            message = await self.notify_queue.get()
+            started = time.monotonic()
+            ok = True
+            try:
+                await send_telegram(message)
+            except Exception as e:
+                ok = False
+                print(f"[{now_kst()}] ❌ 알림 전송 실패: {e}")
+            finally:
+                self.notify_queue.task_done()
+            stats.record(time.monotonic() - started, ok=ok)
+
+    # --- summary ---
+    async def summary_stage(self):
+        stats = self.stats["summary"]
+        # 재시작 전 마지막 발송 블록 이후로 끝난 블록 보충 (기록이 없으면 보충 없이 다음 경계부터)
+        async with self.db_pool.acquire() as conn:
+            last_sent = await get_last_summary_block(conn)
+        self.summary_done_until = last_sent.astimezone(TIMEZONE) if last_sent is not None else None
+        if self.summary_done_until is not None:
+            await self._send_pending_summaries(get_last_completed_block(now_kst(), SUMMARY_INTERVAL)[1], stats)
+
+        step = timedelta(seconds=SUMMARY_INTERVAL)
+        while True:
+            boundary = await self.summary_scheduler.wait()
+            # 수집 구간 밖(주말 등) 블록은 요약 대상이 아님 → 다음 구간의 첫 블록 종료까지 대기
+            if not self.calendar.is_active("watch", boundary - step):
+                resume = self.calendar.next_active_at("watch", boundary - step)
+                self.summary_done_until = resume
+                self.summary_scheduler.resume_at(resume + step)
+                print(f"[{now_kst()}] ⏸️ [summary] 휴장 구간 - {(resume + step).strftime('%Y-%m-%d %H:%M')} 블록부터 재개")
+                continue
+            # 경계 직전 틱이 아직 분석 대기 중이면 잠깐 기다려 블록 데이터를 확정
+            try:
+                await asyncio.wait_for(self.tick_queue.join(), timeout=SUMMARY_SETTLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"[{now_kst()}] ⚠️ [summary] 분석 대기 틱 {self.tick_queue.qsize()}건 - 현재 상태로 요약 진행")
+            await self._send_pending_summaries(boundary, stats)
+
+    async def _send_pending_summaries(self, until: datetime, stats: StageStats):
+        """
+        summary_done_until ~ until 사이에 끝난 블록을 오래된 순으로 발송 (최근 SUMMARY_CATCHUP_BLOCKS 개까지)
+        - 발송 실패 시 그 블록에서 멈추고 summary_done_until 을 유지 → 다음 경계에서 그 블록부터 재시도
+          (계속 실패하면 보충 한도를 벗어나는 시점에 생략되므로 뒤 블록이 무한정 밀리지 않음)
+        """
+        step = timedelta(seconds=SUMMARY_INTERVAL)
+        first_end = until - step * (SUMMARY_CATCHUP_BLOCKS - 1)
+        if self.summary_done_until is None:
+            first_end = until
+        elif self.summary_done_until + step > first_end:
+            first_end = self.summary_done_until + step
+        elif self.summary_done_until + step < first_end:
+            missed = int((first_end - self.summary_done_until) / step) - 1
+            print(f"[{now_kst()}] ⚠️ [summary] 보충 한도 초과로 {missed}개 블록 요약 생략")
+
+        block_end = first_end
+        while block_end <= until:
+            started = time.monotonic()
+            ok = True
+            try:
+                await self._send_block_summary(block_end - step, block_end)
+            except Exception as e:
+                ok = False
+                print(f"[{now_kst()}] ❌ 요약 발송 실패 ({block_end.strftime('%H:%M')}) - 다음 경계에서 재시도: {e}")
+            stats.record(time.monotonic() - started, SUMMARY_INTERVAL, ok)
+            if not ok:
+                if self.summary_done_until is None:
+                    # 발송 기록이 없던 첫 블록도 다음 경계에서 보충 대상이 되도록 시작점 고정
+                    self.summary_done_until = block_end - step
+                return
+            self.summary_done_until = block_end
+            block_end += step
+
+    async def _send_block_summary(self, block_start: datetime, block_end: datetime):
+        """블록 1개 요약: 틱 버퍼가 구간을 보장하면 메모리에서, 아니면 DB 에서 읽고 연결 반납 후 렌더/전송"""
+        now = now_kst()
+        # 알림 제한 시간에는 전송이 버려지므로 조회/차트 렌더부터 생략
+        if not self.calendar.is_active("notify", now):
+            print(f"[{now}] ⏸️ 30분 요약 생략: 알림 제한 시간 ({block_start.strftime('%H:%M')} ~ {block_end.strftime('%H:%M')})")
+            return
+        ticks = self.state.ticks
+        recent_rates = ticks.between(block_start, block_end) if ticks.covers(block_start) else None
+        async with self.db_pool.acquire() as conn:
+            if recent_rates is None:
+                recent_rates = await get_rates_in_block(conn, block_start, block_end)
+            major_events = await get_recent_major_events(conn, block_end) if recent_rates else []
 
-                if is_weekend():
-                    print(f"[{now}] ⏸️ 주말 감지됨. 루프 일시 중지 중...")
-                    await asyncio.sleep(CHECK_INTERVAL)
-                    continue
+        if not recent_rates:
+            print(f"[{now}] ⏸️ 30분 요약 생략: 데이터 없음 ({block_start.strftime('%H:%M')} ~ {block_end.strftime('%H:%M')})")
+            return
 
-                async with db_pool.acquire() as conn:
-
-                    if is_scrape_time(last_scraped_date):
-                        try:
-                            result = fetch_expected_range()
-                            msg = (
-                                "📊 *오늘의 환율 예상 범위 (전문가 제시)*\n\n"
-                                "📌 *주요 외환 딜러들의 예측*\n"
-                                f"- 예상 하단: *{result['low']:.2f}원*\n"
-                                f"- 예상 상단: *{result['high']:.2f}원*\n\n"
-                                "💡 이 수치는 주요 은행 및 글로벌 외환 딜러들이 제시한 예측값으로,\n"
-                                "   하루 환율 흐름을 가늠할 수 있는 *신뢰도 높은 참고 지표*입니다.\n"
-                                f"(출처: {result['source']})"
-                            )
-
-                            print(msg)
-                            await store_expected_range(conn, datetime.now().date(), result["low"], result["high"], result["source"])
-                            await send_telegram(msg)
-                            last_scraped_date = now.date()
-                        except Exception as e:
-                            err_msg = f"⚠️ 예상 범위 스크래핑 실패: {e}"
-                            print(err_msg)
-                            await send_telegram(err_msg, target_chat_ids=["7650730456"])
-
-                    rate = get_usdkrw_rate()
-                    if rate:
-                        print(f"[{now}] 📈 현재 환율: {rate}")
-                        await store_rate(conn, rate)
-
-                        rates = await get_recent_rates(conn, LONG_TERM_PERIOD)
-                        # Compute ATR (close-only fallback) for gating context
-                        atr_val = None
-                        try:
-                            closes = [r[1] if isinstance(r, (list, tuple)) else float(r) for r in rates]
-                        except Exception:
-                            closes = rates
-                        if closes and len(closes) >= 15:
-                            atr_val = atr_from_rates([], [], closes, period=14)
-
-                            # 10분 추세 이벤트 감지
-                            trend_msg = await detect_and_format_10min_trend_event(conn, now, atr_val)
-                            if trend_msg:
-                                await send_telegram(trend_msg)
-
-                        reversal_msgs = await check_breakout_reversals(conn, rate, now)
-                        for r_msg in reversal_msgs:
-                            await send_telegram(r_msg)
-
-                        expected_range = await get_today_expected_range(conn)
-                        e_msg, e_struct = analyze_expected_range(rate, expected_range, now)
-                        j_msg, j_struct = analyze_jump(prev_rate, rate)
-
-                        c_msg, temp_state["short_avg"], temp_state["long_avg"], temp_state["type"], c_struct = analyze_crossover(
-                            rates=rates,
-                            prev_short_avg=temp_state["short_avg"],
-                            prev_long_avg=temp_state["long_avg"],
-                            prev_signal_type=temp_state["type"],
-                            prev_price=prev_rate,
-                            current_price=rate
-                        )
-
-                        b_status, b_msgs, upper_streak, lower_streak, prev_upper_level, prev_lower_level, b_struct = await analyze_bollinger(
-                            conn=conn,
-                            rates=rates,
-                            current=rate,
-                            prev=prev_rate,
-                            prev_upper=prev_upper_level,
-                            prev_lower=prev_lower_level,
-                            cross_msg=c_msg,
-                            jump_msg=j_msg,
-                            prev_status=temp_state.get("b_status")
-                        )
-                        temp_state["b_status"] = b_status
-
-                        # 부팅 직후에는 크로스오버 알림(상태 유지/전환)을 한 번 무음 처리
-                        if startup_mute_crossover:
-                            single_msgs = [msg for msg in [j_msg, e_msg] if msg]
-                        else:
-                            single_msgs = [msg for msg in [j_msg, c_msg, e_msg] if msg]
-
-                        single_msgs.extend(b_msgs)
-
-                        decision_result = make_decision(
-                            b_status,
-                            b_msgs[0] if b_msgs else None,
-                            j_msg,
-                            c_msg,
-                            e_msg,
-                            upper_streak,
-                            lower_streak,
-                            prev_upper_level,
-                            prev_lower_level,
-                            b_struct=b_struct,
-                            j_struct=j_struct,
-                            c_struct=c_struct,
-                            e_struct=e_struct,
-                            # context for gates/decider
-                            current_price=rate,
-                            current_atr=atr_val,
-                            near_event=False,
-                        )
-
-                        if decision_result:
-                            prev_upper_level = decision_result["new_upper_level"]
-                            prev_lower_level = decision_result["new_lower_level"]
-                            await send_telegram(decision_result["message"])
-                        else:
-                            for msg in single_msgs:
-                                await send_telegram(msg)
-
-                        prev_rate = rate
-                        # 최초 루프 완료 후 크로스오버 무음 해제
-                        if startup_mute_crossover:
-                            startup_mute_crossover = False
-
-                        # ✅ 현재 시각 확보 (로그 및 elapsed 시간 출력용)
-                        now = now_kst()
-
-                        # ✅ 30분 요약 및 그래프 생성 시점 판별 (항상 최신 시각 기준으로 블록 계산)
-                        current = now_kst()
-                        block_start, block_end = get_recent_completed_30min_block(current)
-
-                        # ✅ block_end 기준 ±120초 내 도달 여부 판단
-                        elapsed_sec = (current - block_end).total_seconds()
-                        print(f"[{now}] ⏳ 블록 판단 시점: {current}, ⏳ 블록 종료 시점: {block_end}, elapsed_sec: {elapsed_sec:.1f}초")
-
-                        # block_end 기준 ±1분 40초 내에서만 수행
-                        if -60 <= elapsed_sec <= 140:
-                            if last_summary_sent != block_end:
-                                try:
-                                    # 정확한 블록 범위 기준으로 데이터 조회
-                                    recent_rates = await get_rates_in_block(conn, block_start, block_end)
-
-                                    if recent_rates:
-                                        major_events = await get_recent_major_events(conn, block_end)
-
-                                        async def _send_text(msg: str):
-                                            await send_telegram(msg)
-                                        async def _send_photo(buf):
-                                            await send_photo(buf)
-
-                                        await send_30min_summary_then_chart(
-                                            start_time=block_start,
-                                            end_time=block_end,
-                                            rates=recent_rates,
-                                            major_events=major_events,
-                                            send_text=_send_text,
-                                            send_photo=_send_photo,
-                                            ensure_gap_ms=150,
-                                        )
-                                        print(f"[{now}] ✅ 30분 요약/차트 전송 완료 ({block_start.strftime('%H:%M')} ~ {block_end.strftime('%H:%M')})")
-                                        last_summary_sent = block_end
-                                    else:
-                                        print(f"[{now}] ⏸️ 30분 요약 생략: 최근 데이터 부족")
-                                except Exception as e:
-                                    print(f"[{now}] ❌ 요약 발송 실패: {e}")
-                            else:
-                                print(f"[{now}] ⏸️ 이미 {block_end.strftime('%H:%M')} 블록 발송 완료, 생략")
-                        else:
-                            print(f"[{now}] ⏸️ 요약 조건 미충족 (block_end={block_end.strftime('%H:%M')}, now={now.strftime('%H:%M:%S')})")
-                            # 추가: 항상 최신 블록 요약 실행
-                            # try:
-                            #     await run_summary_once(db_pool)
-                            # except Exception as e:
-                            #     print(f"[{now}] ❌ 루프 내 임시 요약 실행 실패: {e}")
-
-
-                    else:
-                        print(f"[{now}] ❌ 환율 조회 실패")
+        async def _send_text(msg: str):
+            await send_telegram(msg)
+        async def _send_photo(buf):
+            await send_photo(buf)
+        async def _send_photo_with_caption(buf, caption: str):
+            await send_photo(buf, caption=caption)
+
+        await send_30min_summary_then_chart(
+            start_time=block_start,
+            end_time=block_end,
+            rates=recent_rates,
+            major_events=major_events,
+            send_text=_send_text,
+            send_photo=_send_photo,
+            send_photo_with_caption=_send_photo_with_caption,
+            caption_limit=CAPTION_LIMIT,
+            bar=self.state.bars.bar_at(SUMMARY_INTERVAL, block_start),
+        )
+        async with self.db_pool.acquire() as conn:
+            await record_summary_sent(conn, block_start, block_end)
+        print(f"[{now}] ✅ 30분 요약/차트 전송 완료 ({block_start.strftime('%H:%M')} ~ {block_end.strftime('%H:%M')})")
+
+    # --- 통계 / 실행 ---
+    def report(self) -> str:
+        stages = " | ".join(s.summary() for s in self.stats.values())
+        queues = (
+            f"tick {self.tick_queue.qsize()}/{self.tick_queue.maxsize}, "
+            f"notify {self.notify_queue.qsize()}/{self.notify_queue.maxsize}"
+        )
+        return (
+            f"🧵 파이프라인: {stages} | 큐 {queues} | "
+            f"스케줄러 {self.scheduler.summary()} | 요약 스케줄러 {self.summary_scheduler.summary()} | "
+            f"폴링 {self.poller.summary()}"
+        )
+
+    async def report_stage(self):
+        while True:
+            await asyncio.sleep(PIPELINE_REPORT_INTERVAL)
+            print(f"[{now_kst()}] {self.report()}")
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def run(self):
+        producers = [asyncio.create_task(self.fetch_stage()), asyncio.create_task(self.analyze_stage())]
+        consumers = [
+            asyncio.create_task(self.notify_stage()),
+            asyncio.create_task(self.summary_stage()),
+            asyncio.create_task(self.report_stage()),
+        ]
+        try:
+            await asyncio.gather(*producers, *consumers)
+        finally:
+            for task in producers:
+                task.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+            # 이미 만들어진 알림은 잠깐 기다려 마저 전송
+            try:
+                await asyncio.wait_for(self.notify_queue.join(), timeout=10)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                print(f"[{now_kst()}] ⚠️ 종료 시 미전송 알림 {self.notify_queue.qsize()}건")
+            for task in consumers + list(self._background):
+                task.cancel()
+            await asyncio.gather(*consumers, *self._background, return_exceptions=True)
+            print(f"[{now_kst()}] {self.report()}")
 
-            except Exception as e:
-                print(f"[{now_kst()}] ❌ 루프 내부 오류: {e}")
 
-            await asyncio.sleep(CHECK_INTERVAL)
+async def run_daily_maintenance(db_pool):
+    """일일 DB 관리: 다음 달들 rates 파티션 확보 + 보관 작업 (전용 연결, 틱 처리와 별도 태스크)"""
+    try:
+        async with db_pool.acquire() as conn:
+            await ensure_rate_partitions(conn)
+            await run_retention(conn)
+    except Exception as e:
+        print(f"[{now_kst()}] ⚠️ 일일 DB 관리 실패: {e}")
 
+
+async def run_watcher(db_pool):
+    """
+    환율 모니터링 메인 루프
+    - 실시간 환율 수집 및 저장
+    - 다양한 전략 분석 수행 및 Telegram 알림 전송
+    - 30분 요약 메시지 및 차트 자동 전송
+    - 단계별 파이프라인(WatcherPipeline)으로 실행: 느린 전송/차트가 다음 시세 수집을 막지 않음
+    """
+    print(f"[{now_kst()}] 🏋️️ 워치 시작")
+    await send_start_message()
+
+    # 전략 공용 증분 이동 통계 (볼린저/크로스/z-score) 및 인메모리 틱 버퍼
+    state = WatcherState()
+    ticks = state.ticks
+
+    # 스키마 마이그레이션(테이블/인덱스) → 볼린저 확률 조회용 이력 최초 1회 백필 및 인메모리 인덱스 적재
+    async with db_pool.acquire() as conn:
+        await run_migrations(conn)
+        await backfill_bollinger_history(conn, MOVING_AVERAGE_PERIOD)
+        await warm_breakout_index(conn, MOVING_AVERAGE_PERIOD)
+        seed_rows = await get_recent_rate_rows(conn, TICK_BUFFER_SIZE)
+        ticks.seed(seed_rows, complete=len(seed_rows) < TICK_BUFFER_SIZE)
+        state.stats.seed(ticks.last(LONG_TERM_PERIOD))
+        # OHLC 캔들: 최초 1회 백필 후 틱 버퍼로 진행 중 캔들까지 복원
+        await backfill_bars(conn, BAR_INTERVALS)
+        state.bars.seed(seed_rows)
+
+    # rates / bollinger_history / breakout_events 는 지연 일괄 저장 (틱 처리 경로에서 쓰기 왕복 제거)
+    write_buffer = WriteBehindBuffer(db_pool)
+    set_write_buffer(write_buffer)
+    write_buffer.start()
+
+    try:
+        await WatcherPipeline(db_pool, state).run()
     finally:
+        await close_http_session()
+        shutdown_chart_pool()
+        # 판정 대기 중인 볼린저 이력 행까지 큐에 넣고, 남은 지연 저장분을 풀 종료 전에 모두 flush
+        try:
+            async with db_pool.acquire() as conn:
+                await flush_bollinger_history(conn, MOVING_AVERAGE_PERIOD)
+        except Exception as e:
+            print(f"[{now_kst()}] ⚠️ 종료 시 볼린저 이력 적재 실패: {e!r}")
+        try:
+            await write_buffer.close()
+        except Exception as e:
+            print(f"[{now_kst()}] ❌ 지연 저장 버퍼 종료 실패: {e!r}")
+        set_write_buffer(None)
         await db_pool.close()
-        print(f"[{datetime.now()}] 🚭 워치 종료. DB 커넥션 종료 완료")
\ No newline at end of file
+        print(f"[{datetime.now()}] 🚭 워치 종료. DB 커넥션 종료 완료")
@@ -3,7 +3,7 @@ from .bollinger import analyze_bollinger, check_breakout_reversals
 from .crossover import analyze_crossover
 from .jump import analyze_jump
 from .expected_range import analyze_expected_range
-from .summary import generate_30min_summary, generate_30min_chart, send_30min_summary_then_chart 
+from .summary import generate_30min_summary, generate_30min_chart, render_30min_chart, send_30min_summary_then_chart
 
 __all__ = [
     "analyze_bollinger",
@@ -13,5 +13,6 @@ __all__ = [
     "check_breakout_reversals",
     "generate_30min_summary",
     "generate_30min_chart",
+    "render_30min_chart",
     "send_30min_summary_then_chart"
 ]
\ No newline at end of file
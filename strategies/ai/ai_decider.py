@@ -105,6 +105,11 @@ try:
 except Exception:
     OpenAI = None
 
+
+def llm_decision_enabled() -> bool:
+    """LLM 판단 설명 사용 여부 (USE_LLM_DECISION=1, openai 설치, OPENAI_API_KEY 설정)"""
+    return os.getenv("USE_LLM_DECISION", "0") == "1" and OpenAI is not None and bool(os.getenv("OPENAI_API_KEY"))
+
 def llm_decide_explain(
     *,
     structs: Dict[str, tuple],
@@ -124,9 +129,7 @@ def llm_decide_explain(
         "headline": "상승 전환"
     }
     """
-    if os.getenv("USE_LLM_DECISION", "0") != "1":
-        return None
-    if OpenAI is None or not os.getenv("OPENAI_API_KEY"):
+    if not llm_decision_enabled():
         return None
 
     sigs = {}
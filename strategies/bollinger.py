@@ -1,6 +1,5 @@
 # strategies/bollinger.py
 
-from statistics import mean, stdev
 from config import MOVING_AVERAGE_PERIOD
 from strategies.utils.streak import get_streak_advisory
 from db import (
@@ -11,8 +10,8 @@ from db import (
     mark_breakout_resolved
 )
 from utils import now_kst
-from strategies.utils.signal_utils import zscore, rolling_stdev, sma
-from collections import deque
+from strategies.utils.rolling import RollingQuantiles
+from strategies.utils.indicator_context import IndicatorContext
 
 SQUEEZE_LOOKBACK = 60          # 최근 60틱 기준
 SQUEEZE_PCTL = 0.20            # 하위 20%면 스퀴즈
@@ -20,16 +19,21 @@ RETEST_TOL = 0.15              # 리테스트 허용 오차(원)
 MIN_Z_FOR_TREND = 1.0          # 추세성 돌파로 인정할 z
 EPSILON = 0.01  # 기준선과 거의 같은 경우 오차 허용
 
-# 최근 밴드폭 이력 (스퀴즈 판별용)
-BAND_WIDTH_HISTORY = deque(maxlen=SQUEEZE_LOOKBACK * 2)
+# 스퀴즈 판정용 추가 lookback (예: (240, 2000)) - 기본 판정과 함께 이동 분위수를 유지해 정의 비교에 사용
+SQUEEZE_EXTRA_LOOKBACKS: tuple[int, ...] = ()
 
-def _is_squeeze(band_width_series):
-    if len(band_width_series) < SQUEEZE_LOOKBACK:
-        return False
-    bw = band_width_series[-1]
-    hist = sorted(band_width_series[-SQUEEZE_LOOKBACK:])
-    threshold = hist[int(len(hist) * SQUEEZE_PCTL)]
-    return bw <= threshold
+# 최근 밴드폭 이동 분위수 (스퀴즈 판별용)
+BAND_WIDTH_HISTORY = RollingQuantiles((SQUEEZE_LOOKBACK, *SQUEEZE_EXTRA_LOOKBACKS))
+
+def reset_band_width_history():
+    """현재 SQUEEZE_LOOKBACK / SQUEEZE_EXTRA_LOOKBACKS 설정으로 밴드폭 이력 재생성"""
+    global BAND_WIDTH_HISTORY
+    BAND_WIDTH_HISTORY = RollingQuantiles((SQUEEZE_LOOKBACK, *SQUEEZE_EXTRA_LOOKBACKS))
+
+def _is_squeeze(band_width, lookback=None, pctl=None):
+    """최근 lookback 개 밴드폭의 하위 pctl 분위수 이하이면 스퀴즈 (이력이 모자라면 False)"""
+    threshold = BAND_WIDTH_HISTORY.quantile(lookback or SQUEEZE_LOOKBACK, SQUEEZE_PCTL if pctl is None else pctl)
+    return threshold is not None and band_width <= threshold
 
 def _retest_confirmed(last_price, baseline, direction):
     # 상단 돌파 후 baseline(상단밴드) 재확인 or 하단 이탈 후 하단밴드 재확인
@@ -187,13 +191,16 @@ async def analyze_bollinger(
     prev_lower: int = 0,
     cross_msg: str = None,
     jump_msg: str = None,
-    prev_status: str = None  # ✅ 추가: 이전 상태 전달
+    prev_status: str = None,  # ✅ 추가: 이전 상태 전달
+    indicators: IndicatorContext | None = None  # 틱 공용 지표 메모 (없으면 rates로 직접 계산)
 ) -> tuple[str | None, list[str], int, int, int, int, dict | None]:
-    if len(rates) < MOVING_AVERAGE_PERIOD:
+    if indicators is None:
+        indicators = IndicatorContext(rates)
+    avg = indicators.mean(MOVING_AVERAGE_PERIOD)
+    std = indicators.stdev(MOVING_AVERAGE_PERIOD)
+    if avg is None or std is None:
         return None, [], prev_upper, prev_lower, 0, 0, None
-
-    avg = mean(rates[-MOVING_AVERAGE_PERIOD:])
-    std = stdev(rates[-MOVING_AVERAGE_PERIOD:])
+    z = indicators.zscore(MOVING_AVERAGE_PERIOD) or 0.0
     upper = avg + 2 * std
     lower = avg - 2 * std
     band_width = upper - lower
@@ -202,9 +209,8 @@ async def analyze_bollinger(
         return None, [], prev_upper, prev_lower, 0, 0, None
 
     # 🔎 스퀴즈/신뢰도 보강
-    BAND_WIDTH_HISTORY.append(band_width)
-    is_squeeze = _is_squeeze(list(BAND_WIDTH_HISTORY))
-    z = zscore(rates, MOVING_AVERAGE_PERIOD) or 0.0
+    BAND_WIDTH_HISTORY.push(band_width)
+    is_squeeze = _is_squeeze(band_width)
 
     volatility_label, volatility_comment = get_volatility_info(band_width)
 
@@ -1,6 +1,5 @@
-from statistics import mean
 from utils.time import now_kst
-from strategies.utils.signal_utils import sma
+from strategies.utils.indicator_context import IndicatorContext
 
 from config import (
     SHORT_TERM_PERIOD, LONG_TERM_PERIOD,
@@ -24,19 +23,22 @@ last_report_time = {
 
 def analyze_crossover(
     rates, prev_short_avg, prev_long_avg,
-    prev_signal_type=None, prev_price=None, current_price=None
+    prev_signal_type=None, prev_price=None, current_price=None,
+    indicators: IndicatorContext | None = None
 ):
     """
     골든/데드크로스 감지 및 메시지 생성 (운영용 최종 버전)
     - 전환 발생 시 즉시 메시지
     - 유지 상태는 의미 있는 변화 발생 시 15분 간격 발송
     - 변화 없으면 1시간마다 리마인드
+    - indicators(틱 공용 지표 메모)가 주어지면 단기/장기 평균을 공유 캐시에서 조회
     """
-    if len(rates) < LONG_TERM_PERIOD:
+    if indicators is None:
+        indicators = IndicatorContext(rates)
+    long_ma = indicators.sma(LONG_TERM_PERIOD)
+    if long_ma is None:
         return None, prev_short_avg, prev_long_avg, prev_signal_type, None
-
-    short_ma = mean(rates[-SHORT_TERM_PERIOD:])
-    long_ma = mean(rates[-LONG_TERM_PERIOD:])
+    short_ma = indicators.sma(SHORT_TERM_PERIOD)
     spread_now = short_ma - long_ma
     now = now_kst()
     struct_signal = None
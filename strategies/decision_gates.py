@@ -21,11 +21,16 @@ class GateConfig:
     p_lo_vol: float = 0.65     # 저변동 확률
     p_hi_vol: float = 0.57     # 고변동 확률
 
+# 기본 게이트 설정 (파라미터 스윕 시 워커에서 교체)
+GATE_CONFIG = GateConfig()
+
 def decide_with_gates(structs: Dict[str, Tuple[int, float, str]],
                       probs: Dict[str, float],
                       ctx: PriceCtx,
-                      cfg: GateConfig = GateConfig()) -> tuple[str, str]:
+                      cfg: GateConfig | None = None) -> tuple[str, str]:
     """returns (action: 'buy'|'sell'|'hold', reason)"""
+    if cfg is None:
+        cfg = GATE_CONFIG
     # 활성 신호 ≥2 검증
     active = [k for k,(d,c,_) in structs.items() if d != 0 and c > 0]
     if len(active) < 2:
@@ -2,15 +2,17 @@
 
 from config import JUMP_THRESHOLD
 from strategies.utils.signal_utils import atr_from_rates
+from strategies.utils.indicator_context import IndicatorContext
 
 REL_JUMP = 0.6   # ATR 대비 60% 이상 움직이면 급변
 COOLDOWN_TICKS = 3
 
 _last_jump_time = None
 
-def analyze_jump(prev, current, highs=None, lows=None, closes=None, now=None):
+def analyze_jump(prev, current, highs=None, lows=None, closes=None, now=None, indicators: IndicatorContext | None = None):
     """
     급변 감지
+    - indicators(틱 공용 지표 메모)가 주어지면 ATR 을 공유 캐시에서 조회 (highs/lows/closes 무시)
     Returns: (message_or_none, struct_or_none)
       struct = {
         "key": "jump",
@@ -24,7 +26,10 @@ def analyze_jump(prev, current, highs=None, lows=None, closes=None, now=None):
         return None, None
 
     diff = round(current - prev, 2)
-    atr = atr_from_rates(highs or [], lows or [], closes or [], period=14)
+    if indicators is not None:
+        atr = indicators.atr(14)
+    else:
+        atr = atr_from_rates(highs or [], lows or [], closes or [], period=14)
     if not atr:
         atr = JUMP_THRESHOLD  # 백업: 기존 절대임계
 
@@ -1,14 +1,14 @@
+import asyncio
 from datetime import datetime, timedelta
 from statistics import mean, stdev
 from config import MOVING_AVERAGE_PERIOD
 from io import BytesIO
 from datetime import datetime
-import matplotlib.pyplot as plt # type: ignore
 from pytz import timezone
 from strategies.utils.score_bar import make_score_gauge
+from utils.charts import render_30min_chart_png, render_in_pool
 from strategies.ai.ai_decider import AIDecider
 from strategies.ai.ai_summary import compose_freeform_30m
-import asyncio
 from typing import Awaitable, Callable, Optional
 
 # === Trend classification thresholds (tunable) ===
@@ -84,12 +84,14 @@ def generate_30min_summary(
     start_time: datetime,
     end_time: datetime,
     rates: list[tuple[datetime, float]],
-    major_events: list[str] = None
+    major_events: list[str] = None,
+    bar=None
 ) -> str:
     """
     30분 간 환율 요약 메시지 생성
     - 추세 분석, 최근 10분 기울기, 변동폭 분석 포함
     - 주요 이벤트와 종합 해석 제공
+    - bar: 해당 블록의 30분 OHLC 캔들 (있으면 시가/고가/저가/종가를 재계산 없이 사용)
     """
 
     if not rates:
@@ -97,10 +99,13 @@ def generate_30min_summary(
 
     # 📌 데이터 정렬 및 기초 통계
     sorted_rates = sorted(rates, key=lambda x: x[0])
-    start_rate = sorted_rates[0][1]
-    end_rate = sorted_rates[-1][1]
-    high = max(r[1] for r in sorted_rates)
-    low = min(r[1] for r in sorted_rates)
+    if bar is not None:
+        start_rate, end_rate, high, low = bar.open, bar.close, bar.high, bar.low
+    else:
+        start_rate = sorted_rates[0][1]
+        end_rate = sorted_rates[-1][1]
+        high = max(r[1] for r in sorted_rates)
+        low = min(r[1] for r in sorted_rates)
     diff = round(end_rate - start_rate, 2)
     band_width = round(high - low, 2)
 
@@ -233,11 +238,10 @@ def generate_30min_summary(
 
 
 
-def generate_30min_chart(rates: list[tuple[datetime, float]]) -> BytesIO | None:
+def _prepare_30min_chart(rates: list[tuple[datetime, float]]) -> tuple[list[str], list[float], str] | None:
     """
-    30분간 USD/KRW 환율 추이 그래프 생성
+    차트 입력 준비: (시각 라벨, 값, 추세 색상)
     - 상승: 빨강, 하락: 파랑, 횡보: 회색
-    - 시작/종료 시점 강조 표시
     - 데이터 부족 시 None 반환
     """
 
@@ -270,61 +274,34 @@ def generate_30min_chart(rates: list[tuple[datetime, float]]) -> BytesIO | None:
     else:
         color = "gray"  # 횡보 (표시상 동일로 간주)
 
-    # ✅ 차트 그리기
-    plt.figure(figsize=(6, 3))
+    return times, values, color
 
-    # y축 범위: 최소 1.00원 폭을 보장, 더 큰 변동일 때만 pad 적용
-    rng = v_max - v_min
-    if rng <= 2.0:
-        # 기본 2원 폭으로 고정
-        center = (v_max + v_min) / 2.0
-        y_min, y_max = center - 1.0, center + 1.0
-    else:
-        # 실제 변동 폭이 2원 이상일 경우 유동적으로 조정
-        pad = rng * 0.5
-        y_min, y_max = v_min - pad, v_max + pad
-    plt.ylim(y_min, y_max)
-
-    plt.plot(times, values, marker="o", linewidth=2, color=color)
-
-    # ✅ 처음, 중간, 마지막만 금액 표시
-    n = len(values)
-    mid_index = n // 2
-    for i, (t, v) in enumerate(zip(times, values)):
-        if i in (0, mid_index, n - 1):
-            plt.text(
-                t, v, f"{v:.2f}",
-                fontsize=8, color="black", ha="center", va="bottom",
-                bbox=dict(facecolor="white", edgecolor="none", alpha=0.7, boxstyle="round,pad=0.2")
-            )
-
-    plt.xticks(rotation=45)
-    plt.title("USD/KRW Last 30 min")  # 영어 제목 유지
-    plt.xlabel("Time")
-    plt.ylabel("KRW")
-    plt.grid(True)
-
-    # ✅ 시작점, 종료점 강조
-    def annotate_point(x, y, label, align="right"):
-        ha = "right" if align == "right" else "left"
-        size = 60 if align == "right" else 80
-        plt.scatter(x, y, color=color, s=size, edgecolors="black", zorder=5)
-        plt.text(
-            x, y, f"{label:.2f}", fontsize=9, color="black", ha=ha, va="bottom",
-            bbox=dict(facecolor="white", edgecolor="gray", boxstyle="round,pad=0.2")
-        )
 
-    annotate_point(times[0], values[0], round(values[0], 2), align="right")
-    annotate_point(times[-1], values[-1], round(values[-1], 2), align="left")
+def generate_30min_chart(rates: list[tuple[datetime, float]]) -> BytesIO | None:
+    """
+    30분간 USD/KRW 환율 추이 그래프 생성 (현재 프로세스에서 동기 렌더링)
+    - 시작/종료 시점 강조 표시
+    - 데이터 부족 시 None 반환
+    - 이벤트 루프 안에서는 render_30min_chart 사용
+    """
+    prepared = _prepare_30min_chart(rates)
+    if prepared is None:
+        return None
+    buf = BytesIO(render_30min_chart_png(*prepared))
+    print(f"✅ 차트 생성 완료 (데이터 {len(prepared[1])}건)")
+    return buf
 
-    # ✅ 메모리 버퍼에 저장
-    buf = BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    plt.close()
 
-    print(f"✅ 차트 생성 완료 (데이터 {len(values)}건)")
+async def render_30min_chart(rates: list[tuple[datetime, float]]) -> BytesIO | None:
+    """
+    generate_30min_chart 의 비동기 버전
+    - 렌더링(Figure 생성/tight_layout/savefig)을 워커 프로세스에서 수행해 이벤트 루프를 막지 않음
+    """
+    prepared = _prepare_30min_chart(rates)
+    if prepared is None:
+        return None
+    buf = BytesIO(await render_in_pool(render_30min_chart_png, *prepared))
+    print(f"✅ 차트 생성 완료 (데이터 {len(prepared[1])}건)")
     return buf
 
 async def send_30min_summary_then_chart(
@@ -334,24 +311,28 @@ async def send_30min_summary_then_chart(
     major_events: Optional[list[str]],
     send_text: Callable[[str], Awaitable[None]],
     send_photo: Callable[[BytesIO], Awaitable[None]],
-    ensure_gap_ms: int = 150,
+    send_photo_with_caption: Optional[Callable[[BytesIO, str], Awaitable[None]]] = None,
+    caption_limit: int = 1024,
+    bar=None,
 ) -> None:
     """
-    텔레그램(또는 임의의 송신기)로 30분 요약 텍스트를 먼저 전송하고,
-    그 다음 차트를 전송하도록 보장하는 헬퍼.
+    텔레그램(또는 임의의 송신기)로 30분 요약 텍스트와 차트를 전송하는 헬퍼.
 
     - send_text: async callable(str) -> None (예: bot.send_message 래퍼)
     - send_photo: async callable(BytesIO) -> None (예: bot.send_photo 래퍼)
-    - ensure_gap_ms: 메시지 간 최소 간격(ms)로, 클라이언트 정렬 문제 방지용
+    - send_photo_with_caption: async callable(BytesIO, str) -> None
+      주어지고 요약이 caption_limit 이하면 차트+요약을 한 메시지로 전송 (순서 문제 없음)
+    - bar: 블록의 30분 OHLC 캔들 (generate_30min_summary 로 전달)
+    - 그 외에는 텍스트 전송 완료 후 차트 전송 (송신기가 완료까지 await 하므로 순서 보장)
+    - 요약 생성(LLM 사용 가능)은 스레드, 차트 렌더링은 워커 프로세스에서 수행 → 이벤트 루프를 막지 않음
     """
-    # 1) 텍스트 먼저 생성/전송
-    text = generate_30min_summary(start_time, end_time, rates, major_events)
-    await send_text(text)
+    text = await asyncio.to_thread(generate_30min_summary, start_time, end_time, rates, major_events, bar=bar)
+    buf = await render_30min_chart(rates)
 
-    # 2) 짧은 간격 후에 차트 생성/전송 (클라이언트 정렬 보장)
-    if ensure_gap_ms > 0:
-        await asyncio.sleep(ensure_gap_ms / 1000.0)
+    if buf is not None and send_photo_with_caption is not None and len(text) <= caption_limit:
+        await send_photo_with_caption(buf, text)
+        return
 
-    buf = generate_30min_chart(rates)
+    await send_text(text)
     if buf is not None:
         await send_photo(buf)
@@ -6,16 +6,20 @@ from typing import Optional
 _last_trend_event_time = None
 _last_trend_event_type = None  # 'up10' | 'down10'
 
-async def detect_and_format_10min_trend_event(conn, now, atr_val: Optional[float]) -> Optional[str]:
+async def detect_and_format_10min_trend_event(conn, now, atr_val: Optional[float], ticks=None) -> Optional[str]:
     """
     Looks back 10 minutes and returns a formatted alert message if a strong up/down trend is detected.
     Cooldown: emits at most once per 10 minutes.
+    When an in-process TickBuffer covering the window is given, it is used instead of the DB.
     """
     from db.repository import get_rates_in_block  # local import to avoid circular imports
 
     try:
         window_start = now - timedelta(minutes=10)
-        recent_10 = await get_rates_in_block(conn, window_start, now)
+        if ticks is not None and ticks.covers(window_start):
+            recent_10 = ticks.between(window_start, now)
+        else:
+            recent_10 = await get_rates_in_block(conn, window_start, now)
         if not (recent_10 and len(recent_10) >= 3):
             return None
 
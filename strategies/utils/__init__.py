@@ -2,6 +2,10 @@
 from .score_bar import get_score_bar
 from .signal_utils import get_signal_score, get_signal_direction, generate_combo_summary, get_action_message
 from .streak import get_streak_advisory
+from .rolling import RollingWindow, RollingStats, RollingQuantiles
+from .indicator_context import IndicatorContext
+from .volatility_regime import RegimeReading, VolatilityRegime
+from .batch import compute_indicators, bollinger_bands, rolling_sma, rolling_std, rolling_zscore, close_atr, squeeze_flags
 
 __all__ = [
     "get_score_bar",
@@ -10,4 +14,17 @@ __all__ = [
     "generate_combo_summary",
     "get_streak_advisory",
     "get_action_message",
-]
\ No newline at end of file
+    "RollingWindow",
+    "RollingStats",
+    "RollingQuantiles",
+    "IndicatorContext",
+    "RegimeReading",
+    "VolatilityRegime",
+    "compute_indicators",
+    "bollinger_bands",
+    "rolling_sma",
+    "rolling_std",
+    "rolling_zscore",
+    "close_atr",
+    "squeeze_flags",
+]
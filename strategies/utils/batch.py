@@ -0,0 +1,173 @@
+# strategies/utils/batch.py
+"""
+전체 rates 이력에 대한 지표 일괄 계산 (NumPy 벡터화)
+
+- 틱마다 호출되는 스칼라 함수(signal_utils.sma/rolling_stdev/zscore/atr_from_rates,
+  bollinger._is_squeeze)와 같은 정의를 전 구간에 대해 한 번에 계산
+- 결과 배열의 i 번째 값 = rates[:i+1] 로 스칼라 함수를 호출한 값
+- 데이터가 모자란 구간은 NaN (squeeze 는 False)
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import MOVING_AVERAGE_PERIOD, SHORT_TERM_PERIOD, LONG_TERM_PERIOD
+
+# 누적합 구간 길이: 구간마다 기준값을 빼고 누적해 부동소수 상쇄 오차를 제한
+_CHUNK = 1 << 16
+# 윈도 편차 제곱합이 구간 누적 제곱합의 이 비율 이하이면 상쇄 오차가 크다고 보고 직접 계산
+_NOISE_RTOL = 1e-9
+# 슬라이딩 윈도 비교 시 한 번에 펼칠 행 수 (메모리 상한)
+_WINDOW_ROWS = 1 << 15
+
+
+def _as_array(rates) -> np.ndarray:
+    return np.ascontiguousarray(rates, dtype=np.float64)
+
+
+def _rolling_moments(x: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    길이 period 이동 윈도의 (평균, 표본분산) - 누적합 기반 O(n)
+    - 구간(_CHUNK)마다 구간 평균을 빼고 누적해 큰 값(1,400원대)의 제곱합 상쇄를 피함
+    - 앞쪽 period-1 개는 NaN
+    """
+    n = len(x)
+    mean = np.full(n, np.nan)
+    var = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return mean, var
+
+    for start in range(period - 1, n, _CHUNK):
+        stop = min(start + _CHUNK, n)
+        seg = x[start - period + 1:stop]
+        center = seg.mean()
+        d = seg - center
+        c1 = np.concatenate(([0.0], np.cumsum(d)))
+        c2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        s1 = c1[period:] - c1[:-period]
+        s2 = c2[period:] - c2[:-period]
+        m = s1 / period
+        mean[start:stop] = center + m
+        if period > 1:
+            ss = s2 - s1 * m
+            # 횡보(분산≈0) 윈도는 편차 제곱합이 누적합 반올림 오차에 묻힘 → 해당 윈도만 직접 계산
+            noisy = ss <= c2[-1] * _NOISE_RTOL
+            if noisy.any():
+                exact = sliding_window_view(d, period)[noisy]
+                exact_ss = exact.var(axis=1) * period
+                # 완전 횡보 윈도는 평균 반올림 잔차 없이 정확히 0 (스칼라 경로처럼 z=0 이 되도록)
+                exact_ss[np.ptp(exact, axis=1) == 0] = 0.0
+                ss[noisy] = exact_ss
+                mean[start:stop][noisy] = center + exact.mean(axis=1)
+            var[start:stop] = np.maximum(ss / (period - 1), 0.0)
+    return mean, var
+
+
+def rolling_sma(rates, period: int) -> np.ndarray:
+    """signal_utils.sma 의 전 구간 버전"""
+    return _rolling_moments(_as_array(rates), period)[0]
+
+
+def rolling_std(rates, period: int) -> np.ndarray:
+    """signal_utils.rolling_stdev 의 전 구간 버전 (표본표준편차, n-1)"""
+    return np.sqrt(_rolling_moments(_as_array(rates), period)[1])
+
+
+def rolling_zscore(rates, period: int) -> np.ndarray:
+    """signal_utils.zscore 의 전 구간 버전 (표준편차 0 이면 0.0)"""
+    x = _as_array(rates)
+    mean, var = _rolling_moments(x, period)
+    std = np.sqrt(var)
+    z = np.full(len(x), np.nan)
+    ok = ~np.isnan(std)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z[ok] = np.where(std[ok] > 0, (x[ok] - mean[ok]) / std[ok], 0.0)
+    return z
+
+
+def bollinger_bands(rates, period: int = MOVING_AVERAGE_PERIOD, k: float = 2.0) -> dict[str, np.ndarray]:
+    """볼린저 밴드 (mid, upper, lower, width, z) - bollinger.check_bollinger_alert 와 같은 정의"""
+    x = _as_array(rates)
+    mean, var = _rolling_moments(x, period)
+    std = np.sqrt(var)
+    upper = mean + k * std
+    lower = mean - k * std
+    z = np.full(len(x), np.nan)
+    ok = ~np.isnan(std)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z[ok] = np.where(std[ok] > 0, (x[ok] - mean[ok]) / std[ok], 0.0)
+    return {"mid": mean, "upper": upper, "lower": lower, "width": upper - lower, "z": z}
+
+
+def close_atr(rates, period: int = 14) -> np.ndarray:
+    """atr_from_rates([], [], closes, period) 의 전 구간 버전 (종가 절대 차분의 최근 period 평균)"""
+    x = _as_array(rates)
+    out = np.full(len(x), np.nan)
+    if len(x) < period + 1:
+        return out
+    diffs = np.abs(np.diff(x))
+    c = np.concatenate(([0.0], np.cumsum(diffs)))
+    out[period:] = (c[period:] - c[:-period]) / period
+    return out
+
+
+def rolling_rank(series, lookback: int) -> np.ndarray:
+    """
+    각 시점 값보다 작은 값이 최근 lookback 개 안에 몇 개인지 (자기 자신 포함 윈도)
+    - 앞쪽 lookback-1 개는 -1
+    - 전 구간 윈도를 한 번에 펼치지 않도록 _WINDOW_ROWS 행씩 나눠 비교
+    """
+    x = _as_array(series)
+    n = len(x)
+    out = np.full(n, -1, dtype=np.int64)
+    if lookback < 1 or n < lookback:
+        return out
+    windows = sliding_window_view(x, lookback)   # 복사 없는 (n-lookback+1, lookback) 뷰
+    for start in range(0, len(windows), _WINDOW_ROWS):
+        block = windows[start:start + _WINDOW_ROWS]
+        out[lookback - 1 + start:lookback - 1 + start + len(block)] = (block < block[:, -1:]).sum(axis=1)
+    return out
+
+
+def squeeze_flags(band_width, lookback: int | None = None, pctl: float | None = None) -> np.ndarray:
+    """
+    bollinger._is_squeeze 의 전 구간 버전
+    - 최근 lookback 개 밴드폭을 정렬해 int(lookback*pctl) 번째 값 이하이면 스퀴즈
+      ⇔ 현재 값보다 작은 값의 개수 ≤ int(lookback*pctl)
+    - NaN(밴드 미형성)·EPSILON 미만 구간은 건너뛰고 유효 밴드폭만으로 이력 구성 (BAND_WIDTH_HISTORY 와 동일)
+    """
+    from strategies.bollinger import SQUEEZE_LOOKBACK, SQUEEZE_PCTL, EPSILON
+
+    lookback = lookback or SQUEEZE_LOOKBACK
+    pctl = SQUEEZE_PCTL if pctl is None else pctl
+    bw = _as_array(band_width)
+    flags = np.zeros(len(bw), dtype=bool)
+    valid = np.flatnonzero(bw >= EPSILON)   # NaN 비교는 False
+    if len(valid) < lookback:
+        return flags
+    rank = rolling_rank(bw[valid], lookback)
+    flags[valid] = (rank >= 0) & (rank <= int(lookback * pctl))
+    return flags
+
+
+def compute_indicators(rates) -> dict[str, np.ndarray]:
+    """
+    전 구간 지표 일괄 계산
+    - boll_*: 볼린저 (MOVING_AVERAGE_PERIOD)
+    - sma_short / sma_long: 크로스오버 단기/장기선
+    - atr: 종가 기반 ATR(14)
+    - squeeze: 볼린저 스퀴즈 여부
+    """
+    x = _as_array(rates)
+    bands = bollinger_bands(x, MOVING_AVERAGE_PERIOD)
+    return {
+        "rate": x,
+        "boll_mid": bands["mid"],
+        "boll_upper": bands["upper"],
+        "boll_lower": bands["lower"],
+        "boll_width": bands["width"],
+        "zscore": bands["z"],
+        "sma_short": rolling_sma(x, SHORT_TERM_PERIOD),
+        "sma_long": rolling_sma(x, LONG_TERM_PERIOD),
+        "atr": close_atr(x, 14),
+        "squeeze": squeeze_flags(bands["width"]),
+    }
@@ -0,0 +1,93 @@
+# strategies/utils/indicator_context.py
+from collections import Counter
+
+from strategies.utils.rolling import RollingStats
+from strategies.utils.signal_utils import sma, rolling_stdev, atr_from_rates
+
+
+class IndicatorContext:
+    """
+    틱 1회 분석 동안 공유하는 지표 메모
+    - 워처가 틱마다 하나 만들어 모든 analyze_* 에 전달
+    - (지표명, 기간) 단위로 처음 요청될 때만 계산하고 이후에는 캐시 반환
+    - 증분 이동 통계(stats)의 윈도가 찼으면 O(1) 조회, 아니면 rates 로 직접 계산
+    - hits / misses 로 틱당 재사용 횟수 확인
+    """
+    def __init__(self, rates: list[float], stats: RollingStats | None = None, bars=None, atr_bar_interval: int = 300):
+        self.rates = rates
+        self.stats = stats
+        self.bars = bars
+        self.atr_bar_interval = atr_bar_interval
+        self._cache: dict[tuple, object] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def _memo(self, key: tuple, compute):
+        if key in self._cache:
+            self.hits[key[0]] += 1
+            return self._cache[key]
+        self.misses[key[0]] += 1
+        value = self._cache[key] = compute()
+        return value
+
+    def _stats_ready(self, period: int) -> bool:
+        return self.stats is not None and period in self.stats.windows and self.stats.ready(period)
+
+    @property
+    def last(self) -> float | None:
+        return self.rates[-1] if self.rates else None
+
+    def sma(self, period: int) -> float | None:
+        def compute():
+            if self._stats_ready(period):
+                return self.stats.sma(period)
+            return sma(self.rates, period)
+        return self._memo(("sma", period), compute)
+
+    mean = sma
+
+    def stdev(self, period: int) -> float | None:
+        """표본 표준편차 (n-1)"""
+        def compute():
+            if self._stats_ready(period):
+                return self.stats.stdev(period)
+            if len(self.rates) < max(period, 2):
+                return None
+            return rolling_stdev(self.rates, period)
+        return self._memo(("stdev", period), compute)
+
+    def zscore(self, period: int) -> float | None:
+        """signal_utils.zscore 와 같은 규약 (표준편차 0 이면 0.0) - 캐시된 sma/stdev 재사용"""
+        def compute():
+            m = self.sma(period)
+            if m is None:
+                return None
+            s = self.stdev(period)
+            if not s:
+                return 0.0
+            return (self.last - m) / s
+        return self._memo(("zscore", period), compute)
+
+    def hlc(self, interval: int, n: int) -> tuple[list[float], list[float], list[float]]:
+        """캔들 (highs, lows, closes) - 캔들 빌더가 없으면 빈 목록"""
+        def compute():
+            if self.bars is None:
+                return [], [], []
+            return self.bars.hlc(interval, n)
+        return self._memo(("hlc", interval, n), compute)
+
+    def atr(self, period: int = 14) -> float | None:
+        """캔들 고저가 TR 기준 ATR, 캔들이 모자라면 틱 종가 차분 ATR"""
+        def compute():
+            # 스윕: 틱별 ATR 을 미리 계산해 둔 통계(replay.precomputed.PrecomputedStats)면 그대로 사용
+            if self.stats is not None and period in getattr(self.stats, "atr_periods", ()):
+                return self.stats.atr(period)
+            highs, lows, closes = self.hlc(self.atr_bar_interval, period + 1)
+            if len(closes) >= period + 1:
+                return atr_from_rates(highs, lows, closes, period=period)
+            return atr_from_rates([], [], self.rates, period=period)
+        return self._memo(("atr", period), compute)
+
+    def cache_info(self) -> str:
+        keys = sorted(set(self.hits) | set(self.misses))
+        return ", ".join(f"{k} {self.hits[k]}/{self.hits[k] + self.misses[k]}" for k in keys)
@@ -0,0 +1,208 @@
+# strategies/utils/rolling.py
+from bisect import bisect_left, insort
+from math import sqrt
+from typing import Iterable, Optional
+
+
+class RollingWindow:
+    """
+    고정 길이 이동 윈도 (ring buffer + Welford 증분 평균/분산)
+    - push 1회당 O(1)
+    - 부동소수 누적 오차를 막기 위해 period 회마다 버퍼 기준으로 재계산 (분할상환 O(1))
+    """
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period는 1 이상이어야 합니다.")
+        self.period = period
+        self._buf = [0.0] * period
+        self._idx = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_resync = 0
+
+    def push(self, x: float):
+        x = float(x)
+        if self._count < self.period:
+            # 윈도가 차기 전: 일반 Welford 추가
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+        else:
+            # 윈도가 찬 뒤: 가장 오래된 값 y를 x로 교체
+            y = self._buf[self._idx]
+            old_mean = self._mean
+            self._mean = old_mean + (x - y) / self.period
+            self._m2 += (x - y) * (x - self._mean + y - old_mean)
+            self._since_resync += 1
+
+        self._buf[self._idx] = x
+        self._idx = (self._idx + 1) % self.period
+
+        if self._since_resync >= self.period:
+            self._resync()
+
+    def _resync(self):
+        window = self._buf if self._count == self.period else self._buf[:self._count]
+        m = sum(window) / len(window)
+        self._mean = m
+        self._m2 = sum((v - m) ** 2 for v in window)
+        self._since_resync = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.period
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self._count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        """표본 분산 (statistics.variance / STDDEV_SAMP 와 동일한 n-1 기준)"""
+        if self._count < 2:
+            return None
+        return max(0.0, self._m2 / (self._count - 1))
+
+    @property
+    def stdev(self) -> Optional[float]:
+        var = self.variance
+        return sqrt(var) if var is not None else None
+
+
+class RollingStats:
+    """
+    여러 기간의 이동 통계를 한 번의 push로 함께 갱신하는 엔진
+    - 기간별 mean / variance / stdev / SMA / EMA / z-score 를 O(1)로 조회
+    - 윈도가 아직 차지 않은 기간은 None 반환 (기존 sma/zscore 유틸과 동일한 규약)
+    """
+    def __init__(self, periods: Iterable[int], ema_periods: Iterable[int] = ()):
+        self.windows: dict[int, RollingWindow] = {p: RollingWindow(p) for p in periods}
+        self._ema: dict[int, Optional[float]] = {p: None for p in ema_periods}
+        self._ema_seed: dict[int, RollingWindow] = {p: RollingWindow(p) for p in ema_periods}
+        self.last: Optional[float] = None
+        self.count = 0
+
+    def push(self, x: float):
+        x = float(x)
+        for w in self.windows.values():
+            w.push(x)
+        for p, e in self._ema.items():
+            if e is None:
+                # 최초 period 개는 SMA로 시드
+                seed = self._ema_seed[p]
+                seed.push(x)
+                if seed.ready:
+                    self._ema[p] = seed.mean
+            else:
+                k = 2 / (p + 1)
+                self._ema[p] = x * k + e * (1 - k)
+        self.last = x
+        self.count += 1
+
+    def seed(self, series: Iterable[float]):
+        """DB 등에서 읽은 과거 시계열로 초기화 (오래된 순)"""
+        for x in series:
+            self.push(x)
+
+    def ready(self, period: int) -> bool:
+        w = self.windows.get(period)
+        return bool(w and w.ready)
+
+    def _window(self, period: int) -> Optional[RollingWindow]:
+        w = self.windows.get(period)
+        if w is None:
+            raise KeyError(f"등록되지 않은 기간: {period}")
+        return w if w.ready else None
+
+    def mean(self, period: int) -> Optional[float]:
+        w = self._window(period)
+        return w.mean if w else None
+
+    sma = mean
+
+    def variance(self, period: int) -> Optional[float]:
+        w = self._window(period)
+        return w.variance if w else None
+
+    def stdev(self, period: int) -> Optional[float]:
+        w = self._window(period)
+        return w.stdev if w else None
+
+    def ema(self, period: int) -> Optional[float]:
+        if period not in self._ema:
+            raise KeyError(f"등록되지 않은 EMA 기간: {period}")
+        return self._ema[period]
+
+    def zscore(self, period: int) -> Optional[float]:
+        """마지막 값이 최근 period 평균 대비 얼마나 벗어났는지 표준화"""
+        w = self._window(period)
+        if w is None:
+            return None
+        s = w.stdev
+        if not s:
+            return 0.0
+        return (self.last - w.mean) / s
+
+
+class RollingQuantiles:
+    """
+    여러 lookback 의 이동 분위수(order statistic)를 함께 유지하는 구조
+    - 값 ring buffer 1개 + lookback 별 정렬 배열
+    - push: lookback 마다 빠지는 값 1개 bisect 제거 + 새 값 insort (탐색 O(log N), 이동은 memmove)
+    - quantile/rank 조회는 정렬 배열 인덱싱/이분 탐색으로 O(1)/O(log N) → 매 틱 sorted() 불필요
+    """
+    def __init__(self, lookbacks: Iterable[int]):
+        self.lookbacks = tuple(sorted(set(lookbacks)))
+        if not self.lookbacks or self.lookbacks[0] < 1:
+            raise ValueError("lookback은 1 이상이어야 합니다.")
+        self._cap = self.lookbacks[-1]
+        self._buf = [0.0] * self._cap
+        self._idx = 0
+        self._count = 0
+        self._sorted: dict[int, list[float]] = {n: [] for n in self.lookbacks}
+
+    def __len__(self):
+        return min(self._count, self._cap)
+
+    def push(self, x: float):
+        x = float(x)
+        for n, s in self._sorted.items():
+            if self._count >= n:
+                # 윈도 n 에서 빠지는 값 = n 개 전 값
+                old = self._buf[(self._idx - n) % self._cap]
+                del s[bisect_left(s, old)]
+            insort(s, x)
+        self._buf[self._idx] = x
+        self._idx = (self._idx + 1) % self._cap
+        self._count += 1
+
+    def clear(self):
+        self._idx = 0
+        self._count = 0
+        for s in self._sorted.values():
+            s.clear()
+
+    def ready(self, lookback: int) -> bool:
+        return self._count >= lookback
+
+    def _window(self, lookback: int) -> list[float]:
+        s = self._sorted.get(lookback)
+        if s is None:
+            raise KeyError(f"등록되지 않은 lookback: {lookback}")
+        return s
+
+    def quantile(self, lookback: int, q: float) -> Optional[float]:
+        """최근 lookback 개를 정렬했을 때 int(lookback*q) 번째 값 (윈도가 차기 전에는 None)"""
+        s = self._window(lookback)
+        if len(s) < lookback:
+            return None
+        return s[min(int(len(s) * q), len(s) - 1)]
+
+    def rank(self, lookback: int, x: float) -> Optional[float]:
+        """최근 lookback 개 중 x 보다 작은 값의 비율 (0~1)"""
+        s = self._window(lookback)
+        if not s:
+            return None
+        return bisect_left(s, x) / len(s)
@@ -0,0 +1,118 @@
+# strategies/utils/volatility_regime.py
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from config import (
+    MOVING_AVERAGE_PERIOD, ATR_BAR_INTERVAL,
+    POLL_HOT_RATIO, POLL_QUIET_RATIO, POLL_NEAR_BAND_Z, POLL_RV_WINDOW, POLL_RV_BASELINE
+)
+from strategies.utils.signal_utils import atr_from_rates
+
+# 밴드폭 기준선 EWMA 평활 계수 (약 50틱)
+BAND_EWMA_ALPHA = 0.02
+
+
+@dataclass
+class RegimeReading:
+    """
+    폴링 간격 결정용 변동성 국면 판정 결과
+    - regime: "hot" (변동성 확대/밴드 근접) | "normal" | "quiet" (모든 지표가 평소보다 잔잔)
+    - 각 비율은 단기 / 기준 구간 (데이터 부족이면 None)
+    """
+    regime: str
+    rv_ratio: Optional[float] = None
+    atr_ratio: Optional[float] = None
+    band_ratio: Optional[float] = None
+    zscore: Optional[float] = None
+    reason: str = ""
+
+    def describe(self) -> str:
+        def fmt(v):
+            return f"{v:.2f}" if v is not None else "-"
+        return (
+            f"{self.regime} (RV {fmt(self.rv_ratio)}, ATR {fmt(self.atr_ratio)}, "
+            f"밴드폭 {fmt(self.band_ratio)}, z {fmt(self.zscore)}{f' / {self.reason}' if self.reason else ''})"
+        )
+
+
+def _variance_rate(rows: list[tuple[datetime, float]]) -> Optional[float]:
+    """로그수익률 제곱합 / 경과 초 (틱 간격이 달라도 비교 가능한 초당 분산)"""
+    if len(rows) < 4:
+        return None
+    elapsed = (rows[-1][0] - rows[0][0]).total_seconds()
+    if elapsed <= 0:
+        return None
+    total = 0.0
+    for (_, prev), (_, cur) in zip(rows, rows[1:]):
+        if prev > 0 and cur > 0:
+            total += math.log(cur / prev) ** 2
+    return total / elapsed
+
+
+class VolatilityRegime:
+    """
+    틱 버퍼/이동 통계/캔들로 현재 변동성 국면 판정 (적응형 폴링용)
+    - 실현 변동성: 최근 POLL_RV_WINDOW 초 vs POLL_RV_BASELINE 초의 초당 분산 비 (제곱근)
+    - ATR: 5분 캔들 최근 6개(30분) vs 72개(6시간)
+    - 밴드폭: 볼린저 표준편차 vs 그 EWMA 기준선
+    - 밴드 근접: |z| >= POLL_NEAR_BAND_Z (볼린저 2σ 돌파 직전)
+    - 판정은 벽시계 구간 기준이라 폴링 간격이 바뀌어도 기준이 흔들리지 않음 (밴드폭 제외)
+    """
+    def __init__(self, band_period: int = MOVING_AVERAGE_PERIOD, bar_interval: int = ATR_BAR_INTERVAL):
+        self.band_period = band_period
+        self.bar_interval = bar_interval
+        self._band_baseline: Optional[float] = None
+
+    def _rv_ratio(self, ticks, now: datetime) -> Optional[float]:
+        if not ticks.covers(now - timedelta(seconds=POLL_RV_BASELINE)):
+            return None
+        rows = ticks.since(now - timedelta(seconds=POLL_RV_BASELINE))
+        short_from = now - timedelta(seconds=POLL_RV_WINDOW)
+        short = _variance_rate([r for r in rows if r[0] >= short_from])
+        base = _variance_rate(rows)
+        if short is None or not base:
+            return None
+        return math.sqrt(short / base)
+
+    def _atr_ratio(self, bars) -> Optional[float]:
+        highs, lows, closes = bars.hlc(self.bar_interval, 73)
+        base = atr_from_rates(highs, lows, closes, period=72)
+        short = atr_from_rates(highs[-7:], lows[-7:], closes[-7:], period=6)
+        if short is None or not base:
+            return None
+        return short / base
+
+    def _band_ratio(self, stats) -> Optional[float]:
+        sd = stats.stdev(self.band_period)
+        if sd is None:
+            return None
+        base = self._band_baseline
+        self._band_baseline = sd if base is None else BAND_EWMA_ALPHA * sd + (1 - BAND_EWMA_ALPHA) * base
+        return sd / base if base else None
+
+    def update(self, ticks, stats, bars, now: datetime) -> RegimeReading:
+        """틱 처리 직후 호출 (밴드폭 기준선이 틱마다 갱신됨)"""
+        reading = RegimeReading(
+            "normal",
+            rv_ratio=self._rv_ratio(ticks, now),
+            atr_ratio=self._atr_ratio(bars),
+            band_ratio=self._band_ratio(stats),
+            zscore=stats.zscore(self.band_period),
+        )
+        ratios = {
+            name: value for name, value in
+            (("RV", reading.rv_ratio), ("ATR", reading.atr_ratio), ("밴드폭", reading.band_ratio))
+            if value is not None
+        }
+        z = abs(reading.zscore) if reading.zscore is not None else 0.0
+
+        if z >= POLL_NEAR_BAND_Z:
+            reading.regime, reading.reason = "hot", "밴드 근접"
+        elif ratios and max(ratios.values()) >= POLL_HOT_RATIO:
+            name = max(ratios, key=ratios.get)
+            reading.regime, reading.reason = "hot", f"{name} 확대"
+        elif ratios and max(ratios.values()) <= POLL_QUIET_RATIO and z < 1.0:
+            reading.regime = "quiet"
+        return reading
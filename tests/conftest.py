@@ -0,0 +1,46 @@
+# tests/conftest.py
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+
+# DB 연동 테스트용 PostgreSQL (설정 안 되어 있으면 해당 테스트 생략)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def run(coro):
+    """비동기 테스트 본문 실행 (공용 aiohttp 세션은 이벤트 루프마다 새로 만들고 닫음)"""
+    from fetcher.rate_fetcher import close_http_session
+
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await close_http_session()
+
+    return asyncio.run(_main())
+
+
+@pytest.fixture
+def db_url():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL 미설정 - DB 연동 테스트 생략")
+    return TEST_DATABASE_URL
+
+
+@asynccontextmanager
+async def scratch_db(url: str):
+    """테스트 전용 스키마에 연결 (search_path 고정, 끝나면 스키마째 삭제)"""
+    import asyncpg
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    conn = await asyncpg.connect(url)
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"SET search_path TO {schema}")
+    try:
+        yield conn
+    finally:
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.close()
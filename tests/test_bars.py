@@ -0,0 +1,78 @@
+# tests/test_bars.py
+"""BarBuilder: 틱 → 다중 주기 OHLC, KST 정각 경계, 늦게 온 틱 재반영, ATR 이 실제 고저가를 쓰는지"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from strategies.utils.indicator_context import IndicatorContext
+from strategies.utils.signal_utils import atr_from_rates
+from utils.bars import BarBuilder
+from utils.time import TIMEZONE
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))   # KST 09:00 (5분/30분/1시간 경계)
+
+
+def _at(sec: float) -> datetime:
+    return T0 + timedelta(seconds=sec)
+
+
+def test_ohlc_and_kst_aligned_boundaries():
+    b = BarBuilder((60, 300, 3600))
+    ticks = [(0, 10.0), (20, 12.0), (40, 9.0), (59, 11.0), (60, 11.5), (299, 13.0), (300, 8.0)]
+    closed = []
+    for sec, price in ticks:
+        closed.append([(bar.interval, bar.start) for bar in b.update(_at(sec), price)])
+
+    # 60초 경계에서 첫 1분봉 마감, 300초 경계에서 1분봉 + 5분봉 마감
+    assert closed[4] == [(60, T0)]
+    assert closed[6] == [(60, _at(240)), (300, T0)]
+    first_5m = b.bars(300, 2)[0]
+    assert (first_5m.open, first_5m.high, first_5m.low, first_5m.close, first_5m.count) == (10.0, 13.0, 9.0, 13.0, 6)
+    assert first_5m.start == T0 and first_5m.end == _at(300)
+    # 1시간봉은 아직 진행 중 (KST 09:00 시작)
+    hour = b.current(3600)
+    assert hour.start == T0 and hour.start.hour == 9 and hour.count == 7
+
+
+def test_late_tick_updates_closed_bar():
+    b = BarBuilder((60,))
+    b.update(_at(0), 10.0)
+    b.update(_at(61), 11.0)
+    late = b.update(_at(30), 15.0)
+    # 마감된 09:00 봉에 반영하고 재저장 대상으로 돌려줌
+    assert [(bar.start, bar.high, bar.close) for bar in late] == [(T0, 15.0, 15.0)]
+    assert b.bar_at(60, T0).high == 15.0
+    # 보관 범위 밖이면 버림
+    assert b.update(_at(-600), 1.0) == []
+
+
+def test_bars_and_hlc_window():
+    b = BarBuilder((60,), history=3)
+    for i in range(6):
+        b.update(_at(60 * i), 100.0 + i)
+    assert [bar.close for bar in b.bars(60, 10)] == [102.0, 103.0, 104.0, 105.0]   # 마감 3 + 진행 1
+    assert [bar.close for bar in b.bars(60, 2, include_current=False)] == [103.0, 104.0]
+    highs, lows, closes = b.hlc(60, 2)
+    assert closes == [104.0, 105.0] and highs == closes and lows == closes
+    assert b.bars(60, 0) == []
+
+
+def test_atr_uses_bar_high_low_when_enough_bars():
+    b = BarBuilder((300,))
+    rates = []
+    for i in range(16 * 30):   # 5분봉 16개 (틱 10초 간격, 봉 안에서 ±1원 흔들림)
+        price = 1390.0 + (1.0 if i % 2 else -1.0) + i * 0.001
+        rates.append(price)
+        b.update(_at(10 * i), price)
+
+    ctx = IndicatorContext(rates[-306:], None, b, 300)
+    highs, lows, closes = b.hlc(300, 15)
+    assert ctx.atr(14) == pytest.approx(atr_from_rates(highs, lows, closes, 14))
+    # 고저가 TR(약 2원)은 봉 종가 차분보다 훨씬 큼
+    assert ctx.atr(14) > 1.9
+
+    # 봉이 모자라면 틱 종가 차분으로 대체
+    short = BarBuilder((300,))
+    short.update(_at(0), 1390.0)
+    ctx = IndicatorContext(rates[-306:], None, short, 300)
+    assert ctx.atr(14) == pytest.approx(atr_from_rates([], [], rates[-306:], 14))
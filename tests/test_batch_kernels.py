@@ -0,0 +1,128 @@
+# tests/test_batch_kernels.py
+"""batch 커널 ↔ 틱별 스칼라 함수(signal_utils, bollinger._is_squeeze) 인덱스별 일치 확인"""
+import math
+import random
+
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from strategies import bollinger
+from strategies.utils import batch
+from strategies.utils.signal_utils import atr_from_rates, rolling_stdev, sma, zscore
+
+PERIOD = 20
+
+
+def _walk(n: int, seed: int = 5, flat_every: int = 0) -> list[float]:
+    """1,400원대 랜덤워크 (flat_every 마다 같은 값이 PERIOD*2 틱 이어지는 횡보 구간 삽입)"""
+    rng = random.Random(seed)
+    rate, out = 1400.0, []
+    while len(out) < n:
+        if flat_every and len(out) % flat_every == 0 and out:
+            out.extend([rate] * (PERIOD * 2))
+            continue
+        rate += rng.gauss(0, 0.3)
+        out.append(round(rate, 2))
+    return out[:n]
+
+
+def _close(a: float, b: float | None, tol: float = 1e-7) -> bool:
+    if b is None:
+        return math.isnan(a)
+    return abs(a - b) <= tol
+
+
+def test_bollinger_bands_match_scalar():
+    rates = _walk(1500, flat_every=400)
+    bands = batch.bollinger_bands(rates, PERIOD)
+    for i in range(len(rates)):
+        prefix = rates[:i + 1]
+        m, s = sma(prefix, PERIOD), rolling_stdev(prefix, PERIOD)
+        assert _close(bands["mid"][i], m)
+        assert _close(bands["upper"][i], None if m is None else m + 2 * s)
+        assert _close(bands["lower"][i], None if m is None else m - 2 * s)
+        assert _close(bands["z"][i], zscore(prefix, PERIOD), tol=1e-5)
+
+
+def test_rolling_zscore_matches_scalar():
+    rates = _walk(1200, seed=9, flat_every=300)
+    z = batch.rolling_zscore(rates, PERIOD)
+    for i in range(len(rates)):
+        assert _close(z[i], zscore(rates[:i + 1], PERIOD), tol=1e-5)
+
+
+def test_close_atr_matches_scalar():
+    rates = _walk(800, seed=2)
+    atr = batch.close_atr(rates, 14)
+    for i in range(len(rates)):
+        assert _close(atr[i], atr_from_rates([], [], rates[:i + 1], period=14), tol=1e-9)
+
+
+def test_squeeze_flags_match_is_squeeze():
+    rates = _walk(3000, seed=4, flat_every=700)
+    width = batch.bollinger_bands(rates, PERIOD)["width"]
+    flags = batch.squeeze_flags(width)
+
+    # analyze_bollinger 와 같은 순서: 밴드 미형성/EPSILON 미만은 이력에 넣지 않고 건너뜀
+    bollinger.reset_band_width_history()
+    try:
+        expected = []
+        for bw in width:
+            if math.isnan(bw) or bw < bollinger.EPSILON:
+                expected.append(False)
+                continue
+            bollinger.BAND_WIDTH_HISTORY.push(bw)
+            expected.append(bool(bollinger._is_squeeze(bw)))
+    finally:
+        bollinger.reset_band_width_history()
+    assert flags.tolist() == expected
+    assert 0 < flags.sum() < len(flags)
+
+
+@pytest.mark.parametrize("chunk", [64, 257, 1 << 16])
+def test_chunked_cumsum_and_noise_fallback(monkeypatch, chunk):
+    """
+    구간 경계가 윈도 중간에 걸려도, 분산≈0 윈도(누적합 반올림 오차에 묻힘)도 직접 계산과 일치
+    - 작은 _CHUNK 로 구간 경계를 여러 번 통과시키고, 완전 횡보/1e-6 진폭 미세 변동 구간을 섞음
+    """
+    monkeypatch.setattr(batch, "_CHUNK", chunk)
+    rng = np.random.default_rng(7)
+    x = 1400.0 + np.cumsum(rng.normal(0, 0.3, 5000))
+    x[1000:1100] = x[999]                                     # 완전 횡보 → 분산 0
+    x[2000:2200] = x[1999] + rng.normal(0, 1e-6, 200)         # 미세 변동 → 상쇄 오차 구간
+    x[3000:3050] = 1e6                                        # 큰 값 급변 후 복귀
+
+    mean, var = batch._rolling_moments(x, PERIOD)
+    windows = sliding_window_view(x, PERIOD)
+    exp_mean = windows.mean(axis=1)
+    exp_var = windows.var(axis=1, ddof=1)
+
+    assert np.isnan(mean[:PERIOD - 1]).all() and np.isnan(var[:PERIOD - 1]).all()
+    np.testing.assert_allclose(mean[PERIOD - 1:], exp_mean, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(var[PERIOD - 1:], exp_var, rtol=1e-6, atol=1e-12)
+
+    # 완전 횡보 윈도: 정확히 0 → z 는 0.0 (스칼라 zscore 와 같은 규약)
+    flat = slice(1000 + PERIOD - 1, 1100)
+    assert (var[flat] == 0).all()
+    assert (batch.rolling_zscore(x, PERIOD)[flat] == 0).all()
+    # 미세 변동 윈도: 부호/크기가 살아 있어야 함 (누적합 경로였다면 0 또는 음수로 뭉개짐)
+    tiny = slice(2000 + PERIOD, 2200)
+    np.testing.assert_allclose(var[tiny], exp_var[2000 + PERIOD - (PERIOD - 1):2200 - (PERIOD - 1)], rtol=1e-3)
+
+
+def test_noise_fallback_is_taken(monkeypatch):
+    """횡보 윈도에서 실제로 직접 계산 경로를 타는지 (sliding_window_view 호출 확인)"""
+    calls = []
+    real = batch.sliding_window_view
+
+    def spy(*args, **kwargs):
+        calls.append(args[1])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(batch, "sliding_window_view", spy)
+    batch._rolling_moments(np.full(500, 1400.0), PERIOD)
+    assert calls == [PERIOD]
+    calls.clear()
+    batch._rolling_moments(1400.0 + np.arange(500) * 0.5, PERIOD)
+    assert calls == []
@@ -0,0 +1,183 @@
+# tests/test_bollinger_history.py
+"""볼린저 이력: 메모리 밴드/복귀 판정이 기존 SQL 규칙(윈도 STDDEV_SAMP, 30분 내 복귀)과 같은지, 틱당 쓰기 1회인지 확인"""
+import random
+from datetime import datetime, timedelta
+from statistics import mean, stdev
+
+import pytest
+
+from db import breakout_index
+from db.breakout_index import RESOLVE_WINDOW, BandOutcomeTracker, BreakoutOutcomeIndex
+from strategies.utils.rolling import RollingStats
+from tests.conftest import run, scratch_db
+from utils.time import TIMEZONE
+
+PERIOD = 20
+
+
+def _ticks(n: int, seed: int = 7, start: datetime | None = None) -> list[tuple[datetime, float]]:
+    rng = random.Random(seed)
+    ts = start or TIMEZONE.localize(datetime(2025, 9, 1, 9))
+    rate = 1390.0
+    rows = []
+    for _ in range(n):
+        ts += timedelta(seconds=rng.choice((30, 60, 60, 90)))
+        rate += rng.gauss(0, 0.4)
+        rows.append((ts, round(rate, 2)))
+    return rows
+
+
+def _reference(ticks) -> dict[datetime, tuple]:
+    """기존 SQL 백필과 같은 규칙의 전수 계산: (ma, std, upper_reverted, lower_rebounded)"""
+    out = {}
+    for i in range(PERIOD - 1, len(ticks)):
+        window = [r for _, r in ticks[i - PERIOD + 1:i + 1]]
+        ts, _ = ticks[i]
+        ma, std = mean(window), stdev(window)
+        upper, lower = ma + 2 * std, ma - 2 * std
+        later = [r for t, r in ticks[i + 1:] if t <= ts + RESOLVE_WINDOW]
+        out[ts] = (ma, std, any(r <= upper for r in later), any(r >= lower for r in later))
+    return out
+
+
+def _feed(tracker: BandOutcomeTracker, ticks) -> list[list]:
+    stats = RollingStats((PERIOD,))
+    finished = []
+    for ts, rate in ticks:
+        stats.push(rate)
+        finished.extend(tracker.observe(ts, rate, stats.mean(PERIOD), stats.stdev(PERIOD)))
+    return finished
+
+
+def test_tracker_matches_sql_rules():
+    ticks = _ticks(400)
+    index = BreakoutOutcomeIndex(PERIOD)
+    tracker = BandOutcomeTracker(index)
+    finished = _feed(tracker, ticks)
+    expected = _reference(ticks)
+
+    # 마지막 30분 이내 행만 판정 대기로 남고, 나머지는 정확히 한 번씩 최종 판정
+    last_ts = ticks[-1][0]
+    assert [r[0] for r in finished] == [ts for ts in expected if ts < last_ts - RESOLVE_WINDOW]
+    for ts, rate, ma, std, upper, lower, up, low in finished:
+        e_ma, e_std, e_up, e_low = expected[ts]
+        assert ma == pytest.approx(e_ma, abs=1e-9)
+        assert std == pytest.approx(e_std, abs=1e-9)
+        assert (up, low) == (e_up, e_low)
+
+    # 대기 행: 이미 확인된 복귀만 TRUE, 나머지는 아직 NULL
+    pending = tracker.drain()
+    assert len(finished) + len(pending) == len(expected)
+    for row in pending:
+        _, _, e_up, e_low = expected[row[0]]
+        assert row[6] in ((True,) if e_up else (None,))
+        assert row[7] in ((True,) if e_low else (None,))
+
+    # 인덱스 적중 수 = 복귀 확인된 행 수
+    assert len(index.upper.hits) == sum(1 for v in expected.values() if v[2])
+    assert len(index.lower.hits) == sum(1 for v in expected.values() if v[3])
+
+
+def test_tracker_skips_until_window_ready():
+    tracker = BandOutcomeTracker(None)
+    assert _feed(tracker, _ticks(PERIOD - 1)) == []
+    assert len(tracker) == 0
+
+
+def test_seeded_rows_resume_and_finalize():
+    ticks = _ticks(120)
+    first = BandOutcomeTracker(None)
+    _feed(first, ticks[:80])
+    saved = [
+        dict(zip(("timestamp", "rate", "ma", "std", "upper", "lower", "upper_reverted", "lower_rebounded"), row))
+        for row in first.drain()
+    ]
+
+    resumed = BandOutcomeTracker(None)
+    resumed.seed(saved)
+    # 재시작 직후 30분 넘게 지난 틱: 대기 행은 모두 최종 판정 (미확인 쪽은 FALSE)
+    gap = ticks[79][0] + RESOLVE_WINDOW + timedelta(minutes=1)
+    finished = resumed.observe(gap, ticks[79][1], None, None)
+    assert [r[0] for r in finished] == [r["timestamp"] for r in saved]
+    assert all(isinstance(r[6], bool) and isinstance(r[7], bool) for r in finished)
+
+
+def _reset_registry():
+    breakout_index._INDEXES.clear()
+    breakout_index._TRACKERS.clear()
+
+
+class _CountingConn:
+    """asyncpg 연결 래퍼: 호출한 메서드 이름 기록"""
+    def __init__(self, conn):
+        self.conn = conn
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.conn, name)
+        if name in ("execute", "executemany", "fetch", "fetchrow", "fetchval"):
+            def wrapped(*args, **kwargs):
+                self.calls.append(name)
+                return attr(*args, **kwargs)
+            return wrapped
+        return attr
+
+
+def test_db_one_write_per_tick_and_restart(db_url):
+    from db.migrations import run_migrations
+    from db.repository import (
+        backfill_bollinger_history, update_bollinger_history, flush_bollinger_history, warm_breakout_index
+    )
+
+    ticks = _ticks(200)
+    expected = _reference(ticks)
+
+    async def main():
+        _reset_registry()
+        async with scratch_db(db_url) as conn:
+            await run_migrations(conn)
+            await backfill_bollinger_history(conn, PERIOD)
+            await warm_breakout_index(conn, PERIOD)
+
+            counting = _CountingConn(conn)
+            stats = RollingStats((PERIOD,))
+            per_tick = []
+            for ts, rate in ticks[:150]:
+                stats.push(rate)
+                before = len(counting.calls)
+                await update_bollinger_history(counting, ts, rate, stats.mean(PERIOD), stats.stdev(PERIOD), PERIOD)
+                per_tick.append(counting.calls[before:])
+            # 조회 없음, 쓰기는 틱당 최대 1회
+            assert all(calls in ([], ["executemany"]) for calls in per_tick)
+
+            assert await flush_bollinger_history(conn, PERIOD) > 0
+            pending = await conn.fetchval(
+                "SELECT count(*) FROM bollinger_history WHERE upper_reverted IS NULL OR lower_rebounded IS NULL"
+            )
+            assert pending > 0
+
+            # 재시작: 인덱스/추적기 재적재 후 나머지 틱 처리
+            _reset_registry()
+            await warm_breakout_index(conn, PERIOD)
+            assert len(breakout_index.get_band_tracker(PERIOD)) == pending
+            for ts, rate in ticks[150:]:
+                stats.push(rate)
+                await update_bollinger_history(conn, ts, rate, stats.mean(PERIOD), stats.stdev(PERIOD), PERIOD)
+            await flush_bollinger_history(conn, PERIOD)
+
+            rows = await conn.fetch(
+                "SELECT timestamp, ma, std, upper_reverted, lower_rebounded FROM bollinger_history WHERE period = $1",
+                PERIOD
+            )
+        _reset_registry()
+        return {r["timestamp"]: r for r in rows}
+
+    rows = run(main())
+    assert set(rows) == set(expected)
+    cutoff = ticks[-1][0] - RESOLVE_WINDOW
+    for ts, (ma, std, up, low) in expected.items():
+        row = rows[ts]
+        assert row["ma"] == pytest.approx(ma, abs=1e-9)
+        assert row["std"] == pytest.approx(std, abs=1e-9)
+        if ts < cutoff:
+            assert (row["upper_reverted"], row["lower_rebounded"]) == (up, low)
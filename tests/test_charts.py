@@ -0,0 +1,72 @@
+# tests/test_charts.py
+"""차트 렌더링 프로세스 풀: 워커에서 PNG 렌더링, 이벤트 루프 비차단, 워커가 죽으면 풀 재생성 후 재시도"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from strategies.summary import generate_30min_chart, render_30min_chart
+from tests.conftest import run
+from utils import charts
+from utils.time import TIMEZONE
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+
+
+@pytest.fixture(autouse=True)
+def chart_pool():
+    yield
+    charts.shutdown_chart_pool()
+
+
+def _rates(n: int = 180) -> list[tuple[datetime, float]]:
+    return [(T0 + timedelta(seconds=10 * i), 1390.0 + (i % 7) * 0.1 + i * 0.01) for i in range(n)]
+
+
+def _die_once(marker: str) -> bytes:
+    """첫 호출은 워커 프로세스를 강제 종료, 재시도에서는 정상 반환 (워커 프로세스에서 실행)"""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return b"ok"
+
+
+def test_pool_renders_png_without_blocking_the_loop():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        buf = await render_30min_chart(_rates())
+        task.cancel()
+        return buf, ticks
+
+    buf, ticks = run(main())
+    data = buf.getvalue()
+    assert data.startswith(PNG_MAGIC)
+    # 렌더링(워커 spawn 포함)하는 동안에도 루프의 다른 작업이 계속 돎
+    assert ticks > 10
+    # 동기 버전과 같은 바이트 (같은 인자로 같은 렌더링 함수 사용)
+    assert generate_30min_chart(_rates()).getvalue() == data
+
+
+def test_not_enough_data_skips_rendering():
+    assert run(render_30min_chart(_rates(1))) is None
+    assert charts._pool is None   # 풀을 띄우지 않음
+
+
+def test_broken_pool_is_recreated_once(tmp_path, capsys):
+    marker = str(tmp_path / "died")
+    assert run(charts.render_in_pool(_die_once, marker)) == b"ok"
+    assert "풀 재생성 후 재시도" in capsys.readouterr().out
+    # 재생성된 풀은 이후 호출에 그대로 사용
+    pool = charts._pool
+    assert run(charts.render_in_pool(_die_once, marker)) == b"ok"
+    assert charts._pool is pool
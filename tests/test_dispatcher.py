@@ -0,0 +1,131 @@
+# tests/test_dispatcher.py
+"""로컬 가짜 Bot API 서버로 FanoutDispatcher 재시도 규칙과 대량(1만 명) 팬아웃 확인"""
+import asyncio
+import os
+import time
+from collections import Counter
+
+import httpx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from telegram import Bot
+from telegram.error import NetworkError, TimedOut
+from telegram.request import HTTPXRequest
+
+from notifier.dispatcher import FanoutDispatcher
+from tests.conftest import run
+
+TOKEN = "123456:TEST"
+LOAD_RECIPIENTS = int(os.environ.get("LOAD_TEST_RECIPIENTS", "10000"))
+
+
+class FakeBotApi:
+    """
+    sendMessage 만 구현한 가짜 Bot API
+    - chat_id 별 요청 수 기록 (중복/재시도 확인용)
+    - "bad*" → 400 chat not found, "blocked*" → 403, "flood*" → 첫 요청만 429 (retry_after=1), "slow*" → 응답 지연
+    """
+    def __init__(self, slow_delay: float = 0.0):
+        self.hits: Counter = Counter()
+        self.slow_delay = slow_delay
+
+    async def send_message(self, request: web.Request):
+        data = await request.post() if request.content_type != "application/json" else await request.json()
+        chat_id = str(data["chat_id"])
+        self.hits[chat_id] += 1
+        if chat_id.startswith("bad"):
+            return web.json_response({"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}, status=400)
+        if chat_id.startswith("blocked"):
+            return web.json_response({"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"}, status=403)
+        if chat_id.startswith("flood") and self.hits[chat_id] == 1:
+            return web.json_response(
+                {"ok": False, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": 1}},
+                status=429,
+            )
+        if chat_id.startswith("slow"):
+            await asyncio.sleep(self.slow_delay)
+        return web.json_response({"ok": True, "result": {
+            "message_id": self.hits.total(), "date": int(time.time()),
+            "chat": {"id": 1, "type": "private"}, "text": data.get("text", ""),
+        }})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(f"/bot{TOKEN}/sendMessage", self.send_message)
+        return app
+
+
+async def _broadcast(api: FakeBotApi, chat_ids: list[str], read_timeout: float = 5.0, **dispatcher_kwargs):
+    server = TestServer(api.app())
+    await server.start_server()
+    bot = Bot(
+        token=TOKEN,
+        base_url=str(server.make_url("/bot")),
+        request=HTTPXRequest(connection_pool_size=64, pool_timeout=30.0, read_timeout=read_timeout),
+    )
+    try:
+        dispatcher = FanoutDispatcher(**dispatcher_kwargs)
+
+        async def send(cid: str):
+            await bot.send_message(chat_id=cid, text="ping")
+
+        return await dispatcher.broadcast(chat_ids, send)
+    finally:
+        await bot.shutdown()
+        await server.close()
+
+
+def test_permanent_errors_are_not_retried():
+    api = FakeBotApi()
+    chat_ids = ["ok1", "bad1", "blocked1", "flood1", "ok2"]
+    report = run(_broadcast(api, chat_ids, global_rate=100, per_chat_rate=100))
+
+    assert report.sent == 3
+    assert set(report.failed) == {"bad1", "blocked1"}
+    # 400/403 은 1회만, 429 는 대기 후 1회 재시도
+    assert api.hits == Counter({"ok1": 1, "ok2": 1, "bad1": 1, "blocked1": 1, "flood1": 2})
+    assert report.retries == 1
+
+
+def test_read_timeout_is_not_retried():
+    api = FakeBotApi(slow_delay=1.0)
+    report = run(_broadcast(api, ["slow1", "ok1"], read_timeout=0.2, global_rate=100, per_chat_rate=100))
+
+    # 서버는 요청을 받았으므로 재전송하면 중복 → 1회만 시도하고 전달 여부 불명으로 기록
+    assert api.hits["slow1"] == 1
+    assert report.sent == 1 and report.uncertain == 1
+    assert "전달 여부 불명" in report.failed["slow1"]
+
+
+def test_unsent_network_errors_are_retried():
+    attempts = Counter()
+
+    async def send(cid: str):
+        attempts[cid] += 1
+        if attempts[cid] < 3:
+            # 연결 단계 실패 (요청이 나가지 않음)
+            cause = httpx.ConnectError("refused") if cid == "conn" else httpx.PoolTimeout("pool")
+            error = NetworkError("connect failed") if cid == "conn" else TimedOut("pool timeout")
+            raise error from cause
+
+    dispatcher = FanoutDispatcher(global_rate=100, per_chat_rate=100)
+    report = run(dispatcher.broadcast(["conn", "pool"], send))
+    assert report.sent == 2 and report.retries == 4
+    assert attempts == Counter({"conn": 3, "pool": 3})
+
+
+def test_fanout_load_10k_recipients():
+    """1만 명 팬아웃: 전역 한도를 풀고 동시 전송 64 로 전부 정확히 1회씩 전달되는지, 소요 시간/지연 분포 출력"""
+    api = FakeBotApi()
+    chat_ids = [f"user{i}" for i in range(LOAD_RECIPIENTS)]
+    chat_ids[::1000] = [f"bad{i}" for i in range(len(chat_ids[::1000]))]
+    started = time.perf_counter()
+    report = run(_broadcast(api, chat_ids, global_rate=1e6, per_chat_rate=1.0, max_concurrency=64))
+    elapsed = time.perf_counter() - started
+
+    bad = sum(1 for cid in chat_ids if cid.startswith("bad"))
+    assert report.sent == len(chat_ids) - bad
+    assert len(report.failed) == bad and report.retries == 0
+    assert set(api.hits.values()) == {1}
+    assert api.hits.total() == len(chat_ids)
+    print(f"\n📨 {len(chat_ids):,}명 팬아웃: {report.summary()} / 총 {elapsed:.1f}s ({len(chat_ids) / elapsed:,.0f}건/s)")
@@ -0,0 +1,72 @@
+# tests/test_market_calendar.py
+"""MarketCalendar: 요일/공휴일 구간, 연말~연초 해를 넘기는 구간 병합과 다음 시작 시각"""
+from datetime import date, datetime
+
+import pytest
+
+from utils.market_calendar import MarketCalendar
+from utils.time import TIMEZONE
+
+
+def _kst(*args) -> datetime:
+    return TIMEZONE.localize(datetime(*args))
+
+
+def test_watch_week_spans_the_year_boundary():
+    cal = MarketCalendar()
+    # 2025-12-29(월) ~ 2026-01-03(토) 00:00 은 해가 바뀌어도 하나의 수집 구간 (1/1 공휴일에도 수집)
+    assert cal.is_active("watch", _kst(2025, 12, 31, 23, 59))
+    assert cal.is_active("watch", _kst(2026, 1, 1, 12))
+    assert cal.active_until("watch", _kst(2025, 12, 31, 23)) == _kst(2026, 1, 3)
+    # 주말 → 다음 주 월요일 0시
+    assert not cal.is_active("watch", _kst(2026, 1, 3, 10))
+    assert cal.next_active_at("watch", _kst(2026, 1, 3, 10)) == _kst(2026, 1, 5)
+    assert cal.active_until("watch", _kst(2026, 1, 3, 10)) is None
+
+
+def test_session_skips_new_year_holiday():
+    cal = MarketCalendar()
+    assert cal.is_holiday(date(2026, 1, 1)) and not cal.is_holiday(date(2025, 12, 31))
+    assert cal.is_active("session", _kst(2025, 12, 31, 15, 29))
+    assert not cal.is_active("session", _kst(2025, 12, 31, 15, 30))
+    # 12/31 장 마감 후 다음 정규장은 1/1(공휴일)을 건너뛴 1/2 09:00
+    assert cal.next_active_at("session", _kst(2025, 12, 31, 16)) == _kst(2026, 1, 2, 9)
+    # 2027-12-31(금) 장 마감 후 → 2028-01-03(월) (다음 해 달력은 필요할 때 계산)
+    assert cal.next_active_at("session", _kst(2027, 12, 31, 16)) == _kst(2028, 1, 3, 9)
+
+
+def test_build_order_does_not_matter():
+    """다음 해를 먼저 계산한 뒤 전년도를 나중에 계산해도 해를 넘는 구간이 하나로 병합됨"""
+    late = MarketCalendar()
+    assert late.active_until("watch", _kst(2026, 1, 2, 12)) == _kst(2026, 1, 3)   # 2026, 2027 계산
+    assert late.is_active("watch", _kst(2025, 12, 30, 12))                        # 2025 나중에 계산
+    fresh = MarketCalendar()
+    fresh.is_active("watch", _kst(2025, 12, 30, 12))                              # 2025, 2026 계산
+
+    def spans(cal):
+        # fresh 는 2027 년을 아직 계산하지 않아 2026 연말 구간이 12/31 에서 끊겨 있으므로 그 전까지만 비교
+        lo, hi = _kst(2025, 1, 1).timestamp(), _kst(2026, 12, 1).timestamp()
+        return [(s, e) for s, e in zip(cal._starts["watch"], cal._ends["watch"]) if lo <= s < hi]
+
+    assert spans(late) == spans(fresh)
+    assert (_kst(2025, 12, 29).timestamp(), _kst(2026, 1, 3).timestamp()) in spans(late)
+
+
+@pytest.mark.parametrize("when, active", [
+    (_kst(2026, 1, 5, 6, 59), False),     # 월요일 0~7시 알림 제한
+    (_kst(2026, 1, 5, 7), True),
+    (_kst(2026, 1, 6, 1, 59), True),      # 화~금 2~7시 제한
+    (_kst(2026, 1, 6, 2), False),
+    (_kst(2026, 1, 3, 4), True),          # 주말은 제한 없음
+    (_kst(2026, 1, 1, 3), False),         # 공휴일도 평일 규칙 (제한)
+])
+def test_notify_window(when, active):
+    assert MarketCalendar().is_active("notify", when) is active
+
+
+def test_always_active_and_unknown_kind():
+    cal = MarketCalendar(always_active=("watch",))
+    assert cal.is_active("watch", _kst(2026, 1, 3, 10))
+    assert cal.active_until("watch", _kst(2026, 1, 3, 10)) is None
+    with pytest.raises(KeyError):
+        cal.is_active("lunch", _kst(2026, 1, 5, 12))
@@ -0,0 +1,187 @@
+# tests/test_migrations.py
+"""스키마는 번호 매긴 마이그레이션만 만들고, 백필 함수는 데이터만 채우는지 (기존 DB 호환 포함), rates 월 파티션과 실행 계획 점검"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from db import breakout_index
+from db.breakout_index import BandOutcomeTracker
+from db.explain_check import PROBE_PERIOD, check_query_plans
+from db.migrations import (
+    MIGRATIONS, PARTITION_MONTHS_AHEAD, _month_start, _partition_name, ensure_rate_partitions, run_migrations,
+)
+from db.repository import backfill_bars, backfill_bollinger_history
+from strategies.utils.rolling import RollingStats
+from tests.conftest import run, scratch_db
+from utils.time import TIMEZONE, now_kst
+
+PERIOD = 20
+
+
+async def _tables(conn) -> set[str]:
+    rows = await conn.fetch(
+        "SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+    )
+    return {r["tablename"] for r in rows}
+
+
+def test_fresh_database(db_url, capsys):
+    async def main():
+        async with scratch_db(db_url) as conn:
+            first = await run_migrations(conn)
+            second = await run_migrations(conn)
+            return first, second, await _tables(conn)
+
+    first, second, tables = run(main())
+    assert first == [v for v, _, _ in MIGRATIONS]
+    assert second == []
+    # 001 에서 바로 파티션 테이블로 만들었으므로 002 이관은 건너뜀
+    assert "rates 월 파티션 이관" not in capsys.readouterr().out
+    assert {"rates", "expected_ranges", "breakout_events", "summary_log", "bollinger_history", "bars"} <= tables
+
+
+def test_existing_tables_are_adopted(db_url):
+    """예전 워처가 ensure_* 로 만든 테이블/행이 있는 DB 에서도 005/006 이 그대로 통과"""
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await conn.execute(
+                """
+                CREATE TABLE bars (
+                  interval INTEGER NOT NULL, start_ts TIMESTAMPTZ NOT NULL,
+                  open DOUBLE PRECISION NOT NULL, high DOUBLE PRECISION NOT NULL,
+                  low DOUBLE PRECISION NOT NULL, close DOUBLE PRECISION NOT NULL,
+                  tick_count INTEGER NOT NULL, PRIMARY KEY (interval, start_ts)
+                );
+                INSERT INTO bars VALUES (60, NOW(), 1, 2, 0.5, 1.5, 3);
+                """
+            )
+            await run_migrations(conn)
+            return await conn.fetchval("SELECT count(*) FROM bars")
+
+    assert run(main()) == 1
+
+
+def test_backfills_match_incremental_path(db_url):
+    """SQL 백필(윈도 함수)과 틱 처리 경로(BandOutcomeTracker)가 같은 밴드/판정을 만드는지"""
+    rng = random.Random(11)
+    start = now_kst().replace(microsecond=0) - timedelta(days=1)
+    ticks, rate = [], 1390.0
+    for i in range(240):
+        rate += rng.gauss(0, 0.4)
+        ticks.append((start + timedelta(minutes=i), round(rate, 2)))
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await run_migrations(conn)
+            await conn.copy_records_to_table("rates", records=ticks, columns=["timestamp", "rate"])
+            await backfill_bollinger_history(conn, PERIOD)
+            await backfill_bollinger_history(conn, PERIOD)   # 두 번째는 건너뜀
+            await backfill_bars(conn, (300,))
+            history = await conn.fetch(
+                "SELECT timestamp, ma, std, upper_reverted, lower_rebounded FROM bollinger_history WHERE period = $1",
+                PERIOD
+            )
+            bars = await conn.fetchval("SELECT count(*) FROM bars WHERE interval = 300")
+            return {r["timestamp"]: r for r in history}, bars
+
+    history, bars = run(main())
+    assert bars >= 240 * 60 // 300
+
+    tracker = BandOutcomeTracker(None)
+    stats = RollingStats((PERIOD,))
+    finished = []
+    for ts, rate in ticks:
+        stats.push(rate)
+        finished.extend(tracker.observe(ts, rate, stats.mean(PERIOD), stats.stdev(PERIOD)))
+    # 마지막 틱 이후 30분 넘게 지났으므로 전부 판정 완료 상태와 비교
+    finished.extend(tracker.observe(now_kst(), ticks[-1][1], None, None))
+
+    assert len(history) == len(finished) == len(ticks) - PERIOD + 1
+    for ts, _, ma, std, _, _, up, low in finished:
+        row = history[ts]
+        assert abs(row["ma"] - ma) < 1e-9 and abs(row["std"] - std) < 1e-9
+        assert (row["upper_reverted"], row["lower_rebounded"]) == (up, low)
+
+
+# === rates 월 파티션 / 실행 계획 점검 (user-018) ===
+
+async def _partition_counts(conn) -> dict[str, int]:
+    rows = await conn.fetch("SELECT tableoid::regclass::text AS part, count(*) AS n FROM rates GROUP BY 1")
+    return {r["part"]: r["n"] for r in rows}
+
+
+def test_legacy_rates_table_is_partitioned_by_kst_month(db_url):
+    # KST 월 경계: 2025-09-30 15:00 UTC = 2025-10-01 00:00 KST → 10월 파티션
+    boundary = TIMEZONE.localize(datetime(2025, 10, 1))
+    ticks = [(boundary + timedelta(seconds=s), 1390.0 + i) for i, s in enumerate((-1, 0, 86400 * 31))]
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await conn.execute("CREATE TABLE rates (timestamp TIMESTAMPTZ NOT NULL, rate DOUBLE PRECISION NOT NULL)")
+            await conn.copy_records_to_table("rates", records=ticks, columns=["timestamp", "rate"])
+            await run_migrations(conn)
+            relkind = await conn.fetchval("SELECT relkind::text FROM pg_class WHERE oid = 'rates'::regclass")
+            counts = await _partition_counts(conn)
+            parts = {
+                r["relname"] for r in await conn.fetch(
+                    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = 'rates'::regclass"
+                )
+            }
+            again = await ensure_rate_partitions(conn)
+            # 미리 만든 달이 아닌 과거 시각은 DEFAULT 파티션으로
+            await conn.execute("INSERT INTO rates VALUES ('2001-01-01 00:00:00+09', 1.0)")
+            return relkind, counts, parts, again, await _partition_counts(conn)
+
+    relkind, counts, parts, again, after = run(main())
+    assert relkind == "p"
+    assert counts == {"rates_y2025m09": 1, "rates_y2025m10": 1, "rates_y2025m11": 1}
+    # 마이그레이션이 이번 달 ~ PARTITION_MONTHS_AHEAD 달 뒤까지 미리 생성, 이후 호출은 변화 없음
+    this_month = _month_start(now_kst().date())
+    assert {_partition_name(_month_start(this_month, k)) for k in range(PARTITION_MONTHS_AHEAD + 1)} <= parts
+    assert "rates_default" in parts and again == []
+    assert after["rates_default"] == 1
+
+
+def test_legacy_rates_with_extra_columns_are_not_migrated(db_url):
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await conn.execute(
+                """
+                CREATE TABLE rates (
+                  id SERIAL PRIMARY KEY, timestamp TIMESTAMPTZ NOT NULL, rate DOUBLE PRECISION NOT NULL, pair TEXT
+                );
+                INSERT INTO rates (timestamp, rate, pair) VALUES (NOW(), 1390.0, 'USDKRW');
+                """
+            )
+            with pytest.raises(RuntimeError, match="id, pair"):
+                await run_migrations(conn)
+            relkind = await conn.fetchval("SELECT relkind::text FROM pg_class WHERE oid = 'rates'::regclass")
+            return relkind, await conn.fetchrow("SELECT id, pair FROM rates")
+
+    relkind, row = run(main())
+    # 트랜잭션 롤백 → 원래 테이블/행 그대로
+    assert relkind == "r"
+    assert (row["id"], row["pair"]) == (1, "USDKRW")
+
+
+def test_query_plan_check_passes_and_catches_missing_index(db_url, capsys):
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await run_migrations(conn)
+            ok = await check_query_plans(conn)
+            leftover = await conn.fetchval("SELECT count(*) FROM breakout_events")
+            await conn.execute("DROP INDEX idx_breakout_events_timestamp, idx_breakout_events_unresolved")
+            return ok, leftover, await check_query_plans(conn)
+
+    ok, leftover, without_index = run(main())
+    assert ok and leftover == 0      # 점검용 INSERT 는 롤백
+    assert not without_index
+    out = capsys.readouterr().out
+    # 쓰기 일괄/스트리밍/롤업 경로도 계획 수집, 점검용 인덱스는 전역 상태에 남지 않음
+    for label in ("_write_bollinger_rows", "backfill_bollinger_history", "warm_breakout_index", "backfill_bars",
+                  "rollup_rates_to_bars", "upsert_bars", "get_rollup_rates", "_fetch_raw_rates",
+                  "iter_rates", "iter_rate_arrays"):
+        assert f"✅ {label} " in out
+    assert breakout_index.get_breakout_index(PROBE_PERIOD) is None
+    assert "❌ get_pending_breakouts" in out and "Seq Scan: breakout_events" in out
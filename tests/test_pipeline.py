@@ -0,0 +1,181 @@
+# tests/test_pipeline.py
+"""파이프라인 단계 집계(StageStats)와 큐 backpressure: 가득 찬 큐는 앞 단계가 기다림(overrun/대기 시간), 동기 LLM 호출은 루프를 막지 않음"""
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+import run_watcher
+from run_watcher import WatcherPipeline, WatcherState
+from strategies import summary
+from strategies.ai import ai_decider
+from tests.conftest import run
+from utils.pipeline import StageStats, put_with_backpressure
+from utils.scheduler import AlignedScheduler
+from utils.time import now_kst
+
+
+@pytest.fixture(autouse=True)
+def _no_quote_budget(monkeypatch):
+    # 요청 예산 집계용 공급자 생성(API 키 필요) 없이 파이프라인 구성
+    monkeypatch.setattr(run_watcher, "QUOTE_PROVIDERS", [])
+
+
+def test_stage_stats_record_and_summary(capsys):
+    stats = StageStats("analyze")
+    stats.record(0.5, budget=1.0)
+    stats.record(1.5, budget=1.0, ok=False)
+    assert (stats.processed, stats.failed, stats.overruns) == (2, 1, 1)
+    assert stats.max_elapsed == 1.5 and stats.busy == 2.0
+    assert "처리 지연: 1.5s > 예산 1s" in capsys.readouterr().out
+    assert stats.summary() == "analyze 2건 (평균 1.00s, 최대 1.50s, 실패 1, overrun 1)"
+    assert StageStats("idle").summary() == "idle 0건 (평균 0.00s, 최대 0.00s)"
+
+
+def test_full_queue_makes_producer_wait():
+    async def main():
+        queue: asyncio.Queue[int] = asyncio.Queue(maxsize=2)
+        stats = StageStats("fetch")
+        received = []
+
+        async def consumer():
+            while True:
+                await asyncio.sleep(0.02)
+                received.append(await queue.get())
+                queue.task_done()
+
+        task = asyncio.create_task(consumer())
+        for i in range(5):
+            await put_with_backpressure(queue, i, stats)
+        await queue.join()
+        task.cancel()
+        return stats, received
+
+    stats, received = run(main())
+    # 버리지 않고 순서대로 전달, 큐가 찬 동안 기다린 횟수/시간 집계
+    assert received == [0, 1, 2, 3, 4]
+    assert stats.overruns >= 2 and stats.waited > 0.02
+
+
+def test_default_polling_keeps_fixed_cadence():
+    # 전략 기간이 틱 수 → 기본 설정에서는 국면이 바뀌어도 CHECK_INTERVAL 유지 (ADAPTIVE_POLLING=1 일 때만 조정)
+    async def main():
+        pipeline = WatcherPipeline(None, WatcherState())
+        now = now_kst()
+        return [pipeline.poller.observe(regime, now) for regime in ("hot", "quiet", "normal")], pipeline
+
+    intervals, pipeline = run(main())
+    assert not run_watcher.ADAPTIVE_POLLING
+    assert intervals == [run_watcher.CHECK_INTERVAL] * 3
+    assert pipeline.scheduler.interval == run_watcher.CHECK_INTERVAL
+
+
+def test_slow_notify_backs_up_analyze_without_losing_alerts(monkeypatch):
+    sent = []
+
+    async def slow_send(message: str, **kwargs):
+        await asyncio.sleep(0.02)
+        if message == "boom":
+            raise RuntimeError("telegram down")
+        sent.append(message)
+
+    monkeypatch.setattr(run_watcher, "send_telegram", slow_send)
+
+    async def main():
+        pipeline = WatcherPipeline(None, WatcherState())
+        pipeline.notify_queue = asyncio.Queue(maxsize=2)
+        task = asyncio.create_task(pipeline.notify_stage())
+        for message in ("a", "b", "boom", "c", "d", "e"):
+            await pipeline.notify(message)
+        await pipeline.notify_queue.join()
+        task.cancel()
+        return pipeline
+
+    pipeline = run(main())
+    # 전송 실패가 다음 알림을 막지 않고, 순서 유지
+    assert sent == ["a", "b", "c", "d", "e"]
+    notify, analyze = pipeline.stats["notify"], pipeline.stats["analyze"]
+    assert (notify.processed, notify.failed) == (6, 1)
+    # 알림 큐가 가득 찬 동안 analyze 가 기다림 → analyze 의 overrun/대기 시간
+    assert analyze.overruns >= 2 and analyze.waited > 0
+    assert "notify 0/2" in pipeline.report()
+
+
+class _NoDb:
+    """analyze 단계용 가짜 풀 (연결 없이 process_tick 대역 실행)"""
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield None
+
+
+def test_blocking_llm_does_not_stall_fetch(monkeypatch):
+    monkeypatch.setenv("USE_LLM_DECISION", "1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(ai_decider, "OpenAI", object)
+
+    def slow_llm_decision(*args, **kwargs):
+        time.sleep(0.3)   # 동기 OpenAI 호출 대역
+        return None
+
+    async def fake_rate():
+        return 1390.0
+
+    async def fake_process_tick(conn, state, rate, now, send):
+        await run_watcher.decide(rate, now)
+
+    monkeypatch.setattr(run_watcher, "make_decision", slow_llm_decision)
+    monkeypatch.setattr(run_watcher, "get_consensus_rate", fake_rate)
+    monkeypatch.setattr(run_watcher, "process_tick", fake_process_tick)
+    monkeypatch.setattr(run_watcher, "is_scrape_time", lambda last: False)
+
+    async def main():
+        pipeline = WatcherPipeline(_NoDb(), WatcherState())
+        pipeline.scheduler = AlignedScheduler(0.05)
+        pipeline.tick_queue = asyncio.Queue(maxsize=100)
+        pipeline.calendar.is_active = lambda *args: True
+        pipeline._plan_next_poll = lambda now: None
+        tasks = [asyncio.create_task(pipeline.fetch_stage()), asyncio.create_task(pipeline.analyze_stage())]
+        await asyncio.sleep(1.0)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return pipeline
+
+    pipeline = run(main())
+    fetch, analyze = pipeline.stats["fetch"], pipeline.stats["analyze"]
+    # 판단(LLM)이 틱당 0.3초 걸려도 fetch 는 0.05초 주기 그대로 수집, 밀린 틱은 큐에서 대기
+    assert analyze.processed <= 4
+    assert fetch.processed >= 15
+    assert pipeline.scheduler.skipped == 0
+
+
+def test_blocking_llm_summary_does_not_stall_loop(monkeypatch):
+    def slow_summary(*args, **kwargs):
+        time.sleep(0.3)   # 동기 OpenAI 호출 대역
+        return "요약"
+
+    monkeypatch.setattr(summary, "generate_30min_summary", slow_summary)
+
+    async def main():
+        ticks, sent = 0, []
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def send_text(text):
+            sent.append(text)
+
+        task = asyncio.create_task(ticker())
+        now = now_kst()
+        # 데이터 1건 → 차트 생략 (렌더링 워커 없이 요약 생성만 확인)
+        await summary.send_30min_summary_then_chart(now, now, [(now, 1390.0)], None, send_text, None)
+        task.cancel()
+        return ticks, sent
+
+    ticks, sent = run(main())
+    assert sent == ["요약"]
+    assert ticks > 10
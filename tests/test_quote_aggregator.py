@@ -0,0 +1,148 @@
+# tests/test_quote_aggregator.py
+"""로컬 가짜 HTTP 서버를 공급자로 두고 QuoteAggregator 합의/제외/예외 경로 확인"""
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fetcher import quote_aggregator as qa
+from fetcher.quote_aggregator import QuoteAggregator, QuoteProvider, build_provider
+from tests.conftest import run
+
+
+def _parse(data: dict):
+    return data.get("rate"), data.get("ts")
+
+
+def _quote_app(quotes: dict[str, dict]) -> web.Application:
+    """경로별 응답: {"rate", "ts"} JSON, "status" 가 있으면 그 상태 코드, "delay" 만큼 지연"""
+    async def handler(request: web.Request):
+        spec = quotes[request.match_info["name"]]
+        if spec.get("delay"):
+            await asyncio.sleep(spec["delay"])
+        if spec.get("status"):
+            return web.Response(status=spec["status"])
+        return web.json_response({"rate": spec.get("rate"), "ts": spec.get("ts", time.time())})
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    return app
+
+
+async def _aggregate(quotes: dict[str, dict], staleness: dict[str, float] | None = None, **kwargs):
+    server = TestServer(_quote_app(quotes))
+    await server.start_server()
+    try:
+        providers = [
+            QuoteProvider(name, str(server.make_url(f"/{name}")), _parse, (staleness or {}).get(name))
+            for name in quotes
+        ]
+        agg = QuoteAggregator(providers, **kwargs)
+        return agg, await agg.fetch()
+    finally:
+        await server.close()
+
+
+def test_median_of_all_providers():
+    agg, result = run(_aggregate(
+        {"a": {"rate": 1390.0}, "b": {"rate": 1391.0}, "c": {"rate": 1392.0}}, min_responses=3,
+    ))
+    assert result.rate == 1391.0
+    assert sorted(q.provider for q in result.quotes) == ["a", "b", "c"]
+    assert all(st.requests == 1 and st.failures == 0 for st in agg.stats.values())
+
+
+def test_outlier_rejected():
+    _, result = run(_aggregate(
+        {"a": {"rate": 1390.0}, "b": {"rate": 1390.5}, "c": {"rate": 1450.0}}, min_responses=3,
+    ))
+    assert result.rate == 1390.25
+    assert [q.provider for q in result.rejected] == ["c"]
+
+
+def test_disagreeing_pair_falls_back_to_freshest_quote():
+    # 두 공급자가 중앙값(1385)에서 각각 0.36% → 다수결 불가, 더 최신 시세(b) 사용
+    now = time.time()
+    _, result = run(_aggregate(
+        {"a": {"rate": 1380.0, "ts": now - 600}, "b": {"rate": 1390.0, "ts": now - 5}}, min_responses=2,
+    ))
+    assert result.rate == 1390.0 and result.fallback
+    assert [q.provider for q in result.quotes] == ["b"]
+    assert [q.provider for q in result.rejected] == ["a"]
+
+
+def test_live_feed_wins_over_daily_feed_on_volatile_day():
+    # 변동성 큰 날: 실시간 1402 vs 전날 기준 일 단위 피드 1385 (1.2% 차이) → 실시간 시세
+    now = time.time()
+    quotes = {"live": {"rate": 1402.0, "ts": now - 30}, "daily": {"rate": 1385.0, "ts": now - 18 * 3600}}
+    _, result = run(_aggregate(quotes, staleness={"daily": 26 * 3600}, min_responses=2, max_staleness=900))
+    assert result.rate == 1402.0 and result.fallback
+    # 실시간 피드가 1시간째 그대로여도(기준 초과) 20시간 지난 일 단위 피드보다는 최신
+    quotes["live"]["ts"] = now - 3600
+    _, result = run(_aggregate(quotes, staleness={"daily": 26 * 3600}, min_responses=2, max_staleness=900))
+    assert result.rate == 1402.0
+
+
+def test_single_provider_with_hour_old_quote_still_returns_rate(monkeypatch):
+    """시간 단위 갱신 요금제의 exchangerate_host 단독 구성 (기본 설정) → 기준(15분)보다 오래돼도 환율 반환"""
+    async def main():
+        server = TestServer(_quote_app({"exchangerate_host": {"rate": 1391.5, "ts": time.time() - 3600}}))
+        await server.start_server()
+        try:
+            url = str(server.make_url("/exchangerate_host"))
+            monkeypatch.setattr(qa, "_default_aggregator", QuoteAggregator([QuoteProvider("exchangerate_host", url, _parse)]))
+            return await qa.get_consensus_rate(retries=1, delay=0)
+        finally:
+            await server.close()
+
+    assert run(main()) == 1391.5
+
+
+def test_get_consensus_rate_returns_none_when_nobody_answers(monkeypatch):
+    async def main():
+        server = TestServer(_quote_app({"a": {"status": 500}, "b": {"status": 503}}))
+        await server.start_server()
+        try:
+            providers = [QuoteProvider(n, str(server.make_url(f"/{n}")), _parse) for n in ("a", "b")]
+            monkeypatch.setattr(qa, "_default_aggregator", QuoteAggregator(providers, min_responses=2))
+            return await qa.get_consensus_rate(retries=2, delay=0)
+        finally:
+            await server.close()
+
+    assert run(main()) is None
+
+
+def test_per_provider_staleness():
+    now = time.time()
+    quotes = {
+        "live": {"rate": 1390.0, "ts": now - 60},
+        "daily": {"rate": 1391.0, "ts": now - 20 * 3600},     # 일 1회 갱신 피드
+        "stuck": {"rate": 1390.5, "ts": now - 2 * 3600},      # 실시간 피드인데 2시간째 그대로
+    }
+    _, result = run(_aggregate(quotes, staleness={"daily": 26 * 3600}, min_responses=3, max_staleness=900))
+    assert sorted(q.provider for q in result.quotes) == ["daily", "live"]
+    assert [q.provider for q in result.rejected] == ["stuck"]
+
+
+def test_failed_and_slow_providers():
+    agg, result = run(_aggregate(
+        {"ok": {"rate": 1390.0}, "down": {"status": 500}, "slow": {"rate": 1390.0, "delay": 2.0}},
+        min_responses=3, latency_budget=0.5,
+    ))
+    assert result.rate == 1390.0
+    assert [q.provider for q in result.quotes] == ["ok"]
+    assert agg.stats["down"].failures == 1
+
+
+def test_exchangerate_host_requires_access_key(monkeypatch):
+    monkeypatch.setattr(qa, "ACCESS_KEY", None)
+    with pytest.raises(ValueError):
+        build_provider("exchangerate_host")
+
+    monkeypatch.setattr(qa, "QUOTE_PROVIDERS", ["exchangerate_host", "frankfurter"])
+    monkeypatch.setattr(qa, "_default_aggregator", None)
+    agg = qa.get_default_aggregator()
+    assert [p.name for p in agg.providers] == ["frankfurter"]
+    assert agg.providers[0].max_staleness == qa.QUOTE_PROVIDER_MAX_STALENESS["frankfurter"]
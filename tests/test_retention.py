@@ -0,0 +1,118 @@
+# tests/test_retention.py
+"""계층형 보관: 경계 이전 틱을 캔들로 확정한 뒤 만료 파티션/DEFAULT 행 정리, 경계 이전 조회는 캔들 종가로 대체"""
+from datetime import timedelta
+
+from db.migrations import _create_rate_partition, _month_start, _partition_name, run_migrations
+from db.repository import get_rates_in_block, raw_retention_cutoff
+from db.retention import run_retention
+from tests.conftest import run, scratch_db
+from utils.time import now_kst
+
+STEP = timedelta(minutes=10)
+
+
+def _history(now):
+    """보관 경계 50일 전 ~ 2일 후, 10분 간격 (분 단위 정렬 → 1분봉 하나에 틱 하나)"""
+    cutoff = raw_retention_cutoff(now)
+    start, end = cutoff - timedelta(days=50), cutoff + timedelta(days=2)
+    ticks, t, i = [], start, 0
+    while t < end:
+        ticks.append((t, 1390.0 + (i % 37) * 0.1))
+        t, i = t + STEP, i + 1
+    # 첫 달은 파티션 없이 DEFAULT 로, 이후 달은 월 파티션으로
+    months, month = [], _month_start(start.date(), 1)
+    while month <= end.date():
+        months.append(month)
+        month = _month_start(month, 1)
+    return cutoff, ticks, months
+
+
+async def _setup(conn, ticks, months, now):
+    await run_migrations(conn)
+    for month in months:
+        await _create_rate_partition(conn, month)
+    await conn.copy_records_to_table("rates", records=ticks, columns=["timestamp", "rate"])
+    old = ticks[0][0]
+    # 실시간 저장 중 잘못 남은 캔들 (보관 작업이 원본 기준으로 덮어써야 함) / 보관 기간 지난 1분봉, 영구 보관 30분봉
+    await conn.execute("INSERT INTO bars VALUES (60, $1, 0, 0, 0, 0, 1)", old)
+    await conn.execute("INSERT INTO bars VALUES (60, $1, 1, 1, 1, 1, 1)", now - timedelta(days=200))
+    await conn.execute("INSERT INTO bars VALUES (1800, $1, 1, 1, 1, 1, 1)", now - timedelta(days=200))
+
+
+def test_retention_rolls_up_then_drops_expired_raw_ticks(db_url):
+    now = now_kst()
+    cutoff, ticks, months = _history(now)
+    expired = [_partition_name(m) for m in months if _month_start(m, 1) <= cutoff.date()]
+    default_old = sum(1 for ts, _ in ticks if ts.date() < months[0])
+    assert expired and default_old
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _setup(conn, ticks, months, now)
+            dry = await run_retention(conn, now, dry_run=True)
+            dry_rows = await conn.fetchval("SELECT count(*) FROM rates")
+            report = await run_retention(conn, now)
+            state = {
+                "oldest": await conn.fetchval("SELECT MIN(timestamp) FROM rates"),
+                "rows": await conn.fetchval("SELECT count(*) FROM rates"),
+                "gone": [await conn.fetchval("SELECT to_regclass($1) IS NULL", name) for name in expired],
+                "bad_bar": await conn.fetchval("SELECT close FROM bars WHERE interval = 60 AND start_ts = $1", ticks[0][0]),
+                "kept_1800": await conn.fetchval(
+                    "SELECT count(*) FROM bars WHERE interval = 1800 AND start_ts = $1", now - timedelta(days=200)
+                ),
+                # 경계를 사이에 둔 조회: 경계 전은 1분봉 종가, 경계 후는 원본
+                "block": await get_rates_in_block(conn, ticks[0][0], cutoff + timedelta(days=1)),
+            }
+            again = await run_retention(conn, now)
+            # 다음 날: 지난 경계 이후 새로 경계를 넘은 하루치만 집계
+            next_day = await run_retention(conn, now + timedelta(days=1))
+            log = [r["cutoff"] for r in await conn.fetch("SELECT cutoff FROM retention_log ORDER BY cutoff")]
+            rolled = await conn.fetchval(
+                "SELECT count(*) FROM bars WHERE interval = 60 AND start_ts >= $1", cutoff
+            )
+            return dry, dry_rows, report, state, again, next_day, log, rolled
+
+    dry, dry_rows, report, state, again, next_day, log, rolled = run(main())
+
+    # dry-run 은 대상만 보고
+    assert dry["partitions"] == expired and dry_rows == len(ticks)
+    assert dry["default_deleted"] == 0 and dry["bars_deleted"][60] == 1
+
+    assert report["cutoff"] == cutoff and report["rolled_from"] == ticks[0][0]
+    assert report["partitions"] == expired and all(state["gone"])
+    assert report["default_deleted"] == default_old
+    assert report["bars_deleted"] == {60: 1, 300: 0}
+    # 경계에 걸친 파티션은 통째로 남김 (경계 이전 행 포함)
+    straddling = _month_start(cutoff.date())
+    assert state["oldest"] == min(ts for ts, _ in ticks if ts.date() >= straddling)
+    assert state["rows"] == sum(1 for ts, _ in ticks if ts.date() >= straddling)
+
+    # 원본 기준으로 캔들 확정 (잘못된 실시간 캔들 덮어씀), 원본이 사라진 구간도 조회는 그대로
+    assert state["bad_bar"] == ticks[0][1]
+    assert state["kept_1800"] == 1     # BAR_RETENTION_DAYS 에 없는 주기는 영구 보관
+    expected = [(ts, rate) for ts, rate in ticks if ts < cutoff + timedelta(days=1)]
+    assert state["block"] == expected
+
+    # 두 번째 실행은 정리할 것 없음 (이미 확정한 구간은 다시 집계하지 않음)
+    assert again["rolled_from"] is None
+    assert again["partitions"] == [] and again["default_deleted"] == 0
+    assert all(count == 0 for count in again["bars_deleted"].values())
+    assert next_day["rolled_from"] == cutoff
+    assert next_day["cutoff"] == raw_retention_cutoff(now + timedelta(days=1))
+    assert rolled == sum(1 for ts, _ in ticks if cutoff <= ts < next_day["cutoff"])
+    # dry-run 은 기록하지 않음
+    assert log == [cutoff, next_day["cutoff"]]
+
+
+def test_reads_fall_back_to_raw_ticks_before_first_retention_run(db_url):
+    now = now_kst()
+    cutoff, ticks, months = _history(now)
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _setup(conn, ticks, months, now)
+            await conn.execute("DELETE FROM bars")
+            return await get_rates_in_block(conn, ticks[0][0], cutoff + timedelta(hours=1))
+
+    rows = run(main())
+    assert rows == [(ts, rate) for ts, rate in ticks if ts < cutoff + timedelta(hours=1)]
@@ -0,0 +1,143 @@
+# tests/test_rolling.py
+"""RollingWindow / RollingStats: 증분 통계가 매 틱 statistics 로 다시 계산한 값과 같은지"""
+import random
+import statistics
+
+import pytest
+
+from strategies.utils.rolling import RollingStats, RollingWindow
+from strategies.utils.signal_utils import rolling_stdev, sma, zscore
+
+
+def _series(n: int, seed: int = 1) -> list[float]:
+    rng = random.Random(seed)
+    rate, out = 1400.0, []
+    for i in range(n):
+        # 중간에 완전 횡보 구간 (분산 0) 포함
+        if not 300 <= i < 380:
+            rate += rng.gauss(0, 0.4)
+        out.append(round(rate, 2))
+    return out
+
+
+@pytest.mark.parametrize("period", [1, 2, 20, 45])
+def test_window_matches_statistics(period):
+    xs = _series(1000)
+    w = RollingWindow(period)
+    for i, x in enumerate(xs):
+        w.push(x)
+        window = xs[max(0, i + 1 - period):i + 1]
+        assert w.ready == (i + 1 >= period)
+        assert w.mean == pytest.approx(statistics.fmean(window), abs=1e-9)
+        if len(window) >= 2:
+            assert w.variance == pytest.approx(statistics.variance(window), abs=1e-9)
+        else:
+            assert w.variance is None and w.stdev is None
+
+
+def test_window_flat_segment_has_zero_variance():
+    w = RollingWindow(20)
+    for x in _series(380):
+        w.push(x)
+    # 300~379 횡보 → 마지막 20개는 같은 값, 주기적 재계산으로 누적 오차 없이 0
+    assert w.variance == 0.0
+
+
+def test_window_rejects_bad_period():
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+
+def test_stats_match_scalar_utils():
+    periods = (20, 45, 90)
+    xs = _series(600, seed=7)
+    stats = RollingStats(periods)
+    for i, x in enumerate(xs):
+        stats.push(x)
+        prefix = xs[:i + 1]
+        for p in periods:
+            assert stats.ready(p) == (len(prefix) >= p)
+            m, s, z = sma(prefix, p), rolling_stdev(prefix, p) if len(prefix) >= p else None, zscore(prefix, p)
+            if m is None:
+                assert stats.mean(p) is None and stats.stdev(p) is None and stats.zscore(p) is None
+                continue
+            assert stats.mean(p) == pytest.approx(m, abs=1e-9)
+            assert stats.stdev(p) == pytest.approx(s, abs=1e-9)
+            assert stats.zscore(p) == pytest.approx(z, abs=1e-6)
+    assert stats.count == len(xs) and stats.last == xs[-1]
+
+
+def test_stats_ema_is_seeded_with_sma():
+    stats = RollingStats((), ema_periods=(3,))
+    for x in (1.0, 2.0):
+        stats.push(x)
+        assert stats.ema(3) is None
+    stats.push(3.0)
+    assert stats.ema(3) == 2.0
+    stats.push(6.0)
+    assert stats.ema(3) == pytest.approx(6.0 * 0.5 + 2.0 * 0.5)
+
+
+def test_stats_unknown_period():
+    stats = RollingStats((20,))
+    stats.seed([1.0] * 30)
+    assert stats.zscore(20) == 0.0
+    with pytest.raises(KeyError):
+        stats.mean(21)
+    with pytest.raises(KeyError):
+        stats.ema(20)
+
+
+# === RollingQuantiles ===
+
+def test_quantiles_match_sorted_window():
+    from strategies.utils.rolling import RollingQuantiles
+
+    lookbacks = (5, 60, 240)
+    rq = RollingQuantiles(lookbacks)
+    rng = random.Random(3)
+    xs = [round(rng.uniform(0.5, 3.0), 2) for _ in range(800)]   # 중복 값 많음 (bisect 제거 확인)
+    for i, x in enumerate(xs):
+        rq.push(x)
+        assert len(rq) == min(i + 1, max(lookbacks))
+        for n in lookbacks:
+            window = sorted(xs[max(0, i + 1 - n):i + 1])
+            assert rq.ready(n) == (i + 1 >= n)
+            for q in (0.0, 0.2, 0.5, 0.99, 1.0):
+                expected = window[min(int(n * q), n - 1)] if len(window) == n else None
+                assert rq.quantile(n, q) == expected
+            probe = xs[i // 2]
+            assert rq.rank(n, probe) == pytest.approx(sum(v < probe for v in window) / len(window))
+
+
+def test_quantiles_clear_and_errors():
+    from strategies.utils.rolling import RollingQuantiles
+
+    rq = RollingQuantiles((3,))
+    for x in (3.0, 1.0, 2.0):
+        rq.push(x)
+    assert rq.quantile(3, 0.5) == 2.0
+    rq.clear()
+    assert len(rq) == 0 and rq.quantile(3, 0.5) is None and rq.rank(3, 1.0) is None
+    with pytest.raises(KeyError):
+        rq.quantile(4, 0.5)
+    with pytest.raises(ValueError):
+        RollingQuantiles(())
+
+
+def test_is_squeeze_uses_configured_lookback(monkeypatch):
+    """SQUEEZE_LOOKBACK 을 바꾸면 reset_band_width_history 가 그 lookback 으로 다시 만듦 (스윕 파라미터)"""
+    from strategies import bollinger
+
+    monkeypatch.setattr(bollinger, "SQUEEZE_LOOKBACK", 10)
+    bollinger.reset_band_width_history()
+    try:
+        for w in [2.0] * 9:
+            bollinger.BAND_WIDTH_HISTORY.push(w)
+            assert not bollinger._is_squeeze(w)   # 이력 부족
+        bollinger.BAND_WIDTH_HISTORY.push(0.5)
+        assert bollinger._is_squeeze(0.5)
+        assert not bollinger._is_squeeze(2.5)
+    finally:
+        monkeypatch.undo()
+        bollinger.reset_band_width_history()
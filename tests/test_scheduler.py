@@ -0,0 +1,225 @@
+# tests/test_scheduler.py
+"""AlignedScheduler: 벽시계 경계 정렬, overrun/건너뜀 집계, 주기 변경 / AdaptivePoller 예산 속도 조절 (가짜 시계/타이머로 실제 대기 없이 확인)"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from tests.conftest import run
+from utils import scheduler as scheduler_module
+from utils.scheduler import AdaptivePoller, AlignedScheduler
+from utils.time import TIMEZONE
+
+# KST 2025-09-01 10:00:00 (200초/30분 경계)
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 10)).timestamp()
+
+
+class FakeClock:
+    """
+    수동으로 옮기는 벽시계
+    - 스케줄러의 타이머 대기(asyncio.wait_for)는 그 시간만큼 시계를 옮기고 바로 시간 초과 처리
+    - lag: 타이머가 깰 때마다 더해지는 지연 (jitter 확인용)
+    """
+    def __init__(self, t: float, lag: float = 0.0):
+        self.t = t
+        self.lag = lag
+        self.sleeps: list[float] = []
+        self.on_sleep = None   # 다음 타이머 대기 중에 한 번 실행할 함수 (대기 중 주기 변경 등)
+
+    def __call__(self) -> float:
+        return self.t
+
+    async def wait_for(self, aw, timeout):
+        aw.close()
+        self.sleeps.append(timeout)
+        if self.on_sleep is not None:
+            hook, self.on_sleep = self.on_sleep, None
+            hook()
+            return   # 이벤트로 깨어남
+        self.t += timeout + self.lag
+        raise asyncio.TimeoutError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(T0)
+    monkeypatch.setattr(scheduler_module.asyncio, "wait_for", fake.wait_for)
+    return fake
+
+
+def test_ticks_land_on_wall_clock_boundaries(clock):
+    clock.t = T0 - 37.5
+    clock.lag = 0.25
+    s = AlignedScheduler(200, clock=clock)
+
+    # 첫 틱은 다음 경계 (시작 시각 + interval 이 아님)
+    first = run(s.wait())
+    assert first == datetime.fromtimestamp(T0, TIMEZONE) and (first.minute, first.second) == (0, 0)
+    assert clock.sleeps == [37.5]
+    assert s.last_jitter == 0.25 and s.overruns == 0
+
+    # 처리 시간이 주기에 더해지지 않음: 9 틱 뒤 = 정확히 30분 경계
+    for _ in range(8):
+        clock.t += 3.0     # 틱 처리 시간
+        run(s.wait())
+    clock.t += 3.0
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 1800, TIMEZONE)
+    assert s.ticks == 10 and s.overruns == 0
+    assert s.max_jitter == pytest.approx(0.25) and s.mean_jitter == pytest.approx(0.25)
+    assert clock.sleeps[-1] == pytest.approx(200 - 0.25 - 3.0)
+
+
+def test_late_tick_runs_immediately_and_merges_missed_boundaries(clock):
+    s = AlignedScheduler(200, clock=clock)
+    run(s.wait())
+    assert s.overruns == 0 and clock.sleeps == []
+
+    # 2.5 주기 늦음 → 즉시 실행, 밀린 경계는 가장 최근 하나(T0+400)로 합침
+    clock.t = T0 + 500
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 400, TIMEZONE)
+    assert (s.overruns, s.skipped, s.last_jitter) == (1, 1, 100)
+
+    # 경계 직후 약간 늦은 경우는 건너뜀 없이 overrun 만
+    clock.t = T0 + 610
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 600, TIMEZONE)
+    assert (s.overruns, s.skipped) == (2, 1)
+    assert "overrun 2" in s.summary()
+
+
+def test_offset_shifts_the_grid(clock):
+    s = AlignedScheduler(200, offset=5, clock=clock)
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 5, TIMEZONE)
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 205, TIMEZONE)
+
+
+# === 주기 변경 (AdaptivePoller) ===
+
+def _kst(*args) -> datetime:
+    return TIMEZONE.localize(datetime(*args))
+
+
+def test_set_interval_between_ticks_stays_on_grid(clock):
+    s = AlignedScheduler(200, clock=clock)
+    run(s.wait())                                   # T0
+    s.set_interval(100)
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 100, TIMEZONE)
+    s.set_interval(600)
+    # 마지막 틱(T0+100) 이후 600초 격자의 첫 경계
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 600, TIMEZONE)
+    s.set_interval(600)                             # 같은 값은 무시
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 1200, TIMEZONE)
+    assert s.overruns == 0
+
+
+def test_set_interval_while_waiting_wakes_at_new_boundary(clock):
+    s = AlignedScheduler(600, clock=clock)
+    run(s.wait())                                   # T0
+
+    def shorten():
+        clock.t = T0 + 30
+        s.set_interval(100)
+
+    clock.on_sleep = shorten
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 100, TIMEZONE)
+    # 첫 대기는 600초, 주기 변경 후 남은 70초만 다시 대기
+    assert clock.sleeps == [600, 70]
+
+    # 변경 시점에 새 격자의 다음 경계가 이미 지났으면 지금 이후 첫 경계
+    s.set_interval(600)
+    assert s._next == T0 + 600
+    clock.t = T0 + 250
+    s.set_interval(100)
+    assert s._next == T0 + 300
+
+
+def test_set_interval_before_first_tick_only_changes_interval(clock):
+    s = AlignedScheduler(200, clock=clock)
+    s.set_interval(600)
+    clock.t = T0 + 1
+    assert run(s.wait()) == datetime.fromtimestamp(T0 + 600, TIMEZONE)
+
+
+class _Counter:
+    def __init__(self):
+        self.n = 0
+
+    def __call__(self) -> int:
+        return self.n
+
+
+def _poller(budget: int | None, counter=None):
+    s = AlignedScheduler(200, clock=FakeClock(T0))
+    intervals = {"hot": 100, "normal": 200, "quiet": 600}
+    return AdaptivePoller(s, intervals, (100, 200, 300, 600, 900), 200, daily_budget=budget, count_requests=counter)
+
+
+def test_poller_without_budget_follows_regime():
+    poller = _poller(None)
+    now = _kst(2025, 9, 1, 12)
+    assert poller.observe("hot", now) == 100 and poller.scheduler.interval == 100
+    assert poller.observe("quiet", now) == 600
+    assert not poller.exhausted(now) and poller.remaining is None
+
+
+def test_poller_paces_short_intervals_by_remaining_budget(capsys):
+    counter = _Counter()
+    poller = _poller(100, counter)
+    noon = _kst(2025, 9, 1, 12)
+
+    # 남은 12시간 ÷ 남은 100건 = 432초 간격이 예산 속도 → hot 이어도 600초(사다리에서 432 이상 첫 단계)
+    assert poller.observe("hot", noon) == 600
+    assert "🎚️ 폴링 간격 200s → 600s" in capsys.readouterr().out
+
+    # 넉넉한 예산이면 hot 간격 그대로 (잔잔한 국면에서 아낀 요청을 변동성 구간에 사용)
+    rich = _poller(1000, _Counter())
+    assert rich.observe("hot", noon) == 100
+    assert rich.observe("quiet", noon) == 600
+
+
+def test_poller_counts_retries_and_stops_when_budget_is_spent(capsys):
+    counter = _Counter()
+    poller = _poller(10, counter)
+    t = _kst(2025, 9, 1, 23)
+    for _ in range(4):
+        counter.n += 2           # 조회 1회당 재시도 포함 요청 2건
+        poller.sync(t)
+    assert poller.spent == 8 and poller.hourly[23] == 8 and poller.remaining == 2
+    assert not poller.exhausted(t)
+    counter.n += 2
+    poller.sync(t)
+    assert poller.exhausted(t)
+    assert poller.observe("hot", t) == 900   # 소진 시 사다리 최장 간격
+
+    # KST 날짜가 바뀌면 전날 요약 출력 후 초기화
+    capsys.readouterr()
+    tomorrow = _kst(2025, 9, 2, 0, 0, 5)
+    assert not poller.exhausted(tomorrow)
+    assert poller.spent == 0 and poller.remaining == 10
+    out = capsys.readouterr().out
+    assert "폴링 일일 요약 (2025-09-01)" in out and "23시 10" in out
+
+
+def test_poller_latency_estimate():
+    poller = _poller(None)
+    poller.observe("hot", _kst(2025, 9, 1, 12))
+    poller.record_tick(None, 1)      # 첫 틱: 간격 없음 → 집계 제외
+    poller.record_tick(100, 2)
+    poller.record_tick(100, 0)
+    poller.record_tick(300, 1)
+    assert poller.regime_ticks["hot"] == 4 and poller.alert_ticks == 2
+    # 알림 틱 평균 간격 200s → 감지 지연 100s, 고정 200s 대비 +0s
+    assert "평균 간격 200s" in poller.latency_text() and "+0s" in poller.latency_text()
+
+
+def test_resume_at_skips_closed_hours_without_counting_overruns(clock):
+    s = AlignedScheduler(200, clock=clock)
+    run(s.wait())                                   # 금 10:00
+    # 장 마감 등으로 쉬었다가 월요일 0시에 재개 → 그 사이 경계는 overrun/건너뜀이 아님
+    monday = _kst(2025, 9, 8)
+    s.resume_at(monday)
+    clock.t = monday.timestamp() - 1
+    assert run(s.wait()) == monday
+    clock.t = monday.timestamp() + 30
+    s.resume_at(_kst(2025, 9, 8, 0, 0, 30))         # 경계 사이 시각은 다음 경계로 올림
+    assert run(s.wait()) == _kst(2025, 9, 8, 0, 3, 20)
+    assert (s.overruns, s.skipped) == (0, 0)
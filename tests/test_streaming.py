@@ -0,0 +1,134 @@
+# tests/test_streaming.py
+"""대용량 이력 스트리밍: 서버 측 커서/바이너리 COPY 결과가 일반 조회와 같고, 중간에 그만 읽어도 연결을 바로 다시 쓸 수 있는지"""
+import random
+from contextlib import aclosing
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from db.migrations import run_migrations
+from db.repository import _fetch_raw_rates, iter_rate_arrays, iter_rates
+from db.streaming import stream_copy_arrays
+from replay.engine import replay
+from replay.sources import iter_db_ticks
+from tests.conftest import run, scratch_db
+from utils.tick_buffer import _to_us
+from utils.time import TIMEZONE
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+
+
+def _ticks(n: int) -> list[tuple[datetime, float]]:
+    # 마이크로초 단위 시각/임의 소수 환율 → 변환 손실이 있으면 드러남
+    return [(T0 + timedelta(seconds=10 * i, microseconds=i % 997), 1390.0 + (i % 113) / 7) for i in range(n)]
+
+
+async def _loaded(conn, ticks):
+    await run_migrations(conn)
+    await conn.copy_records_to_table("rates", records=ticks, columns=["timestamp", "rate"])
+
+
+def test_cursor_stream_matches_list_read(db_url):
+    ticks = _ticks(3000)
+    start, end = ticks[100][0], ticks[2900][0]
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _loaded(conn, ticks)
+            expected = await _fetch_raw_rates(conn, start, end)
+            streamed = [row async for row in iter_rates(conn, start, end, prefetch=7)]
+            # 트랜잭션 안에서 부르면 그 트랜잭션에서 커서 사용
+            async with conn.transaction():
+                inside = [row async for row in iter_rates(conn, start, end, prefetch=500)]
+            return expected, streamed, inside, conn.is_in_transaction()
+
+    expected, streamed, inside, in_tx = run(main())
+    assert streamed == inside == expected == ticks[100:2900]
+    assert not in_tx
+
+
+def test_binary_copy_arrays_match_rows(db_url):
+    ticks = _ticks(5000)
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _loaded(conn, ticks)
+            chunks = [c async for c in iter_rate_arrays(conn, T0, ticks[-1][0] + timedelta(seconds=1), chunk_rows=1024)]
+            empty = [c async for c in iter_rate_arrays(conn, T0 - timedelta(days=1), T0)]
+            return chunks, empty
+
+    chunks, empty = run(main())
+    # 마지막 묶음만 chunk_rows 보다 작음
+    assert [len(ts) for ts, _ in chunks] == [1024] * 4 + [5000 - 4096]
+    ts_us = np.concatenate([ts for ts, _ in chunks])
+    rates = np.concatenate([r for _, r in chunks])
+    assert ts_us.dtype == np.int64 and rates.dtype == np.float64
+    # timestamptz → TickBuffer 와 같은 epoch 마이크로초, 환율은 비트 단위로 동일
+    assert ts_us.tolist() == [_to_us(ts) for ts, _ in ticks]
+    assert rates.tolist() == [rate for _, rate in ticks]
+    assert empty == []
+
+
+def test_copy_column_types_and_invalid_columns(db_url):
+    query = "SELECT g::int4, g::int8 * 10000000000, g / 4.0::float8 FROM generate_series(-3, 3) g"
+    columns = [("a", "int4"), ("b", "int8"), ("c", "float8")]
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            chunks = [c async for c in stream_copy_arrays(conn, query, columns=columns)]
+            # NULL 은 길이 -1 에 값이 없어 행 폭이 달라짐 → NULL 또는 행 길이 불일치로 거부
+            with pytest.raises(ValueError, match="NULL|행 길이"):
+                [c async for c in stream_copy_arrays(
+                    conn, "SELECT NULLIF(g, 0)::int4 FROM generate_series(-1, 1) g", columns=[("a", "int4")]
+                )]
+            with pytest.raises(ValueError, match="미지원 타입"):
+                [c async for c in stream_copy_arrays(conn, "SELECT 'x'::text", columns=[("s", "text")])]
+            return chunks, await conn.fetchval("SELECT 1")
+
+    chunks, after = run(main())
+    assert len(chunks) == 1
+    assert chunks[0]["a"].tolist() == list(range(-3, 4))
+    assert chunks[0]["b"].tolist() == [g * 10_000_000_000 for g in range(-3, 4)]
+    assert chunks[0]["c"].tolist() == [g / 4.0 for g in range(-3, 4)]
+    assert after == 1
+
+
+def test_early_close_leaves_connection_usable(db_url):
+    ticks = _ticks(60_000)
+    end = ticks[-1][0] + timedelta(seconds=1)
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _loaded(conn, ticks)
+            async with aclosing(iter_rate_arrays(conn, T0, end, chunk_rows=256)) as chunks:
+                async for first, _ in chunks:
+                    break
+            async with aclosing(iter_rates(conn, T0, end, prefetch=16)) as rows:
+                async for row in rows:
+                    break
+            # COPY 잔여분 폐기 / 커서 트랜잭션 종료 후 같은 연결로 바로 조회 가능
+            return first, row, conn.is_in_transaction(), await conn.fetchval("SELECT count(*) FROM rates")
+
+    first, row, in_tx, count = run(main())
+    assert len(first) == 256 and row == ticks[0]
+    assert not in_tx and count == len(ticks)
+
+
+def test_replay_accepts_streamed_ticks(db_url):
+    rng = random.Random(7)
+    rate, ticks = 1390.0, []
+    for i in range(1500):
+        rate += rng.gauss(0, 0.15)
+        ticks.append((T0 + timedelta(seconds=10 * i), round(rate, 2)))
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await _loaded(conn, ticks)
+            return await replay(iter_db_ticks(conn, T0, ticks[-1][0] + timedelta(seconds=1)))
+
+    streamed, streamed_sink = run(main())
+    plain, plain_sink = run(replay(ticks))
+    assert streamed.ticks == plain.ticks == len(ticks)
+    # DB 의 UTC 시각을 KST 로 바꿔 넘기므로 파일 재생과 알림 시각까지 동일
+    assert streamed_sink.alerts and streamed_sink.alerts == plain_sink.alerts
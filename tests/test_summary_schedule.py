@@ -0,0 +1,77 @@
+# tests/test_summary_schedule.py
+"""30분 요약 보충: 실패한 블록은 진행 시각을 넘기지 않고 다음 경계에서 재시도, 보충 한도 밖은 생략"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import run_watcher
+from config import SUMMARY_INTERVAL, SUMMARY_CATCHUP_BLOCKS
+from run_watcher import WatcherPipeline, WatcherState
+from tests.conftest import run
+from utils.pipeline import StageStats
+from utils.time import TIMEZONE
+
+STEP = timedelta(seconds=SUMMARY_INTERVAL)
+T0 = TIMEZONE.localize(datetime(2025, 9, 2, 10))   # 화요일 10:00 (블록 경계)
+
+
+@pytest.fixture(autouse=True)
+def _no_quote_budget(monkeypatch):
+    # 요청 예산 집계용 공급자 생성(API 키 필요) 없이 파이프라인 구성
+    monkeypatch.setattr(run_watcher, "QUOTE_PROVIDERS", [])
+
+
+def _pipeline(fail: set[datetime]):
+    """_send_block_summary 를 fail 에 든 블록 종료 시각에서만 실패하는 가짜로 교체"""
+    pipeline = WatcherPipeline(None, WatcherState())
+    calls = []
+
+    async def send_block(start, end):
+        calls.append(end)
+        if end in fail:
+            raise RuntimeError("telegram down")
+
+    pipeline._send_block_summary = send_block
+    return pipeline, calls
+
+
+def test_failed_block_is_retried_at_next_boundary():
+    fail = {T0 + STEP}
+    pipeline, calls = _pipeline(fail)
+    pipeline.summary_done_until = T0
+    stats = StageStats("summary")
+
+    run(pipeline._send_pending_summaries(T0 + 2 * STEP, stats))
+    # 실패한 블록에서 멈춤 (뒤 블록도 순서 유지를 위해 다음 경계로)
+    assert calls == [T0 + STEP]
+    assert pipeline.summary_done_until == T0
+    assert stats.failed == 1
+
+    # 다음 경계: 복구됐으면 실패 블록부터 차례로 발송
+    fail.clear()
+    calls.clear()
+    run(pipeline._send_pending_summaries(T0 + 3 * STEP, stats))
+    assert calls == [T0 + STEP, T0 + 2 * STEP, T0 + 3 * STEP]
+    assert pipeline.summary_done_until == T0 + 3 * STEP
+
+
+def test_first_block_failure_without_history_is_kept():
+    pipeline, calls = _pipeline({T0})
+    run(pipeline._send_pending_summaries(T0, StageStats("summary")))
+    assert calls == [T0]
+    # 기록이 없어도 실패 블록 직전으로 고정 → 다음 경계에서 T0 블록부터 보충
+    assert pipeline.summary_done_until == T0 - STEP
+
+
+def test_persistent_failure_falls_out_of_catchup_window():
+    bad = T0 + STEP
+    pipeline, calls = _pipeline({bad})
+    pipeline.summary_done_until = T0
+    stats = StageStats("summary")
+    until = T0 + STEP
+    for _ in range(SUMMARY_CATCHUP_BLOCKS + 1):
+        run(pipeline._send_pending_summaries(until, stats))
+        until += STEP
+    # 한도를 벗어난 뒤에는 실패 블록을 건너뛰고 이후 블록은 정상 발송
+    assert calls.count(bad) == SUMMARY_CATCHUP_BLOCKS
+    assert pipeline.summary_done_until == until - STEP
@@ -0,0 +1,118 @@
+# tests/test_sweep.py
+"""스윕: 사전 계산 지표/틱 시각으로 재생해도 일반 리플레이와 같은 알림, 기간을 바꾼 조합도 오류 없이 실행"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from replay import sweep
+from replay.engine import replay
+from replay.precomputed import ATR_PERIOD, PrecomputedStats, ReplayTickBuffer, atr_array, rolling_arrays, tick_times
+from replay.sinks import MemoryRepository
+from tests.conftest import run
+from utils.tick_buffer import _to_us
+from utils.time import TIMEZONE, set_clock
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+
+
+def _ticks(n: int = 2500, seed: int = 3) -> list[tuple[datetime, float]]:
+    """10초 간격 랜덤워크 (가끔 큰 점프 → 밴드 이탈/급변 알림 발생)"""
+    rng = random.Random(seed)
+    rate, out = 1390.0, []
+    for i in range(n):
+        rate += rng.gauss(0, 0.15) + (rng.choice((-2.0, 2.0)) if rng.random() < 0.004 else 0.0)
+        out.append((T0 + timedelta(seconds=10 * i), round(rate, 2)))
+    return out
+
+
+def test_precomputed_replay_matches_plain_replay():
+    import run_watcher
+    from config import ATR_BAR_INTERVAL, BAR_HISTORY, BAR_INTERVALS
+
+    ticks = _ticks()
+    plain, plain_sink = run(replay(ticks))
+
+    ts_us = [_to_us(ts) for ts, _ in ticks]
+    prices = [rate for _, rate in ticks]
+    times = tick_times(ts_us)
+    assert times == [ts for ts, _ in ticks]
+    periods = (run_watcher.MOVING_AVERAGE_PERIOD, run_watcher.SHORT_TERM_PERIOD, run_watcher.LONG_TERM_PERIOD)
+    state = run_watcher.WatcherState(
+        stats=PrecomputedStats(
+            prices, rolling_arrays(prices, periods), periods,
+            atr_array(times, prices, BAR_INTERVALS, BAR_HISTORY, ATR_BAR_INTERVAL),
+        ),
+        ticks=ReplayTickBuffer(dict(zip(ts_us, times)), run_watcher.TICK_BUFFER_SIZE),
+    )
+    _, fast_sink = run(replay(list(zip(times, prices)), state=state))
+
+    assert plain.alerts > 0
+    assert fast_sink.alerts == plain_sink.alerts
+
+
+def test_precomputed_stats_rejects_misaligned_ticks():
+    prices = [1390.0, 1390.5, 1391.0]
+    stats = PrecomputedStats(prices, rolling_arrays(prices, (2,)), (2,))
+    stats.push(1390.0)
+    assert stats.mean(2) is None and not stats.ready(2)
+    stats.push(1390.5)
+    assert stats.mean(2) == pytest.approx(1390.25)
+    with pytest.raises(KeyError):
+        stats.stdev(3)
+    with pytest.raises(ValueError):
+        stats.push(1400.0)
+
+
+def test_pending_breakouts_skip_expired_prefix():
+    repo = MemoryRepository()
+    clock = {"now": T0}
+    set_clock(lambda: clock["now"])
+    try:
+        async def main():
+            for i in range(6):
+                await repo.insert_breakout_event(None, "upper_breakout", T0 + timedelta(minutes=10 * i), 1395.0, 1395.0)
+            await repo.mark_breakout_resolved(None, 6)
+            clock["now"] = T0 + timedelta(minutes=55)
+            first = await repo.get_pending_breakouts(None)
+            clock["now"] = T0 + timedelta(minutes=65)
+            return first, await repo.get_pending_breakouts(None)
+
+        first, second = run(main())
+    finally:
+        set_clock(None)
+    # 30분 판정 창: 55분 시점 → 30/40/50분 이벤트 중 미판정(6번 제외), 65분 시점 → 40분 이후
+    assert [e["id"] for e in first] == [4, 5]
+    assert [e["id"] for e in second] == [5]
+    assert repo._pending_from == 4
+
+
+def test_run_combo_with_shared_arrays(monkeypatch):
+    """부모와 같은 방식으로 공유 메모리를 만들고 워커 함수를 프로세스 안에서 직접 호출"""
+    monkeypatch.setenv("USE_LLM_DECISION", "0")
+    ticks = _ticks(1500)
+    grid = {"MOVING_AVERAGE_PERIOD": [30, 45]}
+    shared = sweep.SharedTicks.create(ticks)
+    arrays = sweep.SharedArrays.create(sweep.precompute_indicators(shared, grid), shared.n)
+    try:
+        assert {"mean:30", "std:30", f"atr:{ATR_PERIOD}"} <= set(arrays.names)
+        sweep._init_worker(shared.shm.name, shared.n, {}, arrays.shm.name, arrays.names)
+        results = [sweep._run_combo(params, None) for params in sweep.expand_grid(grid)]
+        # 사전 계산 없이 일반 경로로 같은 조합 실행
+        attached, sweep._worker_arrays = sweep._worker_arrays, None
+        attached.close()
+        plain = sweep._run_combo({"MOVING_AVERAGE_PERIOD": 30}, None)
+    finally:
+        sweep._apply_params({})
+        if sweep._worker_arrays is not None:
+            sweep._worker_arrays.close()
+            sweep._worker_arrays = None
+        if sweep._worker_ticks is not None:
+            sweep._worker_ticks.close()
+            sweep._worker_ticks = None
+        arrays.close()
+        shared.close()
+
+    assert [r.error for r in results] == [None, None]
+    assert results[0].ticks == len(ticks)
+    assert (plain.alerts, plain.hit_rate, plain.avg_latency) == (results[0].alerts, results[0].hit_rate, results[0].avg_latency)
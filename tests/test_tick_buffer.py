@@ -0,0 +1,62 @@
+# tests/test_tick_buffer.py
+"""TickBuffer: DB 조회(get_rates_in_block / get_recent_rates_for_summary)와 같은 구간 규약, 보장 구간(covers), 잘라내기"""
+from datetime import datetime, timedelta
+
+from utils.tick_buffer import TickBuffer, _from_us, _to_us
+from utils.time import TIMEZONE
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+
+
+def _at(sec: float) -> datetime:
+    return T0 + timedelta(seconds=sec)
+
+
+def test_us_round_trip_keeps_kst_and_microseconds():
+    ts = T0 + timedelta(microseconds=123_457)
+    back = _from_us(_to_us(ts))
+    assert back == ts and back.utcoffset() == timedelta(hours=9)
+
+
+def test_range_queries_follow_db_conventions():
+    buf = TickBuffer(capacity=100)
+    buf.seed([(_at(10 * i), 1390.0 + i) for i in range(10)], complete=True)
+
+    # between: start 이상 end 미만 / since: start 이상
+    assert [p for _, p in buf.between(_at(20), _at(50))] == [1392.0, 1393.0, 1394.0]
+    assert [p for _, p in buf.between(_at(21), _at(21))] == []
+    assert [p for _, p in buf.since(_at(80))] == [1398.0, 1399.0]
+    assert buf.last(3) == [1397.0, 1398.0, 1399.0] and buf.last(0) == []
+    assert buf.last_rows(2) == [(_at(80), 1398.0), (_at(90), 1399.0)]
+    assert buf.last_price == 1399.0 and len(buf) == 10
+
+
+def test_out_of_order_append_is_inserted_in_place():
+    buf = TickBuffer()
+    for sec, price in [(0, 1.0), (20, 3.0), (10, 2.0), (20, 3.5)]:
+        buf.append(_at(sec), price)
+    assert buf.since(_at(0)) == [(_at(0), 1.0), (_at(10), 2.0), (_at(20), 3.0), (_at(20), 3.5)]
+
+
+def test_covers_tracks_seed_and_compaction():
+    buf = TickBuffer(capacity=4)
+    assert not buf.covers(_at(0))
+
+    # DB 에서 일부만 시드 → 첫 행 이후만 보장
+    buf.seed([(_at(100), 1.0), (_at(110), 2.0)])
+    assert buf.covers(_at(100)) and not buf.covers(_at(99))
+
+    for i in range(7):
+        buf.append(_at(120 + 10 * i), 3.0 + i)
+    # 9개 > capacity*2 → 오래된 것부터 capacity 개만 남기고 잘라냄, 보장 구간도 함께 이동
+    assert len(buf) == 4
+    assert buf.since(_at(0))[0][0] == _at(150)
+    assert buf.covers(_at(150)) and not buf.covers(_at(140))
+
+
+def test_complete_seed_covers_all_history():
+    buf = TickBuffer(capacity=4)
+    buf.seed([], complete=True)
+    assert buf.covers(_at(-10 ** 6))
+    buf.append(_at(0), 1.0)
+    assert buf.covers(_at(-10 ** 6))
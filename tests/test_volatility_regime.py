@@ -0,0 +1,67 @@
+# tests/test_volatility_regime.py
+"""VolatilityRegime: 벽시계 구간 실현 변동성/ATR/밴드폭/밴드 근접으로 hot·normal·quiet 판정"""
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from strategies.utils.rolling import RollingStats
+from strategies.utils.volatility_regime import VolatilityRegime
+from utils.bars import BarBuilder
+from utils.tick_buffer import TickBuffer
+from utils.time import TIMEZONE
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+PERIOD = 45
+
+
+def _feed(segments: list[tuple], step: int = 60, seed: int = 1):
+    """(틱 수, 틱당 표준편차[, 틱당 추세]) 구간을 이어 붙인 랜덤워크를 버퍼/통계/캔들에 넣고 국면 판정 결과 목록 반환"""
+    rng = random.Random(seed)
+    ticks, stats, bars = TickBuffer(capacity=4096), RollingStats((PERIOD,)), BarBuilder((300,))
+    ticks.seed([], complete=True)
+    regime = VolatilityRegime(band_period=PERIOD, bar_interval=300)
+    rate, now, readings = 1390.0, T0, []
+    for n, sigma, *drift in segments:
+        drift = drift[0] if drift else 0.0
+        for _ in range(n):
+            rate += rng.gauss(drift, sigma)
+            ticks.append(now, rate)
+            stats.push(rate)
+            bars.update(now, rate)
+            readings.append(regime.update(ticks, stats, bars, now))
+            now += timedelta(seconds=step)
+    return readings
+
+
+def test_volatility_burst_is_hot():
+    # 7시간 잔잔 → 최근 30분 변동성 5배
+    last = _feed([(420, 0.05), (30, 0.25)])[-1]
+    assert last.regime == "hot"
+    assert last.rv_ratio > 1.5 and last.atr_ratio > 1.5
+    assert "확대" in last.reason or last.reason == "밴드 근접"
+
+
+def test_calm_after_normal_is_quiet():
+    last = _feed([(420, 0.25), (40, 0.02)], seed=5)[-1]
+    assert last.regime == "quiet", last.describe()
+    assert last.rv_ratio < 0.8 and last.band_ratio < 0.8
+
+
+def test_steady_market_is_normal_and_short_history_has_no_ratios():
+    readings = _feed([(450, 0.1)], seed=9)
+    first = readings[10]
+    # 캔들/밴드 윈도가 차기 전에는 비율 없음, 이력이 30분보다 짧으면 단기 = 기준 구간
+    assert first.atr_ratio is None and first.band_ratio is None and first.zscore is None
+    assert first.rv_ratio == 1.0 and first.regime == "normal"
+    # 같은 변동성이 이어지면 세 비율 모두 1 근처, quiet 로 떨어지지 않음
+    tail = readings[-60:]
+    for name in ("rv_ratio", "atr_ratio", "band_ratio"):
+        assert 0.8 < statistics.median(getattr(r, name) for r in tail) < 1.3, name
+    assert not any(r.regime == "quiet" for r in tail)
+
+
+def test_near_band_is_hot():
+    # 잔잔한 흐름 끝에 같은 크기로 한 방향으로 밀어 밴드 근처(|z| >= 1.8)에 도달
+    last = _feed([(420, 0.05), (4, 0.0, 0.12)], seed=2)[-1]
+    assert abs(last.zscore) >= 1.8
+    assert last.regime == "hot" and last.reason == "밴드 근접", last.describe()
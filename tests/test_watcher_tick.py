@@ -0,0 +1,76 @@
+# tests/test_watcher_tick.py
+"""실제 DB 로 process_tick 을 돌려 틱 처리 경로가 rates 를 다시 읽지 않는지 확인 (TickBuffer/RollingStats 로 대체)"""
+import random
+import re
+from datetime import timedelta
+
+from db import breakout_index
+from tests.conftest import run, scratch_db
+from utils.time import now_kst, set_clock
+
+_RATES_READ = re.compile(r"\bFROM\s+rates\b", re.IGNORECASE)
+
+
+class _RecordingConn:
+    """asyncpg 연결 래퍼: 실행한 SQL 기록"""
+    def __init__(self, conn):
+        self.conn = conn
+        self.queries: list[str] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.conn, name)
+        if name in ("execute", "executemany", "fetch", "fetchrow", "fetchval"):
+            def wrapped(query, *args, **kwargs):
+                self.queries.append(query)
+                return attr(query, *args, **kwargs)
+            return wrapped
+        return attr
+
+
+def test_process_tick_reads_no_rates(db_url):
+    from db.migrations import run_migrations
+    from db.repository import backfill_bollinger_history, warm_breakout_index, backfill_bars
+    from config import BAR_INTERVALS, MOVING_AVERAGE_PERIOD
+    from replay.engine import reset_strategy_state
+    from run_watcher import WatcherState, process_tick
+
+    rng = random.Random(3)
+    start = now_kst() - timedelta(days=1)
+    clock = {"now": start}
+    sent = []
+
+    async def send(message, target_chat_ids=None):
+        sent.append(message)
+
+    async def main():
+        breakout_index._INDEXES.clear()
+        breakout_index._TRACKERS.clear()
+        reset_strategy_state()
+        async with scratch_db(db_url) as conn:
+            await run_migrations(conn)
+            await backfill_bollinger_history(conn, MOVING_AVERAGE_PERIOD)
+            await warm_breakout_index(conn, MOVING_AVERAGE_PERIOD)
+            await backfill_bars(conn, BAR_INTERVALS)
+
+            state = WatcherState()
+            state.ticks.seed([], complete=True)
+            recording = _RecordingConn(conn)
+            set_clock(lambda: clock["now"])
+            try:
+                rate = 1390.0
+                for i in range(400):
+                    clock["now"] = start + timedelta(minutes=i)
+                    rate += rng.gauss(0, 0.5)
+                    await process_tick(recording, state, round(rate, 2), clock["now"], send=send)
+            finally:
+                set_clock(None)
+            stored = await conn.fetchval("SELECT count(*) FROM rates")
+            history = await conn.fetchval("SELECT count(*) FROM bollinger_history")
+        breakout_index._INDEXES.clear()
+        breakout_index._TRACKERS.clear()
+        return recording.queries, stored, history
+
+    queries, stored, history = run(main())
+    assert stored == 400
+    assert history > 0
+    assert [q for q in queries if _RATES_READ.search(q)] == []
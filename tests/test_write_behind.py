@@ -0,0 +1,124 @@
+# tests/test_write_behind.py
+"""WriteBehindBuffer: 한 트랜잭션 flush, 실패 시 재시도 큐 한도/폐기 로그, close() 예외 전달"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import asyncpg
+import pytest
+
+from db.write_behind import WriteBehindBuffer
+from tests.conftest import run, scratch_db
+from utils.time import TIMEZONE, now_kst
+
+T0 = TIMEZONE.localize(datetime(2025, 9, 1, 9))
+
+
+class _DownPool:
+    """acquire 할 때마다 연결 실패하는 풀"""
+    @asynccontextmanager
+    async def acquire(self):
+        raise ConnectionRefusedError("db down")
+        yield
+
+
+def _band(ts: datetime, up=True, low=None) -> tuple:
+    return (ts, 20, 1390.0, 1389.0, 0.5, 1390.0, 1388.0, 0.0, -2.0, up, low)
+
+
+def test_failed_flush_requeues_within_limit(capsys):
+    buffer = WriteBehindBuffer(_DownPool(), max_pending=10)
+    for i in range(8):
+        buffer.add_rate(T0 + timedelta(minutes=i), 1390.0 + i)
+    buffer.add_bollinger_rows([_band(T0 + timedelta(minutes=i)) for i in range(4)])
+    buffer.add_breakout_event("upper_breakout", T0, 1395.0, 1395.0)
+
+    with pytest.raises(ConnectionRefusedError):
+        run(buffer.flush())
+
+    # 13행 → 한도 10: 오래된 rates 3건만 폐기, 이벤트는 유지
+    assert len(buffer) == 10
+    assert buffer.dropped_rows == 3
+    assert [ts for ts, _ in buffer._rates] == [T0 + timedelta(minutes=i) for i in range(3, 8)]
+    assert len(buffer._bands) == 4 and len(buffer._events) == 1
+    out = capsys.readouterr().out
+    assert "rates 3건 폐기" in out and str(T0) in out
+
+
+def test_limit_spills_bands_after_rates():
+    buffer = WriteBehindBuffer(_DownPool(), max_pending=3)
+    buffer.add_rate(T0, 1390.0)
+    buffer.add_bollinger_rows([_band(T0 + timedelta(minutes=i)) for i in range(5)])
+    with pytest.raises(ConnectionRefusedError):
+        run(buffer.flush())
+    assert buffer._rates == []
+    assert [row[0] for row in buffer._bands] == [T0 + timedelta(minutes=i) for i in range(2, 5)]
+    assert buffer.dropped_rows == 3
+
+
+def test_close_raises_when_rows_remain(capsys):
+    buffer = WriteBehindBuffer(_DownPool())
+    buffer.add_rate(T0, 1390.0)
+    with pytest.raises(ConnectionRefusedError):
+        run(buffer.close())
+    assert "1건 미저장" in capsys.readouterr().out
+
+
+def test_bollinger_history_goes_through_buffer():
+    from db import breakout_index
+    from db.repository import flush_bollinger_history, update_bollinger_history
+    from db.write_behind import set_write_buffer
+
+    buffer = WriteBehindBuffer(_DownPool())
+    breakout_index._TRACKERS.clear()
+    set_write_buffer(buffer)
+    try:
+        async def main():
+            # conn=None: 설치된 버퍼가 있으면 연결을 쓰지 않아야 함
+            for i in range(60):
+                await update_bollinger_history(None, T0 + timedelta(minutes=i), 1390.0 + (i % 3), 1390.0, 0.5, 20)
+            return await flush_bollinger_history(None, 20)
+
+        pending = run(main())
+    finally:
+        set_write_buffer(None)
+        breakout_index._TRACKERS.clear()
+        breakout_index._INDEXES.clear()
+    assert pending == 31   # 마지막 틱 기준 30분 이내(경계 포함) 행
+    assert len(buffer._bands) == 60
+    assert buffer._rates == [] and buffer._events == []
+
+
+def test_flush_writes_all_tables_in_one_transaction(db_url):
+    from db.migrations import run_migrations
+
+    # 임시 id 매핑은 최근 1시간만 유지하므로 현재 시각 기준
+    t0 = now_kst().replace(microsecond=0)
+
+    async def main():
+        async with scratch_db(db_url) as conn:
+            await run_migrations(conn)
+            schema = await conn.fetchval("SELECT current_schema()")
+            pool = await asyncpg.create_pool(db_url, min_size=1, max_size=2, server_settings={"search_path": schema})
+            try:
+                buffer = WriteBehindBuffer(pool)
+                for i in range(5):
+                    buffer.add_rate(t0 + timedelta(minutes=i), 1390.0 + i)
+                buffer.add_bollinger_rows([_band(t0 + timedelta(minutes=i), None, None) for i in range(3)])
+                temp_id = buffer.add_breakout_event("upper_breakout", t0, 1395.0, 1395.0)
+                assert await buffer.flush() == 9
+                assert buffer.real_event_id(temp_id) is not None
+
+                # 미판정으로 저장된 행은 판정 결과로 덮어씀 (재시작 후 이어서 판정)
+                buffer.add_bollinger_rows([_band(t0, True, False)])
+                await buffer.close()
+            finally:
+                await pool.close()
+            return (
+                await conn.fetchval("SELECT count(*) FROM rates"),
+                await conn.fetch("SELECT timestamp, upper_reverted, lower_rebounded FROM bollinger_history ORDER BY timestamp"),
+                await conn.fetchval("SELECT count(*) FROM breakout_events"),
+            )
+
+    rates, bands, events = run(main())
+    assert rates == 5 and events == 1
+    assert [(r["upper_reverted"], r["lower_rebounded"]) for r in bands] == [(True, False), (None, None), (None, None)]
@@ -1,4 +1,9 @@
 # 시간 관련 유틸리티
-from .time import is_weekend, now_kst, is_sleep_time, is_market_open, is_time_between, is_exact_time, is_scrape_time
+from .time import is_weekend, now_kst, set_clock, is_sleep_time, is_market_open, is_time_between, is_exact_time, is_scrape_time
+from .tick_buffer import TickBuffer
+from .bars import Bar, BarBuilder
+from .charts import render_in_pool, shutdown_chart_pool
+from .scheduler import AlignedScheduler, AdaptivePoller
+from .market_calendar import MarketCalendar, get_market_calendar, next_active_at
 
-__all__ = ["is_weekend", "now_kst", "is_sleep_time", "is_market_open", "is_time_between", "is_exact_time", "is_scrape_time"]
\ No newline at end of file
+__all__ = ["is_weekend", "now_kst", "set_clock", "is_sleep_time", "is_market_open", "is_time_between", "is_exact_time", "is_scrape_time", "TickBuffer", "Bar", "BarBuilder", "render_in_pool", "shutdown_chart_pool", "AlignedScheduler", "AdaptivePoller", "MarketCalendar", "get_market_calendar", "next_active_at"]
\ No newline at end of file
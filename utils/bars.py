@@ -0,0 +1,111 @@
+# utils/bars.py
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from utils.tick_buffer import _to_us, _from_us
+
+_US = 1_000_000
+
+
+@dataclass
+class Bar:
+    """OHLC 캔들 1개 (interval: 초, start_us: 구간 시작 epoch 마이크로초)"""
+    interval: int
+    start_us: int
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int = 1
+
+    @property
+    def start(self) -> datetime:
+        return _from_us(self.start_us)
+
+    @property
+    def end(self) -> datetime:
+        return _from_us(self.start_us + self.interval * _US)
+
+    def add(self, price: float):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.count += 1
+
+
+class BarBuilder:
+    """
+    틱 → 다중 주기 OHLC 캔들 증분 집계기
+    - 주기별로 진행 중인 캔들 1개 + 마감 캔들 history 개 유지 (틱당 주기 수만큼 O(1))
+    - 캔들 경계는 epoch 기준 정렬 (KST 는 UTC+9 이므로 1m/5m/30m/1h 모두 KST 정각에 맞음)
+    - update() 는 이번 틱으로 마감된 캔들 목록을 돌려줌 → 호출 측에서 bars 테이블에 저장
+    """
+    def __init__(self, intervals: tuple[int, ...], history: int = 512):
+        self.intervals = tuple(intervals)
+        self._current: dict[int, Bar | None] = {iv: None for iv in self.intervals}
+        self._closed: dict[int, deque[Bar]] = {iv: deque(maxlen=history) for iv in self.intervals}
+
+    def seed(self, rows: list[tuple[datetime, float]]):
+        """과거 틱(오래된 순)으로 초기화 - 마감 캔들은 이미 저장된 것으로 보고 반환하지 않음"""
+        for ts, price in rows:
+            self.update(ts, price)
+
+    def update(self, ts: datetime, price: float) -> list[Bar]:
+        us = _to_us(ts)
+        price = float(price)
+        completed = []
+        for iv in self.intervals:
+            start = us - us % (iv * _US)
+            bar = self._current[iv]
+            if bar is None or start > bar.start_us:
+                if bar is not None:
+                    self._closed[iv].append(bar)
+                    completed.append(bar)
+                self._current[iv] = Bar(iv, start, price, price, price, price)
+            elif start == bar.start_us:
+                bar.add(price)
+            else:
+                # 드물게 순서가 뒤바뀐 틱: 이미 마감된 캔들에 반영 후 재저장 대상으로 반환
+                late = self._find_closed(iv, start)
+                if late is not None:
+                    late.add(price)
+                    completed.append(late)
+        return completed
+
+    def _find_closed(self, interval: int, start_us: int) -> Bar | None:
+        for bar in reversed(self._closed[interval]):
+            if bar.start_us == start_us:
+                return bar
+            if bar.start_us < start_us:
+                break
+        return None
+
+    def current(self, interval: int) -> Bar | None:
+        """진행 중인 캔들"""
+        return self._current[interval]
+
+    def bar_at(self, interval: int, start: datetime) -> Bar | None:
+        """start 에 시작하는 캔들 (진행 중 포함)"""
+        start_us = _to_us(start)
+        bar = self._current[interval]
+        if bar is not None and bar.start_us == start_us:
+            return bar
+        return self._find_closed(interval, start_us)
+
+    def bars(self, interval: int, n: int, include_current: bool = True) -> list[Bar]:
+        """최근 n개 캔들 (오래된 순)"""
+        closed = self._closed[interval]
+        bar = self._current[interval] if include_current else None
+        need = n - (1 if bar is not None else 0)
+        out = list(closed)[-need:] if need > 0 else []
+        if bar is not None and n > 0:
+            out.append(bar)
+        return out
+
+    def hlc(self, interval: int, n: int, include_current: bool = True) -> tuple[list[float], list[float], list[float]]:
+        """atr_from_rates 입력용 (highs, lows, closes)"""
+        bars = self.bars(interval, n, include_current)
+        return [b.high for b in bars], [b.low for b in bars], [b.close for b in bars]
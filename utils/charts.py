@@ -0,0 +1,111 @@
+# utils/charts.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from matplotlib.figure import Figure
+
+CHART_WORKERS = 1   # 30분마다 1장 → 워커 1개면 충분
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def render_30min_chart_png(times: list[str], values: list[float], color: str) -> bytes:
+    """
+    30분 환율 추이 차트를 PNG bytes 로 렌더링 (워커 프로세스에서 실행)
+    - pyplot 전역 상태를 쓰지 않는 객체지향 Figure + Agg 캔버스 사용
+    - 인자/반환값 모두 pickle 가능한 기본 타입만 사용
+    """
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot()
+
+    v_min, v_max = min(values), max(values)
+
+    # y축 범위: 최소 1.00원 폭을 보장, 더 큰 변동일 때만 pad 적용
+    rng = v_max - v_min
+    if rng <= 2.0:
+        # 기본 2원 폭으로 고정
+        center = (v_max + v_min) / 2.0
+        y_min, y_max = center - 1.0, center + 1.0
+    else:
+        # 실제 변동 폭이 2원 이상일 경우 유동적으로 조정
+        pad = rng * 0.5
+        y_min, y_max = v_min - pad, v_max + pad
+    ax.set_ylim(y_min, y_max)
+
+    ax.plot(times, values, marker="o", linewidth=2, color=color)
+
+    # ✅ 처음, 중간, 마지막만 금액 표시
+    n = len(values)
+    mid_index = n // 2
+    for i, (t, v) in enumerate(zip(times, values)):
+        if i in (0, mid_index, n - 1):
+            ax.text(
+                t, v, f"{v:.2f}",
+                fontsize=8, color="black", ha="center", va="bottom",
+                bbox=dict(facecolor="white", edgecolor="none", alpha=0.7, boxstyle="round,pad=0.2")
+            )
+
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title("USD/KRW Last 30 min")  # 영어 제목 유지
+    ax.set_xlabel("Time")
+    ax.set_ylabel("KRW")
+    ax.grid(True)
+
+    # ✅ 시작점, 종료점 강조
+    def annotate_point(x, y, label, align="right"):
+        ha = "right" if align == "right" else "left"
+        size = 60 if align == "right" else 80
+        ax.scatter(x, y, color=color, s=size, edgecolors="black", zorder=5)
+        ax.text(
+            x, y, f"{label:.2f}", fontsize=9, color="black", ha=ha, va="bottom",
+            bbox=dict(facecolor="white", edgecolor="gray", boxstyle="round,pad=0.2")
+        )
+
+    annotate_point(times[0], values[0], round(values[0], 2), align="right")
+    annotate_point(times[-1], values[-1], round(values[-1], 2), align="left")
+
+    # ✅ 메모리 버퍼에 저장 (Figure.savefig 는 기본 Agg 캔버스를 사용)
+    buf = BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def get_chart_pool() -> ProcessPoolExecutor:
+    """
+    차트 렌더링 전용 프로세스 풀 (첫 호출 시 생성)
+    - 이벤트 루프/스레드를 가진 부모를 fork 하지 않도록 spawn 사용
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=CHART_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_chart_pool():
+    """워처 종료 시 호출"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+
+
+async def render_in_pool(fn, *args) -> bytes:
+    """
+    렌더링 함수를 프로세스 풀에서 실행 (이벤트 루프를 막지 않음)
+    - 워커가 죽어 풀이 깨졌으면 풀을 새로 만들어 한 번 더 시도
+    """
+    global _pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_chart_pool(), fn, *args)
+    except BrokenProcessPool:
+        print("⚠️ 차트 워커 프로세스 비정상 종료 → 풀 재생성 후 재시도")
+        _pool = None
+        return await loop.run_in_executor(get_chart_pool(), fn, *args)
@@ -0,0 +1,125 @@
+# utils/market_calendar.py
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+
+import holidays
+
+from config import ENVIRONMENT
+from utils.time import TIMEZONE, now_kst
+
+# 구간 종류별 요일(월=0 ... 일=6) → 하루 중 활성 구간 [(시작 분, 종료 분)], 공휴일 제외 여부
+# - watch:   워처가 시세를 수집하는 구간 (평일 종일, 공휴일에도 역외 시장을 보기 위해 수집)
+# - notify:  알림을 보내는 구간 (월 0~7시, 화~금 2~7시 알림 제한 시간 제외, 주말은 제한 없음)
+# - session: 서울 외환시장 정규 거래 시간 (평일 09:00 ~ 15:30, 공휴일 휴장)
+# - scrape:  예상 범위 스크래핑 시간 (평일 11시대, 공휴일 제외)
+_DAY = 24 * 60
+_WINDOWS: dict[str, tuple[dict[int, list[tuple[int, int]]], bool]] = {
+    "watch": ({d: [(0, _DAY)] for d in range(5)}, False),
+    "notify": (
+        {0: [(7 * 60, _DAY)], **{d: [(0, 2 * 60), (7 * 60, _DAY)] for d in range(1, 5)}, 5: [(0, _DAY)], 6: [(0, _DAY)]},
+        False,
+    ),
+    "session": ({d: [(9 * 60, 15 * 60 + 30)] for d in range(5)}, True),
+    "scrape": ({d: [(11 * 60, 12 * 60)] for d in range(5)}, True),
+}
+# local 환경에서는 수집/알림 제한 없음 (기존 is_weekend / is_sleep_time 규약)
+_LOCAL_ALWAYS = ("watch", "notify")
+
+
+class MarketCalendar:
+    """
+    연 단위로 미리 계산한 시장 구간 인덱스 (KST)
+    - 종류별로 겹치지 않게 병합한 [시작, 종료) epoch 초 구간을 시작 순으로 정렬해 보관
+      → is_active / next_active_at / active_until 모두 bisect 한 번 (O(log n))
+    - 연도는 조회 시점에 필요한 해(와 다음 해)만 한 번씩 계산 (공휴일 객체도 연도당 1회 생성)
+    - 연말~연초처럼 해를 넘겨 이어지는 구간은 병합되어 하나로 취급
+    """
+    def __init__(self, always_active: tuple[str, ...] = ()):
+        self.always_active = set(always_active)
+        self.holidays: set[date] = set()
+        self._years: set[int] = set()
+        self._starts: dict[str, list[float]] = {kind: [] for kind in _WINDOWS}
+        self._ends: dict[str, list[float]] = {kind: [] for kind in _WINDOWS}
+
+    @staticmethod
+    def _epoch(day: date, minute: int) -> float:
+        return TIMEZONE.localize(datetime.combine(day, time())).timestamp() + minute * 60
+
+    def _build_year(self, year: int):
+        kr_holidays = set(holidays.KR(years=year))
+        self.holidays |= kr_holidays
+        day = date(year, 1, 1)
+        spans = {kind: [] for kind in _WINDOWS}
+        while day.year == year:
+            for kind, (rules, skip_holidays) in _WINDOWS.items():
+                if skip_holidays and day in kr_holidays:
+                    continue
+                for start, end in rules.get(day.weekday(), ()):
+                    spans[kind].append((self._epoch(day, start), self._epoch(day, end)))
+            day += timedelta(days=1)
+
+        for kind, new in spans.items():
+            merged: list[tuple[float, float]] = []
+            for start, end in sorted(list(zip(self._starts[kind], self._ends[kind])) + new):
+                if merged and start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+                else:
+                    merged.append((start, end))
+            self._starts[kind] = [s for s, _ in merged]
+            self._ends[kind] = [e for _, e in merged]
+        self._years.add(year)
+
+    def _ensure(self, t: datetime):
+        # 다음 해까지 확보해 두어야 연말 구간의 종료/다음 시작을 정확히 찾음
+        for year in (t.year, t.year + 1):
+            if year not in self._years:
+                self._build_year(year)
+
+    def _locate(self, kind: str, t: datetime) -> tuple[int, float]:
+        if kind not in _WINDOWS:
+            raise KeyError(f"알 수 없는 구간 종류: {kind}")
+        self._ensure(t)
+        ts = t.timestamp()
+        return bisect_right(self._starts[kind], ts) - 1, ts
+
+    def is_active(self, kind: str, t: datetime) -> bool:
+        if kind in self.always_active:
+            return True
+        i, ts = self._locate(kind, t)
+        return i >= 0 and ts < self._ends[kind][i]
+
+    def next_active_at(self, kind: str, t: datetime) -> datetime:
+        """t 가 활성 구간이면 t, 아니면 다음 구간 시작 시각"""
+        if self.is_active(kind, t):
+            return t
+        # 다음 해 구간까지 계산돼 있으므로 다음 시작은 항상 존재
+        i, _ = self._locate(kind, t)
+        return datetime.fromtimestamp(self._starts[kind][i + 1], TIMEZONE)
+
+    def active_until(self, kind: str, t: datetime) -> datetime | None:
+        """t 가 속한 활성 구간의 종료 시각 (비활성이거나 상시 활성이면 None)"""
+        if kind in self.always_active or not self.is_active(kind, t):
+            return None
+        i, _ = self._locate(kind, t)
+        return datetime.fromtimestamp(self._ends[kind][i], TIMEZONE)
+
+    def is_holiday(self, day: date) -> bool:
+        if day.year not in self._years:
+            self._build_year(day.year)
+        return day in self.holidays
+
+
+_calendar: MarketCalendar | None = None
+
+
+def get_market_calendar() -> MarketCalendar:
+    """프로세스 공용 달력 (첫 조회 시 생성)"""
+    global _calendar
+    if _calendar is None:
+        _calendar = MarketCalendar(_LOCAL_ALWAYS if ENVIRONMENT == "local" else ())
+    return _calendar
+
+
+def next_active_at(kind: str = "watch", t: datetime | None = None) -> datetime:
+    """다음 활성 구간 시작 시각 (지금 활성이면 지금) - 워처는 "watch", 알림은 "notify" """
+    return get_market_calendar().next_active_at(kind, t or now_kst())
@@ -0,0 +1,54 @@
+# utils/pipeline.py
+import asyncio
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class StageStats:
+    """
+    파이프라인 단계별 처리/지연 집계
+    - overruns: 처리 시간이 예산(틱 주기 등)을 넘었거나, 다음 단계 큐가 가득 차 기다린 횟수
+    - waited: 다음 단계 큐가 비기를 기다린 누적 시간(초) = backpressure 로 밀린 시간
+    """
+    name: str
+    processed: int = 0
+    failed: int = 0
+    overruns: int = 0
+    busy: float = 0.0
+    waited: float = 0.0
+    max_elapsed: float = 0.0
+
+    def record(self, elapsed: float, budget: float | None = None, ok: bool = True):
+        self.processed += 1
+        if not ok:
+            self.failed += 1
+        self.busy += elapsed
+        if elapsed > self.max_elapsed:
+            self.max_elapsed = elapsed
+        if budget is not None and elapsed > budget:
+            self.overruns += 1
+            print(f"⚠️ [{self.name}] 처리 지연: {elapsed:.1f}s > 예산 {budget:.0f}s (누적 {self.overruns}회)")
+
+    def summary(self) -> str:
+        avg = self.busy / self.processed if self.processed else 0.0
+        text = f"{self.name} {self.processed}건 (평균 {avg:.2f}s, 최대 {self.max_elapsed:.2f}s"
+        if self.failed:
+            text += f", 실패 {self.failed}"
+        if self.overruns:
+            text += f", overrun {self.overruns}"
+        if self.waited:
+            text += f", 대기 {self.waited:.1f}s"
+        return text + ")"
+
+
+async def put_with_backpressure(queue: asyncio.Queue, item, stats: StageStats):
+    """큐가 가득 차면 빌 때까지 기다림 (보내는 단계의 overrun/대기 시간으로 집계)"""
+    if not queue.full():
+        queue.put_nowait(item)
+        return
+    stats.overruns += 1
+    print(f"⚠️ [{stats.name}] 다음 단계 큐 가득 참 ({queue.qsize()}/{queue.maxsize}) → 대기")
+    started = time.monotonic()
+    await queue.put(item)
+    stats.waited += time.monotonic() - started
@@ -0,0 +1,230 @@
+# utils/scheduler.py
+import asyncio
+import math
+import time
+from datetime import datetime
+
+from utils.time import TIMEZONE
+
+
+class AlignedScheduler:
+    """
+    벽시계 경계 정렬 고정 주기 스케줄러
+    - 틱 예정 시각 = epoch 기준 interval 의 배수 (+offset)
+      · 200초 주기면 KST 정각/30분(30분 블록 경계)에 틱이 정확히 놓임
+    - 남은 시간은 매 틱 벽시계로 다시 계산하고 대기는 이벤트 루프(monotonic) 타이머 사용
+      → 처리 시간이 주기에 더해지지 않고, 시각 보정이 있어도 다음 경계에서 다시 맞춰짐
+    - 처리가 늦어 예정 시각을 지났으면 즉시 실행(overrun), 한 주기 이상 밀렸으면
+      밀린 경계를 몰아서 실행하지 않고 가장 최근 경계 하나로 합침 (skipped 집계)
+    - jitter = 실제 실행 시각 - 예정 경계 (초)
+    - 첫 틱도 다음 경계까지 기다림 (시작 직후 최대 interval 초 대기)
+    - set_interval 로 주기를 바꾸면 대기 중이어도 새 주기의 다음 경계로 다시 맞춤
+    """
+    def __init__(self, interval: float, offset: float = 0.0, clock=time.time):
+        self.interval = float(interval)
+        self.offset = float(offset)
+        self._clock = clock
+        self._next: float | None = None
+        self._last: float | None = None
+        self._rescheduled = asyncio.Event()
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_jitter = 0.0
+        self.max_jitter = 0.0
+        self._jitter_sum = 0.0
+
+    def _align_up(self, t: float) -> float:
+        return math.ceil((t - self.offset) / self.interval) * self.interval + self.offset
+
+    def _align_down(self, t: float) -> float:
+        return math.floor((t - self.offset) / self.interval) * self.interval + self.offset
+
+    async def wait(self) -> datetime:
+        """다음 예정 경계까지 대기 후 그 경계 시각(KST) 반환"""
+        now = self._clock()
+        if self._next is None:
+            self._next = self._align_up(now)
+        elif now >= self._next:
+            self.overruns += 1
+            latest = self._align_down(now)
+            if latest > self._next:
+                self.skipped += int(round((latest - self._next) / self.interval))
+                self._next = latest
+
+        # 타이머 오차/시각 보정으로 일찍 깨면 남은 만큼 다시 대기 (주기 변경 시 새 경계로 다시 계산)
+        while (delay := self._next - self._clock()) > 0:
+            self._rescheduled.clear()
+            try:
+                await asyncio.wait_for(self._rescheduled.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+        jitter = self._clock() - self._next
+        self.ticks += 1
+        self.last_jitter = jitter
+        self._jitter_sum += jitter
+        if jitter > self.max_jitter:
+            self.max_jitter = jitter
+
+        scheduled = self._next
+        self._last = scheduled
+        self._next += self.interval
+        return datetime.fromtimestamp(scheduled, TIMEZONE)
+
+    def resume_at(self, when: datetime):
+        """다음 틱을 when 이후 첫 경계로 미룸 (휴장 구간 등 의도적으로 쉰 구간은 overrun/건너뜀으로 세지 않음)"""
+        self._next = self._align_up(when.timestamp())
+        self._last = None
+        self._rescheduled.set()
+
+    def set_interval(self, interval: float):
+        """
+        주기 변경: 다음 틱 = 마지막 틱 이후 새 주기의 첫 경계 (이미 지났으면 지금 이후 첫 경계)
+        - 주기들이 서로 배수/약수 관계(예: 30분의 약수)면 틱이 계속 같은 격자 위에 놓임
+        """
+        interval = float(interval)
+        if interval == self.interval:
+            return
+        self.interval = interval
+        if self._next is None:
+            return
+        now_aligned = self._align_up(self._clock())
+        if self._last is None:
+            self._next = max(self._align_up(self._next), now_aligned)
+        else:
+            following = (math.floor((self._last - self.offset) / interval) + 1) * interval + self.offset
+            self._next = max(following, now_aligned)
+        self._rescheduled.set()
+
+    @property
+    def mean_jitter(self) -> float:
+        return self._jitter_sum / self.ticks if self.ticks else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"틱 {self.ticks}회 (jitter 최근 {self.last_jitter * 1000:.0f}ms, 평균 {self.mean_jitter * 1000:.0f}ms, "
+            f"최대 {self.max_jitter * 1000:.0f}ms, overrun {self.overruns}, 건너뜀 {self.skipped})"
+        )
+
+
+class AdaptivePoller:
+    """
+    변동성 국면별 폴링 간격 + 하루 요청 예산 (AlignedScheduler 주기를 조정)
+    - observe(regime): 국면 간격(intervals)을 고르되 예산 속도가 모자라면 ladder 에서 더 긴 간격으로 올림
+      · 남은 예산으로 남은 하루를 기본 간격(base_interval)으로 버틸 수 있을 때만 기본보다 짧은 간격 허용
+      · 잔잔한 국면에서 아낀 요청이 변동성 구간의 짧은 간격에 쓰임
+    - sync(now): 요청 카운터 증가분을 KST 시간대별로 집계 (재시도 포함 실제 요청 수)
+    - record_tick(gap, alerts): 알림이 나간 틱의 직전 폴링 간격 → 고정 간격 대비 감지 지연 개선 추정
+      (가격 변화는 폴링 간격 안에서 고르게 일어난다고 보면 평균 감지 지연 = 간격 / 2)
+    - KST 날짜가 바뀌면 전날 요약을 출력하고 집계 초기화
+    - daily_budget/count_requests 가 None 이면 예산 제한 없이 국면 간격만 적용
+    """
+    def __init__(
+        self,
+        scheduler: AlignedScheduler,
+        intervals: dict[str, float],
+        ladder: tuple[float, ...],
+        base_interval: float,
+        daily_budget: int | None = None,
+        count_requests=None,
+    ):
+        self.scheduler = scheduler
+        self.intervals = intervals
+        self.ladder = tuple(sorted(ladder))
+        self.base_interval = float(base_interval)
+        self.daily_budget = daily_budget if daily_budget and count_requests is not None else None
+        self._count_requests = count_requests
+        self._seen = count_requests() if count_requests is not None else 0
+        self.regime = "normal"
+        self.day = None
+        self._reset()
+
+    def _reset(self):
+        self.spent = 0
+        self.fetches = 0
+        self.hourly = [0] * 24
+        self.regime_ticks = {name: 0 for name in self.intervals}
+        self.alert_ticks = 0
+        self._alert_gap_sum = 0.0
+
+    def _roll(self, now: datetime):
+        if self.day == now.date():
+            return
+        if self.day is not None and self.fetches:
+            print(f"[{now}] 📊 폴링 일일 요약 ({self.day}): {self.daily_report()}")
+        self.day = now.date()
+        self._reset()
+
+    @property
+    def remaining(self) -> int | None:
+        return None if self.daily_budget is None else self.daily_budget - self.spent
+
+    def sync(self, now: datetime):
+        """시세 조회 직후 호출: 이번 조회에서 쓴 요청 수 반영"""
+        self._roll(now)
+        self.fetches += 1
+        if self._count_requests is None:
+            return
+        total = self._count_requests()
+        used, self._seen = total - self._seen, total
+        self.spent += used
+        self.hourly[now.hour] += used
+
+    def exhausted(self, now: datetime) -> bool:
+        self._roll(now)
+        remaining = self.remaining
+        return remaining is not None and remaining <= 0
+
+    def _paced(self, desired: float, now: datetime) -> float:
+        remaining = self.remaining
+        if remaining is None:
+            return desired
+        if remaining <= 0:
+            return self.ladder[-1]
+        left = 86400 - (now.hour * 3600 + now.minute * 60 + now.second)   # KST 는 일광 절약 시간 없음
+        per_fetch = self.spent / self.fetches if self.fetches and self.spent else 1.0
+        pace = left * per_fetch / remaining   # 남은 하루를 이 간격으로 계속 조회하면 예산을 딱 다 씀
+        if pace <= self.base_interval:
+            return desired
+        return max(desired, next((i for i in self.ladder if i >= pace), self.ladder[-1]))
+
+    def observe(self, regime: str, now: datetime) -> float:
+        """틱 분석 후 호출: 국면/예산으로 다음 폴링 간격 결정 → 스케줄러에 반영"""
+        self._roll(now)
+        self.regime = regime
+        interval = self._paced(self.intervals[regime], now)
+        if interval != self.scheduler.interval:
+            print(f"[{now}] 🎚️ 폴링 간격 {self.scheduler.interval:.0f}s → {interval:.0f}s ({self.budget_text()})")
+            self.scheduler.set_interval(interval)
+        return interval
+
+    def record_tick(self, gap: float | None, alerts: int):
+        """분석을 마친 틱 1건 (gap: 직전 틱과의 간격 초, alerts: 이 틱에서 나간 알림 수)"""
+        self.regime_ticks[self.regime] = self.regime_ticks.get(self.regime, 0) + 1
+        if alerts and gap is not None:
+            self.alert_ticks += 1
+            self._alert_gap_sum += gap
+
+    def budget_text(self) -> str:
+        if self.daily_budget is None:
+            return f"오늘 요청 {self.spent}건"
+        return f"오늘 요청 {self.spent}/{self.daily_budget}건"
+
+    def latency_text(self) -> str:
+        if not self.alert_ticks:
+            return "알림 틱 없음"
+        mean_gap = self._alert_gap_sum / self.alert_ticks
+        delta = (mean_gap - self.base_interval) / 2
+        return (
+            f"알림 틱 {self.alert_ticks}건 평균 간격 {mean_gap:.0f}s → 감지 지연 추정 {mean_gap / 2:.0f}s "
+            f"(고정 {self.base_interval:.0f}s 대비 {delta:+.0f}s)"
+        )
+
+    def daily_report(self) -> str:
+        hours = " ".join(f"{h:02d}시 {n}" for h, n in enumerate(self.hourly) if n) or "-"
+        regimes = ", ".join(f"{name} {n}" for name, n in self.regime_ticks.items() if n) or "-"
+        return f"{self.budget_text()} | 시간대별 {hours} | 국면별 틱 {regimes} | {self.latency_text()}"
+
+    def summary(self) -> str:
+        return f"국면 {self.regime} {self.scheduler.interval:.0f}s, {self.budget_text()}, {self.latency_text()}"
@@ -0,0 +1,101 @@
+# utils/tick_buffer.py
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from utils.time import TIMEZONE
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_us(ts: datetime) -> int:
+    """tz-aware datetime → epoch 마이크로초"""
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_us(us: int) -> datetime:
+    return (_EPOCH + timedelta(microseconds=us)).astimezone(TIMEZONE)
+
+
+class TickBuffer:
+    """
+    프로세스 내 환율 틱 버퍼 (float64 가격 + int64 epoch 마이크로초)
+    - 시작 시 DB에서 한 번 시드, 이후 store_rate 직후 append
+    - "최근 N개", "T 이후", "T1~T2 구간" 조회를 DB 왕복 없이 이분 탐색으로 처리
+    - capacity 의 2배를 넘으면 오래된 절반을 한 번에 잘라냄 (분할상환 O(1))
+    """
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._ts = array("q")
+        self._px = array("d")
+        # 이 시각 이후 구간은 버퍼만으로 완전함 (None = 아직 아무것도 보장 못함)
+        self._covered_since: int | None = None
+
+    def __len__(self):
+        return len(self._px)
+
+    def seed(self, rows: list[tuple[datetime, float]], complete: bool = False):
+        """
+        DB 조회 결과(오래된 순)로 초기화
+        :param complete: DB 전체 이력이 rows 에 모두 담겼으면 True (과거 전 구간 보장)
+        """
+        self._ts = array("q", (_to_us(ts) for ts, _ in rows))
+        self._px = array("d", (float(r) for _, r in rows))
+        if complete:
+            self._covered_since = -(2 ** 63)
+        elif self._ts:
+            self._covered_since = self._ts[0]
+        else:
+            self._covered_since = None
+        self._compact()
+
+    def append(self, ts: datetime, price: float):
+        us = _to_us(ts)
+        if not self._ts or us >= self._ts[-1]:
+            self._ts.append(us)
+            self._px.append(float(price))
+        else:
+            # 드물게 순서가 뒤바뀐 경우만 중간 삽입
+            i = bisect_right(self._ts, us)
+            self._ts.insert(i, us)
+            self._px.insert(i, float(price))
+        if self._covered_since is None:
+            self._covered_since = us
+        self._compact()
+
+    def _compact(self):
+        if len(self._ts) <= self.capacity * 2:
+            return
+        drop = len(self._ts) - self.capacity
+        del self._ts[:drop]
+        del self._px[:drop]
+        self._covered_since = max(self._covered_since, self._ts[0])
+
+    def covers(self, since: datetime) -> bool:
+        """since 이후 틱이 버퍼에 빠짐없이 들어있는지"""
+        return self._covered_since is not None and self._covered_since <= _to_us(since)
+
+    @property
+    def last_price(self) -> float | None:
+        return self._px[-1] if self._px else None
+
+    def last(self, n: int) -> list[float]:
+        """최근 n개 가격 (오래된 순)"""
+        return self._px[-n:].tolist() if n > 0 else []
+
+    def last_rows(self, n: int) -> list[tuple[datetime, float]]:
+        start = max(0, len(self._ts) - n)
+        return self._rows(start, len(self._ts))
+
+    def since(self, start: datetime) -> list[tuple[datetime, float]]:
+        """start 이상 모든 틱 (get_recent_rates_for_summary 와 동일 규약)"""
+        return self._rows(bisect_left(self._ts, _to_us(start)), len(self._ts))
+
+    def between(self, start: datetime, end: datetime) -> list[tuple[datetime, float]]:
+        """start 이상 end 미만 틱 (get_rates_in_block 과 동일 규약)"""
+        lo = bisect_left(self._ts, _to_us(start))
+        hi = bisect_left(self._ts, _to_us(end), lo)
+        return self._rows(lo, hi)
+
+    def _rows(self, lo: int, hi: int) -> list[tuple[datetime, float]]:
+        return [(_from_us(self._ts[i]), self._px[i]) for i in range(lo, hi)]
@@ -1,50 +1,51 @@
 from datetime import datetime, time, date, timedelta
 import pytz
-from config import ENVIRONMENT
-import holidays
 
 TIMEZONE = pytz.timezone("Asia/Seoul")
 
+# 가상 시계 (리플레이/백테스트용): None 이면 실제 시각 사용
+_clock = None
+
+def set_clock(clock) -> None:
+    """
+    now_kst() 가 사용할 시계 교체
+    :param clock: tz-aware datetime 을 반환하는 callable, None 이면 실제 시계로 복귀
+    """
+    global _clock
+    _clock = clock
+
 def now_kst() -> datetime:
-    """한국 시간 기준 현재 시각 반환"""
+    """한국 시간 기준 현재 시각 반환 (가상 시계가 설정돼 있으면 그 시각)"""
+    if _clock is not None:
+        return _clock()
     return datetime.now(TIMEZONE)
 
+def _calendar():
+    # utils.market_calendar 가 이 모듈을 import 하므로 호출 시점에 가져옴
+    from utils.market_calendar import get_market_calendar
+    return get_market_calendar()
+
 def is_weekend() -> bool:
     """
-    토요일(5), 일요일(6)에는 True 반환
+    토요일(5), 일요일(6)에는 True 반환 (달력의 "watch" 구간 밖)
     단, local 환경에서는 항상 False (루프 정상 실행)
     """
-    if ENVIRONMENT == "local":
-        return False
-    return now_kst().weekday() >= 5
+    return not _calendar().is_active("watch", now_kst())
 
 def is_sleep_time() -> bool:
     """
-    운영 환경에서만 알림 발송 제한 시간 적용
+    운영 환경에서만 알림 발송 제한 시간 적용 (달력의 "notify" 구간 밖)
     - local 환경: 항상 False (알림 발송 유지)
     - 운영 환경:
         • 월요일: 0시 ~ 7시까지 중지
         • 화~금요일: 2시 ~ 7시까지 중지
-        • 주말: 기존 주말 처리 로직 따름 (is_weekend() 별도 사용)
+        • 주말: 제한 없음 (수집 자체는 is_weekend() 로 중지)
     """
-    if ENVIRONMENT == "local":
-        return False
-
-    now = now_kst()
-    hour = now.hour
-    weekday = now.weekday()  # 월=0, 화=1, ... 일=6
-
-    if weekday == 0:  # 월요일
-        return 0 <= hour < 7
-    elif 1 <= weekday <= 4:  # 화~금
-        return 2 <= hour < 7
-    else:
-        return False
+    return not _calendar().is_active("notify", now_kst())
 
 def is_market_open() -> bool:
-    """서울 외환시장 운영 시간 (09:00 ~ 15:30) 내인지 확인"""
-    now = now_kst()
-    return now.weekday() < 5 and time(9, 0) <= now.time() <= time(15, 30)
+    """서울 외환시장 운영 시간 (평일 09:00 ~ 15:30, 공휴일 휴장) 내인지 확인"""
+    return _calendar().is_active("session", now_kst())
 
 def is_time_between(start_h: int, start_m: int, end_h: int, end_m: int) -> bool:
     """임의의 시간 범위 내인지 확인 (평일 기준)"""
@@ -61,70 +62,22 @@ def is_exact_time(hour: int, minute: int) -> bool:
 def is_scrape_time(last_scraped: date | None = None) -> bool:
     """
     오전 11시대에 해당하며 오늘 아직 스크랩하지 않았다면 True 반환
-    - 주말, 한국 공휴일은 제외
+    - 주말, 한국 공휴일은 제외 (달력의 "scrape" 구간)
     """
     now = now_kst()
-    today = now.date()
-
-    # 주말 제외
-    if now.weekday() >= 5:
-        return False
-
-    # 한국 공휴일 제외
-    kr_holidays = holidays.KR(years=today.year)
-    if today in kr_holidays:
-        return False
+    return _calendar().is_active("scrape", now) and last_scraped != now.date()
 
-    # 11시대이고 오늘 아직 스크랩하지 않았을 때
-    if 11 <= now.hour < 12:
-        if last_scraped is None or last_scraped != today:
-            return True
-    return False
 
-
-def get_recent_completed_30min_block(now: datetime) -> tuple[datetime, datetime]:
+def get_last_completed_block(now: datetime, interval: int = 1800) -> tuple[datetime, datetime]:
     """
-    현재 시각 기준으로 가장 최근 '완료된' 30분 블록 반환
-    - 기준: 각 블록의 end 시각 ±120초(2분 0초) 안에 now가 도달하면 완료로 간주
-    - 또는 end + threshold 이후까지 도달했으면 다음 블록이 완료된 것으로 판단
+    now 기준 가장 최근에 끝난 interval 초 블록 [start, end)
+    - 경계는 epoch 기준 정렬 (KST 는 UTC+9 이므로 30분 블록은 KST 정각/30분)
+    - 틱이 경계에 정렬돼 있으므로 별도 허용 오차 없이 now 를 그대로 내림
 
     예:
-    - now = 15:28:00 → (15:00 ~ 15:30)
-    - now = 15:31:00 → (15:00 ~ 15:30)
-    - now = 15:33:00 → (15:30 ~ 16:00)
+    - now = 15:29:59 → (14:30 ~ 15:00)
+    - now = 15:30:00 → (15:00 ~ 15:30)
     """
-    threshold_sec = 120
-
-    base = TIMEZONE.localize(datetime.combine(now.date(), time.min))  # ✅ 안전한 tz-aware
-    minute = now.minute
-    hour = now.hour
-
-    # 가장 가까운 0분 or 30분 end 시각 후보
-    if minute < 30:
-        candidate_end = base.replace(hour=hour, minute=30)
-    else:
-        candidate_end = base.replace(hour=(hour + 1) % 24, minute=0)
-        if hour == 23:
-            candidate_end += timedelta(days=1)
-
-    # now가 threshold 범위 안이면 이 블록을 완료로 판단
-    time_diff = (now - candidate_end).total_seconds()
-
-    if abs(time_diff) <= threshold_sec:
-        start = candidate_end - timedelta(minutes=30)
-        return start, candidate_end
-
-    elif time_diff > threshold_sec:
-        # 이미 다음 블록도 완료됨
-        next_end = candidate_end + timedelta(minutes=30)
-        start = next_end - timedelta(minutes=30)
-        return start, next_end
-
-    else:
-        # 아직 블록 종료 기준에 도달하지 않음 → 전 블록 반환
-        end = candidate_end - timedelta(minutes=30)
-        start = end - timedelta(minutes=30)
-        return start, end
-
-
-
+    ts = now.timestamp()
+    end = datetime.fromtimestamp(ts - ts % interval, TIMEZONE)
+    return end - timedelta(seconds=interval), end